@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import numpy as np
+
+from geocat.f2py import aio, linint2pts
+
+from .common import random_field
+
+
+class Aio:
+    """Concurrent point requests of a service through geocat.f2py.aio.
+
+    ``sources`` is the number of fields the requests are spread over:
+    the requests for the same field are coalesced into one kernel call,
+    so 1 source is the best case and as many sources as requests the
+    worst.
+    """
+    params = ([1, 16, 64], ["one", "each"])
+    param_names = ["concurrency", "sources"]
+    timeout = 120
+
+    def setup(self, concurrency, sources):
+        rng = np.random.default_rng(0)
+        self.xi = np.linspace(0, 360, 512, endpoint=False)
+        self.yi = np.linspace(-90, 90, 256)
+        fields = [
+            random_field((4, 256, 512), "float64", 0.0, seed=k)
+            for k in range(1 if sources == "one" else concurrency)
+        ]
+        self.fields = [fields[k % len(fields)] for k in range(concurrency)]
+        self.points = [(rng.uniform(0, 359, 100), rng.uniform(-89, 89, 100))
+                       for _ in range(concurrency)]
+
+        # The executor is started outside of the timings
+        aio.get_executor()
+
+    def teardown(self, *args):
+        aio.shutdown()
+
+    async def _requests(self):
+        return await asyncio.gather(
+            *(aio.linint2pts(fi, xo, yo, icycx=True, xi=self.xi, yi=self.yi)
+              for (fi, (xo, yo)) in zip(self.fields, self.points)))
+
+    def time_requests(self, *args):
+        asyncio.run(self._requests())
+
+    def track_requests_per_second(self, concurrency, sources):
+        start = time.perf_counter()
+        asyncio.run(self._requests())
+        return concurrency / (time.perf_counter() - start)
+
+    track_requests_per_second.unit = "requests/s"
+
+    def track_requests_per_second_sync(self, concurrency, sources):
+        # The same requests, one blocking call after the other
+        start = time.perf_counter()
+        for (fi, (xo, yo)) in zip(self.fields, self.points):
+            linint2pts(fi, xo, yo, icycx=True, xi=self.xi, yi=self.yi)
+        return concurrency / (time.perf_counter() - start)
+
+    track_requests_per_second_sync.unit = "requests/s"
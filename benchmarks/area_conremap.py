@@ -0,0 +1,42 @@
+import numpy as np
+
+from geocat.f2py import BinningRegridder
+from geocat.f2py.fortran import binning_get_global_lats_wgts, cremapbin
+
+from .common import (as_input, compute, input_params, msg_fraction_params,
+                     random_field)
+
+# Number of fields regridded at once, e.g. the levels and times of a month
+nfields_params = [1, 64]
+
+
+class BinningRegrid:
+    params = (nfields_params, msg_fraction_params, input_params)
+    param_names = ["nfields", "msg_fraction", "input"]
+
+    def setup(self, nfields, msg_fraction, kind):
+        # T85 Gaussian grid to 2.5 degrees
+        self.lon = np.arange(256) * 1.40625
+        self.lat = np.rad2deg(binning_get_global_lats_wgts(128)[0])
+        self.lon_out = np.arange(0, 360, 2.5)
+        self.lat_out = np.linspace(-88.75, 88.75, 72)
+
+        self.fi = random_field((nfields, 128, 256), "float64", msg_fraction)
+        self.input = as_input(self.fi, kind, ("time", "lat", "lon"))
+        self.regrid = BinningRegridder(self.lon, self.lat, self.lon_out,
+                                       self.lat_out)
+
+    def time_regrid(self, *args):
+        compute(self.regrid(self.input))
+
+    def time_regridder(self, *args):
+        # Including the latitude and edge maps
+        regrid = BinningRegridder(self.lon, self.lat, self.lon_out,
+                                  self.lat_out)
+        compute(regrid(self.input))
+
+    def time_fortran(self, *args):
+        # A single CREMAPBIN call on all the fields
+        fi = np.where(np.isnan(self.fi), 1e20, self.fi)
+        cremapbin(np.transpose(fi), self.lat, self.lon, self.lat_out,
+                  self.lon_out, 128, 72, 1.0, 1e20)
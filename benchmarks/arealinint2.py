@@ -0,0 +1,58 @@
+import numpy as np
+
+from geocat.f2py import ConservativeRegridder
+from geocat.f2py.fortran import arealinint2da
+
+from .common import (as_input, compute, input_params, msg_fraction_params,
+                     random_field)
+
+# Number of fields regridded at once, e.g. the levels and times of a budget
+nfields_params = [1, 64]
+
+
+class ConservativeRegrid:
+    params = (nfields_params, msg_fraction_params, input_params)
+    param_names = ["nfields", "msg_fraction", "input"]
+
+    def setup(self, nfields, msg_fraction, kind):
+        # 1 degree to 5 degrees
+        self.lon = np.arange(0.5, 360, 1.0)
+        self.lat = np.arange(-89.5, 90, 1.0)
+        self.lon_out = np.arange(2.5, 360, 5.0)
+        self.lat_out = np.arange(-87.5, 90, 5.0)
+        self.wyi = np.cos(np.deg2rad(self.lat))
+
+        self.fi = random_field((nfields, 180, 360), "float64", msg_fraction)
+        self.input = as_input(self.fi, kind, ("time", "lat", "lon"))
+        self.regrid = ConservativeRegridder(self.lon,
+                                            self.lat,
+                                            self.lon_out,
+                                            self.lat_out,
+                                            wyi=self.wyi,
+                                            cyclic=True)
+
+    def time_regrid(self, *args):
+        compute(self.regrid(self.input))
+
+    def time_regridder(self, *args):
+        # Including the weights
+        regrid = ConservativeRegridder(self.lon,
+                                       self.lat,
+                                       self.lon_out,
+                                       self.lat_out,
+                                       wyi=self.wyi,
+                                       cyclic=True)
+        compute(regrid(self.input))
+
+    def time_fortran(self, nfields, msg_fraction, kind):
+        # A single ARELININT2DA call on all the fields
+        fi = np.where(np.isnan(self.fi), 1e20, self.fi)
+        arealinint2da(self.lon,
+                      self.lat,
+                      np.transpose(fi),
+                      np.ones(self.lon.shape),
+                      self.wyi,
+                      self.lon_out,
+                      self.lat_out,
+                      zimsg=1e20,
+                      mcyc=1)
@@ -0,0 +1,68 @@
+"""Input generators shared by the geocat.f2py benchmarks.
+
+Every benchmark builds its inputs in ``setup`` with the helpers below, so
+that only the wrapper call itself is timed. Inputs are parametrized by
+
+- grid size (benchmark specific, see each ``params``),
+- number of leading slices, i.e. the size of the leading dimension,
+- dtype of the data,
+- fraction of missing values, which are NaN,
+- input type: ``"numpy"`` for :class:`numpy.ndarray` input, or ``"dask"`` for
+  :class:`xarray.DataArray` input chunked with one leading slice per chunk.
+
+The linint benchmarks are also parametrized by backend, to compare the
+Fortran and NumPy implementations per problem shape.
+"""
+
+import numpy as np
+import xarray as xr
+
+# Parameters shared by most benchmarks
+nslices_params = [1, 8]
+dtype_params = ["float32", "float64"]
+msg_fraction_params = [0.0, 0.1]
+input_params = ["numpy", "dask"]
+backend_params = ["fortran", "numpy"]
+
+
+def random_field(shape, dtype, msg_fraction, seed=0):
+    """Smooth random field of the given shape, with a fraction of NaNs."""
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 2 * np.pi, shape[-2])[:, None]
+    x = np.linspace(0, 2 * np.pi, shape[-1])[None, :]
+    data = np.sin(x) * np.cos(y) + 0.1 * rng.standard_normal(shape)
+    data = data.astype(dtype)
+
+    if msg_fraction > 0:
+        data[rng.random(shape) < msg_fraction] = np.nan
+
+    return data
+
+
+def as_input(data, kind, dims, coords=None, ncore=2):
+    """Converts ``data`` to the benchmarked input type.
+
+    ``"dask"`` input is chunked with one slice per chunk along every
+    dimension but the rightmost ``ncore`` ones.
+    """
+    if kind == "numpy":
+        return data
+
+    data = xr.DataArray(data, dims=dims, coords=coords)
+    return data.chunk({dim: 1 for dim in dims[:-ncore]})
+
+
+def curvilinear_grid(ny, nx):
+    """Slightly rotated, stretched 2D lat/lon grid over [-60, 60] x [0,
+    120]."""
+    j, i = np.meshgrid(np.linspace(0, 1, ny),
+                       np.linspace(0, 1, nx),
+                       indexing="ij")
+    lat2d = -60 + 120 * j + 2 * np.sin(np.pi * i)
+    lon2d = 120 * i + 2 * np.sin(np.pi * j)
+    return lat2d, lon2d
+
+
+def compute(out):
+    """Computes lazy wrapper output so that benchmarks time the whole call."""
+    return out.compute() if hasattr(out, "compute") else out
@@ -0,0 +1,16 @@
+# Import time of the package in a fresh interpreter. `import geocat.f2py`
+# should stay well under 100 ms, i.e. not import dask, xarray or any of the
+# compiled extensions, which are only loaded by the functions that need them.
+
+
+class Import:
+    timeout = 60
+
+    def timeraw_import_package(self):
+        return "import geocat.f2py"
+
+    def timeraw_import_linint1(self):
+        return "from geocat.f2py import linint1"
+
+    def timeraw_import_all(self):
+        return "from geocat.f2py import *"
@@ -0,0 +1,116 @@
+import numpy as np
+
+from geocat.f2py import linint1, linint2, linint2pts
+
+from .common import (as_input, backend_params, compute, dtype_params,
+                     input_params, msg_fraction_params, nslices_params,
+                     random_field)
+
+
+class Linint1:
+    params = ([1000, 10000], nslices_params, dtype_params, msg_fraction_params,
+              input_params, backend_params)
+    param_names = ["nx", "nslices", "dtype", "msg_fraction", "input", "backend"]
+
+    def setup(self, nx, nslices, dtype, msg_fraction, kind, backend):
+        xi = np.linspace(0, 360, nx, endpoint=False)
+        fi = random_field((nslices, nx), dtype, msg_fraction)
+
+        self.xi = None if kind == "dask" else xi
+        self.xo = np.linspace(0, 359, 2 * nx - 1)
+        self.backend = backend
+        self.fi = as_input(fi, kind, ("time", "lon"), {"lon": xi}, ncore=1)
+
+    def time_linint1(self, *args):
+        compute(
+            linint1(self.fi, self.xo, xi=self.xi, icycx=1,
+                    backend=self.backend))
+
+    def peakmem_linint1(self, *args):
+        compute(
+            linint1(self.fi, self.xo, xi=self.xi, icycx=1,
+                    backend=self.backend))
+
+
+class Linint2:
+    params = ([64, 512], nslices_params, dtype_params, msg_fraction_params,
+              input_params, backend_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input", "backend"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind, backend):
+        xi = np.linspace(0, 360, n, endpoint=False)
+        yi = np.linspace(-90, 90, n)
+        fi = random_field((nslices, n, n), dtype, msg_fraction)
+
+        self.xi = None if kind == "dask" else xi
+        self.yi = None if kind == "dask" else yi
+        self.xo = np.linspace(0, 359, 2 * n - 1)
+        self.yo = np.linspace(-89.5, 89.5, 2 * n - 1)
+        self.backend = backend
+        self.fi = as_input(fi, kind, ("time", "lat", "lon"), {
+            "lat": yi,
+            "lon": xi
+        })
+
+    def time_linint2(self, *args):
+        compute(
+            linint2(self.fi,
+                    self.xo,
+                    self.yo,
+                    xi=self.xi,
+                    yi=self.yi,
+                    icycx=1,
+                    backend=self.backend))
+
+    def peakmem_linint2(self, *args):
+        compute(
+            linint2(self.fi,
+                    self.xo,
+                    self.yo,
+                    xi=self.xi,
+                    yi=self.yi,
+                    icycx=1,
+                    backend=self.backend))
+
+
+class Linint2pts:
+    params = ([64, 512], nslices_params, dtype_params, msg_fraction_params,
+              input_params, backend_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input", "backend"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind, backend):
+        rng = np.random.default_rng(0)
+        xi = np.linspace(0, 360, n, endpoint=False)
+        yi = np.linspace(-90, 90, n)
+        fi = random_field((nslices, n, n), dtype, msg_fraction)
+
+        # As many scattered output points as input grid points
+        self.xi = None if kind == "dask" else xi
+        self.yi = None if kind == "dask" else yi
+        self.xo = rng.uniform(0, 359, n * n)
+        self.yo = rng.uniform(-89.5, 89.5, n * n)
+        self.backend = backend
+        self.fi = as_input(fi, kind, ("time", "lat", "lon"), {
+            "lat": yi,
+            "lon": xi
+        })
+
+    def time_linint2pts(self, *args):
+        compute(
+            linint2pts(self.fi,
+                       self.xo,
+                       self.yo,
+                       icycx=True,
+                       xi=self.xi,
+                       yi=self.yi,
+                       backend=self.backend))
+
+    def peakmem_linint2pts(self, *args):
+        compute(
+            linint2pts(self.fi,
+                       self.xo,
+                       self.yo,
+                       icycx=True,
+                       xi=self.xi,
+                       yi=self.yi,
+                       backend=self.backend))
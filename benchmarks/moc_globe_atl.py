@@ -0,0 +1,42 @@
+import numpy as np
+
+from geocat.f2py import moc_globe_atl
+
+from .common import (as_input, compute, curvilinear_grid, dtype_params,
+                     input_params, msg_fraction_params, nslices_params,
+                     random_field)
+
+# Number of vertical levels of the work arrays
+kdep = 20
+
+
+class MocGlobeAtl:
+    params = ([64, 256], nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        self.t_lat, t_lon = curvilinear_grid(n, n)
+        self.lat_aux_grid = np.linspace(-60, 60, n)
+
+        # Globe and an "Atlantic" made of the western third of the grid
+        self.rmlak = np.stack((np.ones((n, n)), t_lon < 40)).astype(np.int32)
+
+        shape = (nslices, kdep, n, n)
+        dims = ("time", "z_t", "nlat", "nlon")
+        self.work = [
+            as_input(random_field(shape, dtype, msg_fraction, seed=seed),
+                     kind,
+                     dims,
+                     ncore=3) for seed in range(3)
+        ]
+
+    def time_moc_globe_atl(self, *args):
+        compute(
+            moc_globe_atl(self.lat_aux_grid, *self.work, self.t_lat,
+                          self.rmlak))
+
+    def peakmem_moc_globe_atl(self, *args):
+        compute(
+            moc_globe_atl(self.lat_aux_grid, *self.work, self.t_lat,
+                          self.rmlak))
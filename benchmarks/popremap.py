@@ -0,0 +1,49 @@
+import numpy as np
+
+from geocat.f2py import ScripRemapper
+from geocat.f2py.fortran import dpopremap
+
+from .common import (as_input, compute, dtype_params, input_params,
+                     msg_fraction_params, random_field)
+
+# Number of fields remapped at once, e.g. the levels of a month of POP output
+nfields_params = [1, 60]
+
+
+class ScripRemap:
+    params = (nfields_params, dtype_params, msg_fraction_params, input_params)
+    param_names = ["nfields", "dtype", "msg_fraction", "input"]
+
+    def setup(self, nfields, dtype, msg_fraction, kind):
+        # gx1v7-sized (384, 320) source grid to a 1 degree grid, by four
+        # links per destination cell as for bilinear weights
+        rng = np.random.default_rng(0)
+        self.ndst = 180 * 360
+        self.dst_address = np.repeat(np.arange(1, self.ndst + 1), 4)
+        self.src_address = rng.integers(1, 384 * 320 + 1, 4 * self.ndst)
+        self.weights = rng.random(4 * self.ndst)
+
+        self.fi = random_field((nfields, 384, 320), dtype, msg_fraction)
+        self.input = as_input(self.fi, kind, ("time", "nlat", "nlon"))
+        self.remap = ScripRemapper(self.src_address,
+                                   self.dst_address,
+                                   self.weights, (384, 320), (180, 360),
+                                   dtype=dtype)
+
+    def time_remap(self, *args):
+        compute(self.remap(self.input))
+
+    def time_remapper(self, nfields, dtype, msg_fraction, kind):
+        # Including the sorting of the links
+        remap = ScripRemapper(self.src_address,
+                              self.dst_address,
+                              self.weights, (384, 320), (180, 360),
+                              dtype=dtype)
+        compute(remap(self.input))
+
+    def time_fortran(self, *args):
+        # DPOPREMAP, one field at a time
+        fi = np.where(np.isnan(self.fi), 1e20, self.fi).astype(np.float64)
+        for field in fi.reshape(fi.shape[0], -1):
+            dpopremap(self.weights[None], self.dst_address, self.src_address,
+                      field, self.ndst)
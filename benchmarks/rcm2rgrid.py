@@ -0,0 +1,76 @@
+import numpy as np
+
+from geocat.f2py import rcm2points, rcm2rgrid, rgrid2rcm
+
+from .common import (as_input, compute, curvilinear_grid, dtype_params,
+                     input_params, msg_fraction_params, nslices_params,
+                     random_field)
+
+# Search-based kernels; their cost grows much faster than the grid size
+grid_params = [32, 128]
+
+
+class Rcm2rgrid:
+    params = (grid_params, nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        self.lat2d, self.lon2d = curvilinear_grid(n, n)
+        self.lat1d = np.linspace(-55, 55, n)
+        self.lon1d = np.linspace(5, 115, n)
+        fi = random_field((nslices, n, n), dtype, msg_fraction)
+        self.fi = as_input(fi, kind, ("time", "y", "x"))
+
+    def time_rcm2rgrid(self, *args):
+        compute(
+            rcm2rgrid(self.lat2d, self.lon2d, self.fi, self.lat1d, self.lon1d))
+
+    def peakmem_rcm2rgrid(self, *args):
+        compute(
+            rcm2rgrid(self.lat2d, self.lon2d, self.fi, self.lat1d, self.lon1d))
+
+
+class Rgrid2rcm:
+    params = (grid_params, nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        self.lat2d, self.lon2d = curvilinear_grid(n, n)
+        self.lat1d = np.linspace(-65, 65, n)
+        self.lon1d = np.linspace(-5, 125, n)
+        fi = random_field((nslices, n, n), dtype, msg_fraction)
+        self.fi = as_input(fi, kind, ("time", "lat", "lon"))
+
+    def time_rgrid2rcm(self, *args):
+        compute(
+            rgrid2rcm(self.lat1d, self.lon1d, self.fi, self.lat2d, self.lon2d))
+
+    def peakmem_rgrid2rcm(self, *args):
+        compute(
+            rgrid2rcm(self.lat1d, self.lon1d, self.fi, self.lat2d, self.lon2d))
+
+
+class Rcm2points:
+    params = (grid_params, nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        rng = np.random.default_rng(0)
+        self.lat2d, self.lon2d = curvilinear_grid(n, n)
+
+        # As many scattered output points as input grid points
+        self.lat1d = rng.uniform(-55, 55, n * n)
+        self.lon1d = rng.uniform(5, 115, n * n)
+        fi = random_field((nslices, n, n), dtype, msg_fraction)
+        self.fi = as_input(fi, kind, ("time", "y", "x"))
+
+    def time_rcm2points(self, *args):
+        compute(
+            rcm2points(self.lat2d, self.lon2d, self.fi, self.lat1d, self.lon1d))
+
+    def peakmem_rcm2points(self, *args):
+        compute(
+            rcm2points(self.lat2d, self.lon2d, self.fi, self.lat1d, self.lon1d))
@@ -0,0 +1,58 @@
+import numpy as np
+
+from geocat.f2py import grid_to_triple, triple_to_grid
+
+from .common import (as_input, compute, dtype_params, input_params,
+                     msg_fraction_params, nslices_params, random_field)
+
+
+class TripleToGrid:
+    params = ([64, 512], nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        rng = np.random.default_rng(0)
+
+        # Scattered points, a quarter as many as output grid points
+        npts = n * n // 4
+        self.x_in = rng.uniform(0, 360, npts)
+        self.y_in = rng.uniform(-90, 90, npts)
+        self.x_out = np.linspace(0, 360, n, endpoint=False)
+        self.y_out = np.linspace(-90, 90, n)
+        data = random_field((nslices, npts), dtype, msg_fraction)
+        self.data = as_input(data, kind, ("time", "pts"), ncore=1)
+
+    def time_triple_to_grid(self, *args):
+        compute(
+            triple_to_grid(self.data, self.x_in, self.y_in, self.x_out,
+                           self.y_out))
+
+    def peakmem_triple_to_grid(self, *args):
+        compute(
+            triple_to_grid(self.data, self.x_in, self.y_in, self.x_out,
+                           self.y_out))
+
+
+class GridToTriple:
+    params = ([64, 512], nslices_params, dtype_params, msg_fraction_params,
+              input_params)
+    param_names = ["n", "nslices", "dtype", "msg_fraction", "input"]
+
+    def setup(self, n, nslices, dtype, msg_fraction, kind):
+        x_in = np.linspace(0, 360, n, endpoint=False)
+        y_in = np.linspace(-90, 90, n)
+        data = random_field((nslices, n, n), dtype, msg_fraction)
+
+        self.x_in = None if kind == "dask" else x_in
+        self.y_in = None if kind == "dask" else y_in
+        self.data = as_input(data, kind, ("time", "lat", "lon"), {
+            "lat": y_in,
+            "lon": x_in
+        })
+
+    def time_grid_to_triple(self, *args):
+        compute(grid_to_triple(self.data, self.x_in, self.y_in))
+
+    def peakmem_grid_to_triple(self, *args):
+        compute(grid_to_triple(self.data, self.x_in, self.y_in))
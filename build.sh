@@ -1,11 +1,18 @@
 #!/bin/sh
 
+# The kernels are parallelized with OpenMP; see geocat.f2py.set_num_threads
+OPENMP="--f77flags=-fopenmp -lgomp"
+
 cd src/geocat/f2py/fortran
+f2py -c --fcompiler=gnu95 area_conremap.pyf area_conremap.f gaus.f
+f2py -c --fcompiler=gnu95 arealinint2.pyf arealinint2.f
 f2py -c --fcompiler=gnu95 grid2triple.pyf grid2triple.f
-f2py -c --fcompiler=gnu95 linint2.pyf linint2.f
-f2py -c --fcompiler=gnu95 moc_loops.pyf moc_loops.f
-f2py -c --fcompiler=gnu95 rcm2points.pyf rcm2points.f rcm2rgrid.f linmsg_dp.f linint2.f
-f2py -c --fcompiler=gnu95 rcm2rgrid.pyf rcm2rgrid.f linmsg_dp.f linint2.f
+f2py -c --fcompiler=gnu95 $OPENMP linint2.pyf linint2.f
+f2py -c --fcompiler=gnu95 $OPENMP moc_loops.pyf moc_loops.f
+f2py -c --fcompiler=gnu95 $OPENMP omp.pyf omp.f
+f2py -c --fcompiler=gnu95 $OPENMP popremap.pyf popremap.f
+f2py -c --fcompiler=gnu95 $OPENMP rcm2points.pyf rcm2points.f rcm2rgrid.f linmsg_dp.f linint2.f
+f2py -c --fcompiler=gnu95 $OPENMP rcm2rgrid.pyf rcm2rgrid.f linmsg_dp.f linint2.f
 f2py -c --fcompiler=gnu95 triple2grid.pyf triple2grid.f
 cd ../../../..
 
@@ -54,6 +54,9 @@ setup(name='geocat.f2py',
       package_data={'geocat.f2py.fortran': files},
       namespace_packages=['geocat'],
       packages=['geocat', 'geocat.f2py', 'geocat.f2py.fortran'],
+      entry_points={
+          'console_scripts': ['geocat-f2py-regrid = geocat.f2py.cli:main',],
+      },
       url='https://github.com/NCAR/geocat-f2py',
       project_urls={
           'Documentation': 'https://geocat-f2py.readthedocs.io',
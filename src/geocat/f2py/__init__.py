@@ -1,11 +1,64 @@
+import builtins
+import importlib
+import sys
+
 # This prevents a python 3.9 bug
-import multiprocessing.popen_spawn_posix
+if sys.version_info[:2] == (3, 9):
+    import multiprocessing.popen_spawn_posix
 
+from . import errors
 from .errors import *
-from .linint2_wrapper import linint1, linint2, linint2_points, linint2pts
-from .missing_values import fort2py_msg, py2fort_msg
-from .moc_globe_atl_wrapper import moc_globe_atl
-from .rcm2points_wrapper import rcm2points
-from .rcm2rgrid_wrapper import rcm2rgrid, rgrid2rcm
-from .triple_to_grid_wrapper import (grid2triple, grid_to_triple, triple2grid,
-                                     triple_to_grid)
+
+# The user API is imported on first access, so that importing the package does
+# not import dask, xarray or the compiled Fortran extensions; e.g. a script
+# only using `linint1` only loads the wrapper and extension it needs.
+_lazy_attributes = {
+    "BinningRegridder": ".area_conremap_wrapper",
+    "ConservativeRegridder": ".arealinint2_wrapper",
+    "linint1": ".linint2_wrapper",
+    "linint2": ".linint2_wrapper",
+    "linint2_points": ".linint2_wrapper",
+    "linint2pts": ".linint2_wrapper",
+    "fort2py_msg": ".missing_values",
+    "py2fort_msg": ".missing_values",
+    "moc_globe_atl": ".moc_globe_atl_wrapper",
+    "rcm2points": ".rcm2points_wrapper",
+    "rcm2rgrid": ".rcm2rgrid_wrapper",
+    "rgrid2rcm": ".rcm2rgrid_wrapper",
+    "ScripRemapper": ".popremap_wrapper",
+    "grid2triple": ".triple_to_grid_wrapper",
+    "grid_to_triple": ".triple_to_grid_wrapper",
+    "grid_to_triple_blocks": ".triple_to_grid_wrapper",
+    "triple2grid": ".triple_to_grid_wrapper",
+    "triple_to_grid": ".triple_to_grid_wrapper",
+    "get_num_threads": ".threads",
+    "num_threads": ".threads",
+    "set_num_threads": ".threads",
+}
+
+_lazy_submodules = {
+    "aio", "cache", "chunking", "oisst", "parallel", "profiling", "streaming",
+    "threads", "wps"
+}
+
+__all__ = sorted({name for name in vars(errors) if not name.startswith("_")} |
+                 set(_lazy_attributes) | _lazy_submodules)
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        value = importlib.import_module("." + name, __name__)
+    elif name in _lazy_attributes:
+        module = importlib.import_module(_lazy_attributes[name], __name__)
+        value = getattr(module, name)
+    else:
+        # `AttributeError` of this package shadows the built-in one
+        raise builtins.AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) | _lazy_submodules)
@@ -0,0 +1,232 @@
+"""asyncio front-end of the point interpolation wrappers.
+
+The coroutines of this module run :func:`~geocat.f2py.linint2pts` and
+:func:`~geocat.f2py.rcm2points` in an executor, so that a service does not
+block its event loop for the whole computation:
+
+.. code-block:: python
+
+    from geocat.f2py import aio
+
+    fo = await aio.linint2pts(fi, xo, yo, icycx=True, xi=xi, yi=yi)
+
+Concurrent requests for the same source field, i.e. the same ``fi`` and
+input coordinate objects with the same options, are coalesced: their points
+are concatenated and interpolated by a single call of the wrapper, whose
+output is split back per request. Requests made within the same iteration of
+the event loop are coalesced by default; a ``window`` (see :func:`configure`)
+also waits for the requests of the following iterations. If the batched call
+fails, every request of the batch raises its exception.
+
+The executor is a thread pool by default, in which the Fortran routines run
+without holding the GIL; a process pool, which requires picklable inputs and
+copies them to the workers for every batch, may be configured instead.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import weakref
+
+import numpy as np
+
+from .errors import DimensionError
+
+_executor = None
+_owned = False
+_window = 0.0
+
+# {event loop: {key: batch}} of the batches not dispatched yet
+_pending = weakref.WeakKeyDictionary()
+
+# Running batch tasks, referenced until done
+_tasks = set()
+
+
+def configure(executor=None, workers: int = None, window: float = None) -> None:
+    """Sets the executor and the coalescing window of the coroutines.
+
+    Parameters
+    ----------
+
+    executor : :obj:`str`, :class:`concurrent.futures.Executor`, optional
+        ``"thread"`` or ``"process"`` for a new pool of ``workers`` threads or
+        ``spawn`` processes, or an executor to use as it is. Unchanged if
+        None.
+
+    workers : :obj:`int`, optional
+        Number of workers of a new pool; defaults to :func:`os.cpu_count`.
+
+    window : :obj:`float`, optional
+        Time, in seconds, to wait for more requests to coalesce with the first
+        one of a batch; 0 only coalesces those of the same event loop
+        iteration. Unchanged if None.
+    """
+    global _executor, _owned, _window
+
+    if window is not None:
+        if window < 0:
+            raise ValueError("aio.configure: `window` must be non-negative!")
+        _window = float(window)
+
+    if executor is None:
+        return
+
+    if isinstance(executor, str):
+        if executor not in ("thread", "process"):
+            raise ValueError(
+                "aio.configure: `executor` must be 'thread', 'process' or an "
+                "executor!")
+        workers = workers or os.cpu_count() or 1
+        if executor == "thread":
+            new = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="geocat-f2py-aio")
+        else:
+            new = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"))
+        owned = True
+    else:
+        new, owned = executor, False
+
+    shutdown()
+    _executor, _owned = new, owned
+
+
+def get_executor() -> concurrent.futures.Executor:
+    """Returns the executor of the coroutines, starting the default thread pool
+    if none is configured."""
+    if _executor is None:
+        configure("thread")
+    return _executor
+
+
+def shutdown() -> None:
+    """Stops the executor, unless it was passed to :func:`configure`; the next
+    request starts the default one."""
+    global _executor, _owned
+
+    if _executor is not None and _owned:
+        _executor.shutdown(wait=False)
+    _executor, _owned = None, False
+
+
+class _Batch:
+    # Requests for the same source field; `call(x, y)` computes the points
+
+    def __init__(self, call):
+        self.call = call
+        self.requests = []  # [(x, y, future)]
+
+
+def _points(x, y, func, names):
+    # The points of a request as float64 arrays
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.ndim != 1 or x.shape != y.shape:
+        raise DimensionError(
+            f"aio.{func}: `{names[0]}` and `{names[1]}` must be "
+            "one-dimensional arrays of the same size!")
+    return x, y
+
+
+async def _request(key, call, x, y):
+    loop = asyncio.get_running_loop()
+    batches = _pending.setdefault(loop, {})
+
+    batch = batches.get(key)
+    if batch is None:
+        batch = batches[key] = _Batch(call)
+        if _window > 0:
+            loop.call_later(_window, _dispatch, loop, key)
+        else:
+            loop.call_soon(_dispatch, loop, key)
+
+    future = loop.create_future()
+    batch.requests.append((x, y, future))
+    return await future
+
+
+def _dispatch(loop, key):
+    batch = _pending[loop].pop(key)
+    task = loop.create_task(_run(loop, batch))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _run(loop, batch):
+    requests = batch.requests
+    x = np.concatenate([x for (x, _, _) in requests])
+    y = np.concatenate([y for (_, y, _) in requests])
+
+    try:
+        fo = await loop.run_in_executor(get_executor(), batch.call, x, y)
+    except BaseException as e:
+        for (_, _, future) in requests:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    # The points of each request are contiguous in the rightmost dimension
+    stop = 0
+    for (x, _, future) in requests:
+        start, stop = stop, stop + x.shape[0]
+        if not future.done():
+            future.set_result(fo[..., start:stop].copy())
+
+
+def _key(func, sources, options):
+    # Source arrays are identified by object, as hashing them would cost
+    # about as much as interpolating; the batch keeps them alive meanwhile
+    return (func,) + tuple(id(s) for s in sources) + tuple(options)
+
+
+async def linint2pts(fi,
+                     xo,
+                     yo,
+                     icycx: bool = False,
+                     msg_py: np.number = None,
+                     xi=None,
+                     yi=None,
+                     backend: str = None):
+    """Coroutine of :func:`geocat.f2py.linint2pts`, with the same arguments and
+    output; ``xo`` and ``yo`` must be one-dimensional."""
+    from .linint2_wrapper import linint2pts as func
+
+    xo, yo = _points(xo, yo, "linint2pts", ("xo", "yo"))
+    call = functools.partial(func,
+                             fi,
+                             icycx=icycx,
+                             msg_py=msg_py,
+                             xi=xi,
+                             yi=yi,
+                             backend=backend)
+    key = _key("linint2pts", (fi, xi, yi), (bool(icycx), msg_py, backend))
+
+    return await _request(key, call, xo, yo)
+
+
+async def rcm2points(lat2d,
+                     lon2d,
+                     fi,
+                     lat1d,
+                     lon1d,
+                     opt: np.number = 0,
+                     msg: np.number = None):
+    """Coroutine of :func:`geocat.f2py.rcm2points`, with the same arguments and
+    output."""
+    from .rcm2points_wrapper import rcm2points as func
+
+    lat1d, lon1d = _points(lat1d, lon1d, "rcm2points", ("lat1d", "lon1d"))
+
+    # Points are the 4th and 5th positional arguments
+    call = functools.partial(_rcm2points, func, lat2d, lon2d, fi, opt, msg)
+    key = _key("rcm2points", (lat2d, lon2d, fi), (opt, msg))
+
+    return await _request(key, call, lat1d, lon1d)
+
+
+def _rcm2points(func, lat2d, lon2d, fi, opt, msg, lat1d, lon1d):
+    return func(lat2d, lon2d, fi, lat1d, lon1d, opt=opt, msg=msg)
@@ -0,0 +1,309 @@
+import typing
+
+import numpy as np
+import xarray as xr
+
+from . import cache, profiling
+from .chunking import apply_blocks
+from .coordinates import monotonic
+from .errors import CoordinateError, DimensionError
+from .missing_values import default_msg_py
+
+try:
+    from .fortran import binning_get_global_lats_wgts, binning_map_edges
+except ImportError:
+    binning_get_global_lats_wgts = binning_map_edges = None
+
+supported_types = typing.Union[xr.DataArray, np.ndarray]
+
+# Tolerance of CREMAPBIN on latitudes, in degrees for the spacing of regular
+# grids and in radians for Gaussian latitudes
+_eps = 1e-5
+
+# Inner wrappers _<funcname>()
+# These wrappers are executed within dask processes (if any), and could/should
+# do anything that can benefit from parallel execution.
+
+
+def _lat_edges(clat, nlat):
+    # Latitudes of the edges of the rows of increasing `clat`, in radians,
+    # halfway between regular latitudes, or by partial sums of the weights of
+    # the `nlat` global Gaussian latitudes of which `clat` are consecutive
+    # (BINNING_MAP_LATS, BINNING_MAP_EDGES)
+    flat = np.deg2rad(clat)
+    dlat = (clat[-1] - clat[0]) / (clat.shape[0] - 1)
+    if not (np.abs(np.diff(clat) - dlat) > _eps).any():
+        return binning_map_edges(0, flat, flat, np.zeros(1), 0)[1]
+
+    if nlat < max(3, clat.shape[0]):
+        raise CoordinateError(
+            f"BinningRegridder: {nlat} global Gaussian latitudes cannot "
+            f"include the {clat.shape[0]} Gaussian latitudes of a grid!")
+    (flat_glob, gw_glob) = binning_get_global_lats_wgts(nlat)
+
+    jfirst = np.flatnonzero(np.abs(flat_glob - flat[0]) < _eps)[:1]
+    if not jfirst.shape[0] or jfirst[0] + clat.shape[0] > nlat or (
+            np.abs(flat_glob[jfirst[0]:jfirst[0] + clat.shape[0]] - flat) >
+            _eps).any():
+        raise CoordinateError(
+            "BinningRegridder: the latitudes of a grid are neither regular "
+            f"nor of the {nlat} global Gaussian latitudes!")
+
+    return binning_map_edges(jfirst[0] + 1, flat, flat, gw_glob, 1)[1]
+
+
+def _lon_edges(flon):
+    # Longitudes of the edges of the columns of increasing `flon`, in radians
+    # (BINNING_MAP_EDGES)
+    return binning_map_edges(0, flon, flon[:2], np.zeros(1), 0)[0]
+
+
+def _x_weights(clon, clono, factor):
+    # The binning weights of the input columns of global, increasing `clon`
+    # in each output column of increasing `clono`, (nxo, nxi), normalized by
+    # the widths of the output bins, of `factor` times the output columns
+    nxi = clon.shape[0]
+    half = nxi // 2
+
+    # The input columns wrapped half-way around the globe at both ends
+    wrap = np.arange(2 * nxi)
+    cols = (half + wrap) % nxi
+    flon = np.deg2rad(clon[cols]) + 2.0 * np.pi * (
+        (wrap >= half + nxi).astype(int) - (wrap < half))
+    floni = _lon_edges(flon)
+    (edge_w, edge_e) = (floni[:-1], floni[1:])
+
+    flono = np.deg2rad(clono)
+    flonoi = _lon_edges(flono)
+    edgeo_w = (flono - (flono - flonoi[:-1]) * factor)[:, None]
+    edgeo_e = (flono + (flonoi[1:] - flono) * factor)[:, None]
+
+    # Widths of the overlaps of the input and output bins
+    dx = np.minimum(np.minimum(edge_e - edge_w, edgeo_e - edgeo_w),
+                    np.minimum(edge_e - edgeo_w, edgeo_e - edge_w))
+    dx = np.where((edge_e > edgeo_w) & (edgeo_e > edge_w), dx, 0.0)
+
+    weights = np.zeros((nxi, clono.shape[0]))
+    np.add.at(weights, cols, dx.T)
+    return weights.T / (edgeo_e - edgeo_w)
+
+
+def _y_weights(clat, clato, nlat, nlato, factor):
+    # The binning weights of the input rows of increasing `clat` in each
+    # output row of increasing `clato`, (nyo, nyi), normalized by the areas
+    # of the output bins
+    flati = _lat_edges(clat, nlat)
+    (edge_s, edge_n) = (flati[:-1], flati[1:])
+
+    flato = np.deg2rad(clato)
+    flatoi = _lat_edges(clato, nlato)
+    tmps = (flato - (flato - flatoi[:-1]) * factor)[:, None]
+    tmpn = (flato + (flatoi[1:] - flato) * factor)[:, None]
+    edgeo_s = np.maximum(tmps, -np.pi / 2) - np.maximum(tmpn - np.pi / 2, 0.0)
+    edgeo_n = np.minimum(tmpn, np.pi / 2) + np.maximum(-np.pi / 2 - tmps, 0.0)
+
+    # The area of an overlap is that of the narrowest of the input bin, the
+    # output bin and their two intersections, the first of these if tied
+    south = np.stack(np.broadcast_arrays(edge_s, edgeo_s, edgeo_s, edge_s))
+    north = np.stack(np.broadcast_arrays(edge_n, edgeo_n, edge_n, edgeo_n))
+    pick = np.argmin(north - south, axis=0)[None]
+    dy = (np.sin(np.take_along_axis(north, pick, axis=0)[0]) -
+          np.sin(np.take_along_axis(south, pick, axis=0)[0]))
+    dy = np.where((edge_n > edgeo_s) & (edgeo_n > edge_s), dy, 0.0)
+
+    return dy / (np.sin(edgeo_n) - np.sin(edgeo_s))
+
+
+def _weights(clon, clat, clono, clato, nlat, nlato, bin_factor, mono_in,
+             mono_out):
+    # `_x_weights` and `_y_weights`, the latter along latitudes monotonic in
+    # the directions `mono_in` and `mono_out`, computed on increasing
+    # latitudes as CREMAPBIN does
+    factor = np.sqrt(bin_factor)
+    wy = _y_weights(clat[::mono_in], clato[::mono_out], nlat, nlato, factor)
+    return (_x_weights(clon, clono, factor), wy[::mono_out, ::mono_in])
+
+
+def _area_conremap(fi, wx, wy, msg_py):
+    # Applies the weights to all the slices of `fi` (CREMAPBIN)
+    t = profiling.timer("area_conremap")
+    shape = fi.shape[:-2] + (wy.shape[0], wx.shape[0])
+
+    fi = np.asarray(fi, dtype=np.float64).reshape((-1,) + fi.shape[-2:])
+    fo = wy @ (fi @ wx.T)
+    t.mark("matmul")
+
+    # Slices of any missing value are missing
+    missing = np.isnan(fi)
+    if not np.isnan(msg_py):
+        missing |= fi == msg_py
+    fo[missing.any(axis=(1, 2))] = msg_py
+    t.mark("missing")
+
+    return fo.reshape(shape)
+
+
+# Outer wrappers <funcname>()
+# These wrappers are executed in the __main__ python process, and should be
+# used for any tasks which would not benefit from parallel execution.
+
+
+class BinningRegridder:
+    """Area-conserving remapping by grid-box binning between global rectilinear
+    grids, regular or Gaussian, as computed by NCL's ``area_conserve_remap``
+    (``CREMAPBIN``).
+
+    Each output value is the average of the input values over the bin of its
+    grid box, weighted by the areas of the overlaps of the input grid boxes
+    and the bin on the sphere. Box edges are halfway between regular
+    latitudes, and follow the Gaussian weights between Gaussian latitudes.
+
+    The latitude and edge maps of the grids are computed once, when the
+    regridder is created, into overlap weights per axis, and every call
+    applies them to any number of leading slices, e.g. levels and times, as
+    matrix products, in parallel over dask chunks. Regridders of the same
+    grids share these weights through :mod:`geocat.f2py.cache` when it is
+    enabled.
+
+    Parameters
+    ----------
+
+    loni : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonically increasing longitudes of the input grid,
+        in degrees, which must be global.
+
+    lati : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonic latitudes of the input grid, in degrees.
+
+    lono : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonically increasing longitudes of the output grid,
+        in degrees.
+
+    lato : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonic latitudes of the output grid, in degrees.
+
+    nlat : :obj:`int`, optional
+        Number of global Gaussian latitudes of which Gaussian ``lati`` are
+        consecutive. Defaults to the number of ``lati``.
+
+    nlato : :obj:`int`, optional
+        Number of global Gaussian latitudes of which Gaussian ``lato`` are
+        consecutive. Defaults to the number of ``lato``.
+
+    bin_factor : :obj:`float`
+        Ratio of the area of the bin of an output grid box to that of the
+        box, at least 1. Default is 1.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from geocat.f2py import BinningRegridder
+
+        regrid = BinningRegridder(ds.lon, ds.lat, lon_2deg, lat_2deg)
+        t = regrid(ds.T.chunk({"time": 12}))
+    """
+
+    def __init__(self,
+                 loni: supported_types,
+                 lati: supported_types,
+                 lono: supported_types,
+                 lato: supported_types,
+                 nlat: int = None,
+                 nlato: int = None,
+                 bin_factor: float = 1.0):
+        if binning_map_edges is None:
+            raise ImportError(
+                "BinningRegridder: the latitude and edge maps need the "
+                "compiled Fortran extension")
+
+        self.loni, self.lati, self.lono, self.lato = (
+            np.asarray(c, dtype=np.float64) for c in (loni, lati, lono, lato))
+        for (name, c) in zip(("loni", "lati", "lono", "lato"),
+                             (self.loni, self.lati, self.lono, self.lato)):
+            if c.ndim != 1 or c.shape[0] < 2:
+                raise DimensionError(
+                    f"BinningRegridder: `{name}` must be one-dimensional "
+                    "with at least two coordinates!")
+
+        if monotonic(self.loni) != 1 or monotonic(self.lono) != 1:
+            raise CoordinateError(
+                "BinningRegridder: `loni` and `lono` must be strictly "
+                "monotonically increasing!")
+        monoi, monoo = monotonic(self.lati), monotonic(self.lato)
+        if monoi == 0 or monoo == 0:
+            raise CoordinateError(
+                "BinningRegridder: `lati` and `lato` must be strictly "
+                "monotonic!")
+
+        if bin_factor < 1.0:
+            raise ValueError(
+                "BinningRegridder: `bin_factor` must be at least 1!")
+
+        self.nlat = self.lati.shape[0] if nlat is None else int(nlat)
+        self.nlato = self.lato.shape[0] if nlato is None else int(nlato)
+        self.bin_factor = float(bin_factor)
+
+        t = profiling.timer("area_conremap")
+        (self._wx, self._wy) = cache.memoize(
+            "weights", ("area_conremap", self.loni, self.lati, self.lono,
+                        self.lato, self.nlat, self.nlato, self.bin_factor),
+            lambda: _weights(self.loni, self.lati, self.lono, self.lato, self.
+                             nlat, self.nlato, self.bin_factor, monoi, monoo))
+        t.mark("weights")
+
+    def weights(self) -> tuple:
+        """Returns the ``(nlono, nloni)`` and ``(nlato, nlati)`` weight
+        matrices of the two axes, whose products with an input slice give the
+        output."""
+        return self._wx, self._wy
+
+    def __call__(self,
+                 fi: supported_types,
+                 msg_py: np.number = None) -> supported_types:
+        """Regrids ``fi``.
+
+        Parameters
+        ----------
+
+        fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            An array of two or more dimensions, on the input grid along its
+            rightmost two dimensions, ``(..., lati, loni)``. Chunked
+            :class:`xarray.DataArray` input must not be chunked along those.
+
+        msg_py : :obj:`numpy.number`, optional
+            A value taken as missing in ``fi``, as well as NaN, and used for
+            missing output values. Defaults to NaN.
+
+        Returns
+        -------
+
+        fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            The regridded double precision array, of the dimensions of ``fi``
+            but ``(..., lato, lono)``. As by CREMAPBIN, output slices are
+            missing altogether wherever their input slice has any missing
+            value. Dask output is only returned for chunked
+            :class:`xarray.DataArray` input.
+        """
+        t = profiling.timer("area_conremap")
+
+        grid = self.lati.shape + self.loni.shape
+        if np.shape(fi)[-2:] != grid:
+            raise DimensionError(
+                "BinningRegridder: the rightmost two dimensions of `fi` must "
+                f"be of the input grid, {grid}!")
+
+        if msg_py is None:
+            msg_py = default_msg_py(np.float64)
+
+        t.mark("validation")
+
+        return apply_blocks(_area_conremap,
+                            fi,
+                            2,
+                            self.lato.shape + self.lono.shape,
+                            (self._wx, self._wy, msg_py),
+                            "area_conremap",
+                            "BinningRegridder",
+                            coords=(self.lato, self.lono))
@@ -0,0 +1,275 @@
+import typing
+
+import numpy as np
+import xarray as xr
+
+from . import cache, profiling
+from .chunking import apply_blocks
+from .coordinates import monotonic
+from .errors import CoordinateError, DimensionError
+from .missing_values import default_msg_py
+
+try:
+    from .fortran import areacells
+except ImportError:
+    areacells = None
+
+supported_types = typing.Union[xr.DataArray, np.ndarray]
+
+# Inner wrappers _<funcname>()
+# These wrappers are executed within dask processes (if any), and could/should
+# do anything that can benefit from parallel execution.
+
+
+def _axis_weights(xi, xo, cyclic):
+    # The overlap weights of the input cells of increasing `xi` in each output
+    # cell of increasing `xo`, (nxo, nxi), the input cells counted in each
+    # output cell, (nxo, nxi), and whether it has any (AREACELLS)
+    fracx, indx = areacells(xi, xo, icyc=int(cyclic))
+    fracx = np.asarray(fracx).T
+    indx = np.asarray(indx)
+
+    # Only the fractions within the range of input cells of each output cell
+    # are set by the Fortran routine
+    ni = np.arange(1, xi.shape[0] + 1)
+    box = (indx[0][:, None] <= ni) & (ni <= indx[1][:, None])
+
+    return np.where(box, fracx, 0.0), box.astype(np.float64), indx[0] > 0
+
+
+def _weights(xi, xo, cyclic, mono_in, mono_out):
+    # `_axis_weights` along an axis of coordinates monotonic in the directions
+    # `mono_in` and `mono_out`, computed on increasing coordinates as
+    # ARELININT2DA does
+    frac, box, found = _axis_weights(xi[::mono_in], xo[::mono_out], cyclic)
+    return (frac[::mono_out, ::mono_in], box[::mono_out, ::mono_in],
+            found[::mono_out])
+
+
+def _product(ax, ay, z):
+    # `ay @ z @ ax.T` for each slice of `z`, along x on all the rows at once
+    zx = z.reshape(-1, z.shape[-1]) @ ax.T
+    return np.matmul(ay, zx.reshape(z.shape[:-1] + (ax.shape[0],)))
+
+
+def _arealinint2(fi, wx, wy, bx, by, found, critpc, msg_py):
+    # Applies the weights to all the slices of `fi` (ARELININT2DA)
+    t = profiling.timer("arealinint2")
+    shape = fi.shape[:-2] + (wy.shape[0], wx.shape[0])
+
+    fi = np.asarray(fi, dtype=np.float64).reshape((-1,) + fi.shape[-2:])
+    missing = np.isnan(fi)
+    if not np.isnan(msg_py):
+        missing |= fi == msg_py
+
+    if missing.any():
+        # The weights of the missing values are left out, and output cells
+        # need at least `critpc` percent of their input cells present
+        present = (~missing).astype(np.float64)
+        fo = _product(wx, wy, np.where(missing, 0.0, fi))
+        sw = _product(wx, wy, present)
+
+        kbox = np.outer(by.sum(axis=1), bx.sum(axis=1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            boxpc = 100.0 * (_product(bx, by, present) / kbox)
+        valid = (sw > 0.0) & (boxpc >= critpc)
+    else:
+        fo = _product(wx, wy, fi)
+        sw = np.outer(wy.sum(axis=1), wx.sum(axis=1))
+        valid = sw > 0.0
+    t.mark("matmul")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fo = np.where(valid & found, fo / sw, msg_py)
+    t.mark("normalization")
+
+    return fo.reshape(shape)
+
+
+# Outer wrappers <funcname>()
+# These wrappers are executed in the __main__ python process, and should be
+# used for any tasks which would not benefit from parallel execution.
+
+
+class ConservativeRegridder:
+    """Area-weighted conservative regridding between rectilinear grids.
+
+    Each output value is the average of the input values of the cells it
+    overlaps, weighted by the fraction of each input cell within the output
+    cell and by the input weights ``wyi``, e.g. the cosine of the latitudes,
+    as computed by NCL's ``area_hi2lores`` (``ARELININT2DA``). Cell
+    bounds are halfway between coordinates.
+
+    The grids are separable, so the overlap weights are computed once per axis
+    when the regridder is created, by the Fortran routine ``AREACELLS``, and
+    every call applies them to any number of leading slices as matrix
+    products. The weights are kept in :mod:`geocat.f2py.cache`, if enabled,
+    including on disk if it has a directory, so that regridders of the same
+    grids in other sessions reuse them.
+
+    Parameters
+    ----------
+
+    xi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonically increasing X-coordinates of the input
+        grid, e.g. longitudes.
+
+    yi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonic Y-coordinates of the input grid, e.g.
+        latitudes.
+
+    xo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonically increasing X-coordinates of the output
+        grid, of no higher resolution than ``xi``.
+
+    yo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The strictly monotonic Y-coordinates of the output grid, of no higher
+        resolution than ``yi``.
+
+    wyi : :obj:`float`, :class:`numpy.ndarray`
+        Weights of the input rows, a scalar or an array of the size of
+        ``yi``, e.g. the cosine of the latitudes or Gaussian weights.
+        Default is 1.
+
+    cyclic : :obj:`bool`
+        Whether the X-coordinates are cyclic, in which case the first and
+        last cells are full width rather than half width.
+
+    critpc : :obj:`float`
+        Minimum percentage of the input cells of an output cell that must be
+        present for it to be computed; default is 100, i.e. an output value
+        is missing if any input value in its cell is. Otherwise, the weights
+        of the cells present are renormalized.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from geocat.f2py import ConservativeRegridder
+
+        regrid = ConservativeRegridder(lon, lat, lon_1deg, lat_1deg,
+                                       wyi=np.cos(np.deg2rad(lat)),
+                                       cyclic=True)
+        fo = regrid(ds.T)
+        fo = regrid(ds.Q, critpc=50)
+    """
+
+    def __init__(self,
+                 xi: supported_types,
+                 yi: supported_types,
+                 xo: supported_types,
+                 yo: supported_types,
+                 wyi=1.0,
+                 cyclic: bool = False,
+                 critpc: float = 100.0):
+        if areacells is None:
+            raise ImportError(
+                "ConservativeRegridder: AREACELLS needs the compiled Fortran "
+                "extension")
+
+        self.xi, self.yi, self.xo, self.yo = (
+            np.asarray(c, dtype=np.float64) for c in (xi, yi, xo, yo))
+        for (name, c) in zip(("xi", "yi", "xo", "yo"),
+                             (self.xi, self.yi, self.xo, self.yo)):
+            if c.ndim != 1 or c.shape[0] < 2:
+                raise DimensionError(
+                    f"ConservativeRegridder: `{name}` must be one-dimensional "
+                    "with at least two coordinates!")
+
+        if monotonic(self.xi) != 1 or monotonic(self.xo) != 1:
+            raise CoordinateError(
+                "ConservativeRegridder: `xi` and `xo` must be strictly "
+                "monotonically increasing!")
+        monoyi, monoyo = monotonic(self.yi), monotonic(self.yo)
+        if monoyi == 0 or monoyo == 0:
+            raise CoordinateError(
+                "ConservativeRegridder: `yi` and `yo` must be strictly "
+                "monotonic!")
+
+        # The output cells average input cells, as checked by CONCHKRES
+        for (ci, co, axis) in [(self.xi, self.xo, "x"),
+                               (self.yi, self.yo, "y")]:
+            if np.abs(np.diff(co)).min() < np.abs(np.diff(ci)).min():
+                raise CoordinateError(
+                    f"ConservativeRegridder: the output grid is of higher "
+                    f"resolution than the input grid along {axis}!")
+
+        self.wyi = np.broadcast_to(np.asarray(wyi, dtype=np.float64),
+                                   self.yi.shape)
+        self.cyclic = bool(cyclic)
+        self.critpc = float(critpc)
+
+        t = profiling.timer("arealinint2")
+        (fx, self._bx, found_x) = cache.memoize(
+            "weights", ("arealinint2", self.xi, self.xo, self.cyclic),
+            lambda: _weights(self.xi, self.xo, self.cyclic, 1, 1))
+        (fy, self._by, found_y) = cache.memoize(
+            "weights", ("arealinint2", self.yi, self.yo, False),
+            lambda: _weights(self.yi, self.yo, False, monoyi, monoyo))
+
+        # The weights of the input rows apply to the original order of `yi`
+        self._wx = fx
+        self._wy = fy * self.wyi
+        self._found = found_y[:, None] & found_x[None, :]
+        t.mark("weights")
+
+    def weights(self) -> tuple:
+        """Returns the ``(nxo, nxi)`` and ``(nyo, nyi)`` weight matrices of the
+        two axes, the input row weights included, whose products with an input
+        slice give the unnormalized output."""
+        return self._wx, self._wy
+
+    def __call__(self,
+                 fi: supported_types,
+                 critpc: float = None,
+                 msg_py: np.number = None) -> supported_types:
+        """Regrids ``fi``.
+
+        Parameters
+        ----------
+
+        fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            An array of two or more dimensions, on the input grid along its
+            rightmost two dimensions, ``(..., yi, xi)``. Chunked
+            :class:`xarray.DataArray` input must not be chunked along those.
+
+        critpc : :obj:`float`, optional
+            Overrides ``critpc`` of the regridder.
+
+        msg_py : :obj:`numpy.number`, optional
+            A value taken as missing in ``fi``, as well as NaN, and used for
+            missing output values. Defaults to NaN.
+
+        Returns
+        -------
+
+        fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            The regridded double precision array, of the dimensions of ``fi``
+            but ``(..., yo, xo)``. Dask output is only returned for chunked
+            :class:`xarray.DataArray` input.
+        """
+        t = profiling.timer("arealinint2")
+
+        critpc = self.critpc if critpc is None else float(critpc)
+
+        grid = self.yi.shape + self.xi.shape
+        if np.shape(fi)[-2:] != grid:
+            raise DimensionError(
+                "ConservativeRegridder: the rightmost two dimensions of `fi` "
+                f"must be of the input grid, {grid}!")
+
+        if msg_py is None:
+            msg_py = default_msg_py(np.float64)
+
+        t.mark("validation")
+
+        return apply_blocks(_arealinint2,
+                            fi,
+                            2,
+                            self.yo.shape + self.xo.shape,
+                            (self._wx, self._wy, self._bx, self._by,
+                             self._found, critpc, msg_py),
+                            "arealinint2",
+                            "ConservativeRegridder",
+                            coords=(self.yo, self.xo))
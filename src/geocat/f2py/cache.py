@@ -0,0 +1,338 @@
+"""Opt-in cache of interpolation weights and results across calls.
+
+When enabled, the wrappers look up, by a hash of their inputs:
+
+- ``weights``: the interpolation indices and weights derived from the
+  coordinates only, e.g. by the NumPy backend of the linint family, which
+  are reused for any data on the same grids
+- ``results``: whole outputs for identical data, coordinates and options,
+  if enabled with ``results=True``; only for NumPy data, since the output
+  of chunked input is lazy
+
+Entries are kept in memory, least recently used first out beyond the
+``memory`` budget, and optionally in a ``directory`` on disk, which is
+shared by processes and sessions and evicted the same way beyond its
+``disk`` budget. Only NumPy arrays are stored, in ``.npz`` files.
+
+The cache belongs to the process: worker processes, e.g. of
+:func:`geocat.f2py.parallel.run`, have their own, disabled by default.
+
+Examples
+--------
+
+.. code-block:: python
+
+    from geocat.f2py import cache, linint2
+
+    cache.enable(results=True, directory="~/.cache/geocat-f2py")
+
+    fo = linint2(fi, xo, yo, xi=xi, yi=yi)
+    fo = linint2(fi, xo, yo, xi=xi, yi=yi)  # from the cache
+
+    cache.stats()["results"]  # {'hits': 1, 'misses': 1}
+"""
+
+import collections
+import hashlib
+import os
+import threading
+
+from dask.utils import parse_bytes
+import numpy as np
+
+# Version of the cached values, part of every key so that entries written by
+# other versions of the wrappers are not used
+_version = 1
+
+_enabled = False
+_results = False
+_lock = threading.Lock()
+
+# {key: value}, least recently used first
+_memory = collections.OrderedDict()
+_memory_nbytes = 0
+_max_memory = 0
+
+_directory = None
+_max_disk = 0
+
+# {kind: [hits, misses]}
+_counts = {"weights": [0, 0], "results": [0, 0]}
+
+
+def enable(memory="256MiB",
+           directory: str = None,
+           disk="1GiB",
+           results: bool = False) -> None:
+    """Starts caching.
+
+    Parameters
+    ----------
+
+    memory : :obj:`int`, :obj:`str`
+        Memory budget of the cache, in bytes or as a string like
+        ``"256MiB"``; default is 256 MiB.
+
+    directory : :obj:`str`, optional
+        Directory to also keep the entries in on disk; created if needed.
+        Entries found there are used as well. Default is memory only.
+
+    disk : :obj:`int`, :obj:`str`
+        Disk budget of ``directory``; default is 1 GiB.
+
+    results : :obj:`bool`
+        If True, whole results are cached as well as weights; default is
+        False.
+    """
+    global _enabled, _results, _max_memory, _directory, _max_disk
+
+    _max_memory = parse_bytes(memory) if isinstance(memory, str) else memory
+    _max_disk = parse_bytes(disk) if isinstance(disk, str) else disk
+
+    if directory is not None:
+        directory = os.path.abspath(os.path.expanduser(directory))
+        os.makedirs(directory, exist_ok=True)
+    _directory = directory
+
+    _results = results
+    _enabled = True
+
+    with _lock:
+        _evict_memory()
+
+
+def disable() -> None:
+    """Stops caching; entries are kept until :func:`clear`."""
+    global _enabled, _results
+    _enabled = False
+    _results = False
+
+
+def is_enabled() -> bool:
+    """Returns whether caching is enabled."""
+    return _enabled
+
+
+def clear(disk: bool = False) -> None:
+    """Discards the entries in memory, and on disk if ``disk`` is True, and
+    resets the statistics."""
+    global _memory_nbytes
+
+    with _lock:
+        _memory.clear()
+        _memory_nbytes = 0
+        for counts in _counts.values():
+            counts[:] = [0, 0]
+
+        if disk and _directory is not None:
+            for (path, _, _) in _disk_entries():
+                _remove(path)
+
+
+def stats() -> dict:
+    """Returns the cache statistics.
+
+    Returns
+    -------
+
+    stats : :obj:`dict`
+        ``{"weights": {"hits": int, "misses": int}, "results": {...},
+        "memory": {"entries": int, "nbytes": int}, "disk": {...}}``, where
+        hits include entries found on disk.
+    """
+    with _lock:
+        out = {
+            kind: {
+                "hits": hits,
+                "misses": misses
+            } for (kind, (hits, misses)) in _counts.items()
+        }
+        out["memory"] = {"entries": len(_memory), "nbytes": _memory_nbytes}
+
+        entries = _disk_entries() if _directory is not None else []
+        out["disk"] = {
+            "entries": len(entries),
+            "nbytes": sum(nbytes for (_, _, nbytes) in entries)
+        }
+
+    return out
+
+
+def key(kind, *parts):
+    """Returns the key of ``parts``, e.g. arrays and options, for ``kind``
+    (``"weights"`` or ``"results"``) entries, or None if those are not cached.
+
+    Arrays are hashed by their type, shape and contents, and other parts
+    by their type and ``repr``.
+    """
+    if not _enabled or (kind == "results" and not _results):
+        return None
+
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{kind}:{_version}".encode())
+    for part in parts:
+        _update(h, part)
+
+    return h.hexdigest()
+
+
+def _update(h, part):
+    # Adds `part` to the hash `h`, tagged by its type
+    if isinstance(part, np.ndarray):
+        h.update(f"ndarray:{part.dtype.str}:{part.shape}".encode())
+        h.update(np.ascontiguousarray(part))
+    elif isinstance(part, (tuple, list)):
+        h.update(f"seq:{len(part)}".encode())
+        for item in part:
+            _update(h, item)
+    else:
+        h.update(f"{type(part).__name__}:{part!r}".encode())
+
+
+def get(kind, key):
+    """Returns the entry of ``key``, an array or a tuple of arrays, or None if
+    there is none (or ``key`` is None); counts a hit or a miss."""
+    if key is None:
+        return None
+
+    with _lock:
+        value = _memory.get(key)
+        if value is not None:
+            _memory.move_to_end(key)
+        elif _directory is not None:
+            value = _load(key)
+            if value is not None:
+                _store_memory(key, value)
+
+        _counts[kind][0 if value is not None else 1] += 1
+
+    return value
+
+
+def put(kind, key, value):
+    """Stores ``value``, an array or a tuple of arrays, as the entry of
+    ``key``; nothing is done if ``key`` is None.
+
+    Cached arrays are made read-only, and returned as they are by
+    :func:`get`; callers handing them out to users should copy them.
+    """
+    if key is None:
+        return
+
+    if isinstance(value, tuple):
+        value = tuple(_frozen(v) for v in value)
+    else:
+        value = _frozen(value)
+
+    with _lock:
+        _store_memory(key, value)
+        if _directory is not None:
+            _save(key, value)
+
+
+def memoize(kind, parts, compute):
+    """Returns the entry of ``parts`` (see :func:`key`), after storing
+    ``compute()`` as such if there is none."""
+    k = key(kind, *parts)
+    value = get(kind, k)
+
+    if value is None:
+        value = compute()
+        put(kind, k, value)
+
+    return value
+
+
+def _frozen(array):
+    array = np.array(array)
+    array.flags.writeable = False
+    return array
+
+
+def _nbytes(value):
+    if isinstance(value, tuple):
+        return sum(v.nbytes for v in value)
+    return value.nbytes
+
+
+def _store_memory(key, value):
+    global _memory_nbytes
+
+    if key in _memory:
+        _memory_nbytes -= _nbytes(_memory.pop(key))
+    _memory[key] = value
+    _memory_nbytes += _nbytes(value)
+
+    _evict_memory()
+
+
+def _evict_memory():
+    # Least recently used entries first, until within the budget
+    global _memory_nbytes
+
+    while _memory and _memory_nbytes > _max_memory:
+        (_, value) = _memory.popitem(last=False)
+        _memory_nbytes -= _nbytes(value)
+
+
+def _path(key):
+    return os.path.join(_directory, key + ".npz")
+
+
+def _save(key, value):
+    path = _path(key)
+    arrays = value if isinstance(value, tuple) else (value,)
+
+    # Written under a temporary name, so that other processes never see a
+    # partial file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, *arrays, tuple=isinstance(value, tuple))
+        os.replace(tmp, path)
+    except OSError:
+        _remove(tmp)
+        return
+
+    # Least recently used files first, until within the budget
+    entries = sorted(_disk_entries(), key=lambda e: e[1])
+    total = sum(nbytes for (_, _, nbytes) in entries)
+    for (path, _, nbytes) in entries:
+        if total <= _max_disk:
+            break
+        _remove(path)
+        total -= nbytes
+
+
+def _load(key):
+    path = _path(key)
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = tuple(
+                _frozen(npz[f"arr_{i}"]) for i in range(len(npz.files) - 1))
+            is_tuple = bool(npz["tuple"])
+        os.utime(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return arrays if is_tuple else arrays[0]
+
+
+def _disk_entries():
+    # (path, last use, nbytes) of the entries on disk
+    entries = []
+    for entry in os.scandir(_directory):
+        if entry.name.endswith(".npz"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((entry.path, stat.st_mtime, stat.st_size))
+    return entries
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
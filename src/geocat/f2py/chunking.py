@@ -0,0 +1,219 @@
+"""Chunk planning shared by the wrappers.
+
+The Fortran routines work on whole "core" slices, i.e. the rightmost one or
+more dimensions of the input, which therefore must not be chunked; any
+number of slices can be processed per task. Unless the input is already
+chunked, :func:`plan_chunks` groups as many leading slices per chunk as fit
+in the memory budget of a task, which is dask's ``array.chunk-size``
+configuration value (128 MiB by default):
+
+.. code-block:: python
+
+    import dask
+
+    with dask.config.set({"array.chunk-size": "32MiB"}):
+        fo = geocat.f2py.linint2(fi, xo, yo, icycx=0)
+
+:func:`apply_blocks` applies a routine to the chunks so planned, and
+packages its output as the wrappers do.
+"""
+
+import math
+
+import dask
+import dask.array as da
+from dask.array.core import map_blocks
+from dask.utils import parse_bytes
+import numpy as np
+import xarray as xr
+
+from . import profiling
+from .errors import ChunkError
+
+# Fortran works on double precision copies of the input and output slices
+_itemsize = 8
+
+
+def chunk_budget() -> int:
+    """Returns the memory budget of a task in bytes, i.e. dask's ``array.chunk-
+    size`` configuration value."""
+    budget = dask.config.get("array.chunk-size")
+    return budget if isinstance(budget, int) else parse_bytes(budget)
+
+
+def plan_chunks(shape, core_ndim, out_core_size, chunks=None, budget=None):
+    """Returns the chunk sizes of an input array for a wrapper.
+
+    Parameters
+    ----------
+
+    shape : :obj:`tuple`
+        Shape of the input array.
+
+    core_ndim : :obj:`int`
+        Number of rightmost dimensions that the Fortran routine needs whole;
+        they are never chunked.
+
+    out_core_size : :obj:`int`
+        Number of output values of each slice of the core dimensions, e.g.
+        ``len(yo) * len(xo)`` for a regridding to a (yo, xo) grid.
+
+    chunks : :obj:`tuple`, optional
+        Existing chunks of the input, e.g. ``DataArray.chunks``. If given,
+        the chunks of the leading dimensions are kept.
+
+    budget : :obj:`int`, optional
+        Memory budget of a task in bytes; defaults to :func:`chunk_budget`.
+
+    Returns
+    -------
+
+    chunks : :obj:`tuple`
+        One entry per dimension of ``shape``: an :obj:`int` chunk size, or
+        the existing :obj:`tuple` of chunk sizes for a dimension of an
+        already chunked input. Core dimensions are given whole.
+    """
+    lead_ndim = len(shape) - core_ndim
+    core_shape = tuple(shape[lead_ndim:])
+
+    if chunks is not None:
+        return tuple(chunks[:lead_ndim]) + core_shape
+
+    if budget is None:
+        budget = chunk_budget()
+
+    slice_nbytes = _itemsize * (math.prod(core_shape) + out_core_size)
+    nslices = max(1, budget // max(1, slice_nbytes))
+
+    # Fill the rightmost leading dimensions first, so that each chunk is a
+    # contiguous block of slices, and balance the chunks of a dimension
+    lead_chunks = []
+    for size in reversed(shape[:lead_ndim]):
+        nblocks = math.ceil(size / max(1, min(size, nslices)))
+        chunk = max(1, math.ceil(size / max(1, nblocks)))
+        lead_chunks.insert(0, chunk)
+        nslices = max(1, nslices // chunk)
+
+    return tuple(lead_chunks) + core_shape
+
+
+def apply_blocks(func,
+                 fi,
+                 core_ndim,
+                 out_core_shape,
+                 args,
+                 name,
+                 caller,
+                 dims=None,
+                 coords=None,
+                 extra_size=0,
+                 dtype=np.float64):
+    """Applies ``func`` to ``fi``, by blocks of as many leading slices as fit
+    in the memory budget of a task, and returns its output.
+
+    Parameters
+    ----------
+
+    func : :obj:`callable`
+        ``func(block, *args)`` returns the output of a block of leading
+        slices of ``fi``, of ``out_core_shape`` rightmost dimensions.
+
+    fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The input. Chunked :class:`xarray.DataArray` input must not be
+        chunked along its ``core_ndim`` rightmost dimensions.
+
+    core_ndim : :obj:`int`
+        Number of rightmost dimensions of ``fi`` that ``func`` works on.
+
+    out_core_shape : :obj:`tuple`
+        Shape of the output of each slice.
+
+    args : :obj:`tuple`
+        The other arguments of ``func``.
+
+    name : :obj:`str`
+        Name of the routine, for profiling.
+
+    caller : :obj:`str`
+        Name of the caller, for error messages.
+
+    dims : :obj:`tuple`, optional
+        Names of the output core dimensions. Defaults to those of ``fi``.
+
+    coords : :obj:`tuple`, optional
+        Coordinates of the output core dimensions, or None for those
+        without.
+
+    extra_size : :obj:`int`
+        Number of other values that a task holds per slice, e.g. values
+        gathered from the input.
+
+    dtype : :class:`numpy.dtype`
+        Type of the output.
+
+    Returns
+    -------
+
+    fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The output, of the leading dimensions of ``fi``. It is lazy only for
+        chunked :class:`xarray.DataArray` input, and is then a
+        :class:`xarray.DataArray` of the attributes of ``fi`` and of its
+        coordinates that do not depend on the core dimensions, as well as
+        ``coords``, as it is for non-dask :class:`xarray.DataArray` input.
+    """
+    t = profiling.timer(name)
+
+    is_input_xr = isinstance(fi, xr.DataArray)
+    if not is_input_xr:
+        fi = xr.DataArray(fi)
+    lead = fi.ndim - core_ndim
+
+    is_input_dask = fi.chunks is not None
+    if is_input_dask and fi.chunks[lead:] != tuple(
+        (n,) for n in fi.shape[lead:]):
+        raise ChunkError(
+            f"{caller}: `fi` must be unchunked along its {core_ndim} rightmost "
+            "dimensions")
+
+    fi_chunks = plan_chunks(fi.shape, core_ndim,
+                            math.prod(out_core_shape) + extra_size, fi.chunks)
+    if is_input_dask:
+        fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
+    else:
+        # Computed right away, so NumPy data is not hashed for a name
+        fi = fi.copy(data=da.from_array(fi.data, chunks=fi_chunks, name=False))
+
+    with profiling.annotate(name):
+        fo = map_blocks(
+            func,
+            fi.data,
+            *args,
+            chunks=fi.chunks[:lead] + tuple((n,) for n in out_core_shape),
+            dtype=dtype,
+            drop_axis=list(range(lead, fi.ndim)),
+            new_axis=list(range(lead, lead + len(out_core_shape))),
+        )
+    t.mark("chunking")
+
+    # Dask output is only kept for chunked xarray.DataArray input
+    if not (is_input_xr and is_input_dask):
+        fo = fo.compute()
+    t.mark("compute")
+
+    if is_input_xr:
+        fo_dims = fi.dims[:lead] + tuple(
+            fi.dims[lead:] if dims is None else dims)
+        fo_coords = {
+            k: v
+            for (k, v) in fi.coords.items()
+            if not set(v.dims) & set(fi.dims[lead:])
+        }
+        fo_coords.update({
+            dim: c
+            for (dim, c) in zip(fo_dims[lead:], coords or ())
+            if c is not None
+        })
+        fo = xr.DataArray(fo, attrs=fi.attrs, dims=fo_dims, coords=fo_coords)
+    t.mark("packaging")
+
+    return fo
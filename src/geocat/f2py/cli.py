@@ -0,0 +1,394 @@
+"""Command-line batch regridding of netCDF and zarr files.
+
+``geocat-f2py-regrid`` interpolates every variable on the grid of each input
+file, with :func:`~geocat.f2py.linint2` for rectilinear or
+:func:`~geocat.f2py.rcm2rgrid` for curvilinear input grids, to a target
+rectilinear grid, and writes one output file per input file:
+
+.. code-block:: bash
+
+    geocat-f2py-regrid "hist/*.nc" --grid=-90:90:1,0:359:1 --cyclic \\
+        --output regridded --workers 4 --memory 4GiB
+
+The target grid and, for ``rcm2rgrid``, the 2-D coordinates of the input grid
+are read once for all files, and :mod:`geocat.f2py.cache` is enabled so that
+the NumPy backend finds the interpolation weights only once. Each file is
+streamed in blocks of time steps: every block is read, regridded as one
+:class:`xarray.Dataset` and written to its own chunk of the output by a pool
+of ``workers`` threads, with blocks as large as the ``memory`` ceiling
+allows. A progress and throughput report is printed to standard error.
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import time
+import uuid
+
+import dask
+import dask.array as da
+from dask.utils import format_bytes, parse_bytes
+import numpy as np
+import xarray as xr
+
+from . import cache
+
+methods = ("linint2", "rcm2rgrid")
+formats = ("netcdf", "zarr")
+
+# Work copies of a block, e.g. the stacked float64 input and output of the
+# wrappers, per byte of the block as read and written
+_copies = 3
+
+
+def _range(spec):
+    # "start:stop:step", both ends included
+    start, stop, step = (float(v) for v in spec.split(":"))
+    if step <= 0 or stop < start:
+        raise ValueError(f"invalid range {spec!r}")
+    return start + step * np.arange(int(round((stop - start) / step)) + 1)
+
+
+def parse_grid(spec: str, lat: str = "lat", lon: str = "lon"):
+    """Returns the latitudes and longitudes of a target grid.
+
+    Parameters
+    ----------
+
+    spec : :obj:`str`
+        Either ``"LAT0:LAT1:DLAT,LON0:LON1:DLON"``, ranges with both ends
+        included, or the path of a netCDF or zarr file to take the grid from.
+
+    lat, lon : :obj:`str`
+        Names of the coordinates of the grid file; default is ``"lat"`` and
+        ``"lon"``.
+
+    Returns
+    -------
+
+    lat, lon : :class:`numpy.ndarray`
+        The one-dimensional coordinates.
+    """
+    if os.path.exists(spec):
+        with _open(spec) as ds:
+            return np.asarray(ds[lat]), np.asarray(ds[lon])
+
+    try:
+        lat_spec, lon_spec = spec.split(",")
+        return _range(lat_spec), _range(lon_spec)
+    except ValueError:
+        raise ValueError(
+            f"invalid grid {spec!r}: expected LAT0:LAT1:DLAT,LON0:LON1:DLON "
+            "or an existing file") from None
+
+
+def _is_zarr(path):
+    return path.rstrip("/").endswith(".zarr")
+
+
+def _open(path):
+    # Lazily loaded, without dask, so that only the blocks read are in memory
+    return xr.open_dataset(path, engine="zarr" if _is_zarr(path) else None)
+
+
+def plan_steps(ds, out, time_dim, memory, workers) -> int:
+    """Returns the number of time steps per block of ``ds``, such that
+    ``workers`` blocks, with their work copies, fit in ``memory`` bytes.
+
+    ``out`` is the regridded first time step of ``ds``, which gives the
+    size of a time step of the output.
+    """
+    if time_dim not in ds.dims:
+        return 1
+
+    def step_nbytes(d):
+        nbytes = sum(
+            v.nbytes for v in d.data_vars.values() if time_dim in v.dims)
+        return nbytes // d.sizes[time_dim]
+
+    per_step = _copies * (step_nbytes(ds) + step_nbytes(out)) + 1
+
+    return int(np.clip(memory // (workers * per_step), 1, ds.sizes[time_dim]))
+
+
+def stream(ds, regrid, time_dim: str = "time", steps: int = 1, first=None):
+    """Returns the lazily regridded ``ds``, computed in blocks of ``steps``
+    time steps along ``time_dim``.
+
+    Parameters
+    ----------
+
+    ds : :class:`xarray.Dataset`
+        The input, typically lazily loaded from a file.
+
+    regrid : :obj:`callable`
+        ``regrid(block)`` returns the regridded Dataset of a loaded block.
+
+    time_dim : :obj:`str`
+        The dimension to stream along; if ``ds`` does not have it, it is
+        regridded as a single block.
+
+    steps : :obj:`int`
+        Number of time steps per block.
+
+    first : :class:`xarray.Dataset`, optional
+        The regridded first time step of ``ds``, if already known.
+
+    Returns
+    -------
+
+    out : :class:`xarray.Dataset`
+        The regridded Dataset, whose variables along ``time_dim`` are dask
+        arrays with one chunk per block; each block is read and regridded by
+        a single task for all of them.
+    """
+    if time_dim not in ds.dims:
+        return first if first is not None else regrid(ds.load())
+
+    # The first time step gives the structure of the output
+    template = first
+    if template is None:
+        template = regrid(ds.isel({time_dim: slice(0, 1)}).load())
+    names = [n for (n, v) in template.data_vars.items() if time_dim in v.dims]
+
+    def block(start, stop):
+        out = regrid(ds.isel({time_dim: slice(start, stop)}).load())
+        return {name: np.asarray(out[name].data) for name in names}
+
+    # Explicit names spare dask the hashing of `ds`, which would read it
+    token = uuid.uuid4().hex
+    bounds = range(0, ds.sizes[time_dim], steps)
+    blocks = [
+        (start, min(start + steps, ds.sizes[time_dim])) for start in bounds
+    ]
+    results = [
+        dask.delayed(block, name=f"regrid-block-{token}")(
+            start, stop, dask_key_name=f"regrid-{token}-{start}")
+        for (start, stop) in blocks
+    ]
+
+    data_vars = {}
+    for (name, variable) in template.data_vars.items():
+        if name not in names:
+            data_vars[name] = variable
+            continue
+
+        axis = variable.dims.index(time_dim)
+        pieces = []
+        for ((start, stop), result) in zip(blocks, results):
+            shape = list(variable.shape)
+            shape[axis] = stop - start
+            pieces.append(
+                da.from_delayed(result[name],
+                                shape=tuple(shape),
+                                dtype=variable.dtype))
+        data_vars[name] = (variable.dims, da.concatenate(pieces, axis=axis),
+                           variable.attrs)
+
+    # Coordinates along the time dimension are those of `ds`
+    coords = {
+        name: coord
+        for (name, coord) in template.coords.items()
+        if time_dim not in coord.dims
+    }
+    coords.update({
+        name: coord
+        for (name, coord) in ds.coords.items()
+        if time_dim in coord.dims and set(coord.dims) <= set(template.dims)
+    })
+
+    return xr.Dataset(data_vars, coords=coords, attrs=template.attrs)
+
+
+def _output_path(path, directory, fmt, suffix):
+    stem = os.path.splitext(os.path.basename(path.rstrip("/")))[0]
+    return os.path.join(directory,
+                        stem + suffix + (".zarr" if fmt == "zarr" else ".nc"))
+
+
+def _write(out, path, fmt, workers):
+    # Written under a temporary name, so that an interrupted run leaves no
+    # partial output behind
+    tmp = f"{path}.{os.getpid()}.part"
+    if fmt == "zarr":
+        delayed = out.to_zarr(tmp, mode="w", compute=False)
+    else:
+        delayed = out.to_netcdf(tmp, compute=False)
+
+    try:
+        dask.compute(delayed, scheduler="threads", num_workers=workers)
+    except BaseException:
+        _remove(tmp)
+        raise
+
+    _remove(path)
+    os.replace(tmp, path)
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _regridder(args, lat, lon, lat2d, lon2d):
+    # The function regridding a loaded block
+    from . import linint2, rcm2rgrid
+
+    if args.method == "linint2":
+        return lambda ds: linint2(
+            ds, lon, lat, icycx=args.cyclic, backend=args.backend)
+
+    drop = [args.lat2d, args.lon2d]
+    return lambda ds: rcm2rgrid(lat2d, lon2d, ds.drop_vars(
+        drop, errors="ignore"), lat, lon)
+
+
+def _curvilinear(path, lat2d, lon2d):
+    # The 2-D coordinates of the input grid, of the first time step if they
+    # vary in time as in WRF output
+    with _open(path) as ds:
+        coords = []
+        for name in (lat2d, lon2d):
+            coord = ds[name]
+            coord = coord.isel({d: 0 for d in coord.dims[:-2]}, drop=True)
+            coords.append(coord.load())
+    return coords
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="geocat-f2py-regrid",
+        description="Regrids netCDF or zarr files to a rectilinear grid.")
+    parser.add_argument("inputs",
+                        nargs="+",
+                        help="input files or glob patterns (quoted)")
+    parser.add_argument(
+        "--grid",
+        required=True,
+        help="target grid, LAT0:LAT1:DLAT,LON0:LON1:DLON or a file")
+    parser.add_argument("--grid-lat",
+                        default="lat",
+                        help="latitude name in a grid file (default: lat)")
+    parser.add_argument("--grid-lon",
+                        default="lon",
+                        help="longitude name in a grid file (default: lon)")
+    parser.add_argument("--method",
+                        choices=methods,
+                        default="linint2",
+                        help="interpolation (default: linint2)")
+    parser.add_argument("--cyclic",
+                        action="store_true",
+                        help="linint2: the input longitudes are cyclic")
+    parser.add_argument("--backend",
+                        choices=("fortran", "numpy"),
+                        help="linint2: implementation to use")
+    parser.add_argument("--lat2d",
+                        default="XLAT",
+                        help="rcm2rgrid: input latitudes (default: XLAT)")
+    parser.add_argument("--lon2d",
+                        default="XLONG",
+                        help="rcm2rgrid: input longitudes (default: XLONG)")
+    parser.add_argument("--time-dim",
+                        default="time",
+                        help="dimension to stream along (default: time)")
+    parser.add_argument("--output",
+                        "-o",
+                        required=True,
+                        help="output directory")
+    parser.add_argument("--format",
+                        choices=formats,
+                        default="netcdf",
+                        help="output format (default: netcdf)")
+    parser.add_argument("--suffix",
+                        default="_regrid",
+                        help="suffix of the output names (default: _regrid)")
+    parser.add_argument("--workers",
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help="worker threads (default: number of CPUs)")
+    parser.add_argument("--memory",
+                        default="2GiB",
+                        help="memory ceiling of the blocks (default: 2GiB)")
+    parser.add_argument("--overwrite",
+                        action="store_true",
+                        help="regrid files whose output exists")
+    parser.add_argument("--quiet",
+                        "-q",
+                        action="store_true",
+                        help="no progress report")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point of ``geocat-f2py-regrid``; returns the exit status."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    paths = sorted({p for pattern in args.inputs for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("no input file matches")
+    if args.workers < 1:
+        parser.error("--workers must be positive")
+    try:
+        memory = parse_bytes(args.memory)
+        lat, lon = parse_grid(args.grid, args.grid_lat, args.grid_lon)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def report(message):
+        if not args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    # The geometry is set up once for all files
+    lat2d = lon2d = None
+    if args.method == "rcm2rgrid":
+        lat2d, lon2d = _curvilinear(paths[0], args.lat2d, args.lon2d)
+    regrid = _regridder(args, lat, lon, lat2d, lon2d)
+    if not cache.is_enabled():
+        cache.enable()
+
+    os.makedirs(args.output, exist_ok=True)
+
+    done = nbytes = 0
+    started = time.perf_counter()
+    # Blocks are computed by the worker threads, and the wrappers within
+    # each block by the thread computing it
+    with dask.config.set(scheduler="synchronous"):
+        for (i, path) in enumerate(paths, 1):
+            out_path = _output_path(path, args.output, args.format, args.suffix)
+            if os.path.exists(out_path) and not args.overwrite:
+                report(f"[{i}/{len(paths)}] {path}: {out_path} exists, skipped")
+                continue
+
+            t = time.perf_counter()
+            with _open(path) as ds:
+                first = regrid(
+                    ds.isel({
+                        args.time_dim: slice(0, 1)
+                    }).load() if args.time_dim in ds.dims else ds.load())
+                steps = plan_steps(ds, first, args.time_dim, memory,
+                                   args.workers)
+                out = stream(ds, regrid, args.time_dim, steps, first)
+                _write(out, out_path, args.format, args.workers)
+                size = ds.nbytes
+            t = time.perf_counter() - t
+
+            done += 1
+            nbytes += size
+            report(f"[{i}/{len(paths)}] {path} -> {out_path}: "
+                   f"{format_bytes(size)} in {t:.1f} s "
+                   f"({size / 1e9 / max(t, 1e-9):.3f} GB/s)")
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    report(f"{done} files, {format_bytes(nbytes)} in {elapsed:.1f} s: "
+           f"{done / elapsed:.2f} files/s, {nbytes / 1e9 / elapsed:.3f} GB/s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""Validation of the coordinates passed to the Fortran routines.
+
+The interpolation routines require monotonic coordinates. Rather than
+having every Fortran call verify the same coordinates again for each
+slice of the input, the outer wrappers verify them once per call with
+these helpers and pass the result on, so that the routines skip their
+own checks.
+"""
+
+import numpy as np
+
+
+def monotonic(x) -> int:
+    """Returns +1 if ``x`` is strictly monotonically increasing, -1 if it is
+    strictly monotonically decreasing and 0 otherwise; a single coordinate
+    counts as increasing."""
+    dx = np.diff(np.asarray(x, dtype=np.float64).ravel())
+
+    if np.all(dx > 0):
+        return 1
+    if np.all(dx < 0):
+        return -1
+    return 0
+
+
+def monotonic_pair(xi, xo) -> int:
+    """Returns the direction (+1/-1) in which both input coordinates ``xi`` and
+    output coordinates ``xo`` are strictly monotonic, or 0 if there is none."""
+    direction = monotonic(xi)
+
+    return direction if direction == monotonic(xo) else 0
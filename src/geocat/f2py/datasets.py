@@ -0,0 +1,153 @@
+"""Regridding of all the data variables of a :class:`xarray.Dataset` at once.
+
+Model output typically holds many variables on the same grid. Rather
+than calling a wrapper once per variable, which repeats the validation
+of the coordinates, the interpolation geometry and the dask graph setup
+for each of them, :func:`regrid` groups the data variables by their
+"core" dimensions, i.e. the rightmost dimensions the wrapper works on,
+and their type. The leading slices of all the variables of a group are
+stacked along a single leading dimension and passed to the wrapper in
+one call, so that each group is computed by a single batched kernel, or
+blockwise layer for dask input.
+"""
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+from .errors import DimensionError
+
+
+def _stack(variables, core_ndim):
+    # The leading slices of `variables` stacked along a single leading
+    # dimension; dask arrays if any of them is
+    arrays = [
+        v.data.reshape((-1,) + v.shape[v.ndim - core_ndim:]) for v in variables
+    ]
+
+    if any(v.chunks is not None for v in variables):
+        return da.concatenate([da.asarray(a) for a in arrays])
+    return np.concatenate(arrays)
+
+
+def on_grid(variable, coord, ds) -> bool:
+    """Returns whether the rightmost dimensions of ``variable`` are those of
+    ``coord``, e.g. the 2-D latitudes of a curvilinear grid, if it is a
+    :class:`xarray.DataArray` on dimensions of the Dataset ``ds``, or else
+    whether they have its shape."""
+    ndim = np.ndim(coord)
+    if isinstance(coord, xr.DataArray) and set(coord.dims) <= set(ds.dims):
+        return variable.dims[variable.ndim - ndim:] == coord.dims
+    return variable.shape[variable.ndim - ndim:] == np.shape(coord)
+
+
+def grid_dims(ds, coords) -> tuple:
+    """Returns the names of the rightmost dimensions of the input grid of
+    ``ds``, one per coordinate of ``coords``, e.g. ``(yi, xi)``: those of the
+    coordinates if they are 1-D :class:`xarray.DataArray` on dimensions of
+    ``ds``, and otherwise the rightmost dimensions with coordinates of its data
+    variables of the highest rank."""
+    dims = tuple(
+        c.dims[0]
+        for c in coords
+        if isinstance(c, xr.DataArray) and c.ndim == 1 and c.dims[0] in ds.dims)
+    if len(dims) == len(coords):
+        return dims
+
+    # Lower-rank variables, e.g. zonal means on (time, lat), may end with
+    # other dimensions with coordinates than the grid
+    ndim = len(coords)
+    variables = [
+        v for v in ds.data_vars.values() if v.ndim >= ndim and all(
+            dim in ds.coords for dim in v.dims[v.ndim - ndim:])
+    ]
+    if not variables:
+        return None
+    variable = max(variables, key=lambda v: v.ndim)
+    return variable.dims[variable.ndim - ndim:]
+
+
+def regrid(ds, core_ndim, match, regrid_group, func):
+    """Returns the Dataset of the data variables of ``ds`` regridded by groups.
+
+    Parameters
+    ----------
+
+    ds : :class:`xarray.Dataset`
+        The input.
+
+    core_ndim : :obj:`int`
+        Number of rightmost dimensions the wrapper works on.
+
+    match : :obj:`callable`
+        ``match(variable)`` returns whether a data variable (of at least
+        ``core_ndim`` dimensions) is on the input grid of the wrapper.
+
+    regrid_group : :obj:`callable`
+        ``regrid_group(stacked)`` calls the wrapper on ``stacked``, a
+        :class:`xarray.DataArray` of the variables of a group along a
+        leading ``"variable"`` dimension, with the coordinates of ``ds`` on
+        the core dimensions, and returns a :class:`xarray.DataArray` of the
+        same leading dimension and named output core dimensions.
+
+    func : :obj:`str`
+        Name of the wrapper, for error messages.
+
+    Returns
+    -------
+
+    out : :class:`xarray.Dataset`
+        The regridded variables with their attributes, along with the
+        variables and coordinates of ``ds`` that do not depend on the input
+        core dimensions; the others are dropped.
+    """
+    # {(core dims, dtype): names}
+    groups = {}
+    for (name, variable) in ds.data_vars.items():
+        if variable.ndim >= core_ndim and match(variable):
+            core_dims = variable.dims[variable.ndim - core_ndim:]
+            groups.setdefault((core_dims, variable.dtype), []).append(name)
+
+    if not groups:
+        raise DimensionError(
+            f"{func}: no data variable of the Dataset is on the input grid!")
+
+    in_dims = {dim for (core_dims, _) in groups for dim in core_dims}
+
+    data_vars = {}
+    coords = {}
+    for ((core_dims, _), names) in groups.items():
+        variables = [ds[name] for name in names]
+        stacked = xr.DataArray(
+            _stack(variables, core_ndim),
+            dims=("variable",) + core_dims,
+            coords={dim: ds[dim] for dim in core_dims if dim in ds.coords})
+
+        fo = regrid_group(stacked)
+        out_dims = fo.dims[1:]
+        coords.update({dim: fo[dim] for dim in out_dims if dim in fo.coords})
+
+        # Each variable is split back from the stacked output
+        start = 0
+        for variable in variables:
+            lead_dims = variable.dims[:variable.ndim - core_ndim]
+            lead_shape = variable.shape[:variable.ndim - core_ndim]
+            stop = start + int(np.prod(lead_shape, dtype=np.int64))
+            data_vars[variable.name] = xr.DataArray(
+                fo.data[start:stop].reshape(lead_shape + fo.shape[1:]),
+                dims=lead_dims + out_dims,
+                attrs=variable.attrs)
+            start = stop
+
+    # Everything else is kept unless it depends on the input grid
+    for (name, variable) in ds.data_vars.items():
+        if name not in data_vars and not in_dims & set(variable.dims):
+            data_vars[name] = variable
+    data_vars = {
+        name: data_vars[name] for name in ds.data_vars if name in data_vars
+    }
+    for (name, coord) in ds.coords.items():
+        if name not in coords and not in_dims & set(coord.dims):
+            coords[name] = coord
+
+    return xr.Dataset(data_vars, coords=coords, attrs=ds.attrs)
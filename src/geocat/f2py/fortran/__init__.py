@@ -1,6 +1,47 @@
-from .grid2triple import (grid2triple)
-from .linint2 import (dlinint1, dlinint2, dlinint2pts)
-from .moc_loops import (mocloops)
-from .rcm2points import (drcm2points)
-from .rcm2rgrid import (drcm2rgrid, drgrid2rcm)
-from .triple2grid import (triple2grid1)
+import importlib
+
+# Each compiled extension is imported on first access to one of its routines
+_lazy_routines = {
+    "binning_get_global_lats_wgts": ".area_conremap",
+    "binning_map_edges": ".area_conremap",
+    "cremapbin": ".area_conremap",
+    "areacells": ".arealinint2",
+    "arealinint2da": ".arealinint2",
+    "grid2triple": ".grid2triple",
+    "dlinint1": ".linint2",
+    "dlinint1mg": ".linint2",
+    "dlinint2": ".linint2",
+    "dlinint2mg": ".linint2",
+    "dlinint2pts": ".linint2",
+    "dlinint2ptsmg": ".linint2",
+    "mocbins": ".moc_loops",
+    "mocloops": ".moc_loops",
+    "mocsums": ".moc_loops",
+    "fomp_enabled": ".omp",
+    "fomp_get_max_threads": ".omp",
+    "fomp_get_num_procs": ".omp",
+    "fomp_set_num_threads": ".omp",
+    "dpopremap": ".popremap",
+    "dpopremapcsr": ".popremap",
+    "spopremapcsr": ".popremap",
+    "drcm2points": ".rcm2points",
+    "drcm2rgrid": ".rcm2rgrid",
+    "drgrid2rcm": ".rcm2rgrid",
+    "triple2grid1": ".triple2grid",
+    "triple2gridp": ".triple2grid",
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_routines:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_lazy_routines[name], __name__)
+    value = getattr(module, name)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_routines))
@@ -15,7 +15,8 @@ c .   x,y   - 1D coord variables dimensioned (mx and ny)
 c .   z     - 2D grid containing functional values z(x,y)
 c .   mx,ny - length of x and y; dimensions of z(mx,ny)
 c .   d     - 2D vector of size (ldmax,3)
-c .   ldmax - mx*ny
+c .   ldmax - size of d; mx*ny, or the exact number of non-missing
+c .           values when the caller has counted them beforehand
 c .   ld    - actual number of non-missing values
 c .   zmsg  - missing value code for z
 c .           if no missing values set to some number which
@@ -30,6 +31,10 @@ c                                               local
       DO N = 1,NY
           DO M = 1,MX
               IF (Z(M,N).NE.ZMSG) THEN
+                  IF (LD.GE.LDMAX) THEN
+                      IER = -20
+                      RETURN
+                  END IF
                   LD = LD + 1
                   D(LD,1) = X(M)
                   D(LD,2) = Y(N)
@@ -1,9 +1,9 @@
 c -----------------------------------------------------------
 c NCLFORTSTART
       SUBROUTINE DLININT1(NXI,XI,FI,ICYCX,NXO,XO,FO,XIW,FXIW,NXI2,XMSG,
-     +                    IOPT,IER)
+     +                    IOPT,MONO,IER)
       IMPLICIT NONE
-      INTEGER NXI,NXO,NXI2,IOPT,ICYCX,IER
+      INTEGER NXI,NXO,NXI2,IOPT,MONO,ICYCX,IER
       DOUBLE PRECISION XI(NXI),FI(NXI)
       DOUBLE PRECISION XO(NXO),FO(NXO),XMSG
       DOUBLE PRECISION XIW(NXI2),FXIW(NXI2)
@@ -44,6 +44,10 @@ c .   xmsg    - missing code
 c .   iopt    - options
 c .           - iopt=0  means to try to preserve missing areas
 c .           - iopt=1  means to try to try to fill-in missing areas
+c .   mono    - =0 check here that xi and xo are monotonically
+c .             (in/de)creasing
+c .             =+1/-1 the caller has verified that xi and xo are
+c .             monotonically increasing/decreasing
 c .   ier     - error code
 c .             =0;   no error
 c .             =1;   not enough points in input/output array
@@ -68,8 +72,12 @@ c                              initialize to msg
           RETURN
       END IF
 c                              mono (in/de)creasing ?
-      CALL DMONOID2(NXI,XI,NXO,XO,IFLAG,IER)
-      IF (IFLAG.EQ.0 .OR. IER.NE.0) RETURN
+      IF (MONO.EQ.0) THEN
+          CALL DMONOID2(NXI,XI,NXO,XO,IFLAG,IER)
+          IF (IFLAG.EQ.0 .OR. IER.NE.0) RETURN
+      ELSE
+          IFLAG = MONO
+      END IF
 c                              are data to be treated cyclic?
       IF (ICYCX.EQ.0) THEN
 c                              data are not cyclic
@@ -135,9 +143,9 @@ c c c         end do
 c -----------------------------------------------------------
 C NCLFORTSTART
       SUBROUTINE DLININT2(NXI,XI,NYI,YI,FI,ICYCX,NXO,XO,NYO,YO,FO,XIW,
-     +                    FXIW,NXI2,XMSG,IOPT,IER)
+     +                    FXIW,NXI2,XMSG,IOPT,MONOX,MONOY,IER)
       IMPLICIT NONE
-      INTEGER NXI,NYI,NXO,NYO,NXI2,ICYCX,IOPT,IER
+      INTEGER NXI,NYI,NXO,NYO,NXI2,ICYCX,IOPT,MONOX,MONOY,IER
       DOUBLE PRECISION XI(NXI),YI(NYI),FI(NXI,NYI)
       DOUBLE PRECISION XO(NXO),YO(NYO),FO(NXO,NYO),XMSG
       DOUBLE PRECISION XIW(NXI2),FXIW(NXI2)
@@ -179,6 +187,11 @@ c .   fo      - functional output values [interpolated]
 c .   xmsg    - missing code
 c .   iopt    - =0 try to preserve msg areas
 c .             =1 try to fill in entire grid
+c .   monox   - =0 check here that xi and xo are monotonically
+c .             (in/de)creasing
+c .             =+1/-1 the caller has verified that xi and xo are
+c .             monotonically increasing/decreasing
+c .   monoy   - same as monox, for yi and yo
 c .   ier     - error code
 c .             =0;   no error
 c .             =1;   not enough points in input/output array
@@ -186,7 +199,7 @@ c .             =2;   xi or xo are not monotonically (in/de)creasing
 c .             =3;   yi or yo are not monotonically (in/de)creasing
 c
 c                              local and temporary/work arrays
-      INTEGER IFLAG,NPTS,NXSTRT,NXLAST
+      INTEGER IFLGX,IFLGY,NPTS,NXSTRT,NXLAST
       DOUBLE PRECISION YIW(NYI),FYIW(NYI),FOYW(NYO)
       DOUBLE PRECISION FTMP(NXO,NYI)
 
@@ -209,33 +222,43 @@ c                              set to msg
           IER = 1
           RETURN
       END IF
-c                              error mono increasing ?
-      CALL DMONOID2(NXI,XI,NXO,XO,IFLAG,IER)
-      IF (IFLAG.EQ.0 .OR. IER.NE.0) THEN
-          IER = 2
-          RETURN
+c                              error mono (in/de)creasing ?
+      IF (MONOX.EQ.0) THEN
+          CALL DMONOID2(NXI,XI,NXO,XO,IFLGX,IER)
+          IF (IFLGX.EQ.0 .OR. IER.NE.0) THEN
+              IER = 2
+              RETURN
+          END IF
+      ELSE
+          IFLGX = MONOX
       END IF
-      CALL DMONOID2(NYI,YI,NYO,YO,IFLAG,IER)
-      IF (IFLAG.EQ.0 .OR. IER.NE.0) THEN
-          IER = 3
-          RETURN
+      IF (MONOY.EQ.0) THEN
+          CALL DMONOID2(NYI,YI,NYO,YO,IFLGY,IER)
+          IF (IFLGY.EQ.0 .OR. IER.NE.0) THEN
+              IER = 3
+              RETURN
+          END IF
+      ELSE
+          IFLGY = MONOY
       END IF
 c                               is the input array cyclic in x
       IF (ICYCX.EQ.0) THEN
 c                               preserve missing areas
           IF (IOPT.EQ.0) THEN
 c                               interpolate in the x direction
+C$OMP PARALLEL DO
               DO NY = 1,NYI
                   CALL DLIN2INT1(NXI,XI,FI(1,NY),NXO,XO,FTMP(1,NY),
-     +                          XMSG,IFLAG)
+     +                          XMSG,IFLGX)
               END DO
 c                               interpolate in the y direction
+C$OMP PARALLEL DO PRIVATE(NY,FYIW,FOYW)
               DO NX = 1,NXO
                   DO NY = 1,NYI
                       FYIW(NY) = FTMP(NX,NY)
                   END DO
 
-                  CALL DLIN2INT1(NYI,YI,FYIW,NYO,YO,FOYW,XMSG,IFLAG)
+                  CALL DLIN2INT1(NYI,YI,FYIW,NYO,YO,FOYW,XMSG,IFLGY)
 
                   DO NY = 1,NYO
                       FO(NX,NY) = FOYW(NY)
@@ -244,6 +267,7 @@ c                               interpolate in the y direction
           ELSE IF (IOPT.EQ.1) THEN
 c                               interpolate in the x direction
 c                               collapse data array
+C$OMP PARALLEL DO PRIVATE(NX,NPTS,XIW,FXIW)
               DO NY = 1,NYI
                   NPTS = 0
                   DO NX = 1,NXI
@@ -255,9 +279,10 @@ c                               collapse data array
                   END DO
 
                   CALL DLIN2INT1(NPTS,XIW(2),FXIW(2),NXO,XO,FTMP(1,NY),
-     +                          XMSG,IFLAG)
+     +                          XMSG,IFLGX)
               END DO
 c                               interpolate in the y direction
+C$OMP PARALLEL DO PRIVATE(NY,NPTS,YIW,FYIW,FOYW)
               DO NX = 1,NXO
                   NPTS = 0
                   DO NY = 1,NYI
@@ -268,7 +293,7 @@ c                               interpolate in the y direction
                       END IF
                   END DO
 
-                  CALL DLIN2INT1(NPTS,YIW,FYIW,NYO,YO,FOYW,XMSG,IFLAG)
+                  CALL DLIN2INT1(NPTS,YIW,FYIW,NYO,YO,FOYW,XMSG,IFLGY)
 
                   DO NY = 1,NYO
                       FO(NX,NY) = FOYW(NY)
@@ -280,6 +305,7 @@ c                               interpolate in the y direction
 c                               must be cyclic in x
 c                               create cyclic "x" coordinates
           IF (IOPT.EQ.0) THEN
+C$OMP PARALLEL DO PRIVATE(NX,NPTS,XIW,FXIW)
               DO NY = 1,NYI
                   DO NX = 1,NXI
                       XIW(NX+1)  = XI(NX)
@@ -287,18 +313,19 @@ c                               create cyclic "x" coordinates
                   END DO
 
                   NPTS = NXI
-                  CALL DLINCYC(NXI,XI,FI(1,NY),1,NXI,IFLAG,XIW,FXIW,
+                  CALL DLINCYC(NXI,XI,FI(1,NY),1,NXI,IFLGX,XIW,FXIW,
      +                         NPTS)
                   CALL DLIN2INT1(NXI+2,XIW,FXIW,NXO,XO,FTMP(1,NY),XMSG,
-     +                           IFLAG)
+     +                           IFLGX)
               END DO
 c                               interpolate in the y direction
+C$OMP PARALLEL DO PRIVATE(NY,FYIW,FOYW)
               DO NX = 1,NXO
                   DO NY = 1,NYI
                       FYIW(NY) = FTMP(NX,NY)
                   END DO
 
-                  CALL DLIN2INT1(NYI,YI,FYIW,NYO,YO,FOYW,XMSG,IFLAG)
+                  CALL DLIN2INT1(NYI,YI,FYIW,NYO,YO,FOYW,XMSG,IFLGY)
 
                   DO NY = 1,NYO
                       FO(NX,NY) = FOYW(NY)
@@ -306,6 +333,7 @@ c                               interpolate in the y direction
               END DO
 
           ELSE IF (IOPT.EQ.1) THEN
+C$OMP PARALLEL DO PRIVATE(NX,NPTS,NXSTRT,NXLAST,XIW,FXIW)
               DO NY = 1,NYI
 c                              collapse data array
                   NPTS = 0
@@ -321,12 +349,13 @@ c                              collapse data array
                       END IF
                   END DO
 
-                  CALL DLINCYC(NXI,XI,FI(1,NY),NXSTRT,NXLAST,IFLAG,XIW,
+                  CALL DLINCYC(NXI,XI,FI(1,NY),NXSTRT,NXLAST,IFLGX,XIW,
      +                         FXIW,NPTS)
                   CALL DLIN2INT1(NPTS+2,XIW,FXIW,NXO,XO,FTMP(1,NY),
-     +                           XMSG,IFLAG)
+     +                           XMSG,IFLGX)
               END DO
 c                               interpolate in the y direction
+C$OMP PARALLEL DO PRIVATE(NY,NPTS,YIW,FYIW,FOYW)
               DO NX = 1,NXO
                   NPTS = 0
                   DO NY = 1,NYI
@@ -337,7 +366,7 @@ c                               interpolate in the y direction
                       END IF
                   END DO
 
-                  CALL DLIN2INT1(NPTS,YIW,FYIW,NYO,YO,FOYW,XMSG,IFLAG)
+                  CALL DLIN2INT1(NPTS,YIW,FYIW,NYO,YO,FOYW,XMSG,IFLGY)
 
                   DO NY = 1,NYO
                       FO(NX,NY) = FOYW(NY)
@@ -539,9 +568,9 @@ c                              local
 c -----------------------------------------------------------
 C NCLFORTSTART
       SUBROUTINE DLININT2PTS(NXI,XI,NYI,YI,FI,ICYCX,NXYO,XO,YO,FO,
-     +                       XIW,FIXW,NXI2,XMSG,IER)
+     +                       XIW,FIXW,NXI2,XMSG,MONO,IER)
       IMPLICIT NONE
-      INTEGER NXI,NYI,NXYO,ICYCX,NXI2,IER
+      INTEGER NXI,NYI,NXYO,ICYCX,NXI2,MONO,IER
       DOUBLE PRECISION XI(NXI),YI(NYI),FI(NXI,NYI)
       DOUBLE PRECISION XO(NXYO),YO(NXYO),FO(NXYO)
       DOUBLE PRECISION XIW(NXI2),FIXW(NXI2,NYI),XMSG
@@ -584,6 +613,9 @@ c .   nopt    - option for how to handle case when not all values
 c .              present
 c .              >= 0 means set the interpolated point to xmsg
 c .              =-1 try some sort of weighted average
+c .   mono    - =0 check here that xi and yi are monotonically
+c .             increasing
+c .             .ne.0 the caller has verified that they are
 c .   ier     - error code
 c .             =0;   no error
 c .             =1;   not enough points in input/output array
@@ -603,10 +635,12 @@ c                              error checking
           RETURN
       END IF
 c                              error mono increasing ?
-      CALL DMONOINC(XI,NXI,2,IER)
-      IF (IER.NE.0) RETURN
-      CALL DMONOINC(YI,NYI,3,IER)
-      IF (IER.NE.0) RETURN
+      IF (MONO.EQ.0) THEN
+          CALL DMONOINC(XI,NXI,2,IER)
+          IF (IER.NE.0) RETURN
+          CALL DMONOINC(YI,NYI,3,IER)
+          IF (IER.NE.0) RETURN
+      END IF
 c                               is the input array cyclic in x
       IF (ICYCX.EQ.0) THEN
           CALL DLINT2XY(NXI,XI,NYI,YI,FI,NXYO,XO,YO,FO,XMSG,NOPT,IER)
@@ -646,6 +680,8 @@ c                               local
       INTEGER N,M,NXY,NN,MM
       DOUBLE PRECISION TMP1,TMP2,SLPX,SLPY
 
+c                               output points are independent
+C$OMP PARALLEL DO PRIVATE(N,M,NN,MM,TMP1,TMP2,SLPX,SLPY)
       DO NXY = 1,NXYO
           FO(NXY) = XMSG
 
@@ -739,5 +775,131 @@ c                               wgted average
           F0 = SUM/SWT
       END IF
 
+      RETURN
+      END
+c -----------------------------------------------------------
+c Drivers of DLININT1, DLININT2 and DLININT2PTS for ngrd grids at a
+c .   time, that also take NaN as missing in fi. Missing values of fo
+c .   are set to xmsg, which may be NaN as well.
+c .
+c .   fiw     - work array for one grid of fi
+c -----------------------------------------------------------
+      SUBROUTINE DLININT1MG(NGRD,NXI,XI,FI,ICYCX,NXO,XO,FO,XIW,FXIW,
+     +                      NXI2,FIW,XMSG,IOPT,MONO,IER)
+      IMPLICIT NONE
+      INTEGER NGRD,NXI,NXO,NXI2,IOPT,MONO,ICYCX,IER
+      DOUBLE PRECISION XI(NXI),FI(NXI,NGRD)
+      DOUBLE PRECISION XO(NXO),FO(NXO,NGRD),XMSG
+      DOUBLE PRECISION XIW(NXI2),FXIW(NXI2),FIW(NXI)
+c                              local
+      INTEGER NG
+      DOUBLE PRECISION FMSG
+
+      CALL DFORTMSG(XMSG,FMSG)
+      DO NG = 1,NGRD
+          CALL DNAN2MSG(NXI,FI(1,NG),FIW,FMSG)
+          CALL DLININT1(NXI,XI,FIW,ICYCX,NXO,XO,FO(1,NG),XIW,FXIW,NXI2,
+     +                  FMSG,IOPT,MONO,IER)
+          CALL DMSG2MSG(NXO,FO(1,NG),FMSG,XMSG)
+      END DO
+
+      RETURN
+      END
+c -----------------------------------------------------------
+      SUBROUTINE DLININT2MG(NGRD,NXI,XI,NYI,YI,FI,ICYCX,NXO,XO,NYO,YO,
+     +                      FO,XIW,FXIW,NXI2,FIW,XMSG,IOPT,MONOX,MONOY,
+     +                      IER)
+      IMPLICIT NONE
+      INTEGER NGRD,NXI,NYI,NXO,NYO,NXI2,ICYCX,IOPT,MONOX,MONOY,IER
+      DOUBLE PRECISION XI(NXI),YI(NYI),FI(NXI,NYI,NGRD)
+      DOUBLE PRECISION XO(NXO),YO(NYO),FO(NXO,NYO,NGRD),XMSG
+      DOUBLE PRECISION XIW(NXI2),FXIW(NXI2),FIW(NXI,NYI)
+c                              local
+      INTEGER NG
+      DOUBLE PRECISION FMSG
+
+      CALL DFORTMSG(XMSG,FMSG)
+      DO NG = 1,NGRD
+          CALL DNAN2MSG(NXI*NYI,FI(1,1,NG),FIW,FMSG)
+          CALL DLININT2(NXI,XI,NYI,YI,FIW,ICYCX,NXO,XO,NYO,YO,
+     +                  FO(1,1,NG),XIW,FXIW,NXI2,FMSG,IOPT,MONOX,MONOY,
+     +                  IER)
+          CALL DMSG2MSG(NXO*NYO,FO(1,1,NG),FMSG,XMSG)
+      END DO
+
+      RETURN
+      END
+c -----------------------------------------------------------
+      SUBROUTINE DLININT2PTSMG(NGRD,NXI,XI,NYI,YI,FI,ICYCX,NXYO,XO,YO,
+     +                         FO,XIW,FIXW,NXI2,FIW,XMSG,MONO,IER)
+      IMPLICIT NONE
+      INTEGER NGRD,NXI,NYI,NXYO,ICYCX,NXI2,MONO,IER
+      DOUBLE PRECISION XI(NXI),YI(NYI),FI(NXI,NYI,NGRD)
+      DOUBLE PRECISION XO(NXYO),YO(NXYO),FO(NXYO,NGRD),XMSG
+      DOUBLE PRECISION XIW(NXI2),FIXW(NXI2,NYI),FIW(NXI,NYI)
+c                              local
+      INTEGER NG
+      DOUBLE PRECISION FMSG
+
+      CALL DFORTMSG(XMSG,FMSG)
+      DO NG = 1,NGRD
+          CALL DNAN2MSG(NXI*NYI,FI(1,1,NG),FIW,FMSG)
+          CALL DLININT2PTS(NXI,XI,NYI,YI,FIW,ICYCX,NXYO,XO,YO,FO(1,NG),
+     +                     XIW,FIXW,NXI2,FMSG,MONO,IER)
+          CALL DMSG2MSG(NXYO,FO(1,NG),FMSG,XMSG)
+      END DO
+
+      RETURN
+      END
+c -----------------------------------------------------------
+      SUBROUTINE DFORTMSG(XMSG,FMSG)
+      IMPLICIT NONE
+      DOUBLE PRECISION XMSG,FMSG
+
+c missing code used by the kernels: xmsg itself, unless it is NaN,
+c .   which compares unequal to everything
+
+      IF (XMSG.NE.XMSG) THEN
+          FMSG = HUGE(XMSG)
+      ELSE
+          FMSG = XMSG
+      END IF
+
+      RETURN
+      END
+c -----------------------------------------------------------
+      SUBROUTINE DNAN2MSG(N,X,XW,FMSG)
+      IMPLICIT NONE
+      INTEGER N
+      DOUBLE PRECISION X(N),XW(N),FMSG
+
+c copy x to xw, with NaN set to fmsg
+c                              local
+      INTEGER I
+
+      DO I = 1,N
+          IF (X(I).NE.X(I)) THEN
+              XW(I) = FMSG
+          ELSE
+              XW(I) = X(I)
+          END IF
+      END DO
+
+      RETURN
+      END
+c -----------------------------------------------------------
+      SUBROUTINE DMSG2MSG(N,X,FMSG,XMSG)
+      IMPLICIT NONE
+      INTEGER N
+      DOUBLE PRECISION X(N),FMSG,XMSG
+
+c replace fmsg by xmsg in x
+c                              local
+      INTEGER I
+
+      DO I = 1,N
+          IF (X(I).EQ.FMSG) X(I) = XMSG
+      END DO
+
       RETURN
       END
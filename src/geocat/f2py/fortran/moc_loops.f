@@ -6,72 +6,118 @@ C NCLFORTSTART
 
       double precision     work1(mlon,nlat,kdep), work2(mlon,nlat,kdep)
      +                    ,work3(mlon,nlat,kdep), wmsg
-      double precision     tmp1(nyaux,kdep,2)   , tmp2(nyaux,kdep,2)
-     +                    ,tmp3(nyaux,kdep,2)  
+      double precision     tmp1(nyaux,kdep,nrx) , tmp2(nyaux,kdep,nrx)
+     +                    ,tmp3(nyaux,kdep,nrx)
       double precision     lat_aux_grid(nyaux)  , tlat(mlon,nlat)
-      
-      integer  rmlak(mlon,nlat,2)
+
+      integer  rmlak(mlon,nlat,nrx)
 C NCLEND
-      integer  ny, kd, nl, ml, nr 
-c c c logical  section(mlon,nlat,kdep)
+      integer  ibin(mlon,nlat)
 
-c initilize 
-      do nr=1,nrx
-        do kd=1,kdep
-          do ny=1,nyaux
-             tmp1(ny,kd,nr) = 0.0d0 
-             tmp2(ny,kd,nr) = 0.0d0 
-             tmp3(ny,kd,nr) = 0.0d0 
-          end do
-        end do
-      end do
+c auxiliary latitude bin of each column [0 if none]:
+c     lat_aux_grid(ny-1) <= tlat < lat_aux_grid(ny)
 
-c globe [note: rmlak(:,:,1)]
+      call mocbins(nyaux,mlon,nlat,tlat,lat_aux_grid,ibin)
 
-      do ny=2,nyaux
+c [note: rmlak(:,:,nr) = 1 for the columns of region nr, e.g.
+c        rmlak(:,:,1) = globe, rmlak(:,:,2) = atlantic]
 
-        do nl=1,nlat
-          do ml=1,mlon
-             if (tlat(ml,nl).ge.lat_aux_grid(ny-1) .and.
-     +           tlat(ml,nl).lt.lat_aux_grid(ny)   .and.
-     +           rmlak(ml,nl,1).eq.1) then
+      call mocsums(nyaux,mlon,nlat,kdep,nrx,1,ibin,rmlak
+     +            ,work1,work2,work3,wmsg,tmp1,tmp2,tmp3)
 
-                 do kd=1,kdep
-                    if (work1(ml,nl,kd).ne.wmsg)  then          
-                        tmp1(ny,kd,1) = tmp1(ny,kd,1) + work1(ml,nl,kd)
-                        tmp2(ny,kd,1) = tmp2(ny,kd,1) + work2(ml,nl,kd)
-                        tmp3(ny,kd,1) = tmp3(ny,kd,1) + work3(ml,nl,kd)
-                    end if
-                 end do
+      return
+      end
+c ----------------------------------------------------------------------
+      subroutine mocsums(nyaux,mlon,nlat,kdep,nrx,ntim,ibin,rmlak
+     +                  ,work1,work2,work3,wmsg,tmp1,tmp2,tmp3)
+      implicit none
+      integer  nyaux,mlon,nlat,kdep,nrx,ntim
+      integer  ibin(mlon,nlat), rmlak(mlon,nlat,nrx)
+      double precision     work1(mlon,nlat,kdep,ntim)
+     +                    ,work2(mlon,nlat,kdep,ntim)
+     +                    ,work3(mlon,nlat,kdep,ntim), wmsg
+      double precision     tmp1(nyaux,kdep,nrx,ntim)
+     +                    ,tmp2(nyaux,kdep,nrx,ntim)
+     +                    ,tmp3(nyaux,kdep,nrx,ntim)
 
-             end if
+c sums of the work arrays over the columns of each auxiliary latitude
+c bin and region, for ntim consecutive time steps. ibin is the bin of
+c each column as returned by mocbins [0 = column is skipped].
+c single sweep over the work arrays, in memory order, for all regions
+
+      integer  ny, kd, nl, ml, nr, nt
+
+      do nt=1,ntim
+        do nr=1,nrx
+          do kd=1,kdep
+            do ny=1,nyaux
+               tmp1(ny,kd,nr,nt) = 0.0d0
+               tmp2(ny,kd,nr,nt) = 0.0d0
+               tmp3(ny,kd,nr,nt) = 0.0d0
+            end do
           end do
         end do
-
       end do
 
-c atlantic [note: rmlak(:,:,2)]
+c time steps and depths are independent
+c$omp parallel do collapse(2) private(nl,ml,ny,nr)
+      do nt=1,ntim
+        do kd=1,kdep
+          do nl=1,nlat
+            do ml=1,mlon
+               ny = ibin(ml,nl)
+               if (ny.gt.0 .and. work1(ml,nl,kd,nt).ne.wmsg) then
+                 do nr=1,nrx
+                   if (rmlak(ml,nl,nr).eq.1) then
+                     tmp1(ny,kd,nr,nt) = tmp1(ny,kd,nr,nt)
+     +                                 + work1(ml,nl,kd,nt)
+                     tmp2(ny,kd,nr,nt) = tmp2(ny,kd,nr,nt)
+     +                                 + work2(ml,nl,kd,nt)
+                     tmp3(ny,kd,nr,nt) = tmp3(ny,kd,nr,nt)
+     +                                 + work3(ml,nl,kd,nt)
+                   end if
+                 end do
+               end if
+            end do
+          end do
+        end do
+      end do
 
-      do ny=2,nyaux
+      return
+      end
+c ----------------------------------------------------------------------
+      subroutine mocbins(nyaux,mlon,nlat,tlat,lat_aux_grid,ibin)
+      implicit none
+      integer  nyaux,mlon,nlat
+      double precision     lat_aux_grid(nyaux)  , tlat(mlon,nlat)
+      integer  ibin(mlon,nlat)
 
-        do nl=1,nlat
-          do ml=1,mlon
-             if (tlat(ml,nl).ge.lat_aux_grid(ny-1) .and.
-     +           tlat(ml,nl).lt.lat_aux_grid(ny)   .and.
-     +           rmlak(ml,nl,2).eq.1) then
+c bisection on lat_aux_grid, which must be monotonically increasing:
+c     ibin = ny  where  lat_aux_grid(ny-1) <= tlat < lat_aux_grid(ny)
+c     ibin = 0   if tlat is outside [lat_aux_grid(1),lat_aux_grid(nyaux))
 
-                 do kd=1,kdep
-                    if (work1(ml,nl,kd).ne.wmsg)  then          
-                        tmp1(ny,kd,2) = tmp1(ny,kd,2) + work1(ml,nl,kd)
-                        tmp2(ny,kd,2) = tmp2(ny,kd,2) + work2(ml,nl,kd)
-                        tmp3(ny,kd,2) = tmp3(ny,kd,2) + work3(ml,nl,kd)
-                    end if
-                 end do
+      integer  nl, ml, lo, hi, mid
+      double precision     tl
 
-             end if
-          end do
+      do nl=1,nlat
+        do ml=1,mlon
+           tl = tlat(ml,nl)
+           ibin(ml,nl) = 0
+           if (tl.ge.lat_aux_grid(1) .and.
+     +         tl.lt.lat_aux_grid(nyaux)) then
+               lo = 1
+               hi = nyaux
+               do while (hi-lo.gt.1)
+                  mid = (lo+hi)/2
+                  if (tl.ge.lat_aux_grid(mid)) then
+                      lo = mid
+                  else
+                      hi = mid
+                  end if
+               end do
+               ibin(ml,nl) = hi
+           end if
         end do
-
       end do
 
       return
@@ -0,0 +1,45 @@
+c OpenMP runtime shims, after all_todo/ompgen.F90, written with the
+c conditional compilation sentinel so that they also build, as no-ops,
+c without OpenMP
+c ----------------------------------------------------------------------
+      logical function fomp_enabled()
+      implicit none
+
+      fomp_enabled = .false.
+!$    fomp_enabled = .true.
+
+      return
+      end
+c ----------------------------------------------------------------------
+      subroutine fomp_set_num_threads(num_threads)
+!$    use omp_lib
+      implicit none
+      integer  num_threads
+
+c [note: sets the number of threads of the parallel regions started by
+c        the calling thread only]
+
+!$    call omp_set_num_threads(num_threads)
+
+      return
+      end
+c ----------------------------------------------------------------------
+      integer function fomp_get_max_threads()
+!$    use omp_lib
+      implicit none
+
+      fomp_get_max_threads = 1
+!$    fomp_get_max_threads = omp_get_max_threads()
+
+      return
+      end
+c ----------------------------------------------------------------------
+      integer function fomp_get_num_procs()
+!$    use omp_lib
+      implicit none
+
+      fomp_get_num_procs = 1
+!$    fomp_get_num_procs = omp_get_num_procs()
+
+      return
+      end
@@ -0,0 +1,115 @@
+C NCLFORTSTART
+      SUBROUTINE DPOPREMAP(DST_ARRAY,MAP_WTS,DST_ADD,SRC_ADD,SRC_ARRAY,
+     +                     NDST,NLINK,NW,NSRC,XMSG)
+
+c written in f77 for the GNU f77 compiler for portability reasons
+
+      IMPLICIT NONE
+      INTEGER NLINK,NW,NDST,NSRC
+      DOUBLE PRECISION MAP_WTS(NW,NLINK)
+      DOUBLE PRECISION DST_ARRAY(NDST)
+      DOUBLE PRECISION SRC_ARRAY(NSRC)
+      INTEGER DST_ADD(NLINK)
+      INTEGER SRC_ADD(NLINK)
+      DOUBLE PRECISION XMSG
+C NCLEND
+      INTEGER N
+
+      DO N = 1,NDST
+c initialize
+          DST_ARRAY(N) = XMSG
+      END DO
+
+      DO N = 1,NLINK
+          IF (SRC_ARRAY(SRC_ADD(N)).NE.XMSG) THEN
+              IF (DST_ARRAY(DST_ADD(N)).EQ.XMSG) THEN
+                  DST_ARRAY(DST_ADD(N)) = SRC_ARRAY(SRC_ADD(N))*
+     +                                    MAP_WTS(1,N)
+              ELSE
+                  DST_ARRAY(DST_ADD(N)) = DST_ARRAY(DST_ADD(N)) +
+     +                                    SRC_ARRAY(SRC_ADD(N))*
+     +                                    MAP_WTS(1,N)
+              END IF
+          END IF
+      END DO
+
+      RETURN
+      END
+c ----------------------------------------------------------------------
+      SUBROUTINE DPOPREMAPCSR(DST_ARRAY,INDPTR,COLS,WTS,SRC_ARRAY,
+     +                        NDST,NLINK,NSRC,NGRD,XMSG)
+      IMPLICIT NONE
+      INTEGER NDST,NLINK,NSRC,NGRD
+      INTEGER INDPTR(NDST+1),COLS(NLINK)
+      DOUBLE PRECISION WTS(NLINK)
+      DOUBLE PRECISION SRC_ARRAY(NSRC,NGRD),DST_ARRAY(NDST,NGRD)
+      DOUBLE PRECISION XMSG
+
+c DPOPREMAP of NGRD fields at once, of the links sorted by destination:
+c the links of destination N are INDPTR(N)+1 .. INDPTR(N+1), of source
+c cells COLS. Source values that are NaN, as well as XMSG, are missing.
+
+      INTEGER NG,N,K
+      DOUBLE PRECISION SRC,ACC
+      LOGICAL FOUND
+
+C$OMP PARALLEL DO COLLAPSE(2) PRIVATE(NG,N,K,SRC,ACC,FOUND)
+      DO NG = 1,NGRD
+          DO N = 1,NDST
+              ACC = 0.0D0
+              FOUND = .FALSE.
+              DO K = INDPTR(N) + 1,INDPTR(N+1)
+                  SRC = SRC_ARRAY(COLS(K),NG)
+                  IF (SRC.EQ.SRC .AND. SRC.NE.XMSG) THEN
+                      ACC = ACC + SRC*WTS(K)
+                      FOUND = .TRUE.
+                  END IF
+              END DO
+              IF (FOUND) THEN
+                  DST_ARRAY(N,NG) = ACC
+              ELSE
+                  DST_ARRAY(N,NG) = XMSG
+              END IF
+          END DO
+      END DO
+
+      RETURN
+      END
+c ----------------------------------------------------------------------
+      SUBROUTINE SPOPREMAPCSR(DST_ARRAY,INDPTR,COLS,WTS,SRC_ARRAY,
+     +                        NDST,NLINK,NSRC,NGRD,XMSG)
+      IMPLICIT NONE
+      INTEGER NDST,NLINK,NSRC,NGRD
+      INTEGER INDPTR(NDST+1),COLS(NLINK)
+      REAL WTS(NLINK)
+      REAL SRC_ARRAY(NSRC,NGRD),DST_ARRAY(NDST,NGRD)
+      REAL XMSG
+
+c single precision DPOPREMAPCSR
+
+      INTEGER NG,N,K
+      REAL SRC,ACC
+      LOGICAL FOUND
+
+C$OMP PARALLEL DO COLLAPSE(2) PRIVATE(NG,N,K,SRC,ACC,FOUND)
+      DO NG = 1,NGRD
+          DO N = 1,NDST
+              ACC = 0.0
+              FOUND = .FALSE.
+              DO K = INDPTR(N) + 1,INDPTR(N+1)
+                  SRC = SRC_ARRAY(COLS(K),NG)
+                  IF (SRC.EQ.SRC .AND. SRC.NE.XMSG) THEN
+                      ACC = ACC + SRC*WTS(K)
+                      FOUND = .TRUE.
+                  END IF
+              END DO
+              IF (FOUND) THEN
+                  DST_ARRAY(N,NG) = ACC
+              ELSE
+                  DST_ARRAY(N,NG) = XMSG
+              END IF
+          END DO
+      END DO
+
+      RETURN
+      END
@@ -29,8 +29,8 @@ c .             =2/3; xi or yi are not monotonically increasing
 c .             =4/5; xo or yo are not monotonically increasing
 c
 c                              local
-      INTEGER NG,NX,NY,NXY,NEXACT,IX,IY,M,N,NW,NER,K
-      DOUBLE PRECISION FW(2,2),W(2,2),SUMF,SUMW,CHKLAT(NYI),CHKLON(NXI)
+      INTEGER NG,NX,NY,NXY,NEXACT,IX,IY,M,N,NW,K
+      DOUBLE PRECISION FW(2,2),W(2,2),SUMF,SUMW
       DOUBLE PRECISION DGCDIST, WX, WY
       DOUBLE PRECISION REARTH, DLAT, PI, RAD, DKM, DIST 
 c                              error checking
@@ -41,20 +41,6 @@ c                              error checking
       END IF
       IF (IER.NE.0) RETURN
 
-      DO NY = 1,NYI
-          CHKLAT(NY) = YI(1,NY)
-c c c    print *,"chklat: ny=",ny,"  chklat=",chklat(ny)
-      END DO
-      CALL DMONOINC(CHKLAT,NYI,IER,NER)
-      IF (IER.NE.0) RETURN
-
-      DO NX = 1,NXI
-          CHKLON(NX) = XI(NX,1)
-c c c    print *,"chklon: nx=",nx,"  chklon=",chklon(nx)
-      END DO
-      CALL DMONOINC(CHKLAT,NYI,IER,NER)
-      IF (IER.NE.0) RETURN
-
 C ORIGINAL  (k = op, never implemented)
       IF (KVAL.LE.0) THEN
          K = 1
@@ -42,9 +42,9 @@ c .             =2/3; xi or yi are not monotonically increasing
 c .             =4/5; xo or yo are not monotonically increasing
 c
 c                              local
-      INTEGER          NG, NX,NY,NEXACT,IX,IY,M,N,NW,NER,K,NCRT
+      INTEGER          NG, NX,NY,NEXACT,IX,IY,M,N,NW,K,NCRT
       INTEGER          MFLAG, MPTCRT, MKNT
-      DOUBLE PRECISION FW(2,2),W(2,2),SUMF,SUMW,CHKLAT(NYI),CHKLON(NXI)
+      DOUBLE PRECISION FW(2,2),W(2,2),SUMF,SUMW
       DOUBLE PRECISION EPS
       DOUBLE PRECISION DGCDIST
 c                              error checking
@@ -54,25 +54,10 @@ c                              error checking
           RETURN
       END IF
       IF (IER.NE.0) RETURN
-
-      CALL DMONOINC(YO,NYO,IER,NER)
-      IF (IER.NE.0) RETURN
-      CALL DMONOINC(XO,NXO,IER,NER)
-      IF (IER.NE.0) RETURN
-
-      DO NY = 1,NYI
-         CHKLAT(NY) = YI(1,NY)
-c c c    print *,"chklat: ny=",ny,"  chklat=",chklat(ny)
-      END DO
-      CALL DMONOINC(CHKLAT,NYI,IER,NER)
-      IF (IER.NE.0) RETURN
-
-      DO NX = 1,NXI
-         CHKLON(NX) = XI(NX,1)
-c c c    print *,"chklon: nx=",nx,"  chklon=",chklon(nx)
-      END DO
-      CALL DMONOINC(CHKLAT,NYI,IER,NER)
-      IF (IER.NE.0) RETURN
+c                              xo and yo are not checked: DMONOINC was
+c                              removed, as its arguments were swapped so
+c                              that it never failed, and decreasing xo or
+c                              yo are handled correctly
 
       K = 2
 c c c k = opt
@@ -95,6 +80,8 @@ c                              people want bit-for-bit match
       EPS    = 1.D-04
       NEXACT = 0
 
+c                              output rows are independent
+C$OMP PARALLEL DO PRIVATE(NX,IY,IX,NG) REDUCTION(+:NEXACT)
       DO NY = 1,NYO
         DO NX = 1,NXO
            DO IY = 1,NYI
@@ -119,6 +106,7 @@ c                              people want bit-for-bit match
 
 c c c print *, "nexact=",nexact
 c                              main loop [interpolation]
+C$OMP PARALLEL DO PRIVATE(NX,IY,IX,NG,M,N,NW,W,FW,SUMF,SUMW)
       DO NY = 1,NYO
         DO NX = 1,NXO
 
@@ -179,6 +167,7 @@ C .   for all of the locations on regular grid. Fill via linear interp.
       MKNT   =  0
       MFLAG  =  0
       MPTCRT =  2
+C$OMP PARALLEL DO PRIVATE(NY,NX) REDUCTION(+:MKNT)
       DO NG=1,NGRD
         DO NY=1,NYO
           DO NX=1,NXO
@@ -236,7 +225,7 @@ c .             =2/3; xi or yi are not monotonically increasing
 c .             =4/5; xo or yo are not monotonically increasing
 c
 c                              local
-      INTEGER          NG,NX,NY,NEXACT,IX,IY,M,N,NW,NER,K
+      INTEGER          NG,NX,NY,NEXACT,IX,IY,M,N,NW,K
       DOUBLE PRECISION FW(2,2),W(2,2),SUMF,SUMW,EPS
       DOUBLE PRECISION DGCDIST
 
@@ -255,11 +244,11 @@ c                              error checking
           RETURN
       END IF
       IF (IER.NE.0) RETURN
-
-      CALL DMONOINC(YI,NYI,IER,NER)
-      IF (IER.NE.0) RETURN
-      CALL DMONOINC(XI,NXI,IER,NER)
-      IF (IER.NE.0) RETURN
+c                              xi and yi are not checked here: DMONOINC
+c                              was removed, as its arguments were swapped
+c                              so that it never failed. xi and yi must be
+c                              increasing, which rgrid2rcm warns about
+c                              from Python
 c                              Init to missing
       DO NG = 1,NGRD
         DO NY = 1,NYO
@@ -272,6 +261,8 @@ c                              main loop [exact matches]
       EPS    = 1.D-03
       NEXACT = 0
 
+c                              output rows are independent
+C$OMP PARALLEL DO PRIVATE(NX,IY,IX,NG) REDUCTION(+:NEXACT)
       DO NY = 1,NYO
         DO NX = 1,NXO
 
@@ -302,6 +293,7 @@ c c c print *, "nexact=",nexact
 c c c k = opt
 
 c                              main loop [interpolation]
+C$OMP PARALLEL DO PRIVATE(NX,IY,IX,NG,M,N,NW,W,FW,SUMF,SUMW)
       DO NY = 1,NYO
         DO NX = 1,NXO
 
@@ -138,6 +138,120 @@ c c c if (debug) then
 c c c     print *, "TOTAL TIME    :  telapse=", (second()-t0)
 c c c end if
 
+      RETURN
+      END
+C ------------
+      SUBROUTINE TRIPLE2GRIDP(KZ,XI,YI,ZI,ZMSG,MX,NY,GX,GY,GRID,DIST,
+     +                        DOMAIN,METHOD,DISTMX,IBIG,MX2,NY2,
+     +                        X,Y,Z,GBIGX,GBIGY,GBIGXY,DBIGXY,IER)
+      IMPLICIT NONE
+
+c Same as TRIPLE2GRID1 [LOOP=0], but also returns the distance of the
+c .   observation assigned to each grid point, so that grids computed
+c .   from disjoint subsets of the observations can be merged by
+c .   keeping, at every grid point, the value with the smaller distance.
+c .   dist  - distance of the assigned observation; 1D20 if none and
+c .           -1 if it matches the grid point exactly
+c .   ibig  - use the oversized grid: -1 if any pt is outside the grid
+c .           (as TRIPLE2GRID1), 0 never, 1 always. Callers merging
+c .           subsets must pass the decision made for the full set.
+
+      INTEGER MX,NY,KZ,IER,MX2,NY2,METHOD,IBIG
+      DOUBLE PRECISION GRID(MX,NY),DIST(MX,NY),GX(MX),GY(NY)
+      DOUBLE PRECISION DISTMX,DOMAIN
+      DOUBLE PRECISION XI(KZ),YI(KZ),ZI(KZ),ZMSG
+      DOUBLE PRECISION X(KZ),Y(KZ),Z(KZ)
+      DOUBLE PRECISION GBIGX(MX2),GBIGY(NY2)
+      DOUBLE PRECISION GBIGXY(MX2,NY2),DBIGXY(MX2,NY2)
+c                          local
+      INTEGER M,N,K,KOUT,KPTS, MFLAG,NFLAG
+      DOUBLE PRECISION DD,DDEPS,DDCRIT
+
+      IER   = 0
+      DDEPS = 1D-3
+      IF (DISTMX.LE.0.0D0) THEN
+          DDCRIT = 1D20
+      ELSE
+          DDCRIT = DISTMX
+      END IF
+c                     strip out missing data (kpts)
+c                     count the number of pts outside the grid (KOUT)
+      KPTS = 0
+      KOUT = 0
+      DO K = 1,KZ
+          IF (ZI(K).NE.ZMSG) THEN
+              KPTS = KPTS + 1
+              X(KPTS) = XI(K)
+              Y(KPTS) = YI(K)
+              Z(KPTS) = ZI(K)
+              IF (XI(K).LT.GX(1) .OR. XI(K).GT.GX(MX) .OR.
+     +            YI(K).LT.GY(1) .OR. YI(K).GT.GY(NY)) KOUT = KOUT + 1
+          END IF
+      END DO
+c                     return if no valid pts
+      IF (KPTS.EQ.0) THEN
+          DO N = 1,NY
+              DO M = 1,MX
+                  GRID(M,N) = ZMSG
+                  DIST(M,N) = 1D20
+              END DO
+          END DO
+          RETURN
+      END IF
+
+      IF (IBIG.GE.0) KOUT = IBIG
+c                    equally spaced in x ???
+      MFLAG = 1
+      DD    = ABS( GX(2)-GX(1) )
+      DO M=2,MX-1
+         IF (DD.LT.(GX(M+1)-GX(M))-DDEPS   .OR.
+     +       DD.GT.(GX(M+1)-GX(M))+DDEPS ) THEN
+             MFLAG = 0
+             GO TO 10 
+         END IF
+      END DO
+c                    equally spaced in y ???
+   10 NFLAG = 1
+      DD    = ABS( GY(2)-GY(1) )
+      DO N=2,NY-1
+         IF (DD.LT.(GY(N+1)-GY(N))-DDEPS   .OR.
+     +       DD.GT.(GY(N+1)-GY(N))+DDEPS ) THEN
+             NFLAG = 0
+             GO TO 20 
+         END IF
+      END DO
+   20 CONTINUE
+
+      IF (KOUT.EQ.0) THEN
+          CALL TRIP2GRD2D(KPTS,X,Y,Z,ZMSG,MX,NY,GX,GY,GRID,DIST
+     +                   ,MFLAG,NFLAG,METHOD,DDCRIT,IER)
+      ELSE
+c          create an oversized (big) grid
+c          allows outliers to influence grid
+          DO N = 1,NY
+             GBIGY(N+1) = GY(N)
+          END DO
+
+          DO M = 1,MX
+             GBIGX(M+1) = GX(M)
+          END DO
+c          domain is arbitrary
+          GBIGY(1)   = GY(1)  - DOMAIN*(GY(2)-GY(1))
+          GBIGY(NY2) = GY(NY) + DOMAIN*(GY(NY)-GY(NY-1))
+          GBIGX(1)   = GX(1)  - DOMAIN*(GX(2)-GX(1))
+          GBIGX(MX2) = GX(MX) + DOMAIN*(GX(MX)-GX(MX-1))
+
+          CALL TRIP2GRD2D(KPTS,X,Y,Z,ZMSG,MX2,NY2,GBIGX,GBIGY
+     +                   ,GBIGXY,DBIGXY,MFLAG,NFLAG,METHOD,DDCRIT,IER)
+c           store interior of gbig in return arrays
+          DO N = 1,NY
+            DO M = 1,MX
+               GRID(M,N) = GBIGXY(M+1,N+1)
+               DIST(M,N) = DBIGXY(M+1,N+1)
+            END DO
+          END DO
+      END IF
+
       RETURN
       END
 C ------------
@@ -153,8 +267,28 @@ c .   will be less than the number KZ due to over writing the same grid pt.
       DOUBLE PRECISION GXOUT(MX),GYOUT(NY),GOUT(MX,NY)
       DOUBLE PRECISION X(KZ),Y(KZ),Z(KZ),ZMSG,DDCRIT
 c                          local
-      INTEGER M,N,K,MM,NN,KSUM,KPTS
       DOUBLE PRECISION DOUT(MX,NY)
+
+      CALL TRIP2GRD2D(KZ,X,Y,Z,ZMSG,MX,NY,GXOUT,GYOUT,GOUT,DOUT
+     +               ,MFLAG,NFLAG,METHOD,DDCRIT,IER)
+
+      RETURN
+      END
+C ------------
+      SUBROUTINE TRIP2GRD2D(KZ,X,Y,Z,ZMSG,MX,NY,GXOUT,GYOUT,GOUT,DOUT
+     +                     ,MFLAG,NFLAG,METHOD,DDCRIT,IER)
+
+c Same as TRIP2GRD2, but DOUT (distance of the value assigned to each
+c .   grid point; 1D20 if none) is returned to the caller. Exact matches
+c .   are flagged with DOUT=-1, which no nearest neighbor can undercut.
+
+      IMPLICIT NONE
+      INTEGER MX,NY,KZ,IER, MFLAG,NFLAG,METHOD
+      DOUBLE PRECISION GXOUT(MX),GYOUT(NY),GOUT(MX,NY)
+      DOUBLE PRECISION X(KZ),Y(KZ),Z(KZ),ZMSG,DDCRIT
+      DOUBLE PRECISION DOUT(MX,NY)
+c                          local
+      INTEGER M,N,K,MM,NN,KSUM,KPTS
       DOUBLE PRECISION DD,XX,YY,SLPY,SLPX,DX,DY,ATMP,YLAT,RE,RAD 
 
 c c c real     t0, t1, t2, second
@@ -191,7 +325,7 @@ c c c t1  = second()
                DO M=1,MX
                   IF (X(K).EQ.GXOUT(M)) THEN
                       GOUT(M,N) = Z(K)
-                      DOUT(M,N) = 0.0D0
+                      DOUT(M,N) = -1.0D0
                       KSUM = KSUM + 1
                       GO TO 10
                    END IF
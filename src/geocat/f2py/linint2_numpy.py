@@ -0,0 +1,201 @@
+"""NumPy implementations of the routines of ``fortran/linint2.f``.
+
+These are the ``backend="numpy"`` counterparts of the Fortran routines called
+by the inner wrappers of :mod:`geocat.f2py.linint2_wrapper`, for platforms
+without the compiled extensions, or for problem shapes where they are faster.
+They return the same values as the Fortran routines (with ``iopt=0``), but
+work on all leading slices of ``fi`` at once: the interpolation indices and
+weights only depend on the coordinates, so they are found once with
+:func:`numpy.searchsorted` and applied to every slice by broadcasting.
+
+Missing values of ``fi``, i.e. NaN and ``msg_py``, are NaN while computing,
+so that any interpolation involving them is NaN as well, and are set to
+``msg_py`` in the output.
+
+The indices and weights are kept in :mod:`geocat.f2py.cache`, if enabled.
+"""
+
+import numpy as np
+
+from . import cache
+
+
+def _nan_msg(fi, msg_py):
+    # float64 copy of `fi`, with `msg_py` set to NaN
+    fi = np.array(fi, dtype=np.float64)
+    if not np.isnan(msg_py):
+        fi[fi == msg_py] = np.nan
+    return fi
+
+
+def _msg_nan(fo, msg_py):
+    # NaN of `fo` set to `msg_py`, in place
+    if not np.isnan(msg_py):
+        fo[np.isnan(fo)] = msg_py
+    return fo
+
+
+def _cyclic(xi, fi, direction, dx0, dx1):
+    # `xi` and the rightmost dimension of `fi` extended with a point on either
+    # side, `dx0` before the first and `dx1` after the last coordinate, that
+    # takes the value at the other end (DLINCYC, DLININT2PTS)
+    xi = np.concatenate(
+        ([xi[0] - direction * dx0], xi, [xi[-1] + direction * dx1]))
+    fi = np.concatenate((fi[..., -1:], fi, fi[..., :1]), axis=-1)
+    return xi, fi
+
+
+def _interp_weights(xi, xo, direction):
+    # Indices and weights of the interpolation from `xi` to `xo`, both
+    # strictly monotonic in `direction`
+    nxi = xi.shape[0]
+
+    # xi[j] <= xo < xi[j + 1] along `direction`
+    j = np.searchsorted(direction * xi, direction * xo, side="right") - 1
+    k = np.clip(j, 0, nxi - 1)
+    exact = (j >= 0) & (xi[k] == xo)
+    inside = (j >= 0) & (j < nxi - 1)
+    j = np.clip(j, 0, nxi - 2)
+
+    return j, k, exact, inside, xi[j + 1] - xi[j], xo - xi[j]
+
+
+def _interp(xi, fi, xo, direction, axis):
+    # Piecewise linear interpolation along `axis` (-1 or -2) of `fi`, from
+    # `xi` to `xo`, both strictly monotonic in `direction` (DLIN2INT1)
+    (j, k, exact, inside, dx,
+     dxo) = cache.memoize("weights", ("linint", xi, xo, direction),
+                          lambda: _interp_weights(xi, xo, direction))
+
+    # Coordinate-only arrays broadcast along the remaining dimensions
+    along = (-1,) + (1,) * (-axis - 1)
+
+    f0 = np.take(fi, j, axis=axis)
+    f1 = np.take(fi, j + 1, axis=axis)
+
+    # Same operations as the Fortran routine, so that results are identical
+    fo = f0 + (f1 - f0) / dx.reshape(along) * dxo.reshape(along)
+    fo = np.where(inside.reshape(along), fo, np.nan)
+
+    # Exact matches take the input value, which covers the last coordinate
+    return np.where(exact.reshape(along), np.take(fi, k, axis=axis), fo)
+
+
+def linint1(xi, fi, xo, icycx, msg_py, mono):
+    """Counterpart of ``DLININT1`` for all slices of ``fi`` at once; ``mono``
+    is the direction (+1/-1) of ``xi`` and ``xo``."""
+    if xi.shape[0] < 2:
+        return np.full(fi.shape[:-1] + xo.shape, msg_py, dtype=np.float64)
+
+    xi = np.asarray(xi, dtype=np.float64)
+    xo = np.asarray(xo, dtype=np.float64)
+    fi = _nan_msg(fi, msg_py)
+
+    if icycx:
+        xi, fi = _cyclic(xi, fi, mono, abs(xi[1] - xi[0]), abs(xi[-1] - xi[-2]))
+
+    return _msg_nan(_interp(xi, fi, xo, mono, -1), msg_py)
+
+
+def linint2(xi, yi, fi, xo, yo, icycx, msg_py, monox, monoy):
+    """Counterpart of ``DLININT2`` for all slices of ``fi`` at once: ``fi`` is
+    interpolated along x, then along y.
+
+    ``monox`` and ``monoy`` are the directions (+1/-1) of the x and y
+    coordinates.
+    """
+    if xi.shape[0] < 2 or yi.shape[0] < 2:
+        return np.full(fi.shape[:-2] + yo.shape + xo.shape,
+                       msg_py,
+                       dtype=np.float64)
+
+    xi = np.asarray(xi, dtype=np.float64)
+    yi = np.asarray(yi, dtype=np.float64)
+    xo = np.asarray(xo, dtype=np.float64)
+    yo = np.asarray(yo, dtype=np.float64)
+    fi = _nan_msg(fi, msg_py)
+
+    if icycx:
+        xi, fi = _cyclic(xi, fi, monox, abs(xi[1] - xi[0]),
+                         abs(xi[-1] - xi[-2]))
+
+    fo = _interp(xi, fi, xo, monox, -1)
+    fo = _interp(yi, fo, yo, monoy, -2)
+
+    return _msg_nan(fo, msg_py)
+
+
+def _pts_weights(xi, yi, xo, yo):
+    # Indices and weights of the interpolation from the (xi, yi) grid to the
+    # (xo, yo) points: xi[n] <= xo < xi[n + 1] and yi[m] <= yo < yi[m + 1];
+    # there is no extrapolation, not even for xo == xi[-1]
+    n = np.searchsorted(xi, xo, side="right") - 1
+    m = np.searchsorted(yi, yo, side="right") - 1
+    found = ((n >= 0) & (n < xi.shape[0] - 1) & (m >= 0) &
+             (m < yi.shape[0] - 1))
+    n = np.clip(n, 0, xi.shape[0] - 2)
+    m = np.clip(m, 0, yi.shape[0] - 2)
+    exact = (xi[n] == xo) & (yi[m] == yo)
+
+    x1, x2, y1, y2 = xi[n], xi[n + 1], yi[m], yi[m + 1]
+    slpx = (xo - x1) / (x2 - x1)
+    slpy = (yo - y1) / (y2 - y1)
+
+    # Inverse distance weights of the four surrounding points (ESTFOW)
+    with np.errstate(divide="ignore"):
+        weights = [
+            1.0 / np.sqrt((x - xo)**2 + (y - yo)**2)
+            for (x, y) in ((x1, y1), (x2, y1), (x1, y2), (x2, y2))
+        ]
+
+    return (n, m, found, exact, slpx, slpy, *weights)
+
+
+def linint2pts(xi, yi, fi, xo, yo, icycx, msg_py):
+    """Counterpart of ``DLININT2PTS`` for all slices of ``fi`` at once, for
+    increasing ``xi`` and ``yi``.
+
+    Points of which some of the four surrounding values are missing get
+    the inverse distance weighted average of the others (ESTFOW).
+    """
+    if xi.shape[0] < 2 or yi.shape[0] < 2:
+        return np.full(fi.shape[:-2] + xo.shape, msg_py, dtype=np.float64)
+
+    xi = np.asarray(xi, dtype=np.float64)
+    yi = np.asarray(yi, dtype=np.float64)
+    xo = np.asarray(xo, dtype=np.float64)
+    yo = np.asarray(yo, dtype=np.float64)
+    fi = _nan_msg(fi, msg_py)
+
+    if icycx:
+        # Both ends are extended by the first spacing, as in the Fortran code
+        xi, fi = _cyclic(xi, fi, 1, xi[1] - xi[0], xi[1] - xi[0])
+
+    (n, m, found, exact, slpx, slpy,
+     *weights) = cache.memoize("weights", ("linint2pts", xi, yi, xo, yo),
+                               lambda: _pts_weights(xi, yi, xo, yo))
+
+    f1, f2 = fi[..., m, n], fi[..., m, n + 1]
+    f3, f4 = fi[..., m + 1, n], fi[..., m + 1, n + 1]
+
+    # Bilinear interpolation, in x first
+    tmp1 = f1 + slpx * (f2 - f1)
+    tmp2 = f3 + slpx * (f4 - f3)
+    fo = tmp1 + slpy * (tmp2 - tmp1)
+
+    # Inverse distance weighted average of the values present, for points
+    # where some are missing; NaN if all are
+    total = np.zeros_like(fo)
+    weights_sum = np.zeros_like(fo)
+    with np.errstate(invalid="ignore"):
+        for (f, w) in zip((f1, f2, f3, f4), weights):
+            present = ~np.isnan(f)
+            total += np.where(present, f * w, 0.0)
+            weights_sum += np.where(present, w, 0.0)
+        estimate = np.where(weights_sum > 0.0, total / weights_sum, np.nan)
+
+    fo = np.where(np.isnan(fo), estimate, fo)
+    fo = np.where(exact, f1, fo)
+    fo = np.where(found, fo, np.nan)
+
+    return _msg_nan(fo, msg_py)
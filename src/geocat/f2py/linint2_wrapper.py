@@ -5,93 +5,147 @@ from dask.array.core import map_blocks
 import numpy as np
 import xarray as xr
 
+from . import cache, datasets, linint2_numpy, profiling, threads
+from .chunking import plan_chunks
+from .coordinates import monotonic, monotonic_pair
 from .errors import ChunkError, CoordinateError
-from .fortran import dlinint1, dlinint2, dlinint2pts
-from .missing_values import fort2py_msg, py2fort_msg
+from .missing_values import default_msg_py
+
+try:
+    from .fortran import dlinint1mg, dlinint2mg, dlinint2ptsmg
+except ImportError:
+    # Without the compiled extension, only the NumPy backend is available
+    dlinint1mg = dlinint2mg = dlinint2ptsmg = None
 
 supported_types = typing.Union[xr.DataArray, np.ndarray]
 
+backends = ("fortran", "numpy")
+
+
+def _get_backend(backend, func):
+    # The Fortran routines by default, unless the extension is missing
+    if backend is None:
+        return "numpy" if dlinint2mg is None else "fortran"
+
+    if backend not in backends:
+        raise ValueError(
+            f"{func}: `backend` must be one of {', '.join(backends)}!")
+    if backend == "fortran" and dlinint2mg is None:
+        raise ImportError(
+            f"{func}: the Fortran extension of geocat.f2py is not available; "
+            "use backend='numpy' instead")
+
+    return backend
+
+
 # Fortran Wrappers _<funcname>()
 # These wrappers are executed within dask processes (if any), and could/should
 # do anything that can benefit from parallel execution.
 
 
-def _linint1(xi, fi, xo, icycx, msg_py, shape):
-    # ''' signature : fo = dlinint1(xi,fi,xo,[icycx,xmsg,iopt])
-    # missing value handling
-    fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
-    # fortran call
-    fo = dlinint1(
-        xi,
-        fi,
-        xo,
-        icycx=icycx,
-        xmsg=msg_fort,
-    )
-    # numpy and reshape
-    fo = np.asarray(fo)
-    fo = fo.reshape(shape)
-    # missing value handling
-    fi, msg_fort, msg_py = fort2py_msg(fi, msg_fort=msg_fort, msg_py=msg_py)
-    fo, msg_fort, msg_py = fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
-    return fo
-
-
-def _linint2(xi, yi, fi, xo, yo, icycx, msg_py, shape):
-    # ''' signature : fo = dlinint2(xi,yi,fi,xo,yo,[icycx,xmsg,iopt])
-    # missing value handling
-    fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
-    # fortran call
-    fo = dlinint2(
-        xi,
-        yi,
-        fi,
-        xo,
-        yo,
-        icycx=icycx,
-        xmsg=msg_fort,
-    )
-    # numpy and reshape
-    fo = np.asarray(fo)
-    fo = fo.reshape(shape)
-    # missing value handling
-    fort2py_msg(fi, msg_fort=msg_fort, msg_py=msg_py)
-    fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
-    return fo
+def _linint1(xi, fi, xo, icycx, msg_py, mono, backend):
+    # ''' signature : fo = dlinint1mg(xi,fi,xo,[icycx,xmsg,iopt,mono])
+    t = profiling.timer("linint1")
+    shape = fi.shape[:-1] + xo.shape
 
+    # The direction of the coordinates is verified by the outer wrapper; if
+    # they are not monotonic, the output is all missing
+    if mono == 0:
+        return np.full(shape, msg_py, dtype=np.float64)
 
-def _linint2pts(xi, yi, fi, xo, yo, icycx, msg_py, shape):
-    # ''' signature : fo = dlinint2pts(xi,yi,fi,xo,yo,[icycx,xmsg])
+    # The NumPy backend works on this C-ordered block as it is
+    if backend == "numpy":
+        fo = linint2_numpy.linint1(xi, fi, xo, icycx, msg_py, mono)
+        t.mark("numpy")
+        return fo
 
-    # missing value handling
-    fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
+    # Fortran expects fi(nxi,ngrd): transposing the C-ordered (ngrd, nx)
+    # slices of this block gives that layout without a copy
+    fi = np.transpose(fi.reshape((-1,) + fi.shape[-1:]))
+    t.mark("transpose")
 
-    # fortran call
+    # A single fortran call for all slices of this block, which also takes
+    # care of the missing values
+    fo = dlinint1mg(xi, fi, xo, icycx=icycx, xmsg=msg_py, mono=mono)
+    t.mark("fortran", copies=(xi, fi, xo))
 
-    fo, error_code = dlinint2pts(xi, yi, fi, xo, yo, icycx=icycx, xmsg=msg_fort)
+    fo = np.transpose(fo).reshape(shape)
+    t.mark("transpose")
+    return fo
 
-    # Catch warnings
-    if error_code == 1:
-        warnings.warn(
-            "WARNING linint2pts: Not enough points in input arrays or output coordinates!"
-        )
-    elif error_code == 2:
-        warnings.warn(
-            "WARNING linint2pts: x_in should be a monotonically increasing array !"
-        )
-    elif error_code == 3:
-        warnings.warn(
-            "WARNING linint2pts: y_in should be a monotonically increasing array !"
-        )
 
-    # numpy and reshape
-    fo = np.asarray(fo)
-    fo = fo.reshape(shape)
+def _linint2(xi, yi, fi, xo, yo, icycx, msg_py, monox, monoy, backend):
+    # ''' signature : fo = dlinint2mg(xi,yi,fi,xo,yo,[icycx,xmsg,iopt,monox,monoy])
+    t = profiling.timer("linint2")
+    shape = fi.shape[:-2] + yo.shape + xo.shape
+
+    # The directions of the coordinates are verified by the outer wrapper; if
+    # they are not monotonic, the output is all missing
+    if monox == 0 or monoy == 0:
+        return np.full(shape, msg_py, dtype=np.float64)
+
+    # The NumPy backend works on this C-ordered block as it is
+    if backend == "numpy":
+        fo = linint2_numpy.linint2(xi, yi, fi, xo, yo, icycx, msg_py, monox,
+                                   monoy)
+        t.mark("numpy")
+        return fo
+
+    # Fortran expects fi(nxi,nyi,ngrd): transposing the C-ordered
+    # (ngrd, ny, nx) slices of this block gives that layout without a copy,
+    # and keeps x as the (possibly cyclic) axis
+    fi = np.transpose(fi.reshape((-1,) + fi.shape[-2:]))
+    t.mark("transpose")
+
+    # A single fortran call for all slices of this block, which also takes
+    # care of the missing values
+    threads.apply()
+    fo = dlinint2mg(xi,
+                    yi,
+                    fi,
+                    xo,
+                    yo,
+                    icycx=icycx,
+                    xmsg=msg_py,
+                    monox=monox,
+                    monoy=monoy)
+    t.mark("fortran", copies=(xi, yi, fi, xo, yo))
+
+    fo = np.transpose(fo).reshape(shape)
+    t.mark("transpose")
+    return fo
 
-    # missing value handling
-    fort2py_msg(fi, msg_fort=msg_fort, msg_py=msg_py)
-    fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
 
+def _linint2pts(xi, yi, fi, xo, yo, icycx, msg_py, mono, backend):
+    # ''' signature : fo = dlinint2ptsmg(xi,yi,fi,xo,yo,[icycx,xmsg,mono])
+    t = profiling.timer("linint2pts")
+    shape = fi.shape[:-2] + xo.shape
+
+    # The coordinates are verified by the outer wrapper; if they are not
+    # monotonically increasing, the output is all missing
+    if mono == 0:
+        return np.full(shape, msg_py, dtype=np.float64)
+
+    # The NumPy backend works on this C-ordered block as it is
+    if backend == "numpy":
+        fo = linint2_numpy.linint2pts(xi, yi, fi, xo, yo, icycx, msg_py)
+        t.mark("numpy")
+        return fo
+
+    # Fortran expects fi(nxi,nyi,ngrd): transposing the C-ordered
+    # (ngrd, ny, nx) slices of this block gives that layout without a copy,
+    # and keeps x as the (possibly cyclic) axis
+    fi = np.transpose(fi.reshape((-1,) + fi.shape[-2:]))
+    t.mark("transpose")
+
+    # A single fortran call for all slices of this block, which also takes
+    # care of the missing values
+    threads.apply()
+    fo = dlinint2ptsmg(xi, yi, fi, xo, yo, icycx=icycx, xmsg=msg_py, mono=mono)
+    t.mark("fortran", copies=(xi, yi, fi, xo, yo))
+
+    fo = np.transpose(fo).reshape(shape)
+    t.mark("transpose")
     return fo
 
 
@@ -104,7 +158,8 @@ def linint1(fi: supported_types,
             xo: supported_types,
             xi: supported_types = None,
             icycx: np.number = 0,
-            msg_py: np.number = None) -> supported_types:
+            msg_py: np.number = None,
+            backend: str = None) -> supported_types:
     # ''' signature : fo = dlinint1(xi,fi,xo,[icycx,xmsg,iopt])
     """Interpolates from one series to another using piecewise linear
     interpolation across the rightmost dimension. The series may be cyclic in
@@ -173,14 +228,21 @@ def linint1(fi: supported_types,
         This argument allows a user to use a missing value scheme
         other than NaN or masked arrays, similar to what NCL allows.
 
+    backend : :obj:`str`, optional
+        The implementation to use: ``"fortran"``, the compiled NCL
+        routine, or ``"numpy"``, a vectorized NumPy implementation
+        that gives the same results without the compiled extensions.
+        Defaults to ``"fortran"``, or to ``"numpy"`` if the Fortran
+        extension is not available.
+
     Returns
     -------
     fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         The interpolated series. The returned value will have the same
         dimensions as ``fi``, except for the rightmost dimension which
         will have the same dimension size as the length of xo.
-        The return type will be double if ``fi`` is double, and float
-        otherwise.
+        The return type is always double (:class:`numpy.float64`),
+        whatever the type of ``fi``.
 
     Examples
     --------
@@ -209,6 +271,10 @@ def linint1(fi: supported_types,
         fo = geocat.comp.linint1(fi, xo, icycx=0)
     """
 
+    t = profiling.timer("linint1")
+
+    backend = _get_backend(backend, "linint1")
+
     # ''' Start of boilerplate
     is_input_xr = True
     is_input_dask = False
@@ -238,65 +304,75 @@ def linint1(fi: supported_types,
             raise Exception(
                 "linint1: fi must be unchunked along the last dimension")
 
-    # Note: Auto-chunking, regardless of what chunk sizes were given by the user, seems
-    # to be explicitly needed in this function because:
-    # The Fortran routine for this function is implemented assuming it would be looped
-    # across the leftmost dimensions of the input (`fi`), i.e. on one-dimensional
-    # chunks of size that is equal to the rightmost dimension of `fi`.
-
-    # Generate chunks of {'dim_0': 1, 'dim_1': 1, ..., 'dim_n': xi.shape}
-    fi_chunks = list(fi.dims)
-    fi_chunks[:-1] = [
-        (k, 1) for (k, v) in zip(list(fi.dims)[:-1],
-                                 list(fi.shape)[:-1])
-    ]
-    fi_chunks[-1:] = [
-        (k, v) for (k, v) in zip(list(fi.dims)[-1:],
-                                 list(fi.shape)[-1:])
-    ]
-    fi_chunks = dict(fi_chunks)
-    fi = fi.chunk(fi_chunks)
+    # Verify the coordinates once here rather than in every Fortran call
+    mono = monotonic_pair(xi, xo)
+    if mono == 0:
+        warnings.warn(
+            "WARNING linint1: xi and xo should be monotonically increasing or "
+            "decreasing in the same direction; the output is all missing !")
+
+    # Missing value of the output, which is taken as missing in `fi` as well
+    # as NaN
+    if msg_py is None:
+        msg_py = default_msg_py(fi.dtype.type)
+
+    t.mark("validation")
+
+    # The results of NumPy data may be cached
+    key = None
+    if not is_input_dask:
+        key = cache.key("results", "linint1", fi.data, np.asarray(xi),
+                        np.asarray(xo), icycx, msg_py, backend)
+    cached = cache.get("results", key)
+    t.mark("cache")
+
+    # Note: The Fortran routine for this function takes any number of slices
+    # along the leftmost dimensions of the input (`fi`), so `fi` is chunked
+    # along those only, and each chunk is computed by a single task and
+    # Fortran call. Existing chunks are kept as they are; otherwise, as many
+    # slices are grouped in each chunk as fit in the memory budget of a task.
+    fi_chunks = plan_chunks(fi.shape, 1, xo.shape[0], fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
 
     # fo data structure elements
-    fo_chunks = list(fi.chunks)
-    fo_chunks[-1:] = (xo.shape,)
-    fo_chunks = tuple(fo_chunks)
-    fo_shape = tuple(a[0] for a in list(fo_chunks))
+    fo_chunks = fi.chunks[:-1] + (xo.shape,)
     fo_coords = {k: v for (k, v) in fi.coords.items()}
     fo_coords[fi.dims[-1]] = xo
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    fo = map_blocks(
-        _linint1,
-        xi,
-        fi.data,
-        xo,
-        icycx,
-        msg_py,
-        fo_shape,
-        chunks=fo_chunks,
-        dtype=fi.dtype,
-        drop_axis=[fi.ndim - 1],
-        new_axis=[fi.ndim - 1],
-    )
+    if cached is None:
+        # Inner Fortran wrapper call
+        with profiling.annotate("linint1"):
+            fo = map_blocks(
+                _linint1,
+                np.asarray(xi),
+                fi.data,
+                np.asarray(xo),
+                icycx,
+                msg_py,
+                mono,
+                backend,
+                chunks=fo_chunks,
+                dtype=np.float64,
+                drop_axis=[fi.ndim - 1],
+                new_axis=[fi.ndim - 1],
+            )
+        t.mark("chunking")
+
+        # Dask output is only kept for chunked xarray.DataArray input
+        if not (is_input_xr and is_input_dask):
+            fo = fo.compute()
+        t.mark("compute")
+
+        cache.put("results", key, fo)
+    else:
+        # Cached arrays are read-only
+        fo = cached.copy()
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
-        if is_input_dask:
-            fo = xr.DataArray(fo,
-                              attrs=fi.attrs,
-                              dims=fi.dims,
-                              coords=fo_coords)
-        else:
-            fo = xr.DataArray(fo,
-                              attrs=fi.attrs,
-                              dims=fi.dims,
-                              coords=fo_coords).compute()
-
-    # Else if input was numpy.ndarray, convert Dask output to numpy.ndarray with `.compute()
-    else:
-        fo = fo.compute()
+        fo = xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims, coords=fo_coords)
+    t.mark("packaging")
 
     return fo
 
@@ -309,7 +385,8 @@ def linint2(fi: supported_types,
             xi: supported_types = None,
             yi: supported_types = None,
             icycx: bool = 0,
-            msg_py: np.number = None) -> supported_types:
+            msg_py: np.number = None,
+            backend: str = None) -> supported_types:
     """Interpolates a regular grid to a rectilinear one using bi-linear
     interpolation. The input grid may be cyclic in the x-direction. The
     interpolation is first performed in the x-direction, and then in the
@@ -331,6 +408,13 @@ def linint2(fi: supported_types,
         This variable must be supplied as a :class:`xarray.DataArray` in order to copy the
         dimension names to the output. Otherwise, default names will be used.
 
+        ``fi`` may also be a :class:`xarray.Dataset`, whose data variables are all interpolated
+        if their rightmost two dimensions are those of the grid: the dimensions of ``yi`` and
+        ``xi`` if they are :class:`xarray.DataArray`, and otherwise the rightmost two
+        dimensions with coordinates of the variables of the highest rank. Variables on the same
+        grid and of the same type are stacked and interpolated in a single call; variables which
+        do not depend on those dimensions are kept as they are, and the others are dropped.
+
     xo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         A one-dimensional array that specifies the X-coordinates of the return array. It must be
         strictly monotonically increasing, but may be unequally spaced. For geo-referenced data,
@@ -391,15 +475,21 @@ def linint2(fi: supported_types,
         A numpy scalar value that represent a missing value in ``fi``. This argument allows a user to
         use a missing value scheme other than NaN or masked arrays, similar to what NCL allows.
 
+    backend : :obj:`str`, optional
+        The implementation to use: ``"fortran"``, the compiled NCL routine, or ``"numpy"``, a
+        vectorized NumPy implementation that gives the same results without the compiled extensions.
+        Defaults to ``"fortran"``, or to ``"numpy"`` if the Fortran extension is not available.
+
     Returns
     -------
 
-    fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+    fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`, :class:`xarray.Dataset`
         The interpolated grid. If the *meta* parameter is True, then the result will include named
         dimensions matching the input array. The returned value will have the same dimensions as ``fi``,
         except for the rightmost two dimensions which will have the same dimension sizes as the
-        lengths of ``yo`` and ``xo``. The return type will be double if ``fi`` is double, and float
-        otherwise.
+        lengths of ``yo`` and ``xo``. The return type is always double (:class:`numpy.float64`),
+        whatever the type of ``fi``. A :class:`xarray.Dataset` of the interpolated variables is returned for a
+        :class:`xarray.Dataset` ``fi``.
 
     Examples
     --------
@@ -429,6 +519,22 @@ def linint2(fi: supported_types,
         fo = geocat.comp.linint2(fi, xo, yo, icycx=0)
     """
 
+    # All the variables on the same grid are interpolated at once
+    if isinstance(fi, xr.Dataset):
+        dims = datasets.grid_dims(fi, (yi, xi))
+        return datasets.regrid(
+            fi,
+            2,
+            lambda v: v.dims[-2:] == dims,
+            lambda stacked: linint2(
+                stacked, xo, yo, icycx=icycx, msg_py=msg_py, backend=backend),
+            "linint2",
+        )
+
+    t = profiling.timer("linint2")
+
+    backend = _get_backend(backend, "linint2")
+
     # ''' Start of boilerplate
     is_input_xr = True
     is_input_dask = False
@@ -460,67 +566,85 @@ def linint2(fi: supported_types,
                 "linint2: `fi` must be unchunked along the rightmost two dimensions"
             )
 
-    # Note: Auto-chunking, regardless of what chunk sizes were given by the user, seems
-    # to be explicitly needed in this function because:
-    # The Fortran routine for this function is implemented assuming it would be looped
-    # across the leftmost dimensions of the input (`fi`), i.e. on one-dimensional
-    # chunks of size that is equal to the rightmost dimension of `fi`.
-
-    # Generate chunks of {'dim_0': 1, 'dim_1': 1, ..., 'dim_n-1': yi.shape, 'dim_n': xi.shape}
-    fi_chunks = list(fi.dims)
-    fi_chunks[:-2] = [
-        (k, 1) for (k, v) in zip(list(fi.dims)[:-2],
-                                 list(fi.shape)[:-2])
-    ]
-    fi_chunks[-2:] = [
-        (k, v) for (k, v) in zip(list(fi.dims)[-2:],
-                                 list(fi.shape)[-2:])
-    ]
-    fi_chunks = dict(fi_chunks)
-    fi = fi.chunk(fi_chunks)
+    # Verify the coordinates once here rather than in every Fortran call
+    monox = monotonic_pair(xi, xo)
+    monoy = monotonic_pair(yi, yo)
+    if monox == 0:
+        warnings.warn(
+            "WARNING linint2: xi and xo should be monotonically increasing or "
+            "decreasing in the same direction; the output is all missing !")
+    if monoy == 0:
+        warnings.warn(
+            "WARNING linint2: yi and yo should be monotonically increasing or "
+            "decreasing in the same direction; the output is all missing !")
+
+    # Missing value of the output, which is taken as missing in `fi` as well
+    # as NaN
+    if msg_py is None:
+        msg_py = default_msg_py(fi.dtype.type)
+
+    t.mark("validation")
+
+    # The results of NumPy data may be cached
+    key = None
+    if not is_input_dask:
+        key = cache.key("results", "linint2", fi.data, np.asarray(xi),
+                        np.asarray(yi), np.asarray(xo), np.asarray(yo), icycx,
+                        msg_py, backend)
+    cached = cache.get("results", key)
+    t.mark("cache")
+
+    # Note: The Fortran routine for this function takes any number of slices
+    # along the leftmost dimensions of the input (`fi`), so `fi` is chunked
+    # along those only, and each chunk is computed by a single task and
+    # Fortran call. Existing chunks are kept as they are; otherwise, as many
+    # slices are grouped in each chunk as fit in the memory budget of a task.
+    fi_chunks = plan_chunks(fi.shape, 2, yo.shape[0] * xo.shape[0], fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
 
     # fo data structure elements
-    fo_chunks = list(fi.chunks)
-    fo_chunks[-2:] = (yo.shape, xo.shape)
-    fo_chunks = tuple(fo_chunks)
-    fo_shape = tuple(a[0] for a in list(fo_chunks))
+    fo_chunks = fi.chunks[:-2] + (yo.shape, xo.shape)
     fo_coords = {k: v for (k, v) in fi.coords.items()}
     fo_coords[fi.dims[-1]] = xo
     fo_coords[fi.dims[-2]] = yo
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    fo = map_blocks(
-        _linint2,
-        yi,
-        xi,
-        fi.data,
-        yo,
-        xo,
-        icycx,
-        msg_py,
-        fo_shape,
-        chunks=fo_chunks,
-        dtype=fi.dtype,
-        drop_axis=[fi.ndim - 2, fi.ndim - 1],
-        new_axis=[fi.ndim - 2, fi.ndim - 1],
-    )
+    if cached is None:
+        # Inner Fortran wrapper call
+        with profiling.annotate("linint2"):
+            fo = map_blocks(
+                _linint2,
+                np.asarray(xi),
+                np.asarray(yi),
+                fi.data,
+                np.asarray(xo),
+                np.asarray(yo),
+                icycx,
+                msg_py,
+                monox,
+                monoy,
+                backend,
+                chunks=fo_chunks,
+                dtype=np.float64,
+                drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                new_axis=[fi.ndim - 2, fi.ndim - 1],
+            )
+        t.mark("chunking")
+
+        # Dask output is only kept for chunked xarray.DataArray input
+        if not (is_input_xr and is_input_dask):
+            fo = fo.compute()
+        t.mark("compute")
+
+        cache.put("results", key, fo)
+    else:
+        # Cached arrays are read-only
+        fo = cached.copy()
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
-        if is_input_dask:
-            fo = xr.DataArray(fo,
-                              attrs=fi.attrs,
-                              dims=fi.dims,
-                              coords=fo_coords)
-        else:
-            fo = xr.DataArray(fo,
-                              attrs=fi.attrs,
-                              dims=fi.dims,
-                              coords=fo_coords).compute()
-    # Else if input was numpy.ndarray, convert Dask output to numpy.ndarray with `.compute()
-    else:
-        fo = fo.compute()
+        fo = xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims, coords=fo_coords)
+    t.mark("packaging")
 
     return fo
 
@@ -533,7 +657,8 @@ def linint2pts(fi: supported_types,
                icycx: bool = False,
                msg_py: np.number = None,
                xi: supported_types = None,
-               yi: supported_types = None) -> supported_types:
+               yi: supported_types = None,
+               backend: str = None) -> supported_types:
     """Interpolates from a rectilinear grid to an unstructured grid or
     locations using bilinear interpolation.
 
@@ -594,12 +719,18 @@ def linint2pts(fi: supported_types,
         the ``fi`` array. ``yi`` might be defined as the coordinates of ``fi`` when ``fi`` is of type
         ``xarray.DataArray``; in this case ``yi`` may not be explicitly given as a function argument.
 
+    backend : :obj:`str`, optional
+        The implementation to use: ``"fortran"``, the compiled NCL routine, or ``"numpy"``, a
+        vectorized NumPy implementation that gives the same results without the compiled extensions.
+        Defaults to ``"fortran"``, or to ``"numpy"`` if the Fortran extension is not available.
+
     Returns
     -------
 
     fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         The returned value will have the same dimensions as ``fi``, except for the rightmost dimension
-        which will have the same dimension size as the length of ``yo`` and ``xo``.
+        which will have the same dimension size as the length of ``yo`` and ``xo``. The return type
+        is always double (:class:`numpy.float64`), whatever the type of ``fi``.
 
     Examples
     --------
@@ -630,6 +761,10 @@ def linint2pts(fi: supported_types,
         fo = geocat.comp.linint2pts(fi, xo, yo, 0)
     """
 
+    t = profiling.timer("linint2pts")
+
+    backend = _get_backend(backend, "linint2pts")
+
     # ''' Start of boilerplate
     is_input_xr = True
     is_input_dask = False
@@ -669,62 +804,90 @@ def linint2pts(fi: supported_types,
     if xo.shape != yo.shape:
         raise Exception("linint2pts xo and yo must be of equal length")
 
-    # Note: Auto-chunking, regardless of what chunk sizes were given by the user, seems
-    # to be explicitly needed in this function because:
-    # The Fortran routine for this function is implemented assuming it would be looped
-    # across the leftmost dimensions of the input (`fi`), i.e. on one-dimensional
-    # chunks of size that is equal to the rightmost dimension of `fi`.
-
-    # Generate chunks of {'dim_0': 1, 'dim_1': 1, ..., 'dim_n-1': yi.shape, 'dim_n': xi.shape}
-    fi_chunks = list(fi.dims)
-    fi_chunks[:-2] = [
-        (k, 1) for (k, v) in zip(list(fi.dims)[:-2],
-                                 list(fi.shape)[:-2])
-    ]
-    fi_chunks[-2:] = [
-        (k, v) for (k, v) in zip(list(fi.dims)[-2:],
-                                 list(fi.shape)[-2:])
-    ]
-    fi_chunks = dict(fi_chunks)
-    fi = fi.chunk(fi_chunks)
+    # Verify the coordinates once here rather than in every Fortran call
+    mono = 0
+    if xi.shape[0] < 2 or yi.shape[0] < 2:
+        warnings.warn(
+            "WARNING linint2pts: Not enough points in input arrays or output coordinates!"
+        )
+    elif monotonic(xi) != 1:
+        warnings.warn(
+            "WARNING linint2pts: x_in should be a monotonically increasing array !"
+        )
+    elif monotonic(yi) != 1:
+        warnings.warn(
+            "WARNING linint2pts: y_in should be a monotonically increasing array !"
+        )
+    else:
+        mono = 1
+
+    # Missing value of the output, which is taken as missing in `fi` as well
+    # as NaN
+    if msg_py is None:
+        msg_py = default_msg_py(fi.dtype.type)
+
+    t.mark("validation")
+
+    # The results of NumPy data may be cached
+    key = None
+    if not is_input_dask:
+        key = cache.key("results", "linint2pts", fi.data, np.asarray(xi),
+                        np.asarray(yi), np.asarray(xo), np.asarray(yo), icycx,
+                        msg_py, backend)
+    cached = cache.get("results", key)
+    t.mark("cache")
+
+    # Note: The Fortran routine for this function takes any number of slices
+    # along the leftmost dimensions of the input (`fi`), so `fi` is chunked
+    # along those only, and each chunk is computed by a single task and
+    # Fortran call. Existing chunks are kept as they are; otherwise, as many
+    # slices are grouped in each chunk as fit in the memory budget of a task.
+    fi_chunks = plan_chunks(fi.shape, 2, xo.shape[0], fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
 
     # fo datastructure elements
-    fo_chunks = list(fi.chunks)
-    fo_chunks[-2:] = (xo.shape,)
-    fo_chunks = tuple(fo_chunks)
-    fo_shape = tuple(a[0] for a in list(fo_chunks))
+    fo_chunks = fi.chunks[:-2] + (xo.shape,)
     fo_coords = {k: v for (k, v) in fi.coords.items()}
     # fo_coords.remove(fi.dims[-1]) # this dimension dissapears
     fo_coords[fi.dims[-1]] = xo  # remove this line omce dims are figured out
     fo_coords[fi.dims[-2]] = yo  # maybe replace with 'pts'
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    fo = map_blocks(
-        _linint2pts,
-        yi,
-        xi,
-        fi.data,
-        yo,
-        xo,
-        icycx,
-        msg_py,
-        fo_shape,
-        chunks=fo_chunks,
-        dtype=fi.dtype,
-        drop_axis=[fi.ndim - 2, fi.ndim - 1],
-        new_axis=[fi.ndim - 2],
-    )
+    if cached is None:
+        # Inner Fortran wrapper call
+        with profiling.annotate("linint2pts"):
+            fo = map_blocks(
+                _linint2pts,
+                np.asarray(xi),
+                np.asarray(yi),
+                fi.data,
+                np.asarray(xo),
+                np.asarray(yo),
+                icycx,
+                msg_py,
+                mono,
+                backend,
+                chunks=fo_chunks,
+                dtype=np.float64,
+                drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                new_axis=[fi.ndim - 2],
+            )
+        t.mark("chunking")
+
+        # Dask output is only kept for chunked xarray.DataArray input
+        if not (is_input_xr and is_input_dask):
+            fo = fo.compute()
+        t.mark("compute")
+
+        cache.put("results", key, fo)
+    else:
+        # Cached arrays are read-only
+        fo = cached.copy()
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
-        if is_input_dask:
-            fo = xr.DataArray(fo, attrs=fi.attrs)
-        else:
-            fo = xr.DataArray(fo, attrs=fi.attrs).compute()
-    # Else if input was numpy.ndarray, convert Dask output to numpy.ndarray with `.compute()
-    else:
-        fo = fo.compute()
+        fo = xr.DataArray(fo, attrs=fi.attrs)
+    t.mark("packaging")
 
     return fo
 
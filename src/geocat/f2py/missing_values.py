@@ -33,6 +33,16 @@ string_dtypes = [str]
 supported_dtypes = msg_dtype.keys()
 
 
+def default_msg_py(ndtype):
+    # missing value of a dtype on the python side: NaN where the dtype has one
+    if ndtype in float_dtypes:
+        return np.nan
+    elif ndtype in complex_dtypes:
+        return np.nan + np.nan * 1j
+    else:
+        return msg_dtype[ndtype]
+
+
 # python to fortran
 def py2fort_msg(ndarray, msg_py=None, msg_fort=None):
     msg_indices = None
@@ -43,12 +53,7 @@ def py2fort_msg(ndarray, msg_py=None, msg_fort=None):
                         " is not a supported type")
 
     if msg_py is None:
-        if ndtype in float_dtypes:
-            msg_py = np.nan
-        elif ndtype in complex_dtypes:
-            msg_py = np.nan + np.nan * 1j
-        else:
-            msg_py = msg_dtype[ndtype]
+        msg_py = default_msg_py(ndtype)
 
     if msg_fort is None:
         msg_fort = msg_dtype[ndtype]
@@ -78,12 +83,7 @@ def fort2py_msg(ndarray, msg_fort=None, msg_py=None):
         msg_fort = msg_dtype[ndtype]
 
     if msg_py is None:
-        if ndtype in float_dtypes:
-            msg_py = np.nan
-        elif ndtype in complex_dtypes:
-            msg_py = np.nan + np.nan * 1j
-        else:
-            msg_py = msg_dtype[ndtype]
+        msg_py = default_msg_py(ndtype)
 
     msg_indices = (ndarray == msg_fort)
 
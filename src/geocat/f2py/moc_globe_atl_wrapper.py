@@ -1,9 +1,13 @@
 import typing
 
+from dask.array.core import map_blocks
 import numpy as np
 import xarray as xr
 
-from .fortran import mocloops
+from . import profiling, threads
+from .chunking import plan_chunks
+from .errors import DimensionError
+from .fortran import mocbins, mocloops, mocsums
 from .missing_values import fort2py_msg, py2fort_msg
 
 supported_types = typing.Union[xr.DataArray, np.ndarray]
@@ -15,6 +19,7 @@ supported_types = typing.Union[xr.DataArray, np.ndarray]
 
 def _moc_loops(lat_aux_grid, a_wvel, a_bolus, a_submeso, t_lat, rmlak, msg_py):
     # signature:  tmp1,tmp2,tmp3 = mocloops(tlat,lat_aux_grid,rmlak,work1,work2,work3,wmsg)
+    t = profiling.timer("moc_globe_atl")
     work1 = a_wvel
     work2 = a_bolus
     work3 = a_submeso
@@ -26,23 +31,35 @@ def _moc_loops(lat_aux_grid, a_wvel, a_bolus, a_submeso, t_lat, rmlak, msg_py):
     # transpositions
     t_lat = np.transpose(t_lat, axes=(1, 0))
     rmlak = np.transpose(rmlak, axes=(2, 1, 0))
+    t.mark("transpose")
 
     # missing value handing for a_wvel (work1)
     work1, msg_py, msg_fort = py2fort_msg(work1, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     # fortran call
+    threads.apply()
     tmp1, tmp2, tmp3 = mocloops(t_lat, lat_aux_grid, rmlak, work1, work2, work3,
                                 msg_fort)
+    t.mark("fortran", copies=(t_lat, lat_aux_grid, rmlak, work1, work2, work3))
+
+    # missing value handling
+    work1, msg_fort, msg_py = fort2py_msg(work1,
+                                          msg_fort=msg_fort,
+                                          msg_py=msg_py)
+    t.mark("msg_conversion")
 
     # Un-transpose arrays for output
     tmp1 = np.transpose(tmp1, axes=(2, 1, 0))
     tmp2 = np.transpose(tmp2, axes=(2, 1, 0))
     tmp3 = np.transpose(tmp3, axes=(2, 1, 0))
+    t.mark("transpose")
 
     # missing value handling
     tmp1, msg_fort, msg_py = fort2py_msg(tmp1, msg_fort=msg_fort, msg_py=msg_py)
     tmp2, msg_fort, msg_py = fort2py_msg(tmp2, msg_fort=msg_fort, msg_py=msg_py)
     tmp3, msg_fort, msg_py = fort2py_msg(tmp3, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     # Merge output arrays
     tmp_out = xr.DataArray(np.stack((tmp1, tmp2, tmp3)))
@@ -50,11 +67,170 @@ def _moc_loops(lat_aux_grid, a_wvel, a_bolus, a_submeso, t_lat, rmlak, msg_py):
     return tmp_out
 
 
+def _moc_bins(lat_aux_grid, t_lat, rmlak):
+    # signature:  ibin = mocbins(tlat,lat_aux_grid)
+    # Auxiliary latitude bin of each column, in Fortran order
+    ibin = mocbins(np.transpose(t_lat, axes=(1, 0)), lat_aux_grid)
+
+    # Columns that are in none of the regions never contribute
+    ibin[~np.any(rmlak == 1, axis=0).T] = 0
+
+    return ibin
+
+
+def _moc_sums(a_wvel, a_bolus, a_submeso, ibin, rmlak, nyaux, msg_py):
+    # signature:  tmp1,tmp2,tmp3 = mocsums(nyaux,ibin,rmlak,work1,work2,work3,wmsg)
+    t = profiling.timer("moc_globe_atl")
+    # (time, z, y, x) blocks are (x, y, z, time) in Fortran order, no copy
+    work1 = np.transpose(a_wvel, axes=(3, 2, 1, 0))
+    work2 = np.transpose(a_bolus, axes=(3, 2, 1, 0))
+    work3 = np.transpose(a_submeso, axes=(3, 2, 1, 0))
+    t.mark("transpose")
+
+    # missing value handing for a_wvel (work1)
+    work1, msg_py, msg_fort = py2fort_msg(work1, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    # fortran call
+    threads.apply()
+    tmp1, tmp2, tmp3 = mocsums(nyaux, ibin, rmlak, work1, work2, work3,
+                               msg_fort)
+    t.mark("fortran", copies=(ibin, rmlak, work1, work2, work3))
+
+    # missing value handling
+    work1, msg_fort, msg_py = fort2py_msg(work1,
+                                          msg_fort=msg_fort,
+                                          msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    # Un-transpose arrays for output: (time, region, z, lat_aux)
+    tmp1 = np.transpose(tmp1, axes=(3, 2, 1, 0))
+    tmp2 = np.transpose(tmp2, axes=(3, 2, 1, 0))
+    tmp3 = np.transpose(tmp3, axes=(3, 2, 1, 0))
+    t.mark("transpose")
+
+    tmp1, msg_fort, msg_py = fort2py_msg(tmp1, msg_fort=msg_fort, msg_py=msg_py)
+    tmp2, msg_fort, msg_py = fort2py_msg(tmp2, msg_fort=msg_fort, msg_py=msg_py)
+    tmp3, msg_fort, msg_py = fort2py_msg(tmp3, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    # Merge output arrays: (time, transport_comp, region, z, lat_aux)
+    return np.stack((tmp1, tmp2, tmp3), axis=1)
+
+
+def _moc_globe_atl_time(lat_aux_grid, a_wvel, a_bolus, a_submeso, t_lat, rmlak,
+                        msg, is_input_xr, is_work_xr):
+    # Time-batched `moc_globe_atl` for (time, z, y, x) work arrays
+    t = profiling.timer("moc_globe_atl")
+
+    # ''' Start of boilerplate
+    if (a_bolus.shape != a_wvel.shape) | (a_submeso.shape != a_wvel.shape):
+        raise DimensionError(
+            "moc_globe_atl: `a_wvel`, `a_bolus` and `a_submeso` must have the "
+            "same shape !\n")
+
+    if t_lat.shape != a_wvel.shape[-2:]:
+        raise DimensionError(
+            "moc_globe_atl: `t_lat` must have the same shape as the rightmost "
+            "two dimensions of the work arrays !\n")
+
+    if (rmlak.ndim != 3) | (rmlak.shape[-2:] != a_wvel.shape[-2:]):
+        raise DimensionError(
+            "moc_globe_atl: `rmlak` must be a stack of region masks with the "
+            "same shape as the rightmost two dimensions of the work arrays !\n")
+
+    nyaux = lat_aux_grid.shape[0]
+    nrx = rmlak.shape[0]
+    kdep = a_wvel.shape[1]
+    t.mark("validation")
+
+    # The latitude bin and region of each column depend on the grid only, so
+    # they are computed once here and shared by all time steps
+    rmlak_np = np.asarray(rmlak.data)
+    ibin = _moc_bins(np.asarray(lat_aux_grid.data), np.asarray(t_lat.data),
+                     rmlak_np)
+    rmlak_fort = np.asfortranarray(
+        np.transpose(rmlak_np, axes=(2, 1, 0)).astype(np.int32))
+
+    # Chunk the work arrays along time only, keeping any existing time chunks,
+    # so that each chunk is summed in a single Fortran call. Otherwise, as
+    # many time steps of the three work arrays and of the output are grouped
+    # per chunk as fit in the memory budget of a task.
+    time_chunks = plan_chunks(a_wvel.shape, 3,
+                              2 * a_wvel[0].size + 3 * nrx * kdep * nyaux,
+                              a_wvel.chunks)[0]
+    a_wvel = a_wvel.chunk(dict(zip(a_wvel.dims, (time_chunks, -1, -1, -1))))
+    a_bolus = a_bolus.chunk(dict(zip(a_bolus.dims, a_wvel.chunks)))
+    a_submeso = a_submeso.chunk(dict(zip(a_submeso.dims, a_wvel.chunks)))
+
+    fo_chunks = (a_wvel.chunks[0], (3,), (nrx,), (kdep,), (nyaux,))
+    # ''' end of boilerplate
+
+    with profiling.annotate("moc_globe_atl"):
+        fo = map_blocks(
+            _moc_sums,
+            a_wvel.data,
+            a_bolus.data,
+            a_submeso.data,
+            ibin,
+            rmlak_fort,
+            nyaux,
+            msg,
+            new_axis=4,
+            chunks=fo_chunks,
+            dtype=np.float64,
+        )
+    t.mark("chunking")
+
+    # Lazy output, with the time and depth coordinates of the work arrays
+    time_dim, z_dim = a_wvel.dims[:2] if is_work_xr else ("time", "z")
+    lat_dim = lat_aux_grid.dims[0] if is_input_xr else "lat_aux_grid"
+
+    fo_coords = {lat_dim: np.asarray(lat_aux_grid.data)}
+    if "transport_reg" in rmlak.coords:
+        fo_coords["transport_reg"] = rmlak.coords["transport_reg"].data
+    for (dim, fo_dim) in ((a_wvel.dims[0], time_dim), (a_wvel.dims[1], z_dim)):
+        if dim in a_wvel.coords:
+            fo_coords[fo_dim] = a_wvel.coords[dim].data
+
+    fo = xr.DataArray(fo,
+                      dims=(time_dim, "transport_comp", "transport_reg", z_dim,
+                            lat_dim),
+                      coords=fo_coords)
+    t.mark("packaging")
+
+    return fo
+
+
 # Outer Wrapper <funcname>()
 # This wrapper is excecuted in the __main__ python process, and should be
 # used for any tasks which would not benefit from parallel execution.
 
 
+def _region_masks(rmlak, regions):
+    # Stack of region masks, one per region, from a region-ID array
+    if regions is None:
+        ids = np.unique(np.asarray(rmlak.data))
+        regions = ids[ids > 0].tolist()
+
+    if len(regions) == 0:
+        raise ValueError("moc_globe_atl: `regions` must not be empty !\n")
+
+    masks = np.stack([
+        np.isin(np.asarray(rmlak.data), region).astype(np.int32)
+        for region in regions
+    ])
+
+    # Label the regions if each one is a single region ID
+    coords = {}
+    if all(np.ndim(region) == 0 for region in regions):
+        coords["transport_reg"] = list(regions)
+
+    return xr.DataArray(masks,
+                        dims=("transport_reg",) + rmlak.dims,
+                        coords=coords)
+
+
 def moc_globe_atl(lat_aux_grid: supported_types,
                   a_wvel: supported_types,
                   a_bolus: supported_types,
@@ -62,30 +238,41 @@ def moc_globe_atl(lat_aux_grid: supported_types,
                   t_lat: supported_types,
                   rmlak: supported_types,
                   msg: np.number = None,
-                  meta: bool = False) -> supported_types:
+                  meta: bool = False,
+                  regions: typing.Sequence = None) -> supported_types:
     """Facilitates calculating the meridional overturning circulation for the
-    globe and Atlantic.
+    globe and Atlantic, or for any number of other regions.
 
     Parameters
     ----------
 
     lat_aux_grid : :class:`xarray.DataArray`, :class:`numpy.ndarray`
-        Latitude grid for transport diagnostics.
+        Latitude grid for transport diagnostics. Must be monotonically
+        increasing.
 
     a_wvel : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         Area weighted Eulerian-mean vertical velocity [``TAREA x WVEL``].
+        Either a single snapshot of size [``kdepth``] x [``nlat``] x [``mlon``],
+        or a time series of size [``time``] x [``kdepth``] x [``nlat``] x
+        [``mlon``], optionally chunked in time with dask.
 
     a_bolus : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         Area weighted Eddy-induced (bolus) vertical velocity [``TAREA x WISOP``].
+        Same shape as ``a_wvel``.
 
     a_submeso : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         Area weighted submeso vertical velocity [``TAREA x WSUBM``].
+        Same shape as ``a_wvel``.
 
     tlat : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         Array of t-grid latitudes.
 
     rmlak : :class:`xarray.DataArray`, :class:`numpy.ndarray`
-        Basin index number: [0]=Globe, [1]=Atlantic
+        Region masks, either as a stack of size [``n_transport_reg``] x
+        [``nlat``] x [``mlon``] where columns of region ``n`` are 1 in
+        ``rmlak[n]`` (e.g. [0]=Globe, [1]=Atlantic), or as an integer region-ID
+        array of size [``nlat``] x [``mlon``] such as the POP ``REGION_MASK``, in
+        which case the regions are given by ``regions``.
 
     msg : :obj:`numpy.number`
       A numpy scalar value that represent a missing value.
@@ -98,6 +285,12 @@ def moc_globe_atl(lat_aux_grid: supported_types,
         default is False.
         Warning: this option is not currently supported.
 
+    regions : :obj:`list`, optional
+        Only used if ``rmlak`` is a region-ID array. Each element defines one
+        transport region, either as a single region ID or as a list of region
+        IDs that are combined, e.g. ``[[1, 2, 3, 6], 6, [2, 3]]``. Defaults to
+        one region per positive ID found in ``rmlak``.
+
     Returns
     -------
 
@@ -106,10 +299,23 @@ def moc_globe_atl(lat_aux_grid: supported_types,
         [``moc_comp``] x [``n_transport_reg``] x [``kdepth``] x [``nyaux``] where:
 
         - ``moc_comp`` refers to the three components returned
-        - ``n_transport_reg`` refers to the Globe and Atlantic
+        - ``n_transport_reg`` refers to the regions of ``rmlak``, e.g. the Globe
+          and Atlantic
         - ``kdepth`` is the the number of vertical levels of the work arrays
         - ``nyaux`` is the size of the ``lat_aux_grid``
 
+        If the work arrays have a leading time dimension, the output is a lazy
+        dask-backed :class:`xarray.DataArray` of size [``time``] x
+        [``moc_comp``] x [``n_transport_reg``] x [``kdepth``] x [``nyaux``] with
+        dimensions ``(time, transport_comp, transport_reg, z, lat_aux_grid)``;
+        the time and depth dimension names and coordinates are taken from
+        ``a_wvel`` if it is an :class:`xarray.DataArray`. The latitude bin and
+        region of each column are computed once for all time steps, and each
+        time chunk of the work arrays is summed in a single Fortran call.
+        Non-dask input is split into chunks of as many time steps as fit in
+        the memory budget of a task (see :mod:`geocat.f2py.chunking`), and
+        the existing time chunks of dask input are kept.
+
     Examples
     --------
 
@@ -140,7 +346,18 @@ def moc_globe_atl(lat_aux_grid: supported_types,
         # (4) Calling with Numpy inputs and user-defined arguments (Missing value = np.nan, NO meta information)
         out_arr = moc_globe_atl(lat_aux_grid.values, a_wvel.values, a_bolus.values, a_submeso.values,
                                 tlat.values, rmlak.values, msg=-99.0, meta=True)
+
+        # (5) Calling with (time, z, y, x) xArray inputs chunked in time; the output is lazy
+        ds = xr.open_mfdataset("pop_monthly_*.nc", chunks={"time": 12})
+        out_arr = moc_globe_atl(lat_aux_grid, ds.a_wvel, ds.a_bolus, ds.a_submeso, tlat, rmlak)
+        out_arr = out_arr.compute()
+
+        # (6) Calling with the POP region-ID mask for globe, Atlantic, Indo-Pacific,
+        #     Southern Ocean and Arctic transports, all computed in a single pass
+        out_arr = moc_globe_atl(lat_aux_grid, a_wvel, a_bolus, a_submeso, tlat, ds.REGION_MASK,
+                                regions=[[1, 2, 3, 6, 8, 9, 10], [6, 8, 9], [2, 3], 1, 10])
     """
+    t = profiling.timer("moc_globe_atl")
 
     # ''' Start of boilerplate
     is_input_xr = True
@@ -149,6 +366,8 @@ def moc_globe_atl(lat_aux_grid: supported_types,
         is_input_xr = False
         lat_aux_grid = xr.DataArray(lat_aux_grid)
 
+    is_work_xr = isinstance(a_wvel, xr.DataArray)
+
     # Convert other arguments to Xarray for inner wrapper call below if they are numpy
     a_wvel = xr.DataArray(a_wvel)
     a_bolus = xr.DataArray(a_bolus)
@@ -156,11 +375,29 @@ def moc_globe_atl(lat_aux_grid: supported_types,
     t_lat = xr.DataArray(t_lat)
     rmlak = xr.DataArray(rmlak)
 
+    # A region-ID array is turned into one mask per region; all regions are
+    # then accumulated during a single pass over the work arrays
+    if rmlak.ndim == 2:
+        rmlak = _region_masks(rmlak, regions)
+    elif regions is not None:
+        raise ValueError(
+            "moc_globe_atl: `regions` can only be given with a region-ID "
+            "`rmlak` !\n")
+
+    t.mark("validation")
+
+    if a_wvel.ndim == 4:
+        return _moc_globe_atl_time(lat_aux_grid, a_wvel, a_bolus, a_submeso,
+                                   t_lat, rmlak, msg, is_input_xr, is_work_xr)
+    # ''' end of boilerplate
+
     fo = _moc_loops(lat_aux_grid.data, a_wvel.data, a_bolus.data,
                     a_submeso.data, t_lat.data, rmlak.data, msg)
+    t.mark("compute")
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
         fo = xr.DataArray(fo)
+    t.mark("packaging")
 
     return fo
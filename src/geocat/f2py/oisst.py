@@ -0,0 +1,227 @@
+"""Reader and writer of NOAA optimum interpolation (OI) SST binary files.
+
+The weekly, monthly and climatology OI SST grids are stored as a header of
+eight integers followed by the 1x1 degree ``(180, 360)`` grid, as read one
+grid at a time by ``rdsstoi`` in ``fortran/all_todo``. In the binary files,
+both are big-endian Fortran unformatted records, the grid of ``float32``
+values in degrees C. The header is the start date ``iyrst, imst, idst``, the
+end date ``iyrend, imend, idend``, the number of days ``ndays``, e.g. 7 for
+weekly grids, and an ``index``.
+
+Records that may follow the grid, e.g. analysis errors, are skipped.
+
+As all the grids of a file take the same number of bytes, the file is
+memory-mapped as an array of fixed-size records, of which the grids are a
+strided, zero-copy view: :func:`open_dataarray` indexes the headers, and
+returns a DataArray backed by dask chunks of that view, so that subsetting a
+multi-decade archive only reads the grids selected. :func:`write` writes the
+same layout.
+
+.. code-block:: python
+
+    from geocat.f2py import oisst
+
+    sst = oisst.open_dataarray(sorted(glob.glob("oisst.wkmean.*")))
+    nino34 = sst.sel(lat=slice(-5, 5), lon=slice(-170, -120)).mean(
+        ("lat", "lon")).compute()
+"""
+
+import os
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+from .errors import DimensionError
+
+# Grid, and its geolocation, as documented by rdsstoi: SST(1,1) is at 179.5W,
+# 89.5S and SST(360,180) at 179.5E, 89.5N
+_nlat, _nlon = 180, 360
+_lat = np.arange(_nlat) - 89.5
+_lon = np.arange(_nlon) - 179.5
+
+_header_size = 8 * 4
+_grid_size = _nlat * _nlon * 4
+
+
+def _records(stride):
+    # A grid and its header, framed by their record markers, followed by any
+    # other records up to `stride` bytes
+    return np.dtype({
+        "names": ["m0", "header", "m1", "m2", "sst", "m3"],
+        "formats": [
+            ">i4", (">i4", 8), ">i4", ">i4", (">f4", (_nlat, _nlon)), ">i4"
+        ],
+        "offsets": [
+            0, 4, 4 + _header_size, 8 + _header_size, 12 + _header_size,
+            12 + _header_size + _grid_size
+        ],
+        "itemsize": stride,
+    })
+
+
+def _stride(path, size):
+    # Bytes from a header to the next one, by walking the records after the
+    # first header; None if these are not records
+    with open(path, "rb") as f:
+        pos = 0
+        while pos + 4 <= size:
+            f.seek(pos)
+            n = int(np.fromfile(f, dtype=">i4", count=1)[0])
+            if n < 0 or (not pos and n != _header_size):
+                return None
+            if pos and n == _header_size:
+                return pos
+            pos += n + 8
+    return size if pos == size else None
+
+
+def memmap(path) -> np.memmap:
+    """Returns the records of a file as a read-only :class:`numpy.memmap` of a
+    structured type, of fields ``header``, the ``(n, 8)`` integers, and
+    ``sst``, the ``(n, 180, 360)`` grids, which are only read on access."""
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+    if size == 0:
+        raise ValueError(f"oisst: '{path}' is empty!")
+
+    stride = _stride(path, size)
+    if (stride is None or stride < 16 + _header_size + _grid_size or
+            size % stride):
+        raise ValueError(f"oisst: '{path}' is not of big-endian header and "
+                         f"{_nlon} x {_nlat} grid records!")
+
+    records = np.memmap(path, dtype=_records(stride), mode="r")
+
+    # The markers of the header and grid records of every grid
+    if ((records["m0"] != _header_size).any() or
+        (records["m1"] != _header_size).any() or
+        (records["m2"] != _grid_size).any() or
+        (records["m3"] != _grid_size).any()):
+        raise ValueError(f"oisst: '{path}' is corrupted!")
+
+    return records
+
+
+def _dates(years, months, days):
+    # datetime64 dates, two-digit years being of the 1900s as in wrsstoi
+    years = np.where(years < 100, years + 1900, years)
+    months = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    return months.astype("datetime64[D]") + (days - 1).astype("timedelta64[D]")
+
+
+def open_dataarray(paths, chunks: int = 52) -> xr.DataArray:
+    """Opens OI SST binary files lazily.
+
+    Parameters
+    ----------
+
+    paths : :obj:`str`, :class:`os.PathLike`, :obj:`list`
+        A file, or files in time order, e.g. one per year.
+
+    chunks : :obj:`int`
+        Number of grids per dask chunk; default is 52, i.e. about 13 MB.
+
+    Returns
+    -------
+
+    sst : :class:`xarray.DataArray`
+        The ``float32`` grids, of dimensions ``("time", "lat", "lon")``,
+        backed by dask chunks of :func:`memmap` views of the files. ``time``
+        is the start date of each grid; the end date (``time_end``) and the
+        other header values are coordinates along ``time``.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if not paths:
+        raise ValueError("oisst.open_dataarray: no file!")
+    if isinstance(chunks, bool) or not isinstance(chunks, int) or chunks < 1:
+        raise ValueError(
+            "oisst.open_dataarray: `chunks` must be a positive integer!")
+
+    arrays = []
+    headers = []
+    for path in paths:
+        records = memmap(path)
+        arrays.append(
+            da.from_array(records["sst"],
+                          chunks=(chunks, _nlat, _nlon),
+                          meta=np.empty((0, 0, 0), dtype=">f4"),
+                          name=f"oisst-{os.fspath(path)}"))
+        headers.append(np.array(records["header"], dtype=np.int32))
+    header = np.concatenate(headers)
+
+    return xr.DataArray(da.concatenate(arrays).astype(np.float32),
+                        dims=("time", "lat", "lon"),
+                        coords={
+                            "time": _dates(*header[:, 0:3].T),
+                            "time_end": ("time", _dates(*header[:, 3:6].T)),
+                            "ndays": ("time", header[:, 6]),
+                            "index": ("time", header[:, 7]),
+                            "lat": _lat,
+                            "lon": _lon,
+                        },
+                        name="sst",
+                        attrs={
+                            "units": "degC",
+                            "long_name": "Optimum interpolation SST"
+                        })
+
+
+def write(sst, path) -> None:
+    """Writes grids to an OI SST binary file.
+
+    Parameters
+    ----------
+
+    sst : :class:`xarray.DataArray`
+        Grids of dimensions ``(time, lat, lon)``, of shape ``(n, 180, 360)``,
+        in degrees C, on the grid of :func:`open_dataarray`. ``time`` is the
+        start date of the grids; ``time_end``, ``ndays`` and ``index``
+        coordinates are written as well if present, and otherwise default to
+        weekly grids of index 0. Dask data is written a chunk at a time.
+
+    path : :obj:`str`, :class:`os.PathLike`
+        The file, overwritten if it exists.
+    """
+    if sst.ndim != 3 or sst.shape[1:] != (_nlat, _nlon):
+        raise DimensionError(
+            f"oisst.write: `sst` must be of shape (time, {_nlat}, {_nlon})!")
+    if "time" not in sst.coords:
+        raise ValueError("oisst.write: `sst` has no `time` coordinate!")
+
+    start = sst["time"].values.astype("datetime64[D]")
+    ndays = (sst["ndays"].values if "ndays" in sst.coords else np.full(
+        start.shape, 7))
+    end = (sst["time_end"].values.astype("datetime64[D]")
+           if "time_end" in sst.coords else start + ndays.astype(int) - 1)
+
+    header = np.empty((start.shape[0], 8), dtype=np.int32)
+    for (i, dates) in enumerate((start, end)):
+        header[:, 3 * i] = dates.astype("datetime64[Y]").astype(int) + 1970
+        header[:,
+               3 * i + 1] = dates.astype("datetime64[M]").astype(int) % 12 + 1
+        header[:, 3 * i +
+               2] = (dates - dates.astype("datetime64[M]")).astype(int) + 1
+    header[:, 6] = ndays
+    header[:, 7] = sst["index"].values if "index" in sst.coords else 0
+
+    dtype = _records(16 + _header_size + _grid_size)
+    path = os.fspath(path)
+    tmp = f"{path}.{os.getpid()}.part"
+    try:
+        records = np.memmap(tmp, dtype=dtype, mode="w+", shape=start.shape)
+        records["m0"] = records["m1"] = _header_size
+        records["m2"] = records["m3"] = _grid_size
+        records["header"] = header
+        if isinstance(sst.data, da.Array):
+            da.store(sst.data, records["sst"], lock=False)
+        else:
+            records["sst"] = sst.values
+        records.flush()
+        del records
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,200 @@
+"""Process-parallel computation of the wrappers for NumPy input.
+
+The wrappers compute NumPy input in the calling process, and dask's own
+process-based schedulers pickle every block to and from the workers.
+:func:`run` instead copies the input once into a
+:mod:`multiprocessing.shared_memory` segment, and has a persistent pool of
+worker processes each compute a slab of its leading dimensions, reading the
+input and writing the output through views of shared memory; only the slab
+bounds and the small arguments, e.g. coordinates, are sent to the workers.
+
+The pool is started on first use, with the ``spawn`` method, and kept for
+later calls with the same number of workers; :func:`shutdown` stops it. As
+with any ``spawn`` pool, the workers import the main module of the calling
+script, so its calls must be guarded by ``if __name__ == "__main__":``.
+
+Examples
+--------
+
+.. code-block:: python
+
+    from geocat.f2py import linint2, parallel
+
+    if __name__ == "__main__":
+        fo = parallel.run(linint2, fi, xo, yo, xi=xi, yi=yi, icycx=1,
+                          workers=8)
+"""
+
+import concurrent.futures
+import inspect
+import math
+import multiprocessing
+import os
+import warnings
+from multiprocessing import shared_memory
+
+import numpy as np
+import xarray as xr
+
+# Data argument of each supported wrapper, and its number of rightmost (core)
+# dimensions, which are computed whole by each worker
+_data_args = {
+    "linint1": ("fi", 1),
+    "linint2": ("fi", 2),
+    "linint2pts": ("fi", 2),
+    "rcm2points": ("fi", 2),
+    "rcm2rgrid": ("fi", 2),
+    "rgrid2rcm": ("fi", 2),
+    "triple_to_grid": ("data", 1),
+}
+
+_pool = None
+_pool_workers = 0
+
+
+def _init_worker():
+    import dask
+
+    # Each worker computes its slab on its own, like a single dask thread
+    dask.config.set(scheduler="synchronous")
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+
+    if _pool is None or _pool_workers != workers:
+        shutdown()
+        _pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker)
+        _pool_workers = workers
+
+    return _pool
+
+
+def shutdown() -> None:
+    """Stops the worker processes of :func:`run`, if any."""
+    global _pool, _pool_workers
+
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _pool_workers = 0
+
+
+def _run_slab(func, arguments, data_arg, fi_spec, fo_spec, start, stop):
+    # Computes slices [start, stop) of the shared input into the shared
+    # output; a spec is (segment name, shape, dtype)
+    fi_shm = shared_memory.SharedMemory(name=fi_spec[0])
+    fo_shm = shared_memory.SharedMemory(name=fo_spec[0])
+    fi = fo = None
+    try:
+        fi = np.ndarray(fi_spec[1], dtype=fi_spec[2], buffer=fi_shm.buf)
+        fo = np.ndarray(fo_spec[1], dtype=fo_spec[2], buffer=fo_shm.buf)
+
+        # Warnings were issued by the calling process already
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fo[start:stop] = func(**arguments, **{data_arg: fi[start:stop]})
+    finally:
+        # The segments cannot be closed while views of them exist
+        fi = fo = None
+        fi_shm.close()
+        fo_shm.close()
+
+
+def run(func, *args, workers: int = None, **kwargs) -> np.ndarray:
+    """Computes ``func(*args, **kwargs)`` on ``workers`` processes.
+
+    The leading dimensions of the data argument of ``func`` are split into
+    one contiguous slab per worker. The first leading slice is computed in
+    the calling process, which gives the shape of the output and issues any
+    warnings of ``func``.
+
+    Parameters
+    ----------
+
+    func : :obj:`callable`
+        One of ``linint1``, ``linint2``, ``linint2pts``, ``rcm2rgrid``,
+        ``rgrid2rcm``, ``rcm2points`` or ``triple_to_grid``.
+
+    *args, **kwargs
+        Arguments of ``func``. Its data argument (``fi``, or ``data`` for
+        ``triple_to_grid``) must be a :class:`numpy.ndarray`; dask is the way
+        to compute :class:`xarray.DataArray` input in parallel.
+
+    workers : :obj:`int`, optional
+        Number of worker processes; defaults to :func:`os.cpu_count`. With 1
+        worker, or a single leading slice, ``func`` is simply called.
+
+    Returns
+    -------
+
+    fo : :class:`numpy.ndarray`
+        The output of ``func``.
+    """
+    name = getattr(func, "__name__", None)
+    if name not in _data_args:
+        raise ValueError(
+            f"parallel.run: `func` must be one of {', '.join(_data_args)}!")
+    data_arg, core_ndim = _data_args[name]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError("parallel.run: `workers` must be a positive integer!")
+
+    arguments = inspect.signature(func).bind(*args, **kwargs).arguments
+    data = arguments.pop(data_arg)
+    if isinstance(data, xr.DataArray):
+        raise TypeError(
+            f"parallel.run: `{data_arg}` must be a numpy.ndarray; use dask to "
+            "compute xarray.DataArray input in parallel")
+
+    data = np.asarray(data)
+    lead_shape = data.shape[:data.ndim - core_ndim]
+    nslices = math.prod(lead_shape)
+    if workers == 1 or nslices < 2:
+        return func(**arguments, **{data_arg: data})
+
+    # The first slice gives the output shape and type, and the warnings
+    data = data.reshape((nslices,) + data.shape[len(lead_shape):])
+    fo0 = np.asarray(func(**arguments, **{data_arg: data[:1]}))
+
+    fo_shape = (nslices,) + fo0.shape[1:]
+    fo_nbytes = math.prod(fo_shape) * fo0.dtype.itemsize
+
+    fi_shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+    fo_shm = shared_memory.SharedMemory(create=True, size=max(1, fo_nbytes))
+    fi = fo = None
+    try:
+        fi = np.ndarray(data.shape, dtype=data.dtype, buffer=fi_shm.buf)
+        fo = np.ndarray(fo_shape, dtype=fo0.dtype, buffer=fo_shm.buf)
+        fi[...] = data
+        fo[:1] = fo0
+
+        # One balanced slab of the remaining slices per worker
+        bounds = np.linspace(1, nslices, min(workers, nslices - 1) + 1)
+        bounds = np.round(bounds).astype(int)
+
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_run_slab, func, arguments, data_arg,
+                        (fi_shm.name, fi.shape, fi.dtype.str),
+                        (fo_shm.name, fo.shape, fo.dtype.str), start, stop)
+            for (start, stop) in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+        # The segments are released on return, so the output is copied out
+        out = fo.reshape(lead_shape + fo_shape[1:]).copy()
+    finally:
+        fi = fo = None
+        fi_shm.close()
+        fi_shm.unlink()
+        fo_shm.close()
+        fo_shm.unlink()
+
+    return out
@@ -0,0 +1,280 @@
+import os
+import typing
+
+import numpy as np
+import xarray as xr
+
+from . import cache, profiling, threads
+from .chunking import apply_blocks
+from .errors import DimensionError
+from .missing_values import default_msg_py
+
+try:
+    from .fortran import dpopremapcsr, spopremapcsr
+except ImportError:
+    dpopremapcsr = spopremapcsr = None
+
+supported_types = typing.Union[xr.DataArray, np.ndarray]
+
+# Names of the links, weights, and grid sizes and shapes in SCRIP remapping
+# files, and in ESMF_RegridWeightGen ones
+_scrip = ("src_address", "dst_address", "remap_matrix", "src_grid_size",
+          "dst_grid_size")
+_esmf = ("col", "row", "S", "n_a", "n_b")
+
+# Inner wrappers _<funcname>()
+# These wrappers are executed within dask processes (if any), and could/should
+# do anything that can benefit from parallel execution.
+
+
+def _csr(src, dst, weights, ndst):
+    # The links sorted by destination, in compressed sparse row form: the
+    # links of destination `i` are `indptr[i]:indptr[i + 1]`, of one-based
+    # source cells `cols`
+    order = np.argsort(dst, kind="stable")
+    indptr = np.searchsorted(dst[order], np.arange(1, ndst + 2))
+    return (indptr.astype(np.int32), src[order].astype(np.int32),
+            weights[order])
+
+
+def _popremap(fi, indptr, cols, data, core, msg_py):
+    # Applies the links to all the slices of `fi` at once (DPOPREMAP), of
+    # `core[0]` rightmost dimensions of the source grid, into slices of shape
+    # `core[1]`
+    lead = fi.ndim - core[0]
+    shape = fi.shape[:lead] + core[1]
+
+    # Slices are the columns of the Fortran arrays, without copies
+    fi = np.asarray(fi, dtype=data.dtype).reshape(
+        (-1, int(np.prod(fi.shape[lead:]))))
+    kernel = spopremapcsr if data.dtype == np.float32 else dpopremapcsr
+    threads.apply()
+    fo = kernel(indptr, cols, data, fi.T, xmsg=msg_py)
+
+    return fo.T.reshape(shape)
+
+
+# Outer wrappers <funcname>()
+# These wrappers are executed in the __main__ python process, and should be
+# used for any tasks which would not benefit from parallel execution.
+
+
+class ScripRemapper:
+    """Remapping between any two grids by precomputed sparse weights, e.g. of
+    SCRIP or ESMF remapping files, as applied by NCL's ``PopLatLon``
+    (``DPOPREMAP``).
+
+    Each destination value is the sum of the weighted source values of its
+    links, those missing left out. A destination value is missing if it has
+    no link to a present source value. The weights are not renormalized.
+
+    The links are sorted into compressed sparse row form once, when the
+    remapper is created, and every call applies them to any number of
+    leading slices at once, as a single sparse product per chunk by the
+    Fortran routine ``DPOPREMAPCSR``, or ``SPOPREMAPCSR`` in single
+    precision. They are kept in :mod:`geocat.f2py.cache`, if enabled.
+
+    Parameters
+    ----------
+
+    src_address : :class:`numpy.ndarray`
+        The one-based source cell of each link, in the flattened source
+        grid.
+
+    dst_address : :class:`numpy.ndarray`
+        The one-based destination cell of each link, in the flattened
+        destination grid.
+
+    weights : :class:`numpy.ndarray`
+        The weight of each link. Of a ``(nlink, nweights)`` array, e.g.
+        ``remap_matrix`` of SCRIP files, only the first weights are used.
+
+    src_shape : :obj:`int`, :obj:`tuple`
+        Number of source cells, or shape of the source grid, e.g.
+        ``(nlat, nlon)``.
+
+    dst_shape : :obj:`int`, :obj:`tuple`
+        Number of destination cells, or shape of the destination grid.
+
+    dtype : :class:`numpy.dtype`
+        Precision of the remapping and of its output, e.g.
+        :class:`numpy.float32` to halve memory traffic. Default is
+        :class:`numpy.float64`.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from geocat.f2py import ScripRemapper
+
+        remap = ScripRemapper.from_file("map_gx1v7_TO_1x1d_blin.nc",
+                                        dtype=np.float32)
+        sst = remap(ds.TEMP.isel(z_t=0), dims=("lat", "lon"))
+        temp = remap(ds.TEMP.chunk({"time": 12}), dims=("lat", "lon"))
+    """
+
+    def __init__(self,
+                 src_address,
+                 dst_address,
+                 weights,
+                 src_shape,
+                 dst_shape,
+                 dtype=np.float64):
+        if dpopremapcsr is None:
+            raise ImportError(
+                "ScripRemapper: DPOPREMAPCSR needs the compiled Fortran "
+                "extension")
+
+        self.src_shape = tuple(np.atleast_1d(src_shape).astype(int))
+        self.dst_shape = tuple(np.atleast_1d(dst_shape).astype(int))
+        self.dtype = np.dtype(dtype)
+        nsrc, ndst = int(np.prod(self.src_shape)), int(np.prod(self.dst_shape))
+
+        src = np.asarray(src_address, dtype=np.int64).ravel()
+        dst = np.asarray(dst_address, dtype=np.int64).ravel()
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 2:
+            weights = weights[:, 0]
+        if not src.shape == dst.shape == weights.shape:
+            raise DimensionError(
+                "ScripRemapper: `src_address`, `dst_address` and `weights` "
+                "must be of the same number of links!")
+        if src.shape[0] and (src.min() < 1 or src.max() > nsrc or
+                             dst.min() < 1 or dst.max() > ndst):
+            raise ValueError(
+                "ScripRemapper: the addresses must be one-based cells of the "
+                "source and destination grids!")
+
+        t = profiling.timer("popremap")
+        (self._indptr, self._cols,
+         data) = cache.memoize("weights", ("popremap", src, dst, weights, ndst),
+                               lambda: _csr(src, dst, weights, ndst))
+        self._data = data.astype(self.dtype)
+        t.mark("weights")
+
+    @classmethod
+    def from_file(cls, path, dtype=np.float64) -> "ScripRemapper":
+        """Creates a remapper of the links of a SCRIP remapping file, of
+        variables ``src_address``, ``dst_address`` and ``remap_matrix``, or of
+        an ESMF_RegridWeightGen one, of ``col``, ``row`` and ``S``.
+
+        Parameters
+        ----------
+
+        path : :obj:`str`, :class:`os.PathLike`, :class:`xarray.Dataset`
+            The file, opened by :func:`xarray.open_dataset`, or an opened
+            dataset. The shapes of the grids are ``src_grid_dims`` and
+            ``dst_grid_dims``, if present, and their sizes otherwise.
+
+        dtype : :class:`numpy.dtype`
+            See :class:`ScripRemapper`.
+        """
+        if isinstance(path, (str, os.PathLike)):
+            with xr.open_dataset(path) as ds:
+                return cls.from_file(ds.load(), dtype=dtype)
+
+        ds = path
+        names = _scrip if _scrip[0] in ds else _esmf
+        if names[0] not in ds:
+            raise ValueError(
+                "ScripRemapper.from_file: neither a SCRIP nor an ESMF "
+                "remapping file!")
+        (src, dst, weights, nsrc, ndst) = names
+
+        # Grid dimensions are listed in Fortran order, e.g. (nlon, nlat)
+        shapes = [
+            tuple(ds[f"{g}_grid_dims"].values[::-1])
+            if f"{g}_grid_dims" in ds else ds.sizes[n]
+            for (g, n) in (("src", nsrc), ("dst", ndst))
+        ]
+
+        return cls(ds[src].values,
+                   ds[dst].values,
+                   ds[weights].values,
+                   *shapes,
+                   dtype=dtype)
+
+    def weights(self) -> tuple:
+        """Returns the ``(indptr, indices, data)`` of the ``(ndst, nsrc)``
+        compressed sparse row matrix of the weights, e.g. for
+        ``scipy.sparse.csr_matrix((data, indices, indptr))``, with zero-based
+        cells of the flattened grids."""
+        return self._indptr, self._cols - 1, self._data
+
+    def __call__(self,
+                 fi: supported_types,
+                 msg_py: np.number = None,
+                 dims: tuple = None) -> supported_types:
+        """Remaps ``fi``.
+
+        Parameters
+        ----------
+
+        fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            An array on the source grid along its rightmost dimensions,
+            either of the shape of the grid, e.g. ``(..., nlat, nlon)``, or
+            flattened, ``(..., ncells)``. Chunked :class:`xarray.DataArray`
+            input must not be chunked along those.
+
+        msg_py : :obj:`numpy.number`, optional
+            A value taken as missing in ``fi``, as well as NaN, and used for
+            missing output values. Defaults to NaN.
+
+        dims : :obj:`tuple`, optional
+            Names of the rightmost dimensions of :class:`xarray.DataArray`
+            output. Defaults to those of ``fi`` if of the same number, and
+            otherwise to ``("ncells",)`` or ``("lat", "lon")``.
+
+        Returns
+        -------
+
+        fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+            The remapped array of the precision of the remapper, of the
+            dimensions of ``fi`` but on the destination grid, of its shape if
+            ``fi`` is of the shape of the source grid and flattened
+            otherwise. Dask output is only returned for chunked
+            :class:`xarray.DataArray` input.
+        """
+        t = profiling.timer("popremap")
+
+        nsrc = int(np.prod(self.src_shape))
+        shape = np.shape(fi)
+        if shape[len(shape) - len(self.src_shape):] == self.src_shape:
+            core = (len(self.src_shape), self.dst_shape)
+        elif shape[-1:] == (nsrc,):
+            core = (1, (int(np.prod(self.dst_shape)),))
+        else:
+            raise DimensionError(
+                "ScripRemapper: the rightmost dimensions of `fi` must be of "
+                f"the source grid, {self.src_shape} or ({nsrc},)!")
+
+        (core_ndim, dst_shape) = core
+        if isinstance(fi, xr.DataArray):
+            if dims is None and core_ndim == len(dst_shape):
+                dims = fi.dims[fi.ndim - core_ndim:]
+            elif dims is None:
+                dims = {1: ("ncells",), 2: ("lat", "lon")}.get(len(dst_shape))
+            if dims is None or len(dims) != len(dst_shape):
+                raise DimensionError(
+                    f"ScripRemapper: `dims` must name the {len(dst_shape)} "
+                    "dimensions of the destination grid!")
+
+        if msg_py is None:
+            msg_py = default_msg_py(self.dtype.type)
+        msg_py = self.dtype.type(msg_py)
+
+        t.mark("validation")
+
+        # Tasks also hold the gathered link values of their slices
+        args = (self._indptr, self._cols, self._data, core, msg_py)
+        return apply_blocks(_popremap,
+                            fi,
+                            core_ndim,
+                            dst_shape,
+                            args,
+                            "popremap",
+                            "ScripRemapper",
+                            dims=dims,
+                            extra_size=self._cols.shape[0],
+                            dtype=self.dtype)
@@ -0,0 +1,227 @@
+"""Opt-in profiling of the stages of the geocat.f2py wrappers.
+
+When enabled, every user API function records, per stage, the wall time
+spent, the number of calls and the number of bytes copied. Stages are:
+
+- ``validation``: sanity checks and conversion of the arguments
+- ``cache``: hashing of the inputs and lookup of the result in
+  :mod:`geocat.f2py.cache`
+- ``chunking``: (re-)chunking of the input and setup of the dask graph
+- ``transpose``: reordering of the data between NumPy and Fortran layouts
+- ``msg_conversion``: conversion of missing values to and from Fortran
+- ``fortran``: the call of the compiled routine, including the copies f2py
+  makes of inputs that are not Fortran-contiguous ``float64`` arrays
+- ``numpy``: the computation of the NumPy backend, which replaces the
+  ``transpose``, ``msg_conversion`` and ``fortran`` stages
+- ``compute``: evaluation of the dask graph, which includes the
+  ``transpose``, ``msg_conversion``, ``fortran`` or ``numpy`` stages of every
+  chunk
+- ``packaging``: construction of the returned array
+
+The Fortran-side stages run once per chunk, possibly in dask worker threads,
+and are accumulated over all chunks. Stages of chunks computed in other
+processes, e.g. on a ``dask.distributed`` cluster, are recorded in those
+processes.
+
+Profiling is disabled by default, in which case the wrappers only pay for a
+few no-op method calls.
+
+Examples
+--------
+
+.. code-block:: python
+
+    from geocat.f2py import linint2, profiling
+
+    with profiling.profile() as stats:
+        fo = linint2(fi, xo, yo, icycx=0)
+
+    stats["linint2"]["fortran"]  # {'calls': ..., 'time': ..., 'bytes': ...}
+    profiling.stats(as_frame=True)  # the same as a pandas.DataFrame
+"""
+
+import contextlib
+import threading
+import time
+
+import numpy as np
+
+_enabled = False
+_annotations = False
+_lock = threading.Lock()
+
+# {function: {stage: [calls, time, bytes]}}
+_records = {}
+
+
+def enable(annotations: bool = False) -> None:
+    """Starts recording the stages of the wrapper calls.
+
+    Parameters
+    ----------
+
+    annotations : :obj:`bool`
+        If True, the dask tasks built by the wrappers are also annotated with
+        ``geocat_f2py=<function name>`` (see :func:`dask.annotate`), e.g. to
+        find them in the task stream of the dask dashboard; default is False.
+    """
+    global _enabled, _annotations
+    _enabled = True
+    _annotations = annotations
+
+
+def disable() -> None:
+    """Stops recording; records collected so far are kept."""
+    global _enabled, _annotations
+    _enabled = False
+    _annotations = False
+
+
+def is_enabled() -> bool:
+    """Returns whether profiling is enabled."""
+    return _enabled
+
+
+def reset() -> None:
+    """Discards all records."""
+    with _lock:
+        _records.clear()
+
+
+def stats(as_frame: bool = False):
+    """Returns the records collected so far.
+
+    Parameters
+    ----------
+
+    as_frame : :obj:`bool`
+        If True, returns a :class:`pandas.DataFrame` indexed by function and
+        stage; default is False.
+
+    Returns
+    -------
+
+    stats : :obj:`dict`, :class:`pandas.DataFrame`
+        ``{function: {stage: {"calls": int, "time": float, "bytes": int}}}``,
+        where ``time`` is the total wall time in seconds.
+    """
+    with _lock:
+        out = {
+            func: {
+                stage: {
+                    "calls": calls,
+                    "time": seconds,
+                    "bytes": nbytes
+                } for (stage, (calls, seconds, nbytes)) in stages.items()
+            } for (func, stages) in _records.items()
+        }
+
+    if as_frame:
+        import pandas as pd
+
+        out = pd.DataFrame.from_dict(
+            {(func, stage): record for (func, stages) in out.items()
+             for (stage, record) in stages.items()},
+            orient="index",
+            columns=["calls", "time", "bytes"])
+        out.index.names = ["function", "stage"]
+
+    return out
+
+
+@contextlib.contextmanager
+def profile(annotations: bool = False):
+    """Context manager that profiles the wrapper calls made in its body.
+
+    Records are reset on entry, and the yielded :obj:`dict` is filled with
+    :func:`stats` on exit. The previous enabled state is restored on exit.
+
+    Parameters
+    ----------
+
+    annotations : :obj:`bool`
+        See :func:`enable`.
+    """
+    was_enabled, had_annotations = _enabled, _annotations
+    out = {}
+
+    reset()
+    enable(annotations=annotations)
+    try:
+        yield out
+    finally:
+        out.update(stats())
+        if was_enabled:
+            enable(annotations=had_annotations)
+        else:
+            disable()
+
+
+def copied_nbytes(*arrays) -> int:
+    """Number of bytes f2py copies to pass ``arrays`` to a ``double precision``
+    Fortran routine."""
+    arrays = [np.asarray(a) for a in arrays]
+    return sum(
+        a.size * 8
+        for a in arrays
+        if a.ndim > 0 and not (a.dtype == np.float64 and a.flags.f_contiguous))
+
+
+class _Timer:
+    # Records the time since the previous mark, or since creation, as a stage
+
+    __slots__ = ("func", "last")
+
+    def __init__(self, func):
+        self.func = func
+        self.last = time.perf_counter()
+
+    def mark(self, stage, nbytes=0, copies=()):
+        now = time.perf_counter()
+        nbytes += copied_nbytes(*copies)
+
+        with _lock:
+            record = _records.setdefault(self.func,
+                                         {}).setdefault(stage, [0, 0.0, 0])
+            record[0] += 1
+            record[1] += now - self.last
+            record[2] += nbytes
+
+        self.last = time.perf_counter()
+
+
+class _NullTimer:
+    # Stand-in for `_Timer` while profiling is disabled
+
+    __slots__ = ()
+
+    def mark(self, stage, nbytes=0, copies=()):
+        pass
+
+
+_null_timer = _NullTimer()
+
+
+def timer(func):
+    """Returns a timer whose ``mark(stage, nbytes=0, copies=())`` records the
+    time since its previous mark (or creation) as ``stage`` of ``func``.
+
+    ``copies`` are arrays about to be passed to Fortran; the bytes f2py
+    copies to do so are added to ``nbytes``. This is a no-op while
+    profiling is disabled.
+    """
+    if not _enabled:
+        return _null_timer
+
+    return _Timer(func)
+
+
+def annotate(func):
+    """Context manager annotating the dask tasks built in its body with
+    ``geocat_f2py=func``, if enabled with ``annotations=True``."""
+    if not _annotations:
+        return contextlib.nullcontext()
+
+    import dask
+
+    return dask.annotate(geocat_f2py=func)
@@ -1,8 +1,11 @@
 import typing
 
+from dask.array.core import map_blocks
 import numpy as np
 import xarray as xr
 
+from . import profiling
+from .chunking import plan_chunks
 from .errors import ChunkError, CoordinateError, DimensionError
 from .fortran import drcm2points
 from .missing_values import fort2py_msg, py2fort_msg
@@ -15,18 +18,30 @@ supported_types = typing.Union[xr.DataArray, np.ndarray]
 
 
 def _rcm2points(lat2d, lon2d, fi, lat1d, lon1d, msg_py, opt):
+    t = profiling.timer("rcm2points")
+
+    # The Fortran routine loops over any number of grids, so all of the
+    # leftmost dimensions of this block are collapsed into one
+    lead = fi.shape[:-2]
+    fi = fi.reshape((-1,) + fi.shape[-2:])
     fi = np.transpose(fi, axes=(2, 1, 0))
     lat2d = np.transpose(lat2d, axes=(1, 0))
     lon2d = np.transpose(lon2d, axes=(1, 0))
+    t.mark("transpose")
 
     fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     fo = drcm2points(lat2d, lon2d, fi, lat1d, lon1d, xmsg=msg_fort, opt=opt)
+    t.mark("fortran", copies=(lat2d, lon2d, fi, lat1d, lon1d))
     fo = np.asarray(fo)
     fo = np.transpose(fo, axes=(1, 0))
+    fo = fo.reshape(lead + fo.shape[-1:])
+    t.mark("transpose")
 
     fort2py_msg(fi, msg_fort=msg_fort, msg_py=msg_py)
     fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     return fo
 
@@ -68,9 +83,6 @@ def _validity_check(lat2d, lon2d, fi, lat1d, lon1d):
 # This wrapper is excecuted in the __main__ python process, and should be
 # used for any tasks which would not benefit from parallel execution.
 
-# TODO: Even though this function is advertised to work on multi-dimensional arrays,
-#  it is currently only applicable to 3D-arrays due to the implementation of `_rcm2points`
-
 
 # TODO: This function requires the input to have the coordinates in the rightmost two dimensions,
 #  but xarray.DataArrray inputs with coordinates anywhere could/should actually be fine
@@ -137,6 +149,8 @@ def rcm2points(lat2d: supported_types,
             ``lon1d``).
     """
 
+    t = profiling.timer("rcm2points")
+
     # Basic validity checks
     _validity_check(lat2d, lon2d, fi, lat1d, lon1d)
 
@@ -163,13 +177,37 @@ def rcm2points(lat2d: supported_types,
             raise ChunkError(
                 "rcm2points: fi must be unchunked along the rightmost two dimensions"
             )
+
+    # Group as many grids per chunk as fit in the memory budget of a task
+    fi_chunks = plan_chunks(fi.shape, 2, lat1d.shape[0], fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
+    fo_chunks = fi.chunks[:-2] + (lat1d.shape,)
     # ''' end of boilerplate
+    t.mark("validation")
+
+    with profiling.annotate("rcm2points"):
+        fo = map_blocks(
+            _rcm2points,
+            np.asarray(lat2d.data),
+            np.asarray(lon2d.data),
+            fi.data,
+            np.asarray(lat1d.data),
+            np.asarray(lon1d.data),
+            msg,
+            opt,
+            chunks=fo_chunks,
+            dtype=fi.dtype,
+            drop_axis=[fi.ndim - 2, fi.ndim - 1],
+            new_axis=[fi.ndim - 2],
+        )
+    t.mark("chunking")
 
-    fo = _rcm2points(lat2d.data, lon2d.data, fi.data, lat1d.data, lon1d.data,
-                     msg, opt)
+    fo = fo.compute()
+    t.mark("compute")
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
         fo = xr.DataArray(fo, attrs=fi.attrs)
+    t.mark("packaging")
 
     return fo
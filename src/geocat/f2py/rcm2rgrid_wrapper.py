@@ -1,8 +1,13 @@
 import typing
+import warnings
 
+from dask.array.core import map_blocks
 import numpy as np
 import xarray as xr
 
+from . import cache, datasets, profiling, threads
+from .chunking import plan_chunks
+from .coordinates import monotonic
 from .errors import ChunkError, CoordinateError
 from .fortran import drcm2rgrid, drgrid2rcm
 from .missing_values import fort2py_msg, py2fort_msg
@@ -15,35 +20,59 @@ supported_types = typing.Union[xr.DataArray, np.ndarray]
 
 
 def _rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, msg_py):
+    t = profiling.timer("rcm2rgrid")
 
+    # The Fortran routine loops over any number of grids, so all of the
+    # leftmost dimensions of this block are collapsed into one
+    lead = fi.shape[:-2]
+    fi = fi.reshape((-1,) + fi.shape[-2:])
     fi = np.transpose(fi, axes=(2, 1, 0))
     lat2d = np.transpose(lat2d, axes=(1, 0))
     lon2d = np.transpose(lon2d, axes=(1, 0))
+    t.mark("transpose")
 
     fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
+    t.mark("msg_conversion")
 
+    threads.apply()
     fo = drcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d, xmsg=msg_fort)
+    t.mark("fortran", copies=(lat2d, lon2d, fi, lat1d, lon1d))
     fo = np.asarray(fo)
     fo = np.transpose(fo, axes=(2, 1, 0))
+    fo = fo.reshape(lead + fo.shape[-2:])
+    t.mark("transpose")
 
     fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     return fo
 
 
 def _rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg_py):
+    t = profiling.timer("rgrid2rcm")
 
+    # The Fortran routine loops over any number of grids, so all of the
+    # leftmost dimensions of this block are collapsed into one
+    lead = fi.shape[:-2]
+    fi = fi.reshape((-1,) + fi.shape[-2:])
     fi = np.transpose(fi, axes=(2, 1, 0))
     lat2d = np.transpose(lat2d, axes=(1, 0))
     lon2d = np.transpose(lon2d, axes=(1, 0))
+    t.mark("transpose")
 
     fi, msg_py, msg_fort = py2fort_msg(fi, msg_py=msg_py)
+    t.mark("msg_conversion")
 
+    threads.apply()
     fo = drgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, xmsg=msg_fort)
+    t.mark("fortran", copies=(lat1d, lon1d, fi, lat2d, lon2d))
     fo = np.asarray(fo)
     fo = np.transpose(fo, axes=(2, 1, 0))
+    fo = fo.reshape(lead + fo.shape[-2:])
+    t.mark("transpose")
 
     fort2py_msg(fo, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
 
     return fo
 
@@ -53,8 +82,6 @@ def _rgrid2rcm(lat1d, lon1d, fi, lat2d, lon2d, msg_py):
 # used for any tasks which would not benefit from parallel execution.
 
 
-# TODO: Even though this function is advertised to work on multi-dimensional arrays,
-# it is currently only applicable to 3D-arrays due to the implementation of `_rcm2rgrid`
 def rcm2rgrid(
     lat2d: supported_types,
     lon2d: supported_types,
@@ -104,10 +131,16 @@ def rcm2rgrid(
         coordinate variable of ``fi``; therefore, it always needs to be explicitly
         provided. The latitude order must be west-to-east.
 
-    fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+    fi : :class:`xarray.DataArray`, :class:`numpy.ndarray`, :class:`xarray.Dataset`
         A multi-dimensional array to be interpolated. The rightmost two
         dimensions (latitude, longitude) are the dimensions to be interpolated.
 
+        For a :class:`xarray.Dataset`, all the data variables on the grid of
+        ``lat2d``, i.e. on its dimensions or else of its shape, are
+        interpolated, those of the same type in a single call; variables which
+        do not depend on those dimensions are kept as they are, and the others
+        are dropped.
+
     lat1d : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         A one-dimensional array that specifies the latitude coordinates of
         the regular grid. Must be monotonically increasing.
@@ -130,7 +163,7 @@ def rcm2rgrid(
     Returns
     -------
 
-    fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+    fo : :class:`xarray.DataArray`, :class:`numpy.ndarray`, :class:`xarray.Dataset`
         The interpolated grid. A multi-dimensional array
         of the same size as ``fi`` except that the rightmost dimension sizes have been
         replaced by the sizes of ``lat1d`` and ``lon1d``, respectively.
@@ -165,6 +198,18 @@ def rcm2rgrid(
         raise CoordinateError(
             "rcm2rgrid: lon2d and lat2d should always be provided!")
 
+    # All the variables on the curvilinear grid are interpolated at once
+    if isinstance(fi, xr.Dataset):
+        return datasets.regrid(
+            fi,
+            2,
+            lambda v: datasets.on_grid(v, lat2d, fi),
+            lambda stacked: rcm2rgrid(lat2d, lon2d, stacked, lat1d, lon1d, msg),
+            "rcm2rgrid",
+        )
+
+    t = profiling.timer("rcm2rgrid")
+
     # ''' Start of boilerplate
     is_input_xr = True
 
@@ -187,11 +232,50 @@ def rcm2rgrid(
             raise ChunkError(
                 "rcm2rgrid: `fi` must be unchunked along the rightmost two dimensions!"
             )
+
+    t.mark("validation")
+
+    # The results of NumPy data may be cached
+    key = None
+    if fi.chunks is None:
+        key = cache.key("results", "rcm2rgrid", fi.data, np.asarray(lat2d.data),
+                        np.asarray(lon2d.data), np.asarray(lat1d.data),
+                        np.asarray(lon1d.data), msg)
+    cached = cache.get("results", key)
+    t.mark("cache")
+
+    # Group as many grids per chunk as fit in the memory budget of a task
+    fi_chunks = plan_chunks(fi.shape, 2, lat1d.shape[0] * lon1d.shape[0],
+                            fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
+    fo_chunks = fi.chunks[:-2] + (lat1d.shape, lon1d.shape)
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    fo = _rcm2rgrid(lat2d.data, lon2d.data, fi.data, lat1d.data, lon1d.data,
-                    msg)
+    if cached is None:
+        # Inner Fortran wrapper call
+        with profiling.annotate("rcm2rgrid"):
+            fo = map_blocks(
+                _rcm2rgrid,
+                np.asarray(lat2d.data),
+                np.asarray(lon2d.data),
+                fi.data,
+                np.asarray(lat1d.data),
+                np.asarray(lon1d.data),
+                msg,
+                chunks=fo_chunks,
+                dtype=fi.dtype,
+                drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                new_axis=[fi.ndim - 2, fi.ndim - 1],
+            )
+        t.mark("chunking")
+
+        fo = fo.compute()
+        t.mark("compute")
+
+        cache.put("results", key, fo)
+    else:
+        # Cached arrays are read-only
+        fo = cached.copy()
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
@@ -201,14 +285,11 @@ def rcm2rgrid(
         fo_coords[fi.dims[-2]] = lat1d.data
 
         fo = xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims, coords=fo_coords)
+    t.mark("packaging")
 
     return fo
 
 
-# TODO: Even though this function is advertised to work on multi-dimensional arrays,
-#  it is currently only applicable to 3D-arrays due to the implementation of `_rcm2rgrid`
-
-
 # TODO: This function requires the input to have the coordinates in the rightmost two dimensions,
 #  but xarray.DataArrray inputs with coordinates anywhere could/should actually be fine
 def rgrid2rcm(
@@ -310,6 +391,7 @@ def rgrid2rcm(
 
         ht_curv = geocat.comp.rgrid2rcm(lat1D_rect, lon1D_rect, ht_rect, newlat2D_curv, newlon2D_curv)
     """
+    t = profiling.timer("rgrid2rcm")
 
     # ''' Start of boilerplate
     is_input_xr = True
@@ -342,14 +424,59 @@ def rgrid2rcm(
             raise Exception(
                 "rgrid2rcm: `fi` must be unchunked along the last two dimensions"
             )
+
+    # Verify the coordinates once here rather than in every Fortran call
+    if monotonic(lat1d) != 1 or monotonic(lon1d) != 1:
+        warnings.warn(
+            "WARNING rgrid2rcm: lat1d and lon1d should be monotonically "
+            "increasing arrays !")
+
+    t.mark("validation")
+
+    # The results of NumPy data may be cached
+    key = None
+    if fi.chunks is None:
+        key = cache.key("results", "rgrid2rcm", fi.data, np.asarray(lat1d.data),
+                        np.asarray(lon1d.data), np.asarray(lat2d.data),
+                        np.asarray(lon2d.data), msg)
+    cached = cache.get("results", key)
+    t.mark("cache")
+
+    # Group as many grids per chunk as fit in the memory budget of a task
+    fi_chunks = plan_chunks(fi.shape, 2, lat2d.size, fi.chunks)
+    fi = fi.chunk(dict(zip(fi.dims, fi_chunks)))
+    fo_chunks = fi.chunks[:-2] + ((lat2d.shape[0],), (lat2d.shape[1],))
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    fo = _rgrid2rcm(lat1d.data, lon1d.data, fi.data, lat2d.data, lon2d.data,
-                    msg)
+    if cached is None:
+        # Inner Fortran wrapper call
+        with profiling.annotate("rgrid2rcm"):
+            fo = map_blocks(
+                _rgrid2rcm,
+                np.asarray(lat1d.data),
+                np.asarray(lon1d.data),
+                fi.data,
+                np.asarray(lat2d.data),
+                np.asarray(lon2d.data),
+                msg,
+                chunks=fo_chunks,
+                dtype=fi.dtype,
+                drop_axis=[fi.ndim - 2, fi.ndim - 1],
+                new_axis=[fi.ndim - 2, fi.ndim - 1],
+            )
+        t.mark("chunking")
+
+        fo = fo.compute()
+        t.mark("compute")
+
+        cache.put("results", key, fo)
+    else:
+        # Cached arrays are read-only
+        fo = cached.copy()
 
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
         fo = xr.DataArray(fo, attrs=fi.attrs, dims=fi.dims)
+    t.mark("packaging")
 
     return fo
@@ -0,0 +1,210 @@
+"""Streaming of series of slabs through a wrapper, overlapping I/O and
+computation.
+
+Regridding a long time series slab by slab otherwise serializes reading a
+slab, computing it and writing the result. :func:`imap` reads the next slabs
+on a background thread while the current one is computed, and :func:`run`
+also writes finished slabs on another background thread. The Fortran
+routines release the GIL while they run, so that reading and writing proceed
+in the meantime.
+
+At most ``depth`` slabs wait to be computed, and at most ``depth`` results
+wait to be written, which bounds the memory used.
+
+Examples
+--------
+
+.. code-block:: python
+
+    from geocat.f2py import linint2, streaming
+
+    ds = xr.open_dataset("hist.nc")
+    slabs = (ds.T.isel(time=slice(i, i + 12)) for i in range(0, 1200, 12))
+
+    # The results, in order
+    for fo in streaming.imap(linint2, slabs, xo, yo, icycx=1):
+        ...
+
+    # The results written by `write(fo)`, in order
+    streaming.run(linint2, slabs, write, xo, yo, icycx=1)
+"""
+
+import queue
+import threading
+
+import xarray as xr
+
+# End of a stream
+_done = object()
+
+
+class _Failure:
+    # Exception raised by a background thread, to be raised by the consumer
+    def __init__(self, exception):
+        self.exception = exception
+
+
+def _put(q, item, stop):
+    # Waits for room in `q` unless the stream is stopped; returns whether
+    # `item` was queued
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q):
+    item = q.get()
+    if isinstance(item, _Failure):
+        raise item.exception
+    return item
+
+
+def _read(slabs, q, stop):
+    # Iterates `slabs`, loading xarray slabs here rather than in the consumer
+    try:
+        for slab in slabs:
+            if isinstance(slab, (xr.DataArray, xr.Dataset)):
+                slab = slab.load()
+            if not _put(q, slab, stop):
+                return
+    except BaseException as e:
+        _put(q, _Failure(e), stop)
+    else:
+        _put(q, _done, stop)
+
+
+def _check_depth(depth):
+    if isinstance(depth, bool) or not isinstance(depth, int) or depth < 1:
+        raise ValueError("streaming: `depth` must be a positive integer!")
+
+
+def imap(func, slabs, *args, depth: int = 2, **kwargs):
+    """Yields ``func(slab, *args, **kwargs)`` for each slab of ``slabs``, in
+    order, while the next slabs are read on a background thread.
+
+    Parameters
+    ----------
+
+    func : :obj:`callable`
+        The wrapper, e.g. :func:`~geocat.f2py.linint2`, whose first argument
+        is the data.
+
+    slabs : :obj:`iterable`
+        The input slabs, e.g. of :class:`numpy.ndarray` or lazily loaded
+        :class:`xarray.DataArray`, which are loaded by the background thread.
+
+    *args, **kwargs
+        The other arguments of ``func``.
+
+    depth : :obj:`int`
+        Maximum number of slabs read ahead; default is 2.
+
+    Yields
+    ------
+
+    fo
+        The output of ``func`` for each slab.
+    """
+    _check_depth(depth)
+
+    # Started on the first result
+    return _imap(func, iter(slabs), args, kwargs, depth)
+
+
+def _imap(func, slabs, args, kwargs, depth):
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    reader = threading.Thread(target=_read,
+                              args=(slabs, q, stop),
+                              name="geocat-f2py-reader",
+                              daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            slab = _get(q)
+            if slab is _done:
+                break
+            yield func(slab, *args, **kwargs)
+    finally:
+        # Also stops the reader if the consumer does not exhaust the stream
+        stop.set()
+        reader.join()
+
+
+def _write(write, q, stop, failure):
+    while True:
+        fo = q.get()
+        if fo is _done:
+            return
+        try:
+            write(fo)
+        except BaseException as e:
+            failure.append(e)
+            stop.set()
+            return
+
+
+def run(func, slabs, write, *args, depth: int = 2, **kwargs) -> int:
+    """Calls ``write(func(slab, *args, **kwargs))`` for each slab of ``slabs``,
+    in order, while the next slabs are read and the previous results are
+    written on background threads.
+
+    Parameters
+    ----------
+
+    func : :obj:`callable`
+        The wrapper, e.g. :func:`~geocat.f2py.linint2`, whose first argument
+        is the data.
+
+    slabs : :obj:`iterable`
+        The input slabs, as for :func:`imap`.
+
+    write : :obj:`callable`
+        Called with each result, on the writer thread.
+
+    *args, **kwargs
+        The other arguments of ``func``.
+
+    depth : :obj:`int`
+        Maximum number of slabs read ahead, and of results waiting to be
+        written; default is 2.
+
+    Returns
+    -------
+
+    count : :obj:`int`
+        The number of slabs.
+    """
+    _check_depth(depth)
+
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    failure = []
+    writer = threading.Thread(target=_write,
+                              args=(write, q, stop, failure),
+                              name="geocat-f2py-writer",
+                              daemon=True)
+    writer.start()
+
+    results = imap(func, slabs, *args, depth=depth, **kwargs)
+    count = 0
+    try:
+        for fo in results:
+            if not _put(q, fo, stop):
+                break
+            count += 1
+    finally:
+        results.close()
+
+        # The writer finishes the results queued so far, unless it failed
+        _put(q, _done, stop)
+        writer.join()
+
+    if failure:
+        raise failure[0]
+    return count
@@ -0,0 +1,114 @@
+"""Number of OpenMP threads used by the Fortran routines.
+
+The loops over independent rows, points, levels or destination cells of
+``linint2``, ``linint2pts``, ``rcm2rgrid``, ``rgrid2rcm``, ``moc_globe_atl``
+and ``ScripRemapper`` are parallelized with OpenMP, so that a single large
+field, which dask cannot split any further, is still computed on several
+cores.
+
+The number of threads defaults to the ``OMP_NUM_THREADS`` environment
+variable, or to 1 if it is not set, so that dask workers running one
+Fortran call per thread do not oversubscribe the cores. It applies to the
+Fortran calls made while it is set, including those made when a dask output
+is computed; e.g. wrap ``.compute()`` in :func:`num_threads` to use more
+threads for the computation of a lazy output.
+
+Examples
+--------
+
+.. code-block:: python
+
+    import geocat.f2py
+
+    geocat.f2py.set_num_threads(8)
+    fo = geocat.f2py.linint2(fi, xo, yo, icycx=0)
+
+    with geocat.f2py.num_threads(4):
+        fo = geocat.f2py.rcm2rgrid(lat2d, lon2d, fi, lat1d, lon1d)
+"""
+
+import contextlib
+import numbers
+import os
+
+try:
+    from .fortran import (fomp_enabled, fomp_get_max_threads,
+                          fomp_get_num_procs, fomp_set_num_threads)
+except ImportError:
+    # Without the compiled extensions, only the NumPy backends run, serially
+    fomp_enabled = fomp_get_max_threads = None
+    fomp_get_num_procs = fomp_set_num_threads = None
+
+
+def _default_num_threads():
+    # The first level of OMP_NUM_THREADS, e.g. "4" or "4,2"
+    try:
+        return max(1, int(os.environ.get("OMP_NUM_THREADS", "").split(",")[0]))
+    except ValueError:
+        return 1
+
+
+_num_threads = _default_num_threads()
+
+
+def set_num_threads(n: int) -> None:
+    """Sets the number of OpenMP threads used by the Fortran routines.
+
+    Parameters
+    ----------
+
+    n : :obj:`int`
+        Number of threads, at least 1. :func:`max_num_threads` gives the
+        number of processors available.
+    """
+    global _num_threads
+
+    if isinstance(n, bool) or not isinstance(n, numbers.Integral):
+        raise TypeError("set_num_threads: `n` must be an integer!")
+    if n < 1:
+        raise ValueError("set_num_threads: `n` must be at least 1!")
+
+    _num_threads = int(n)
+
+
+def get_num_threads() -> int:
+    """Returns the number of OpenMP threads used by the Fortran routines."""
+    return _num_threads
+
+
+@contextlib.contextmanager
+def num_threads(n: int):
+    """Context manager that sets the number of OpenMP threads used by the
+    Fortran routines called in its body, see :func:`set_num_threads`."""
+    previous = _num_threads
+
+    set_num_threads(n)
+    try:
+        yield
+    finally:
+        set_num_threads(previous)
+
+
+def openmp_enabled() -> bool:
+    """Returns whether the Fortran routines were compiled with OpenMP; if not,
+    they always run on a single thread."""
+    return fomp_enabled is not None and bool(fomp_enabled())
+
+
+def max_num_threads() -> int:
+    """Returns the number of processors available to OpenMP."""
+    return 1 if fomp_get_num_procs is None else fomp_get_num_procs()
+
+
+def apply() -> None:
+    """Applies the number of threads to the OpenMP runtime.
+
+    The OpenMP setting belongs to the calling thread, so the inner
+    wrappers call this right before each parallelized Fortran routine,
+    e.g. in dask worker threads.
+    """
+    if fomp_get_max_threads is None:
+        return
+
+    if fomp_get_max_threads() != _num_threads:
+        fomp_set_num_threads(_num_threads)
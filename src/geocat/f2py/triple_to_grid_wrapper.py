@@ -1,13 +1,18 @@
+import itertools
 import typing
 import warnings
 
+from dask import delayed
+import dask.array as da
 from dask.array.core import map_blocks
 import numpy as np
 import xarray as xr
 
-from .errors import ChunkError, CoordinateError, DimensionError
+from . import datasets, profiling
+from .chunking import plan_chunks
+from .errors import CoordinateError, DimensionError
 from .fortran import grid2triple as grid2triple_fort
-from .fortran import triple2grid1
+from .fortran import triple2grid1, triple2gridp
 from .missing_values import fort2py_msg, py2fort_msg
 
 supported_types = typing.Union[xr.DataArray, np.ndarray]
@@ -17,27 +22,73 @@ supported_types = typing.Union[xr.DataArray, np.ndarray]
 # do anything that can benefit from parallel execution.
 
 
-def _grid_to_triple(x, y, z, msg_py):
+def _grid_to_triple(x, y, z, msg_py, ld_max=None):
+    t = profiling.timer("grid_to_triple")
+
     # Transpose z before Fortran function call
     z = np.transpose(z, axes=(1, 0))
+    t.mark("transpose")
 
     # Handle Python2Fortran missing value conversion
     z, msg_py, msg_fort = py2fort_msg(z, msg_py=msg_py)
 
+    # Counting pass: size the Fortran output by the number of non-missing values
+    # instead of allocating a full (mx*ny, 3) buffer and slicing its valid prefix
+    if ld_max is None:
+        ld_max = np.count_nonzero(z != msg_fort)
+    t.mark("msg_conversion")
+
     # Fortran call
     # num_elem is the total number of elements from beginning of each column in the array,
     # which are non missing-value
-    out, num_elem = grid2triple_fort(x, y, z, msg_fort)
+    out, num_elem, ier = grid2triple_fort(x, y, z, ldmax=ld_max, zmsg=msg_fort)
+    t.mark("fortran", copies=(x, y, z))
+
+    if ier == -20:
+        raise ValueError(
+            f"grid_to_triple: more than {ld_max} non-missing values in `z`!")
 
     # Transpose output to correct dimension order before returning it to outer wrapper
     # As well as get rid of indices corresponding to missing values
     out = np.asarray(out)
     out = np.transpose(out, axes=(1, 0))
     out = out[:, :num_elem]
+    t.mark("transpose")
 
     # Handle Fortran2Python missing value conversion back
     fort2py_msg(z, msg_fort=msg_fort, msg_py=msg_py)
     fort2py_msg(out, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    return out
+
+
+def _grid_to_triple_nd(x, y, z, msg_py, index_offset=None):
+    # Two-dimensional input keeps the plain (3, ld) triple table
+    if z.ndim == 2:
+        return _grid_to_triple(x, y, z, msg_py)
+
+    lead_shape = z.shape[:-2]
+    if index_offset is None:
+        index_offset = (0,) * len(lead_shape)
+
+    # Counting pass over every leading slice, so that the combined table is
+    # allocated exactly once at its final size; values are counted as
+    # GRID2TRIPLE sees them, once converted for Fortran
+    z, msg_py, msg_fort = py2fort_msg(z, msg_py=msg_py)
+    counts = [
+        np.count_nonzero(z[idx] != msg_fort) for idx in np.ndindex(lead_shape)
+    ]
+
+    # Rows are x, y, z followed by one index row per leading dimension of `z`
+    out = np.empty((3 + len(lead_shape), sum(counts)), dtype=np.float64)
+
+    start = 0
+    for idx, count in zip(np.ndindex(lead_shape), counts):
+        stop = start + count
+        out[:3, start:stop] = _grid_to_triple(x, y, z[idx], msg_py, count)
+        out[3:, start:stop] = np.add(idx, index_offset)[:, None]
+        start = stop
 
     return out
 
@@ -47,37 +98,163 @@ def _triple_to_grid(data,
                     y_in,
                     x_out,
                     y_out,
-                    shape,
                     method=None,
                     distmx=None,
                     domain=None,
                     msg_py=None):
+    t = profiling.timer("triple_to_grid")
+
+    grid = np.empty(data.shape[:-1] + (y_out.shape[0], x_out.shape[0]),
+                    dtype=np.float64)
 
     # Handle Python2Fortran missing value conversion
     data, msg_py, msg_fort = py2fort_msg(data, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    # Fortran function call for each leading slice of this block
+    for idx in np.ndindex(data.shape[:-1]):
+        grid_idx = triple2grid1(x_in,
+                                y_in,
+                                data[idx],
+                                x_out,
+                                y_out,
+                                zmsg=msg_fort,
+                                domain=domain,
+                                method=method,
+                                distmx=distmx)
+        t.mark("fortran", copies=(x_in, y_in, data[idx], x_out, y_out))
+
+        # Transpose output to the (y_out, x_out) order of the outer wrapper
+        grid[idx] = np.asarray(grid_idx).T
+        t.mark("transpose")
+
+    # Handle Fortran2Python missing value conversion back
+    fort2py_msg(data, msg_fort=msg_fort, msg_py=msg_py)
+    fort2py_msg(grid, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    return grid
 
-    # Fortran function call
-    grid = triple2grid1(x_in,
-                        y_in,
-                        data,
-                        x_out,
-                        y_out,
-                        zmsg=msg_fort,
-                        domain=domain,
-                        method=method,
-                        distmx=distmx)
-
-    # Reshape output to correct the dimensionality  before returning it to the outer wrapper
-    grid = np.asarray(grid)
-    grid = grid.reshape(shape)
+
+def _triple_to_grid_partial(data,
+                            x_in,
+                            y_in,
+                            x_out,
+                            y_out,
+                            big_grid,
+                            method=None,
+                            distmx=None,
+                            domain=None,
+                            msg_py=None):
+    # ''' signature: grid,dist = triple2gridp(xi,yi,zi,gx,gy,[zmsg,domain,method,distmx,ibig])
+    t = profiling.timer("triple_to_grid")
+
+    # Handle Python2Fortran missing value conversion
+    data, msg_py, msg_fort = py2fort_msg(data, msg_py=msg_py)
+    t.mark("msg_conversion")
+
+    grid_shape = data.shape[:-1] + (y_out.shape[0], x_out.shape[0])
+    grid = np.empty(grid_shape, dtype=np.float64)
+    dist = np.empty(grid_shape, dtype=np.float64)
+
+    # Fortran function call for each leading slice of this block of points;
+    # `big_grid` carries the oversized grid decision made for all points
+    for idx in np.ndindex(data.shape[:-1]):
+        grid_idx, dist_idx = triple2gridp(x_in,
+                                          y_in,
+                                          data[idx],
+                                          x_out,
+                                          y_out,
+                                          zmsg=msg_fort,
+                                          domain=domain,
+                                          method=method,
+                                          distmx=distmx,
+                                          ibig=int(big_grid[idx]))
+        grid[idx] = np.asarray(grid_idx).T
+        dist[idx] = np.asarray(dist_idx).T
+    t.mark("fortran", copies=(x_in, y_in, data, x_out, y_out))
 
     # Handle Fortran2Python missing value conversion back
     fort2py_msg(data, msg_fort=msg_fort, msg_py=msg_py)
     fort2py_msg(grid, msg_fort=msg_fort, msg_py=msg_py)
+    t.mark("msg_conversion")
 
-    print(grid)
+    return grid, dist
 
-    return grid
+
+def _present(data, msg_py):
+    # Non-missing values as the Fortran routines see them, after `py2fort_msg`
+    data, msg_py, msg_fort = py2fort_msg(data.copy(), msg_py=msg_py)
+    return data != msg_fort
+
+
+def _merge_nearest(partial_a, partial_b):
+    # "Nearest wins" reduction of two partial (grid, dist) pairs, `partial_a`
+    # having been computed from the earlier points. As in TRIP2GRD2, ties keep
+    # the earlier point except for exact matches (flagged by a distance of -1),
+    # where the later point wins.
+    grid_a, dist_a = partial_a
+    grid_b, dist_b = partial_b
+
+    take_b = (dist_b < dist_a) | (dist_b == -1)
+
+    return np.where(take_b, grid_b, grid_a), np.where(take_b, dist_b, dist_a)
+
+
+def _triple_to_grid_chunked(data, x_in, y_in, x_out, y_out, method, distmx,
+                            domain, msg_py):
+    # Grids each chunk of points independently, then merges the partial grids
+    # of each leading block with a pairwise tree of `_merge_nearest` tasks
+    x_in = da.asarray(x_in).rechunk((data.chunks[-1],))
+    y_in = da.asarray(y_in).rechunk((data.chunks[-1],))
+
+    # TRIPLE2GRID1 switches to an oversized grid when any valid point of a
+    # slice falls outside of the output grid; decide that once for all chunks
+    outside = ((x_in < x_out[0]) | (x_in > x_out[-1]) | (y_in < y_out[0]) |
+               (y_in > y_out[-1]))
+    big_grid = (data.map_blocks(_present, msg_py, dtype=bool) &
+                outside).any(axis=-1)
+
+    data_blocks = data.to_delayed()
+    x_blocks = x_in.to_delayed()
+    y_blocks = y_in.to_delayed()
+    big_grid_blocks = big_grid.to_delayed()
+
+    partial = delayed(_triple_to_grid_partial, pure=True)
+    merge = delayed(_merge_nearest, pure=True)
+
+    # Nested as deep as the output, so that `da.block` stacks the blocks along
+    # the leading dimensions only
+    grid_blocks = np.empty(data_blocks.shape[:-1] + (1, 1), dtype=object)
+    for idx in np.ndindex(data_blocks.shape[:-1]):
+        partials = [
+            partial(data_blocks[idx + (j,)],
+                    x_blocks[j],
+                    y_blocks[j],
+                    x_out,
+                    y_out,
+                    big_grid_blocks[idx],
+                    method=method,
+                    distmx=distmx,
+                    domain=domain,
+                    msg_py=msg_py) for j in range(data_blocks.shape[-1])
+        ]
+
+        # Merging neighbours only keeps the points in their original order
+        while len(partials) > 1:
+            partials = [
+                merge(*partials[i:i +
+                                2]) if i + 1 < len(partials) else partials[i]
+                for i in range(0, len(partials), 2)
+            ]
+
+        block_shape = tuple(c[i] for (c, i) in zip(data.chunks[:-1], idx))
+        block_shape += (y_out.shape[0], x_out.shape[0])
+        grid_blocks[idx + (0, 0)] = da.from_delayed(partials[0][0],
+                                                    shape=block_shape,
+                                                    dtype=np.float64)
+
+    return da.block(grid_blocks.tolist())
 
 
 # TODO: Revisit for implementing this function after deprecating geocat.ncomp
@@ -91,6 +268,49 @@ def _triple_to_grid_2d(x_in, y_in, data, x_out, y_out, msg_py):
 # used for any tasks which would not benefit from parallel execution.
 
 
+def _grid_to_triple_check(data, x_in, y_in, func_name):
+    # Shared boilerplate of `grid_to_triple` and `grid_to_triple_blocks`
+    is_input_xr = True
+
+    # If the input is numpy.ndarray, convert it to xarray.DataArray
+    if not isinstance(data, xr.DataArray):
+        if (x_in is None) | (y_in is None):
+            raise CoordinateError(
+                func_name + ": Argument `x_in` and `y_in` must be provided "
+                "explicitly unless `data` is an xarray.DataArray.")
+
+        is_input_xr = False
+
+        data = xr.DataArray(data)
+        data = data.assign_coords({data.dims[-1]: x_in, data.dims[-2]: y_in})
+
+    # x_in and y_in should be coming from xarray input coords or assigned
+    # as coords while xarray being initiated from numpy input above
+    x_in = data.coords[data.dims[-1]]
+    y_in = data.coords[data.dims[-2]]
+
+    # Basic validity checks
+    if data.ndim < 2:
+        raise DimensionError(func_name +
+                             ": `data` must have at least two dimensions !\n")
+
+    if x_in.ndim != 1:
+        raise DimensionError(func_name + ": `x_in` must have one dimension !\n")
+    elif x_in.shape[0] != data.shape[-1]:
+        raise DimensionError(
+            func_name + ": `x_in` must have the same size (call it `mx`) as "
+            "the rightmost dimension of `data`. !\n")
+
+    if y_in.ndim != 1:
+        raise DimensionError(func_name + ": `y_in` must have one dimension !\n")
+    elif y_in.shape[0] != data.shape[-2]:
+        raise DimensionError(
+            func_name + ": `y_in` must have the same size (call it `ny`) as "
+            "the second rightmost dimension of `data`. !\n")
+
+    return data, x_in, y_in, is_input_xr
+
+
 # TODO: This function requires the input to have the coordinates in a particular order,
 #  but xarray.DataArrray inputs with coordinates anywhere could/should actually be fine
 def grid_to_triple(
@@ -99,16 +319,16 @@ def grid_to_triple(
     y_in: supported_types = None,
     msg_py: supported_types = None,
 ) -> supported_types:
-    """Converts a two-dimensional grid with one-dimensional coordinate
-    variables to an array where each grid value is associated with its
-    coordinates.
+    """Converts a grid with one-dimensional coordinate variables to an array
+    where each grid value is associated with its coordinates.
 
     Parameters
     ----------
 
     data : :class:`xarray.DataArray`, :class:`numpy.ndarray`
-        Two-dimensional input array of size ny x mx containing the data values.
-        Missing values may be present in ``data``, but they are ignored.
+        Array of two or more dimensions whose rightmost two dimensions are of
+        size ny x mx and contain the data values. Missing values may be present
+        in ``data``, but they are ignored.
 
     x_in : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         A one-dimensional array that specifies the the right dimension coordinates of
@@ -133,10 +353,24 @@ def grid_to_triple(
     -------
 
     out : :class:`xarray.DataArray`, :class:`numpy.ndarray`
-        The maximum size of the returned array will be ``3 x ld``, where ``ld <= ny x mx``.
-        If no missing values are encountered in ``data``, then ``ld = ny x mx``. If missing
-        values are encountered in ``data``, they are not returned and hence ``ld`` will be
-        equal to ``ny x mx`` minus the number of missing values found in ``data``.
+        For two-dimensional ``data``, the maximum size of the returned array will be
+        ``3 x ld``, where ``ld <= ny x mx``. If no missing values are encountered in
+        ``data``, then ``ld = ny x mx``. If missing values are encountered in ``data``,
+        they are not returned and hence ``ld`` will be equal to ``ny x mx`` minus the
+        number of missing values found in ``data``.
+
+        If ``data`` has leading dimensions, the triples of all leading slices are
+        combined into one table of size ``(3 + ndim - 2) x ld``: rows 0-2 hold x, y
+        and the data value, and each following row holds the index of the triple
+        along one of the leading dimensions of ``data``, in order.
+
+        The returned array is allocated at its final size after counting the
+        non-missing values of ``data``.
+
+    See Also
+    --------
+
+    grid_to_triple_blocks : Generator that emits the same table block by block.
 
     Examples
     --------
@@ -159,57 +393,160 @@ def grid_to_triple(
 
             output = geocat.comp.grid_to_triple(data, x_in, y_in)
     """
+    t = profiling.timer("grid_to_triple")
 
     # ''' Start of boilerplate
-    is_input_xr = True
+    data, x_in, y_in, is_input_xr = _grid_to_triple_check(
+        data, x_in, y_in, "grid_to_triple")
+    # ''' end of boilerplate
+    t.mark("validation")
 
-    # If the input is numpy.ndarray, convert it to xarray.DataArray
-    if not isinstance(data, xr.DataArray):
-        if (x_in is None) | (y_in is None):
-            raise CoordinateError(
-                "grid_to_triple: Argument `x_in` and `y_in` must be provided "
-                "explicitly unless `data` is an xarray.DataArray.")
+    if data.chunks is not None:
+        # Dask input is converted one block at a time, so that only the
+        # compact per-block tables are held in memory next to the output
+        out = np.concatenate([
+            np.asarray(table)
+            for table in grid_to_triple_blocks(data, msg_py=msg_py)
+        ],
+                             axis=1)
+    else:
+        # Inner Fortran wrapper call
+        out = _grid_to_triple_nd(x_in.data, y_in.data, data.data, msg_py)
+    t.mark("compute")
 
-        is_input_xr = False
+    # If input was xarray.DataArray, convert output to xarray.DataArray as well
+    if is_input_xr:
+        out = xr.DataArray(out, attrs=data.attrs)
+    t.mark("packaging")
 
-        data = xr.DataArray(data)
-        data = data.assign_coords({data.dims[-1]: x_in, data.dims[-2]: y_in})
+    return out
 
-    # x_in and y_in should be coming from xarray input coords or assigned
-    # as coords while xarray being initiated from numpy input above
-    x_in = data.coords[data.dims[-1]]
-    y_in = data.coords[data.dims[-2]]
 
-    # Basic validity checks
-    if data.ndim != 2:
-        raise DimensionError(
-            "grid_to_triple: `data` must have two dimensions !\n")
+def grid_to_triple_blocks(
+    data: supported_types,
+    x_in: supported_types = None,
+    y_in: supported_types = None,
+    msg_py: supported_types = None,
+    rows: int = None,
+) -> typing.Iterator[supported_types]:
+    """Generator version of :func:`grid_to_triple` that emits the triple table
+    block by block.
 
-    if x_in.ndim != 1:
-        raise DimensionError(
-            "grid_to_triple: `x_in` must have one dimension !\n")
-    elif x_in.shape[0] != data.shape[1]:
-        raise DimensionError(
-            "grid_to_triple: `x_in` must have the same size (call it `mx`) as the "
-            "right dimension of `data`. !\n")
+    Each block covers one leading slice of ``data`` (or one dask chunk along the
+    leading dimensions) and at most ``rows`` rows of its second rightmost
+    dimension. Only the input block being converted and its compact triple table
+    are held in memory at any time, so very large grids can be converted and
+    written out incrementally.
 
-    if y_in.ndim != 1:
-        raise DimensionError(
-            "grid_to_triple: `y_in` must have one dimension !\n")
-    elif y_in.shape[0] != data.shape[0]:
-        raise DimensionError(
-            "grid_to_triple: `y_in` must have the same size (call it `ny`) as the "
-            "left dimension of `data`. !\n")
+    Concatenating the emitted tables along their last axis gives the same table
+    as :func:`grid_to_triple`.
+
+    Parameters
+    ----------
+
+    data : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        Array of two or more dimensions whose rightmost two dimensions are of
+        size ny x mx and contain the data values. If ``data`` is backed by a dask
+        array, its chunks along the leading dimensions are used as blocks and it
+        is computed one block at a time.
+
+    x_in : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        A one-dimensional array that specifies the the right dimension coordinates of
+        the input (``data``). See :func:`grid_to_triple`.
+
+    y_in : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        A one-dimensional array that specifies the the left dimension coordinates of
+        the input (``data``). See :func:`grid_to_triple`.
+
+    msg_py : :obj:`numpy.number`
+        A numpy scalar value that represent a missing value in ``data``.
+
+    rows : :obj:`int`, optional
+        Maximum number of rows (i.e. elements along the second rightmost
+        dimension) per block. Defaults to whole slices for NumPy input and to the
+        existing chunks for dask input.
+
+    Yields
+    ------
+
+    out : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+        The triple table of one block, laid out as described for
+        :func:`grid_to_triple`. Index rows refer to positions in the whole of
+        ``data``.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import numpy as np
+        from geocat.f2py import grid_to_triple_blocks
+
+        with open("triples.bin", "wb") as f:
+            for table in grid_to_triple_blocks(data, x_in, y_in, rows=100):
+                np.asarray(table).T.tofile(f)
+    """
+    t = profiling.timer("grid_to_triple_blocks")
+
+    # ''' Start of boilerplate
+    data, x_in, y_in, is_input_xr = _grid_to_triple_check(
+        data, x_in, y_in, "grid_to_triple_blocks")
+
+    if rows is not None and rows < 1:
+        raise ValueError("grid_to_triple_blocks: `rows` must be positive!")
+
+    is_input_dask = data.chunks is not None
+
+    if is_input_dask:
+        # Keep rows whole so that blocks are emitted in the row-major order of
+        # the combined table
+        data_chunks = {data.dims[-1]: -1}
+        if rows is not None:
+            data_chunks[data.dims[-2]] = rows
+        data = data.chunk(data_chunks)
+        if len(data.chunks[-2]) > 1:
+            # A block of several leading slices would interleave their row
+            # blocks, so split rows are converted one leading slice at a time
+            data = data.chunk({dim: 1 for dim in data.dims[:-2]})
+        chunks = data.chunks
+    else:
+        ny = data.shape[-2]
+        rows = ny if rows is None else rows
+        row_chunks = (rows,) * (ny // rows)
+        if ny % rows:
+            row_chunks += (ny % rows,)
+        chunks = tuple((1,) * n for n in data.shape[:-2])
+        chunks += (row_chunks, (data.shape[-1],))
     # ''' end of boilerplate
+    t.mark("validation")
 
-    # Inner Fortran wrapper call
-    out = _grid_to_triple(x_in.data, y_in.data, data.data, msg_py)
+    starts = [np.cumsum((0,) + c[:-1]) for c in chunks]
 
-    # If input was xarray.DataArray, convert output to xarray.DataArray as well
-    if is_input_xr:
-        out = xr.DataArray(out, attrs=data.attrs)
+    for block_index in itertools.product(*[range(len(c)) for c in chunks]):
+        # Restarted for every block, so that the time the caller spends
+        # between blocks is not recorded
+        t = profiling.timer("grid_to_triple_blocks")
+        block_start = [s[i] for (s, i) in zip(starts, block_index)]
+        block_slices = tuple(
+            slice(s[i], s[i] + c[i])
+            for (s, c, i) in zip(starts, chunks, block_index))
 
-    return out
+        if is_input_dask:
+            block = np.asarray(data.data.blocks[block_index])
+        else:
+            block = data.data[block_slices]
+
+        # Inner Fortran wrapper call
+        out = _grid_to_triple_nd(x_in.data, y_in.data[block_slices[-2]], block,
+                                 msg_py, block_start[:-2])
+        t.mark("compute")
+
+        # If input was xarray.DataArray, convert output to xarray.DataArray as well
+        if is_input_xr:
+            out = xr.DataArray(out, attrs=data.attrs)
+        t.mark("packaging")
+
+        yield out
 
 
 # TODO: This function requires the input to have the coordinates in the rightmost two dimensions,
@@ -248,6 +585,21 @@ def triple_to_grid(
         the "x" and "y" coordinates. Missing values may be present but
         will be ignored.
 
+        If ``data`` is backed by a dask array that is chunked along its
+        rightmost dimension, each chunk of points is gridded in a separate
+        task and the partial grids are merged by keeping, at every grid
+        point, the value of the nearest observation. This allows datasets
+        that do not fit in memory to be gridded across dask workers. ``x_in``
+        and ``y_in`` may then be dask arrays as well.
+
+        ``data`` may also be a :class:`xarray.Dataset`, whose data variables
+        on the points of ``x_in``, i.e. on its dimension or else of its
+        length, are all gridded, those of the same type in a single call.
+        The grid dimensions are named after those of ``y_out`` and ``x_out``
+        if they are :class:`xarray.DataArray`, and ``"y"`` and ``"x"``
+        otherwise. Variables which do not depend on the points dimension are
+        kept as they are, and the others are dropped.
+
     x_in : :class:`xarray.DataArray`, :class:`numpy.ndarray`
         A one-dimensional array that specifies the x-coordinate
         associated with the input (``data``).
@@ -307,7 +659,7 @@ def triple_to_grid(
     Returns
     -------
 
-    grid : :class:`xarray.DataArray`, :class:`numpy.ndarray`
+    grid : :class:`xarray.DataArray`, :class:`numpy.ndarray`, :class:`xarray.Dataset`
         The returned array will be ``K`` x ``N`` x ``M``, where ``K`` represents the leftmost
         dimensions of ``data``, N represent the size of ``y_out``,
         and M represent the size of ``x_out`` coordinate vectors.
@@ -346,6 +698,27 @@ def triple_to_grid(
             "triple_to_grid: Arguments `x_in` and `y_in` must always be "
             "explicitly provided!")
 
+    # All the variables on the points of `x_in` are gridded at once
+    if isinstance(data, xr.Dataset):
+        y_dim = y_out.dims[0] if isinstance(y_out, xr.DataArray) else "y"
+        x_dim = x_out.dims[0] if isinstance(x_out, xr.DataArray) else "x"
+
+        def grid_group(stacked):
+            grid = triple_to_grid(stacked, x_in, y_in, x_out, y_out, method,
+                                  domain, distmx, missing_value)
+            return xr.DataArray(grid.data,
+                                dims=("variable", y_dim, x_dim),
+                                coords={
+                                    y_dim: np.asarray(y_out),
+                                    x_dim: np.asarray(x_out)
+                                })
+
+        return datasets.regrid(data, 1,
+                               lambda v: datasets.on_grid(v, x_in, data),
+                               grid_group, "triple_to_grid")
+
+    t = profiling.timer("triple_to_grid")
+
     # ''' Start of boilerplate
     is_input_xr = True
     is_input_dask = False
@@ -391,69 +764,69 @@ def triple_to_grid(
 
     if np.asarray(domain).size != 1:
         raise ValueError("triple_to_grid: Provide a scalar value for `domain`!")
+    t.mark("validation")
 
     # If input data is already chunked
     if data.chunks is not None:
         is_input_dask = True
 
-        # Ensure the rightmost dimension of `data` is not chunked
-        if list(data.chunks)[-1:] != [x_in.shape]:
-            raise ChunkError(
-                "triple_to_grid: Data must be unchunked along the rightmost dimension!"
-            )
-
-    # NOTE: Auto-chunking, regardless of what chunk sizes were given by the user, seems
-    # to be explicitly needed in this function because:
-    # The Fortran routine for this function is implemented assuming it would be looped
-    # across the leftmost dimensions of the input (`data`), i.e. on one-dimensional
-    # chunks of size that is equal to the rightmost dimension of `data`, which is the
-    # same as length of `x_in` or `y_in`.
-
-    # Generate chunks of {'dim_0': 1, 'dim_1': 1, ..., 'dim_n': x_in.shape}
-    data_chunks = list(data.dims)
-    data_chunks[:-1] = [
-        (k, 1) for (k, v) in zip(list(data.dims)[:-1],
-                                 list(data.shape)[:-1])
-    ]
-    data_chunks[-1:] = [
-        (k, v) for (k, v) in zip(list(data.dims)[-1:],
-                                 list(data.shape)[-1:])
-    ]
-    data_chunks = dict(data_chunks)
-    data = data.chunk(data_chunks)
+    # Chunks along the rightmost (points) dimension of dask input are kept, and
+    # each chunk of points is gridded separately before the partial grids are
+    # merged, so that very large sets of points can be gridded in parallel.
+    is_points_chunked = is_input_dask and len(data.chunks[-1]) > 1
+
+    # NOTE: The Fortran routine for this function is looped across the leftmost
+    # dimensions of the input (`data`) by the inner wrapper, on one-dimensional
+    # slices of size that is equal to the rightmost dimension of `data`, which is
+    # the same as length of `x_in` or `y_in`. Unless `data` is already chunked,
+    # as many slices are grouped in each chunk as fit in the memory budget of a
+    # task.
+    data_chunks = plan_chunks(data.shape, 1, y_out.shape[0] * x_out.shape[0],
+                              data.chunks)
+    if is_points_chunked:
+        data_chunks = data_chunks[:-1] + (data.chunks[-1],)
+    data = data.chunk(dict(zip(data.dims, data_chunks)))
 
     # grid data structure elements
-    grid_chunks = list(data.chunks)
-    grid_chunks[-1] = (y_out.shape[0] * x_out.shape[0],)
-    grid_chunks = tuple(grid_chunks)
-    dask_grid_shape = tuple(a[0] for a in list(grid_chunks))
+    grid_chunks = data.chunks[:-1] + ((y_out.shape[0],), (x_out.shape[0],))
     grid_coords = {k: v for (k, v) in data.coords.items()}
     grid_coords[data.dims[-1]] = x_out
     grid_coords[data.dims[-2]] = y_out
     # ''' end of boilerplate
 
-    # Inner Fortran wrapper call
-    grid = map_blocks(
-        _triple_to_grid,
-        data.data,
-        x_in,
-        y_in,
-        x_out,
-        y_out,
-        dask_grid_shape,
-        method=method,
-        distmx=distmx,
-        domain=domain,
-        msg_py=missing_value,
-        chunks=grid_chunks,
-        dtype=data.dtype,
-        drop_axis=[data.ndim - 1],
-        new_axis=[data.ndim - 1],
-    )
-
-    # Reshape grid to its final shape
-    grid_shape = (data.shape[:-1] + (y_out.shape[0],) + (x_out.shape[0],))
-    grid = grid.reshape(grid_shape)
+    with profiling.annotate("triple_to_grid"):
+        if is_points_chunked:
+            # Inner Fortran wrapper calls, one per chunk of points
+            grid = _triple_to_grid_chunked(
+                data.data,
+                x_in.data if isinstance(x_in, xr.DataArray) else x_in,
+                y_in.data if isinstance(y_in, xr.DataArray) else y_in,
+                np.asarray(x_out),
+                np.asarray(y_out),
+                method=method,
+                distmx=distmx,
+                domain=domain,
+                msg_py=missing_value,
+            )
+        else:
+            # Inner Fortran wrapper call
+            grid = map_blocks(
+                _triple_to_grid,
+                data.data,
+                x_in,
+                y_in,
+                x_out,
+                y_out,
+                method=method,
+                distmx=distmx,
+                domain=domain,
+                msg_py=missing_value,
+                chunks=grid_chunks,
+                dtype=data.dtype,
+                drop_axis=[data.ndim - 1],
+                new_axis=[data.ndim - 1, data.ndim],
+            )
+    t.mark("chunking")
 
     if meta:
         # grid = xr.DataArray(grid, attrs=data.attrs, dims=data.dims, coords=grid_coords)
@@ -464,15 +837,15 @@ def triple_to_grid(
     # else:
     #     grid = xr.DataArray(grid, coords=grid_coords)
 
+    # Dask output is only kept for chunked xarray.DataArray input
+    if not (is_input_xr and is_input_dask):
+        grid = grid.compute()
+    t.mark("compute")
+
     # If input was xarray.DataArray, convert output to xarray.DataArray as well
     if is_input_xr:
-        if is_input_dask:
-            grid = xr.DataArray(grid)
-        else:
-            grid = xr.DataArray(grid).compute()
-    # Else if input was numpy.ndarray, convert Dask output to numpy.ndarray with `.compute()
-    else:
-        grid = grid.compute()
+        grid = xr.DataArray(grid)
+    t.mark("packaging")
 
     return grid
 
@@ -0,0 +1,519 @@
+"""Reader and writer of WPS intermediate files.
+
+The intermediate files written by ungrib, or by ``write_intermediate_wps``,
+are Fortran unformatted sequential, big-endian files holding one field after
+the other, each as five records (see ``plotfmt_rdhead`` and
+``plotfmt_rddata`` in ``fortran/all_todo``):
+
+1. the format version, 5
+2. the date, forecast hour, source, field name, units, description, level
+   and the grid size and projection
+3. the projection parameters
+4. whether the winds are grid-relative
+5. the ``(ny, nx)`` slab of ``float32`` values
+
+Rather than reading the whole file sequentially, :func:`index` walks the
+record markers of the file, which only touches the headers, and
+:func:`memmap` returns the slab of a field as a zero-copy
+:class:`numpy.memmap` view. :func:`open_dataset` backs every slab by a dask
+chunk of such a view, so that selecting one field at one level of a large file
+only reads that slab.
+
+Rather than a call of ``write_intermediate_wps`` per slab, :func:`write`
+serializes all the fields and levels of a Dataset at a date at once: the
+file is allocated with its final size, computed from the record sizes, and
+the records are filled in at their offsets through a memory map. The files of
+the dates are written in parallel.
+
+.. code-block:: python
+
+    from geocat.f2py import wps
+
+    ds = wps.open_dataset("FILE:2021-06-01_00")
+    tt = ds.TT.sel(level=85000).values
+
+    for record in wps.index("FILE:2021-06-01_00"):
+        if record.field == "PMSL":
+            pmsl = wps.memmap(record)
+
+    paths = wps.write(era5, "FILE")  # FILE:2021-06-01_00, FILE:2021-06-01_06
+"""
+
+import collections
+import concurrent.futures
+import mmap
+import os
+import struct
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+from .errors import DimensionError
+
+# Version of the format written by WPS since v3
+_version = 5
+
+# Record 2: hdate, xfcst, map_source, field, units, desc, xlvl, nx, ny, iproj
+_head = struct.Struct(">24sf32s9s25s46sfiii")
+
+# Projection parameters of record 3, after the 8 character start location, by
+# projection code
+_start = ("startlat", "startlon")
+_projections = {
+    0: _start + ("deltalat", "deltalon", "earth_radius"),
+    1: _start + ("dx", "dy", "truelat1", "earth_radius"),
+    3: _start + ("dx", "dy", "xlonc", "truelat1", "truelat2", "earth_radius"),
+    4: _start + ("nlats", "deltalon", "earth_radius"),
+    5: _start + ("dx", "dy", "xlonc", "truelat1", "earth_radius"),
+}
+
+# Record markers are 4 byte lengths before and after each record
+_marker = struct.Struct(">i")
+
+# Default earth radius, in km, as in WPS
+_earth_radius = 6367.47
+
+Record = collections.namedtuple("Record", [
+    "path", "field", "level", "date", "xfcst", "units", "desc", "map_source",
+    "nx", "ny", "iproj", "startloc", "projection", "is_wind_grid_rel", "offset"
+])
+Record.__doc__ = """A field of a WPS intermediate file.
+
+``date`` is the date string of the file, ``level`` is in Pa or one of the
+special WPS codes, e.g. 200100 for the surface, ``projection`` the
+:obj:`dict` of the parameters of ``iproj``, and ``offset`` the position of
+the ``(ny, nx)`` slab in the file ``path``, in bytes."""
+
+
+def _string(b):
+    return b.decode("ascii", "replace").strip()
+
+
+def _record(mm, pos, path):
+    # Payload bounds of the record at `pos`, and the position of the next one
+    if pos + _marker.size > len(mm):
+        raise ValueError(f"wps: truncated record at byte {pos} of '{path}'!")
+    (n,) = _marker.unpack_from(mm, pos)
+    start = pos + _marker.size
+    stop = start + n
+    if n < 0 or stop + _marker.size > len(mm) or _marker.unpack_from(
+            mm, stop)[0] != n:
+        raise ValueError(
+            f"wps: '{path}' is not a big-endian Fortran unformatted file, "
+            f"or is corrupted at byte {pos}!")
+    return start, stop, stop + _marker.size
+
+
+def index(path) -> list:
+    """Returns the fields of a WPS intermediate file, in file order.
+
+    Parameters
+    ----------
+
+    path : :obj:`str`, :class:`os.PathLike`
+        The file.
+
+    Returns
+    -------
+
+    records : :obj:`list` of :class:`Record`
+        The headers of the fields and the positions of their slabs. Only the
+        headers are read: the slabs are skipped over.
+    """
+    path = os.fspath(path)
+    records = []
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return records
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with mm:
+        pos = 0
+        while pos < len(mm):
+            start, stop, pos = _record(mm, pos, path)
+            (version,) = _marker.unpack_from(mm, start)
+            if stop - start != 4 or version != _version:
+                raise ValueError(
+                    f"wps: unsupported format version {version} in "
+                    f"'{path}'; only version {_version} is!")
+
+            start, stop, pos = _record(mm, pos, path)
+            (hdate, xfcst, map_source, field, units, desc, xlvl, nx, ny,
+             iproj) = _head.unpack_from(mm, start)
+
+            start, stop, pos = _record(mm, pos, path)
+            if iproj not in _projections:
+                raise ValueError(
+                    f"wps: unknown projection {iproj} of '{_string(field)}' "
+                    f"in '{path}'!")
+            names = _projections[iproj]
+            values = struct.unpack_from(f">8s{len(names)}f", mm, start)
+
+            start, stop, pos = _record(mm, pos, path)
+            (is_wind_grid_rel,) = _marker.unpack_from(mm, start)
+
+            start, stop, pos = _record(mm, pos, path)
+            if stop - start != 4 * nx * ny:
+                raise ValueError(
+                    f"wps: the slab of '{_string(field)}' in '{path}' is not "
+                    f"of {nx} x {ny} values!")
+
+            records.append(
+                Record(path=path,
+                       field=_string(field),
+                       level=float(xlvl),
+                       date=_string(hdate),
+                       xfcst=float(xfcst),
+                       units=_string(units),
+                       desc=_string(desc),
+                       map_source=_string(map_source),
+                       nx=nx,
+                       ny=ny,
+                       iproj=iproj,
+                       startloc=_string(values[0]),
+                       projection=dict(zip(names, values[1:])),
+                       is_wind_grid_rel=bool(is_wind_grid_rel),
+                       offset=start))
+
+    return records
+
+
+def memmap(record) -> np.memmap:
+    """Returns the ``(ny, nx)`` slab of a field as a read-only, big-endian
+    :class:`numpy.memmap` view of its file, which is only read on access."""
+    return np.memmap(record.path,
+                     dtype=">f4",
+                     mode="r",
+                     offset=record.offset,
+                     shape=(record.ny, record.nx))
+
+
+def _time(date):
+    # The WPS date string, e.g. "2021-06-01_00:00:00", as datetime64
+    try:
+        return np.datetime64(date.replace("_", "T"), "ns")
+    except ValueError:
+        return None
+
+
+def _slab(record):
+    # A chunk of the slab of `record`, named by its location so that reopening
+    # the same file gives the same graph
+    return da.from_array(memmap(record),
+                         chunks=-1,
+                         meta=np.empty((0, 0), dtype=">f4"),
+                         name=f"wps-{record.path}-{record.offset}")
+
+
+def open_dataset(paths) -> xr.Dataset:
+    """Opens WPS intermediate files lazily.
+
+    Parameters
+    ----------
+
+    paths : :obj:`str`, :class:`os.PathLike`, :obj:`list`
+        A file, or files, e.g. one per date.
+
+    Returns
+    -------
+
+    ds : :class:`xarray.Dataset`
+        A variable per field, of dimensions ``("time", "level", "y", "x")``
+        over all the dates and levels of the files, backed by a dask chunk
+        per slab of the files, NaN where a field is not at a date and level.
+        ``lat`` and ``lon`` coordinates are given for regular lat/lon grids
+        (``iproj`` 0); the projection parameters are attributes. All fields
+        must be on the same grid.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    records = [record for path in paths for record in index(path)]
+    if not records:
+        raise ValueError("wps.open_dataset: no field in the files!")
+
+    first = records[0]
+    grid = (first.nx, first.ny, first.iproj, first.projection)
+    others = sorted({
+        r.field for r in records if (r.nx, r.ny, r.iproj, r.projection) != grid
+    })
+    if others:
+        raise DimensionError(
+            f"wps.open_dataset: fields {others} are not on the grid of "
+            f"'{first.field}'!")
+
+    dates = sorted({r.date for r in records})
+    levels = sorted({r.level for r in records}, reverse=True)
+
+    # {field: {(date, level): record}}, the last one of duplicates
+    fields = {}
+    for record in records:
+        fields.setdefault(record.field,
+                          {})[(record.date, record.level)] = record
+
+    shape = (first.ny, first.nx)
+    data_vars = {}
+    for (field, slabs) in fields.items():
+        data = da.stack([
+            da.stack([
+                _slab(slabs[(date, level)]).astype(np.float32) if
+                (date,
+                 level) in slabs else da.full(shape, np.nan, dtype=np.float32)
+                for level in levels
+            ])
+            for date in dates
+        ])
+        record = next(iter(slabs.values()))
+        data_vars[field] = xr.DataArray(
+            data,
+            dims=("time", "level", "y", "x"),
+            attrs={
+                "units": record.units,
+                "description": record.desc,
+                "map_source": record.map_source,
+                "xfcst": record.xfcst,
+                "is_wind_grid_rel": int(record.is_wind_grid_rel),
+            })
+
+    times = [_time(date) for date in dates]
+    coords = {
+        "time": times if None not in times else dates,
+        "level": np.array(levels),
+    }
+    if first.iproj == 0:
+        p = first.projection
+        coords["lat"] = ("y", p["startlat"] +
+                         p["deltalat"] * np.arange(first.ny, dtype=np.float64))
+        coords["lon"] = ("x", p["startlon"] +
+                         p["deltalon"] * np.arange(first.nx, dtype=np.float64))
+
+    attrs = {"iproj": first.iproj, "startloc": first.startloc}
+    attrs.update(first.projection)
+
+    return xr.Dataset(data_vars, coords=coords, attrs=attrs)
+
+
+def _wps_date(t):
+    # The WPS date string of a time coordinate value
+    if isinstance(t, str):
+        return t
+    return np.datetime_as_string(np.datetime64(t, "s")).replace("T", "_")
+
+
+def _projection(ds, projection):
+    # The projection code, start location and parameters to write
+    if projection is None:
+        if "iproj" in ds.attrs:
+            projection = ds.attrs
+        elif ("lat" in ds.coords and "lon" in ds.coords and ds.lat.ndim == 1 and
+              ds.lon.ndim == 1 and ds.lat.size > 1 and ds.lon.size > 1):
+            lat, lon = ds.lat.values, ds.lon.values
+            projection = {
+                "iproj": 0,
+                "startlat": lat[0],
+                "startlon": lon[0],
+                "deltalat": lat[1] - lat[0],
+                "deltalon": lon[1] - lon[0],
+            }
+        else:
+            raise ValueError(
+                "wps.write: `projection` is needed, as `ds` has neither "
+                "projection attributes nor 1-D lat and lon coordinates!")
+
+    iproj = int(projection.get("iproj", -1))
+    if iproj not in _projections:
+        raise ValueError(f"wps.write: unknown projection {iproj}!")
+
+    params = dict(projection)
+    params.setdefault("earth_radius", _earth_radius)
+    missing = [name for name in _projections[iproj] if name not in params]
+    if missing:
+        raise ValueError(
+            f"wps.write: parameters {missing} of projection {iproj} are "
+            "missing!")
+
+    return (iproj, str(params.get("startloc", "SWCORNER")),
+            [float(params[name]) for name in _projections[iproj]])
+
+
+def _pack(s, width):
+    return s.encode("ascii", "replace")[:width].ljust(width)
+
+
+def _headers(name, variable, level, date, nx, ny, map_source, projection):
+    # The first four records of a field, as in write_intermediate_wps
+    iproj, startloc, values = projection
+    attrs = variable.attrs
+    head = _head.pack(_pack(date, 24), float(attrs.get("xfcst", 0.0)),
+                      _pack(str(attrs.get("map_source", map_source)), 32),
+                      _pack(name, 9), _pack(str(attrs.get("units", "")), 25),
+                      _pack(str(attrs.get("description", "")), 46), level, nx,
+                      ny, iproj)
+    proj = struct.pack(f">8s{len(values)}f", _pack(startloc, 8), *values)
+    wind = _marker.pack(int(bool(attrs.get("is_wind_grid_rel", 0))))
+
+    return [_marker.pack(_version), head, proj, wind]
+
+
+def _write_file(path, ds, date, fields, level_dim, map_source, projection):
+    # Writes the fields of `ds`, at a single date, to `path`
+    ds = ds.load()
+    ny, nx = ds[fields[0]].shape[-2:]
+
+    # [(headers, slab)], of the slabs not entirely missing
+    records = []
+    for name in fields:
+        variable = ds[name]
+        if level_dim in variable.dims:
+            slabs = variable.transpose(level_dim, ...)
+            levels = variable[level_dim].values
+        else:
+            slabs = variable.expand_dims(level_dim)
+            levels = [variable.attrs.get("level", 200100.0)]
+        for (level, slab) in zip(levels, slabs.values):
+            if np.isnan(slab).all():
+                continue
+            records.append((_headers(name, variable, float(level), date, nx, ny,
+                                     map_source, projection), slab))
+
+    # The five records of each field are framed by two markers each
+    field_size = 4 * nx * ny + 10 * _marker.size
+    size = sum(field_size + len(b"".join(headers)) for (headers, _) in records)
+
+    # Written under a temporary name, so that an interrupted write leaves no
+    # partial file behind
+    tmp = f"{path}.{os.getpid()}.part"
+    try:
+        with open(tmp, "wb") as f:
+            f.truncate(size)
+        if size:
+            buffer = np.memmap(tmp, dtype=np.uint8, mode="r+", shape=(size,))
+            pos = 0
+            for (headers, slab) in records:
+                for payload in headers:
+                    view, pos = _put(buffer, pos, len(payload))
+                    view[:] = np.frombuffer(payload, dtype=np.uint8)
+                view, pos = _put(buffer, pos, 4 * nx * ny)
+                view.view(">f4").reshape(ny, nx)[...] = slab
+            buffer.flush()
+            del buffer
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    return path
+
+
+def _put(buffer, pos, n):
+    # Writes the markers of a record of `n` bytes at `pos`; returns the view of
+    # its payload and the position of the next record
+    start = pos + _marker.size
+    _marker.pack_into(buffer, pos, n)
+    _marker.pack_into(buffer, start + n, n)
+    return buffer[start:start + n], start + n + _marker.size
+
+
+def write(ds,
+          prefix,
+          time_dim: str = "time",
+          level_dim: str = "level",
+          map_source: str = "geocat-f2py",
+          projection: dict = None,
+          workers: int = None) -> list:
+    """Writes the data variables of a Dataset to WPS intermediate files, a file
+    per date.
+
+    Parameters
+    ----------
+
+    ds : :class:`xarray.Dataset`
+        The fields, of rightmost dimensions ``(y, x)``, and optionally
+        ``time_dim`` and ``level_dim`` dimensions. Variable names must be at
+        most 9 characters long. Their ``units``, ``description``,
+        ``map_source``, ``xfcst`` and ``is_wind_grid_rel`` attributes are
+        written, and the ``level`` attribute of variables without a level
+        dimension, which defaults to the surface, 200100. Slabs entirely NaN,
+        e.g. of a field missing at a level in :func:`open_dataset`, are not
+        written.
+
+    prefix : :obj:`str`, :class:`os.PathLike`
+        Files are named ``prefix:YYYY-MM-DD_HH``, as by ungrib, and
+        overwritten if they exist.
+
+    time_dim : :obj:`str`
+        The time dimension, or scalar coordinate, of datetime64 values or
+        WPS date strings.
+
+    level_dim : :obj:`str`
+        The level dimension, in Pa or WPS level codes.
+
+    map_source : :obj:`str`
+        The source, unless given by the attributes of a variable.
+
+    projection : :obj:`dict`, optional
+        ``iproj``, the parameters of the projection, named as in
+        :attr:`Record.projection`, and optionally ``startloc``, which
+        defaults to ``"SWCORNER"``, and ``earth_radius``, which defaults to
+        6367.47 km. Defaults to the attributes of ``ds`` if it has an
+        ``iproj``, as from :func:`open_dataset`, or else to the regular
+        lat/lon grid of its 1-D ``lat`` and ``lon`` coordinates.
+
+    workers : :obj:`int`, optional
+        Number of files written at once; defaults to :func:`os.cpu_count`.
+
+    Returns
+    -------
+
+    paths : :obj:`list` of :obj:`str`
+        The files written, in time order.
+    """
+    prefix = os.fspath(prefix)
+    fields = [name for (name, v) in ds.data_vars.items() if v.ndim >= 2]
+    if not fields:
+        raise DimensionError("wps.write: no data variable of `ds` is 2-D!")
+    names = [name for name in fields if len(str(name)) > 9]
+    if names:
+        raise ValueError(
+            f"wps.write: field names {names} are longer than 9 characters!")
+
+    grids = {ds[name].shape[-2:] for name in fields}
+    if len(grids) > 1:
+        raise DimensionError(
+            "wps.write: the data variables are not on the same grid!")
+
+    for name in fields:
+        extra = set(ds[name].dims[:-2]) - {time_dim, level_dim}
+        if extra:
+            raise DimensionError(
+                f"wps.write: `{name}` has dimensions {sorted(extra)} other "
+                "than time, level, y and x!")
+
+    projection = _projection(ds, projection)
+
+    if time_dim not in ds.coords:
+        raise ValueError(
+            f"wps.write: `ds` has no `{time_dim}` coordinate of the dates!")
+    if time_dim in ds.dims:
+        slices = [ds.isel({time_dim: i}) for i in range(ds.sizes[time_dim])]
+    else:
+        slices = [ds]
+
+    jobs = []
+    for slice_ in slices:
+        date = _wps_date(slice_[time_dim].values[()])
+        jobs.append((f"{prefix}:{date[:13]}", slice_.drop_vars(time_dim), date))
+
+    paths = [path for (path, _, _) in jobs]
+    if len(set(paths)) < len(paths):
+        raise ValueError("wps.write: dates are not unique to the hour!")
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_file, path, slice_, date, fields, level_dim,
+                        map_source, projection) for (path, slice_, date) in jobs
+        ]
+        return [future.result() for future in futures]
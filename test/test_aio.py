@@ -0,0 +1,142 @@
+import asyncio
+import sys
+import time
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (DimensionError, aio, linint2pts, profiling,
+                                 rcm2points)
+else:
+    from geocat.f2py import (DimensionError, aio, linint2pts, profiling,
+                             rcm2points)
+
+rng = np.random.default_rng(0)
+
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = rng.random((3, 73, 144))
+
+# Points of 8 requests
+points = [(rng.uniform(0, 357, 50), rng.uniform(-89, 89, 50)) for _ in range(8)]
+
+
+async def gather(*coroutines, **kwargs):
+    return await asyncio.gather(*coroutines, **kwargs)
+
+
+class Test_linint2pts(ut.TestCase):
+
+    def tearDown(self):
+        aio.configure(window=0)
+        aio.shutdown()
+
+    def test_results(self):
+        results = asyncio.run(
+            gather(*(aio.linint2pts(fi, xo, yo, True, xi=lon, yi=lat)
+                     for (xo, yo) in points)))
+        for ((xo, yo), fo) in zip(points, results):
+            nt.assert_array_equal(fo,
+                                  linint2pts(fi, xo, yo, True, xi=lon, yi=lat))
+
+    def test_coalesced(self):
+        with profiling.profile() as stats:
+            asyncio.run(
+                gather(*(aio.linint2pts(fi, xo, yo, True, xi=lon, yi=lat)
+                         for (xo, yo) in points)))
+        self.assertEqual(stats["linint2pts"]["validation"]["calls"], 1)
+
+    def test_window(self):
+
+        async def staggered(i, xo, yo):
+            await asyncio.sleep(0.01 * i)
+            return await aio.linint2pts(fi, xo, yo, True, xi=lon, yi=lat)
+
+        aio.configure(window=0.5)
+        with profiling.profile() as stats:
+            asyncio.run(
+                gather(*(staggered(i, *p) for (i, p) in enumerate(points))))
+        self.assertEqual(stats["linint2pts"]["validation"]["calls"], 1)
+
+    def test_other_sources(self):
+        # Another field, or other options, are another batch
+        with profiling.profile() as stats:
+            asyncio.run(
+                gather(aio.linint2pts(fi, *points[0], True, xi=lon, yi=lat),
+                       aio.linint2pts(fi + 1, *points[1], True, xi=lon, yi=lat),
+                       aio.linint2pts(fi, *points[2], False, xi=lon, yi=lat)))
+        self.assertEqual(stats["linint2pts"]["validation"]["calls"], 3)
+
+    def test_errors(self):
+        with self.assertRaises(DimensionError):
+            asyncio.run(aio.linint2pts(fi, lon[:3], lat[:4], xi=lon, yi=lat))
+
+        # Every request of a failed batch raises
+        results = asyncio.run(
+            gather(*(aio.linint2pts(fi, xo, yo) for (xo, yo) in points),
+                   return_exceptions=True))
+        self.assertEqual(len(results), 8)
+        for result in results:
+            self.assertIsInstance(result, Exception)
+
+    def test_event_loop_not_blocked(self):
+        big = rng.random((8, 721, 1440))
+        xo, yo = rng.uniform(0, 359, 200000), rng.uniform(-89, 89, 200000)
+
+        async def ticker(ticks, request):
+            while not request.done():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.001)
+
+        async def main():
+            ticks = []
+            start = time.perf_counter()
+            request = asyncio.ensure_future(
+                aio.linint2pts(big,
+                               xo,
+                               yo,
+                               xi=np.linspace(0, 359.75, 1440),
+                               yi=np.linspace(-90, 90, 721)))
+            await ticker(ticks, request)
+            await request
+            return np.diff([start] + ticks).max(), time.perf_counter() - start
+
+        gap, elapsed = asyncio.run(main())
+        self.assertLess(gap, 0.5 * elapsed)
+
+    def test_process_executor(self):
+        aio.configure("process", workers=1)
+        fo = asyncio.run(aio.linint2pts(fi, *points[0], True, xi=lon, yi=lat))
+        nt.assert_array_equal(fo,
+                              linint2pts(fi, *points[0], True, xi=lon, yi=lat))
+
+    def test_configure_errors(self):
+        with self.assertRaises(ValueError):
+            aio.configure("fiber")
+        with self.assertRaises(ValueError):
+            aio.configure(window=-1)
+
+
+class Test_rcm2points(ut.TestCase):
+
+    def test_results(self):
+        lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                                   np.linspace(100, 200, 30),
+                                   indexing="ij")
+        fi_curv = rng.random((2, 25, 30))
+        requests = [(rng.uniform(-30, 30, 20), rng.uniform(110, 190, 20))
+                    for _ in range(4)]
+
+        with profiling.profile() as stats:
+            results = asyncio.run(
+                gather(*(aio.rcm2points(lat2d, lon2d, fi_curv, lat1d, lon1d)
+                         for (lat1d, lon1d) in requests)))
+        self.assertEqual(stats["rcm2points"]["validation"]["calls"], 1)
+
+        for ((lat1d, lon1d), fo) in zip(requests, results):
+            nt.assert_array_equal(
+                fo, rcm2points(lat2d, lon2d, fi_curv, lat1d, lon1d))
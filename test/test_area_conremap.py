@@ -0,0 +1,133 @@
+import sys
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (BinningRegridder, CoordinateError,
+                                 DimensionError)
+    from src.geocat.f2py.fortran import (binning_get_global_lats_wgts,
+                                         cremapbin)
+else:
+    from geocat.f2py import BinningRegridder, CoordinateError, DimensionError
+    from geocat.f2py.fortran import binning_get_global_lats_wgts, cremapbin
+
+rng = np.random.default_rng(0)
+
+lon = np.arange(0, 360, 2.5)
+lat = np.linspace(-88.75, 88.75, 72)
+lon_out = np.arange(0, 360, 5.0)
+lat_out = np.linspace(-87.5, 87.5, 36)
+
+# T42 Gaussian grid
+lon_t42 = np.arange(128) * 2.8125
+lat_t42 = np.rad2deg(binning_get_global_lats_wgts(64)[0])
+
+fi = rng.random((3, 4, 72, 144))
+
+
+def reference(fi, loni, lati, lono, lato, nlat, nlato, bin_factor=1.0):
+    # CREMAPBIN of all the slices at once, on latitudes S->N
+    msg = 1e20
+    fi = np.where(np.isnan(fi), msg, fi).reshape((-1,) + fi.shape[-2:])
+    yy = cremapbin(np.transpose(fi), lati, loni, lato, lono, nlat, nlato,
+                   bin_factor, msg)
+    fo = np.transpose(yy).reshape(fi.shape[:-2] + lato.shape + lono.shape)
+    return np.where(fo == msg, np.nan, fo)
+
+
+class Test_BinningRegridder(ut.TestCase):
+
+    def test_fortran(self):
+        regrid = BinningRegridder(lon, lat, lon_out, lat_out)
+        fo = regrid(fi)
+        self.assertEqual(fo.shape, (3, 4, 36, 72))
+        self.assertEqual(regrid.weights()[1].shape, (36, 72))
+        nt.assert_allclose(fo.reshape(12, 36, 72),
+                           reference(fi, lon, lat, lon_out, lat_out, 72, 36),
+                           rtol=1e-12)
+
+    def test_bin_factor(self):
+        regrid = BinningRegridder(lon, lat, lon_out, lat_out, bin_factor=2.0)
+        nt.assert_allclose(regrid(fi).reshape(12, 36, 72),
+                           reference(fi, lon, lat, lon_out, lat_out, 72, 36,
+                                     2.0),
+                           rtol=1e-12)
+
+    def test_gaussian(self):
+        ft = rng.random((2, 64, 128))
+        regrid = BinningRegridder(lon_t42, lat_t42, lon_out, lat_out)
+        nt.assert_allclose(regrid(ft),
+                           reference(ft, lon_t42, lat_t42, lon_out, lat_out, 64,
+                                     36),
+                           rtol=1e-12)
+
+        # Regional Gaussian latitudes of a global grid
+        regrid = BinningRegridder(lon_t42,
+                                  lat_t42[10:50],
+                                  lon_out,
+                                  lat_out[8:28],
+                                  nlat=64)
+        nt.assert_allclose(regrid(ft[:, 10:50]),
+                           reference(ft[:, 10:50], lon_t42, lat_t42[10:50],
+                                     lon_out, lat_out[8:28], 64, 36),
+                           rtol=1e-12)
+
+        # Gaussian output
+        regrid = BinningRegridder(lon, lat, lon_t42, lat_t42)
+        nt.assert_allclose(regrid(fi[0]),
+                           reference(fi[0], lon, lat, lon_t42, lat_t42, 72, 64),
+                           rtol=1e-12)
+
+    def test_decreasing_lat(self):
+        regrid = BinningRegridder(lon, lat[::-1], lon_out, lat_out)
+        nt.assert_allclose(regrid(fi[..., ::-1, :]),
+                           BinningRegridder(lon, lat, lon_out, lat_out)(fi),
+                           rtol=1e-14)
+
+        regrid = BinningRegridder(lon, lat, lon_out, lat_out[::-1])
+        nt.assert_allclose(regrid(fi)[..., ::-1, :],
+                           BinningRegridder(lon, lat, lon_out, lat_out)(fi),
+                           rtol=1e-14)
+
+    def test_constant(self):
+        # Averages of a constant field are the constant
+        regrid = BinningRegridder(lon_t42, lat_t42, lon_out, lat_out)
+        nt.assert_allclose(regrid(np.full((64, 128), 3.0)), 3.0, rtol=1e-11)
+
+    def test_missing(self):
+        fm = fi.copy()
+        fm[0, 1, 3, 3] = np.nan
+        fm[2, 0, 70, 0] = -99.0
+
+        fo = BinningRegridder(lon, lat, lon_out, lat_out)(fm)
+        self.assertTrue(np.isnan(fo[0, 1]).all())
+        self.assertFalse(np.isnan(fo[2, 0]).any())
+        self.assertEqual(np.isnan(fo).sum(), 36 * 72)
+        nt.assert_array_equal(
+            np.isnan(fo.reshape(12, 36, 72)),
+            np.isnan(reference(fm, lon, lat, lon_out, lat_out, 72, 36)))
+
+        fo = BinningRegridder(lon, lat, lon_out, lat_out)(fm, msg_py=-99.0)
+        nt.assert_array_equal(fo[2, 0], -99.0)
+
+    def test_errors(self):
+        with self.assertRaises(CoordinateError):
+            BinningRegridder(lon[::-1], lat, lon_out, lat_out)
+        with self.assertRaises(CoordinateError):
+            # Neither regular nor Gaussian
+            BinningRegridder(lon,
+                             np.sort(rng.random(72)) * 90, lon_out, lat_out)
+        with self.assertRaises(CoordinateError):
+            BinningRegridder(lon_t42, lat_t42, lon_out, lat_out, nlat=32)
+        with self.assertRaises(ValueError):
+            BinningRegridder(lon, lat, lon_out, lat_out, bin_factor=0.5)
+        with self.assertRaises(DimensionError):
+            BinningRegridder(lon[:1], lat, lon_out, lat_out)
+
+        regrid = BinningRegridder(lon, lat, lon_out, lat_out)
+        with self.assertRaises(DimensionError):
+            regrid(fi[..., 1:])
@@ -0,0 +1,135 @@
+import sys
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (ConservativeRegridder, CoordinateError,
+                                 DimensionError, cache)
+    from src.geocat.f2py.fortran import arealinint2da
+else:
+    from geocat.f2py import (ConservativeRegridder, CoordinateError,
+                             DimensionError, cache)
+    from geocat.f2py.fortran import arealinint2da
+
+rng = np.random.default_rng(0)
+
+lon = np.arange(0, 360, 2.5)
+lat = np.linspace(-88.75, 88.75, 72)
+lon_out = np.arange(2.5, 360, 10.0)
+lat_out = np.linspace(-85, 85, 18)
+wyi = np.cos(np.deg2rad(lat))
+
+fi = rng.random((3, 4, 72, 144))
+
+
+def reference(fi, xi, yi, xo, yo, wyi=1.0, cyclic=False, critpc=100.0):
+    # ARELININT2DA, slice by slice
+    msg = 1e20
+    fi = np.where(np.isnan(fi), msg, fi)
+    wyi = np.broadcast_to(wyi, yi.shape).astype(np.float64)
+    fo = np.empty(fi.shape[:-2] + yo.shape + xo.shape)
+    for index in np.ndindex(fi.shape[:-2]):
+        zo, ier = arealinint2da(xi,
+                                yi,
+                                np.transpose(fi[index][None]),
+                                np.ones(xi.shape),
+                                wyi,
+                                xo,
+                                yo,
+                                zimsg=msg,
+                                mcyc=int(cyclic),
+                                critpc=critpc)
+        assert ier == 0
+        fo[index] = np.transpose(zo)[0]
+    return np.where(fo == msg, np.nan, fo)
+
+
+class Test_ConservativeRegridder(ut.TestCase):
+
+    def test_fortran(self):
+        regrid = ConservativeRegridder(lon, lat, lon_out, lat_out, wyi=wyi)
+        fo = regrid(fi)
+        self.assertEqual(fo.shape, (3, 4, 18, 36))
+        nt.assert_allclose(fo,
+                           reference(fi, lon, lat, lon_out, lat_out, wyi),
+                           rtol=1e-12)
+
+    def test_cyclic(self):
+        regrid = ConservativeRegridder(lon, lat, lon_out, lat_out, cyclic=True)
+        nt.assert_allclose(regrid(fi),
+                           reference(fi,
+                                     lon,
+                                     lat,
+                                     lon_out,
+                                     lat_out,
+                                     cyclic=True),
+                           rtol=1e-12)
+
+    def test_decreasing_y(self):
+        # Either or both of the y coordinates may be decreasing
+        for (yi, yo) in [(lat[::-1], lat_out[::-1]), (lat[::-1], lat_out),
+                         (lat, lat_out[::-1])]:
+            regrid = ConservativeRegridder(lon, yi, lon_out, yo)
+            nt.assert_allclose(regrid(fi),
+                               reference(fi, lon, yi, lon_out, yo),
+                               rtol=1e-12)
+
+    def test_missing(self):
+        fm = fi.copy()
+        fm[rng.random(fm.shape) < 0.05] = np.nan
+
+        for critpc in (100.0, 90.0, 0.0):
+            regrid = ConservativeRegridder(lon,
+                                           lat,
+                                           lon_out,
+                                           lat_out,
+                                           wyi=wyi,
+                                           critpc=critpc)
+            expected = reference(fm,
+                                 lon,
+                                 lat,
+                                 lon_out,
+                                 lat_out,
+                                 wyi,
+                                 critpc=critpc)
+            fo = regrid(fm)
+            nt.assert_array_equal(np.isnan(fo), np.isnan(expected))
+            nt.assert_allclose(fo, expected, rtol=1e-12)
+
+        # Some but not all of the output is missing at 90%
+        self.assertTrue(0 < np.isnan(regrid(fm, critpc=90.0)).sum() < fo.size)
+
+        # Missing values given by `msg_py`
+        fo = regrid(np.where(np.isnan(fm), -99.0, fm), msg_py=-99.0)
+        nt.assert_allclose(fo,
+                           np.where(np.isnan(expected), -99.0, expected),
+                           rtol=1e-12)
+
+    def test_weights_cache(self):
+        # The weights of each axis are shared, whatever `wyi`
+        cache.enable()
+        try:
+            ConservativeRegridder(lon, lat, lon_out, lat_out)
+            before = cache.stats()["weights"]["hits"]
+            ConservativeRegridder(lon, lat, lon_out, lat_out, wyi=wyi)
+            self.assertEqual(cache.stats()["weights"]["hits"], before + 2)
+        finally:
+            cache.disable()
+            cache.clear()
+
+    def test_errors(self):
+        with self.assertRaises(CoordinateError):
+            ConservativeRegridder(lon[::-1], lat, lon_out[::-1], lat_out)
+        with self.assertRaises(CoordinateError):
+            # Higher output resolution
+            ConservativeRegridder(lon_out, lat_out, lon, lat)
+        with self.assertRaises(DimensionError):
+            ConservativeRegridder(lon[:1], lat, lon_out, lat_out)
+
+        regrid = ConservativeRegridder(lon, lat, lon_out, lat_out)
+        with self.assertRaises(DimensionError):
+            regrid(fi[..., 1:])
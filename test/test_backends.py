@@ -0,0 +1,167 @@
+import os
+import subprocess
+import sys
+import unittest as ut
+from unittest import mock
+
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    package = "src.geocat.f2py"
+    from src.geocat.f2py import linint1, linint2, linint2pts, linint2_wrapper
+else:
+    package = "geocat.f2py"
+    from geocat.f2py import linint1, linint2, linint2pts, linint2_wrapper
+
+rng = np.random.default_rng(0)
+
+# Global grid, with missing values
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = rng.random((3, 2, 73, 144))
+fi[rng.random(fi.shape) < 0.1] = np.nan
+
+# Output grid and points beyond the input grid on all sides, with some exact
+# matches of the input coordinates
+lon_out = np.linspace(-2, 359.9, 211)
+lat_out = np.linspace(-91, 91, 97)
+lon_pts = np.concatenate((rng.uniform(-3, 362, 500), lon[:5], [lon[-1]]))
+lat_pts = np.concatenate((rng.uniform(-91, 91, 500), lat[:5], [lat[-1]]))
+
+
+def _both(func, *args, **kwargs):
+    # Outputs of `func` with the Fortran and the NumPy backends
+    return [
+        np.asarray(func(*args, **kwargs, backend=backend))
+        for backend in ("fortran", "numpy")
+    ]
+
+
+class Test_backend_equivalence(ut.TestCase):
+
+    def assert_equivalent(self, func, *args, **kwargs):
+        fo_fortran, fo_numpy = _both(func, *args, **kwargs)
+        nt.assert_allclose(fo_numpy, fo_fortran, rtol=1e-12, atol=0)
+
+    def test_linint1(self):
+        for icycx in (0, 1):
+            self.assert_equivalent(linint1, fi, lon_out, xi=lon, icycx=icycx)
+
+    def test_linint1_decreasing(self):
+        self.assert_equivalent(linint1,
+                               fi[..., ::-1],
+                               lon_out[::-1],
+                               xi=lon[::-1],
+                               icycx=1)
+
+    def test_linint2(self):
+        for icycx in (0, 1):
+            self.assert_equivalent(linint2,
+                                   fi,
+                                   lon_out,
+                                   lat_out,
+                                   xi=lon,
+                                   yi=lat,
+                                   icycx=icycx)
+
+    def test_linint2_decreasing(self):
+        self.assert_equivalent(linint2,
+                               fi[..., ::-1, :],
+                               lon_out,
+                               lat_out[::-1],
+                               xi=lon,
+                               yi=lat[::-1],
+                               icycx=1)
+
+    def test_linint2_msg(self):
+        fi_msg = np.where(np.isnan(fi), -99, np.round(fi * 100)).astype(int)
+        fo_fortran, fo_numpy = _both(linint2,
+                                     fi_msg,
+                                     lon_out,
+                                     lat_out,
+                                     xi=lon,
+                                     yi=lat,
+                                     msg_py=-99)
+        nt.assert_allclose(fo_numpy, fo_fortran, rtol=1e-12, atol=0)
+        self.assertTrue((fo_numpy == -99).any())
+
+    def test_linint2_float32(self):
+        self.assert_equivalent(linint2,
+                               fi.astype(np.float32),
+                               lon_out,
+                               lat_out,
+                               xi=lon,
+                               yi=lat)
+
+    def test_linint2pts(self):
+        for icycx in (0, 1):
+            self.assert_equivalent(linint2pts,
+                                   fi,
+                                   lon_pts,
+                                   lat_pts,
+                                   icycx=icycx,
+                                   xi=lon,
+                                   yi=lat)
+
+    def test_linint2pts_msg(self):
+        self.assert_equivalent(linint2pts,
+                               np.nan_to_num(fi, nan=-99),
+                               lon_pts,
+                               lat_pts,
+                               msg_py=-99,
+                               xi=lon,
+                               yi=lat)
+
+    def test_dask_input(self):
+        fi_xr = xr.DataArray(fi,
+                             dims=("time", "level", "lat", "lon"),
+                             coords={
+                                 "lat": lat,
+                                 "lon": lon
+                             }).chunk({"time": 1})
+
+        fo = linint2(fi_xr, lon_out, lat_out, backend="numpy")
+        self.assertEqual(fo.chunks, fi_xr.chunks[:2] + ((97,), (211,)))
+        nt.assert_allclose(fo.values,
+                           linint2(fi, lon_out, lat_out, xi=lon, yi=lat),
+                           rtol=1e-12)
+
+
+class Test_backend_selection(ut.TestCase):
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            linint2(fi, lon_out, lat_out, xi=lon, yi=lat, backend="cuda")
+
+    def test_without_fortran(self):
+        # As if the compiled extension was missing
+        with mock.patch.object(linint2_wrapper, "dlinint2mg", None):
+            fo = linint2(fi, lon_out, lat_out, xi=lon, yi=lat)
+            with self.assertRaises(ImportError):
+                linint2(fi, lon_out, lat_out, xi=lon, yi=lat, backend="fortran")
+
+        nt.assert_allclose(fo,
+                           linint2(fi, lon_out, lat_out, xi=lon, yi=lat),
+                           rtol=1e-12)
+
+    def test_import_without_extensions(self):
+        # None in `sys.modules` makes importing the extensions fail
+        blocked = "; ".join(f"sys.modules['{package}.fortran.{name}'] = None"
+                            for name in ("linint2", "omp"))
+        script = (f"import sys; {blocked}\n"
+                  "import numpy as np\n"
+                  f"from {package} import linint1\n"
+                  "x = np.arange(2.0)\n"
+                  "print(linint1(x, x[:1] + 0.5, xi=x)[0])")
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        out = subprocess.run([sys.executable, "-c", script],
+                             env=env,
+                             capture_output=True,
+                             text=True,
+                             check=True)
+        self.assertEqual(out.stdout.strip(), "0.5")
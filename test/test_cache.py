@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import cache, linint2, rcm2rgrid
+else:
+    from geocat.f2py import cache, linint2, rcm2rgrid
+
+rng = np.random.default_rng(0)
+
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = rng.random((3, 73, 144))
+
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+
+class Test_cache(ut.TestCase):
+
+    def tearDown(self):
+        cache.disable()
+        cache.clear()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(cache.is_enabled())
+        self.assertIsNone(cache.key("weights", fi))
+
+        linint2(fi, lon_out, lat_out, lon, lat, 1, backend="numpy")
+        self.assertEqual(cache.stats()["memory"]["entries"], 0)
+
+    def test_results(self):
+        cache.enable(results=True)
+        expected = linint2(fi, lon_out, lat_out, lon, lat, 1)
+
+        fo = linint2(fi, lon_out, lat_out, lon, lat, 1)
+        nt.assert_array_equal(fo, expected)
+        self.assertEqual(cache.stats()["results"], {"hits": 1, "misses": 1})
+
+        # Returned arrays are the caller's own
+        fo[...] = 0
+        nt.assert_array_equal(linint2(fi, lon_out, lat_out, lon, lat, 1),
+                              expected)
+
+        # Any other input is another entry
+        linint2(fi + 1, lon_out, lat_out, lon, lat, 1)
+        linint2(fi, lon_out, lat_out, lon, lat, 0)
+        self.assertEqual(cache.stats()["results"], {"hits": 2, "misses": 3})
+
+    def test_results_rcm2rgrid(self):
+        lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                                   np.linspace(100, 200, 30),
+                                   indexing="ij")
+        fi_curv = rng.random((2, 25, 30))
+        lat1d = np.linspace(-30, 30, 20)
+        lon1d = np.linspace(110, 190, 25)
+
+        cache.enable(results=True)
+        expected = rcm2rgrid(lat2d, lon2d, fi_curv, lat1d, lon1d)
+        nt.assert_array_equal(rcm2rgrid(lat2d, lon2d, fi_curv, lat1d, lon1d),
+                              expected)
+        self.assertEqual(cache.stats()["results"], {"hits": 1, "misses": 1})
+
+    def test_weights(self):
+        cache.enable()
+        expected = linint2(fi, lon_out, lat_out, lon, lat, 1, backend="numpy")
+
+        # The weights of both dimensions are reused for other data
+        fo = linint2(fi * 2, lon_out, lat_out, lon, lat, 1, backend="numpy")
+        nt.assert_array_equal(fo, expected * 2)
+        self.assertEqual(cache.stats()["weights"], {"hits": 2, "misses": 2})
+        self.assertEqual(cache.stats()["results"], {"hits": 0, "misses": 0})
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache.enable(directory=directory, results=True)
+            expected = linint2(fi, lon_out, lat_out, lon, lat, 1)
+            self.assertEqual(cache.stats()["disk"]["entries"], 1)
+
+            # Entries on disk outlive those in memory
+            cache.clear()
+            nt.assert_array_equal(linint2(fi, lon_out, lat_out, lon, lat, 1),
+                                  expected)
+            self.assertEqual(cache.stats()["results"], {"hits": 1, "misses": 0})
+
+            cache.clear(disk=True)
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_memory_eviction(self):
+        a, b = np.zeros(100), np.ones(100)
+        cache.enable(memory=1000)
+
+        cache.put("weights", cache.key("weights", "a"), a)
+        cache.put("weights", cache.key("weights", "b"), b)
+        self.assertIsNone(cache.get("weights", cache.key("weights", "a")))
+        nt.assert_array_equal(cache.get("weights", cache.key("weights", "b")),
+                              b)
+        self.assertEqual(cache.stats()["memory"], {"entries": 1, "nbytes": 800})
+
+    def test_disk_eviction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache.enable(directory=directory, disk=2000)
+
+            # Each file is older than the next one
+            for (i, name) in enumerate(("a", "b", "c")):
+                k = cache.key("weights", name)
+                cache.put("weights", k, np.zeros(100))
+                os.utime(os.path.join(directory, k + ".npz"), times=(i, i))
+
+            # Only the most recently used file fits
+            self.assertEqual(os.listdir(directory),
+                             [cache.key("weights", "c") + ".npz"])
+
+    def test_tuple_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache.enable(directory=directory)
+            value = (np.arange(3), np.array([True, False]))
+            k = cache.key("weights", "tuple", np.arange(3))
+
+            cache.put("weights", k, value)
+            cache.clear()
+            loaded = cache.get("weights", k)
+            self.assertIsInstance(loaded, tuple)
+            for (x, y) in zip(loaded, value):
+                nt.assert_array_equal(x, y)
+                self.assertFalse(x.flags.writeable)
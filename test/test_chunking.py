@@ -0,0 +1,233 @@
+import sys
+import unittest as ut
+
+import dask
+import dask.array as da
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (ChunkError, chunking, linint2, rcm2points,
+                                 rcm2rgrid, rgrid2rcm, triple_to_grid)
+else:
+    from geocat.f2py import (ChunkError, chunking, linint2, rcm2points,
+                             rcm2rgrid, rgrid2rcm, triple_to_grid)
+
+rng = np.random.default_rng(0)
+
+# Smooth field on a global grid, with missing values
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = np.cos(np.deg2rad(lat))[:, None] * np.sin(np.deg2rad(2 * lon))
+fi = np.stack([fi * (k + 1) for k in range(6)]) + rng.random((6, 73, 144)) / 10
+fi[:, 10:14, 30:40] = np.nan
+
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+# Curvilinear grid around the center of the global grid
+lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                           np.linspace(100, 200, 30),
+                           indexing="ij")
+lat2d = lat2d + 2 * np.sin(np.deg2rad(lon2d))
+fi_curv = np.cos(np.deg2rad(lat2d)) * np.sin(np.deg2rad(2 * lon2d))
+fi_curv = np.stack([fi_curv * (k + 1) for k in range(6)]).reshape(2, 3, 25, 30)
+
+
+class Test_plan_chunks(ut.TestCase):
+
+    def test_budget_split(self):
+        # 10 slices of 8 * (100 + 50) bytes fit in 12000 bytes
+        self.assertEqual(
+            chunking.plan_chunks((40, 10, 10), 2, 50, budget=12000),
+            (10, 10, 10))
+
+    def test_balanced_chunks(self):
+        # 7 slices fit, so 4 chunks of 6 or 5 slices rather than 7+7+7+2
+        self.assertEqual(chunking.plan_chunks((23, 10, 10), 2, 50, budget=8400),
+                         (6, 10, 10))
+
+    def test_rightmost_leading_dims_first(self):
+        self.assertEqual(
+            chunking.plan_chunks((4, 5, 10, 10), 2, 50, budget=12000),
+            (2, 5, 10, 10))
+        self.assertEqual(
+            chunking.plan_chunks((4, 50, 10, 10), 2, 50, budget=12000),
+            (1, 10, 10, 10))
+
+    def test_slice_over_budget(self):
+        self.assertEqual(chunking.plan_chunks((4, 10, 10), 2, 50, budget=1),
+                         (1, 10, 10))
+
+    def test_whole_input(self):
+        self.assertEqual(chunking.plan_chunks((4, 10, 10), 2, 50), (4, 10, 10))
+
+    def test_no_leading_dims(self):
+        self.assertEqual(chunking.plan_chunks((10, 10), 2, 50, budget=1),
+                         (10, 10))
+
+    def test_existing_chunks_kept(self):
+        chunks = da.zeros((40, 10, 10), chunks=(3, 5, 10)).chunks
+        self.assertEqual(
+            chunking.plan_chunks((40, 10, 10), 2, 50, chunks, budget=1),
+            chunks[:1] + (10, 10))
+
+    def test_chunk_budget(self):
+        with dask.config.set({"array.chunk-size": "1KiB"}):
+            self.assertEqual(chunking.chunk_budget(), 1024)
+
+
+def _coarsen(block, factor):
+    # Means of `factor` by `factor` boxes of the slices of `block`
+    shape = block.shape[:-2] + (block.shape[-2] // factor, factor,
+                                block.shape[-1] // factor, factor)
+    return block.reshape(shape).mean(axis=(-3, -1))
+
+
+def _zonal_mean(block):
+    return block.mean(axis=-1)
+
+
+class Test_apply_blocks(ut.TestCase):
+
+    def setUp(self):
+        self.fi = xr.DataArray(rng.random((4, 3, 6, 8)),
+                               dims=("time", "lev", "lat", "lon"),
+                               coords={
+                                   "time": np.arange(4),
+                                   "lat": np.arange(6),
+                                   "lon": np.arange(8),
+                                   "area": (("lat", "lon"), np.ones((6, 8)))
+                               },
+                               attrs={"units": "K"})
+        self.expected = _coarsen(self.fi.values, 2)
+
+    def apply(self, fi, **kwargs):
+        return chunking.apply_blocks(_coarsen, fi, 2, (3, 4), (2,), "coarsen",
+                                     "coarsen", **kwargs)
+
+    def test_numpy(self):
+        # Split according to the budget, and computed
+        for budget in ("1B", "128MiB"):
+            with dask.config.set({"array.chunk-size": budget}):
+                fo = self.apply(self.fi.values)
+            self.assertIsInstance(fo, np.ndarray)
+            nt.assert_array_equal(fo, self.expected)
+
+    def test_xarray(self):
+        fo = self.apply(self.fi, coords=(np.arange(3), None))
+        self.assertIsInstance(fo.data, np.ndarray)
+        self.assertEqual(fo.dims, self.fi.dims)
+        self.assertEqual(fo.attrs, {"units": "K"})
+        self.assertEqual(set(fo.coords), {"time", "lat"})
+        nt.assert_array_equal(fo.lat, np.arange(3))
+        nt.assert_array_equal(fo, self.expected)
+
+    def test_dask(self):
+        fo = self.apply(self.fi.chunk({"time": 1, "lev": 2}))
+        self.assertIsInstance(fo.data, da.Array)
+        self.assertEqual(fo.data.chunks, ((1, 1, 1, 1), (2, 1), (3,), (4,)))
+        nt.assert_array_equal(fo, self.expected)
+
+        with self.assertRaises(ChunkError):
+            self.apply(self.fi.chunk({"lon": 4}))
+
+    def test_core_dims(self):
+        # Output slices of another number of dimensions
+        fo = chunking.apply_blocks(_zonal_mean,
+                                   self.fi,
+                                   core_ndim=2,
+                                   out_core_shape=(6,),
+                                   args=(),
+                                   name="zonal_mean",
+                                   caller="zonal_mean",
+                                   dims=("y",))
+        self.assertEqual(fo.dims, ("time", "lev", "y"))
+        nt.assert_array_equal(fo, self.fi.values.mean(axis=-1))
+
+
+class Test_wrappers(ut.TestCase):
+
+    def _dask_chunked(self, func, budget, *args, **kwargs):
+        # Result and number of chunks of a lazy output of `func`
+        with dask.config.set({"array.chunk-size": budget}):
+            fo = func(*args, **kwargs)
+        return fo.values, fo.data.numblocks
+
+    def test_linint2_budget(self):
+        expected = linint2(fi, lon_out, lat_out, lon, lat, 1)
+
+        # Unchunked inputs are split according to the budget
+        for budget in ("1B", "260KB"):
+            with dask.config.set({"array.chunk-size": budget}):
+                nt.assert_array_equal(
+                    linint2(fi, lon_out, lat_out, lon, lat, 1), expected)
+
+    def test_linint2_existing_chunks(self):
+        fi_xr = xr.DataArray(fi,
+                             dims=("time", "lat", "lon"),
+                             coords={
+                                 "lat": lat,
+                                 "lon": lon
+                             }).chunk({"time": 4})
+        expected = linint2(fi, lon_out, lat_out, lon, lat, 1)
+
+        fo, numblocks = self._dask_chunked(linint2,
+                                           "1B",
+                                           fi_xr,
+                                           lon_out,
+                                           lat_out,
+                                           icycx=1)
+        self.assertEqual(numblocks, (2, 1, 1))
+        nt.assert_array_equal(fo, expected)
+
+    def test_triple_to_grid_budget(self):
+        x_in = rng.uniform(0, 360, 500)
+        y_in = rng.uniform(-90, 90, 500)
+        data = np.stack([np.sin(np.deg2rad(x_in)) * (k + 1) for k in range(6)
+                        ]).reshape(2, 3, 500)
+
+        expected = triple_to_grid(data, x_in, y_in, lon_out, lat_out)
+        for budget in ("1B", "100KB"):
+            with dask.config.set({"array.chunk-size": budget}):
+                fo = triple_to_grid(data, x_in, y_in, lon_out, lat_out)
+            self.assertEqual(fo.shape, (2, 3, 61, 97))
+            nt.assert_array_equal(fo, expected)
+
+    def test_rcm2rgrid_leading_dims(self):
+        lat1d = np.linspace(-30, 30, 20)
+        lon1d = np.linspace(110, 190, 25)
+
+        fo = rcm2rgrid(lat2d, lon2d, fi_curv, lat1d, lon1d)
+        self.assertEqual(fo.shape, (2, 3, 20, 25))
+        for (i, j) in np.ndindex(2, 3):
+            nt.assert_array_equal(
+                fo[i, j],
+                rcm2rgrid(lat2d, lon2d, fi_curv[i, j][None], lat1d, lon1d)[0])
+
+        with dask.config.set({"array.chunk-size": "1B"}):
+            nt.assert_array_equal(
+                rcm2rgrid(lat2d, lon2d, fi_curv, lat1d, lon1d), fo)
+
+    def test_rgrid2rcm_leading_dims(self):
+        fi_rect = fi[:, ::2, ::2].reshape(2, 3, 37, 72)
+        lat1d, lon1d = lat[::2], lon[::2]
+
+        fo = rgrid2rcm(lat1d, lon1d, fi_rect, lat2d, lon2d)
+        self.assertEqual(fo.shape, (2, 3, 25, 30))
+        with dask.config.set({"array.chunk-size": "1B"}):
+            nt.assert_array_equal(
+                rgrid2rcm(lat1d, lon1d, fi_rect, lat2d, lon2d), fo)
+
+    def test_rcm2points_leading_dims(self):
+        lat1d = rng.uniform(-30, 30, 40)
+        lon1d = rng.uniform(110, 190, 40)
+
+        fo = rcm2points(lat2d, lon2d, fi_curv, lat1d, lon1d)
+        self.assertEqual(fo.shape, (2, 3, 40))
+        with dask.config.set({"array.chunk-size": "1B"}):
+            nt.assert_array_equal(
+                rcm2points(lat2d, lon2d, fi_curv, lat1d, lon1d), fo)
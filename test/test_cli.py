@@ -0,0 +1,140 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest as ut
+
+import dask
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import cache, cli, linint2, rcm2rgrid
+else:
+    from geocat.f2py import cache, cli, linint2, rcm2rgrid
+
+rng = np.random.default_rng(0)
+
+ds = xr.Dataset(
+    {
+        "t": (("time", "lat", "lon"), rng.random((10, 73, 144))),
+        "hgt": (("lat", "lon"), rng.random((73, 144))),
+        "time_bnds": (("time", "nbnd"), rng.random((10, 2))),
+    },
+    coords={
+        "time": np.arange(10.0),
+        "lat": np.linspace(-90, 90, 73),
+        "lon": np.linspace(0, 357.5, 144)
+    },
+)
+
+lat_out, lon_out = np.linspace(-89, 89, 90), np.linspace(0, 358, 180)
+
+has_netcdf = any(
+    importlib.util.find_spec(m) for m in ("netCDF4", "h5netcdf", "scipy"))
+
+
+def regrid(block):
+    return linint2(block, lon_out, lat_out, icycx=1)
+
+
+class Test_parse_grid(ut.TestCase):
+
+    def test_ranges(self):
+        lat, lon = cli.parse_grid("-89:89:2,0:358:2")
+        nt.assert_array_equal(lat, lat_out)
+        nt.assert_array_equal(lon, lon_out)
+
+    def test_invalid(self):
+        for spec in ("-89:89:2", "-89:89:0,0:358:2", "a:b:c,0:1:1"):
+            with self.assertRaises(ValueError):
+                cli.parse_grid(spec)
+
+
+class Test_stream(ut.TestCase):
+
+    def test_blocks(self):
+        with dask.config.set(scheduler="synchronous"):
+            out = cli.stream(ds, regrid, "time", 3)
+
+            # One chunk per block, along the time dimension only
+            self.assertEqual(out["t"].chunks, ((3, 3, 3, 1), (90,), (180,)))
+            self.assertEqual(out["time_bnds"].chunks, ((3, 3, 3, 1), (2,)))
+            xr.testing.assert_identical(out.compute(), regrid(ds))
+
+    def test_no_time_dim(self):
+        out = cli.stream(ds.isel(time=0, drop=True), regrid, "time", 3)
+        xr.testing.assert_identical(out, regrid(ds.isel(time=0, drop=True)))
+
+        # A known first time step is not regridded again
+        first = regrid(ds.isel(time=0, drop=True))
+        out = cli.stream(ds.isel(time=0, drop=True),
+                         lambda ds: self.fail("regridded again"), "time", 3,
+                         first)
+        self.assertIs(out, first)
+
+    def test_rcm2rgrid(self):
+        lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                                   np.linspace(100, 200, 30),
+                                   indexing="ij")
+        lat2d = xr.DataArray(lat2d, dims=("y", "x"))
+        lon2d = xr.DataArray(lon2d, dims=("y", "x"))
+        lat1d, lon1d = np.linspace(-30, 30, 20), np.linspace(110, 190, 25)
+        ds_curv = xr.Dataset(
+            {"t": (("time", "y", "x"), rng.random((5, 25, 30)))})
+
+        def regrid_curv(block):
+            return rcm2rgrid(lat2d, lon2d, block, lat1d, lon1d)
+
+        with dask.config.set(scheduler="synchronous"):
+            out = cli.stream(ds_curv, regrid_curv, "time", 2)
+            xr.testing.assert_identical(out.compute(), regrid_curv(ds_curv))
+
+    def test_plan_steps(self):
+        first = regrid(ds.isel(time=slice(0, 1)))
+
+        # Per time step: 3 copies of 73 * 144 + 90 * 180 + 2 + 2 float64
+        per_step = 3 * 8 * (73 * 144 + 90 * 180 + 4) + 1
+        self.assertEqual(cli.plan_steps(ds, first, "time", 8 * per_step, 2), 4)
+        self.assertEqual(cli.plan_steps(ds, first, "time", 1, 2), 1)
+        self.assertEqual(cli.plan_steps(ds, first, "time", 2**40, 2), 10)
+
+
+class Test_main(ut.TestCase):
+
+    def tearDown(self):
+        cache.disable()
+        cache.clear()
+
+    def test_no_inputs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(SystemExit) as cm:
+                cli.main([
+                    os.path.join(directory, "*.nc"), "--grid=-89:89:2,0:358:2",
+                    "--output", directory, "--quiet"
+                ])
+            self.assertEqual(cm.exception.code, 2)
+
+    @ut.skipUnless(has_netcdf, "requires a netCDF engine")
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for k in range(2):
+                ds.to_netcdf(os.path.join(directory, f"h{k}.nc"))
+
+            out_dir = os.path.join(directory, "out")
+            args = [
+                os.path.join(directory, "h*.nc"), "--grid=-89:89:2,0:358:2",
+                "--cyclic", "--output", out_dir, "--memory", "1MiB", "--quiet"
+            ]
+            self.assertEqual(cli.main(args), 0)
+
+            self.assertEqual(sorted(os.listdir(out_dir)),
+                             ["h0_regrid.nc", "h1_regrid.nc"])
+            with xr.open_dataset(os.path.join(out_dir, "h1_regrid.nc")) as out:
+                xr.testing.assert_allclose(out, regrid(ds))
+
+            # Existing outputs are skipped
+            self.assertEqual(cli.main(args), 0)
@@ -0,0 +1,135 @@
+import sys
+import unittest as ut
+
+import dask.array as da
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (DimensionError, linint2, profiling, rcm2rgrid,
+                                 triple_to_grid)
+else:
+    from geocat.f2py import (DimensionError, linint2, profiling, rcm2rgrid,
+                             triple_to_grid)
+
+rng = np.random.default_rng(0)
+
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+# Variables on the grid, with and without leading dimensions, another type,
+# and variables not on it
+ds = xr.Dataset(
+    {
+        "t": (("time", "lev", "lat", "lon"), rng.random((2, 3, 73, 144))),
+        "ps": (("time", "lat", "lon"), rng.random((2, 73, 144))),
+        "sst": (("lat", "lon"), rng.random((73, 144)).astype(np.float32)),
+        "time_bnds": (("time", "nbnd"), rng.random((2, 2))),
+        "lat_bnds": (("lat", "nbnd"), rng.random((73, 2))),
+    },
+    coords={
+        "time": [0.0, 1.0],
+        "lat": lat,
+        "lon": lon
+    },
+    attrs={"title": "history"},
+)
+ds["t"].attrs["units"] = "K"
+
+
+class Test_linint2(ut.TestCase):
+
+    def test_variables(self):
+        out = linint2(ds, lon_out, lat_out, icycx=1)
+
+        self.assertEqual(list(out.data_vars), ["t", "ps", "sst", "time_bnds"])
+        for name in ("t", "ps", "sst"):
+            expected = linint2(ds[name], lon_out, lat_out, icycx=1)
+            self.assertEqual(out[name].dims, expected.dims)
+            nt.assert_array_equal(out[name], expected)
+
+        nt.assert_array_equal(out["time_bnds"], ds["time_bnds"])
+        nt.assert_array_equal(out["lat"], lat_out)
+        nt.assert_array_equal(out["time"], ds["time"])
+        self.assertEqual(out["t"].attrs, {"units": "K"})
+        self.assertEqual(out.attrs, ds.attrs)
+
+    def test_single_call_per_group(self):
+        with profiling.profile() as stats:
+            linint2(ds, lon_out, lat_out, icycx=1)
+
+        # One for the float64 variables, one for the float32 one
+        self.assertEqual(stats["linint2"]["validation"]["calls"], 2)
+
+    def test_dask(self):
+        out = linint2(ds.chunk({"time": 1}), lon_out, lat_out, icycx=1)
+        self.assertIsInstance(out["t"].data, da.Array)
+        nt.assert_array_equal(out["t"],
+                              linint2(ds["t"], lon_out, lat_out, icycx=1))
+
+    def test_zonal_mean(self):
+        # A (time, lat) variable is not on the grid, whatever its coordinates
+        dz = ds.assign(zm=ds["ps"].mean("lon"))
+        out = linint2(dz, lon_out, lat_out, icycx=1)
+        self.assertEqual(list(out.data_vars), ["t", "ps", "sst", "time_bnds"])
+        nt.assert_array_equal(out["ps"],
+                              linint2(ds["ps"], lon_out, lat_out, icycx=1))
+
+        # Nor on the grid of `xi` and `yi`
+        xr.testing.assert_identical(
+            linint2(dz, lon_out, lat_out, icycx=1, xi=dz.lon, yi=dz.lat), out)
+
+    def test_no_variable_on_grid(self):
+        with self.assertRaises(DimensionError):
+            linint2(ds[["time_bnds"]], lon_out, lat_out)
+
+
+class Test_rcm2rgrid(ut.TestCase):
+
+    def test_variables(self):
+        lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                                   np.linspace(100, 200, 30),
+                                   indexing="ij")
+        lat1d = np.linspace(-30, 30, 20)
+        lon1d = np.linspace(110, 190, 25)
+        ds_curv = xr.Dataset({
+            "t": (("time", "y", "x"), rng.random((4, 25, 30))),
+            "hgt": (("y", "x"), rng.random((25, 30))),
+            "u": (("time", "y", "x_stag"), rng.random((4, 25, 31))),
+        })
+
+        out = rcm2rgrid(lat2d, lon2d, ds_curv, lat1d, lon1d)
+        self.assertEqual(list(out.data_vars), ["t", "hgt"])
+        for name in ("t", "hgt"):
+            nt.assert_array_equal(
+                out[name],
+                rcm2rgrid(lat2d, lon2d, ds_curv[name].values, lat1d, lon1d))
+        nt.assert_array_equal(out["y"], lat1d)
+
+
+class Test_triple_to_grid(ut.TestCase):
+
+    def test_variables(self):
+        x_in = xr.DataArray(rng.uniform(0, 360, 500), dims="ncol")
+        y_in = xr.DataArray(rng.uniform(-90, 90, 500), dims="ncol")
+        ds_pts = xr.Dataset({
+            "t": (("time", "ncol"), rng.random((3, 500))),
+            "ps": (("ncol",), rng.random(500)),
+        })
+        x_out = xr.DataArray(lon_out, dims="lon")
+        y_out = xr.DataArray(lat_out, dims="lat")
+
+        out = triple_to_grid(ds_pts, x_in, y_in, x_out, y_out)
+        self.assertEqual(out["t"].dims, ("time", "lat", "lon"))
+        nt.assert_array_equal(
+            out["t"],
+            triple_to_grid(ds_pts["t"].values, x_in, y_in, x_out, y_out))
+        nt.assert_array_equal(
+            out["ps"],
+            triple_to_grid(ds_pts["ps"].values[None], x_in, y_in, x_out,
+                           y_out)[0])
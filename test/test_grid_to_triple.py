@@ -7,9 +7,9 @@ import xarray as xr
 # Import from directory structure if coverage test, or from installed
 # packages otherwise
 if "--cov" in str(sys.argv):
-    from src.geocat.f2py import grid_to_triple
+    from src.geocat.f2py import grid_to_triple, grid_to_triple_blocks
 else:
-    from geocat.f2py import grid_to_triple
+    from geocat.f2py import grid_to_triple, grid_to_triple_blocks
 
 # Size of the grids
 ny = 2
@@ -119,3 +119,91 @@ class Test_grid_to_triple_float32(ut.TestCase):
                              y.astype(np.float32),
                              msg_py=-99)
         np.testing.assert_array_equal(out_expected_msg.astype(np.float32), out)
+
+
+class Test_grid_to_triple_nd(ut.TestCase):
+
+    def test_grid_to_triple_3d(self):
+        data_3d = np.stack((data, data_nan))
+        out = grid_to_triple(data_3d, x, y)
+
+        np.testing.assert_array_equal((4, 6 + 4), out.shape)
+        np.testing.assert_array_equal(out_expected, out[:3, :6])
+        np.testing.assert_array_equal(out_expected_msg, out[:3, 6:])
+        np.testing.assert_array_equal([0] * 6 + [1] * 4, out[3])
+
+    def test_grid_to_triple_3d_msg_fort(self):
+        # The Fortran missing value is missing too, whatever `msg_py`
+        data_max = data.copy()
+        data_max[0, 0] = np.finfo(np.float64).max
+        out = grid_to_triple(np.stack((data_max, data_msg)), x, y, msg_py=-99.)
+
+        np.testing.assert_array_equal((4, 5 + 4), out.shape)
+        np.testing.assert_array_equal(out_expected[:, 1:], out[:3, :5])
+        np.testing.assert_array_equal(out_expected_msg, out[:3, 5:])
+
+    def test_grid_to_triple_4d_xr_chunked(self):
+        data_4d = np.stack((data, data_nan, data_msg)).reshape((3, 1, ny, mx))
+        data_xr = xr.DataArray(
+            data_4d,
+            coords={
+                'lat': y,
+                'lon': x,
+            },
+            dims=['time', 'level', 'lat', 'lon'],
+        )
+
+        out = grid_to_triple(data_xr)
+        out_chunked = grid_to_triple(data_xr.chunk({'time': 2, 'lon': 1}))
+
+        np.testing.assert_array_equal((5, 6 + 4 + 6), out.shape)
+        np.testing.assert_array_equal(out.values, out_chunked.values)
+        np.testing.assert_array_equal([0] * 6 + [1] * 4 + [2] * 6, out[3])
+        np.testing.assert_array_equal(np.zeros(16), out[4])
+
+
+class Test_grid_to_triple_blocks(ut.TestCase):
+
+    def test_grid_to_triple_blocks_rows(self):
+        tables = list(grid_to_triple_blocks(data_nan, x, y, rows=1))
+
+        np.testing.assert_equal(2, len(tables))
+        np.testing.assert_array_equal(out_expected_msg,
+                                      np.concatenate(tables, axis=1))
+
+    def test_grid_to_triple_blocks_dask(self):
+        data_3d = xr.DataArray(
+            np.stack((data, data_nan)),
+            coords={
+                'lat': y,
+                'lon': x,
+            },
+            dims=['time', 'lat', 'lon'],
+        ).chunk({'time': 1})
+
+        tables = list(grid_to_triple_blocks(data_3d))
+
+        np.testing.assert_equal(2, len(tables))
+        np.testing.assert_array_equal(grid_to_triple(data_3d.values, x, y),
+                                      np.concatenate(tables, axis=1))
+
+    def test_grid_to_triple_dask_rows(self):
+        # Chunks of several leading slices and of split rows
+        data_3d = np.arange(24.0).reshape((2, 4, 3))
+        data_xr = xr.DataArray(
+            data_3d,
+            coords={
+                'lat': np.arange(4.0),
+                'lon': x,
+            },
+            dims=['time', 'lat', 'lon'],
+        ).chunk({
+            'time': 2,
+            'lat': 1
+        })
+
+        expected = grid_to_triple(data_3d, x, np.arange(4.0))
+        np.testing.assert_array_equal(expected, grid_to_triple(data_xr))
+        np.testing.assert_array_equal(
+            expected,
+            np.concatenate(list(grid_to_triple_blocks(data_xr)), axis=1))
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import unittest as ut
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    package = "src.geocat.f2py"
+else:
+    package = "geocat.f2py"
+
+
+def _loaded_after(code):
+    # Modules loaded by `code` in a fresh interpreter, which sees the same
+    # packages as this one
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    script = f"import sys\n{code}\nprint(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", script],
+                         env=env,
+                         capture_output=True,
+                         text=True,
+                         check=True)
+    return set(out.stdout.split())
+
+
+class Test_lazy_imports(ut.TestCase):
+
+    def test_package_import(self):
+        loaded = _loaded_after(f"import {package}")
+
+        self.assertNotIn("dask", loaded)
+        self.assertNotIn("xarray", loaded)
+        self.assertNotIn(f"{package}.linint2_wrapper", loaded)
+        self.assertFalse(
+            [m for m in loaded if m.startswith(f"{package}.fortran.")])
+
+    def test_single_function(self):
+        loaded = _loaded_after(f"from {package} import linint1")
+
+        self.assertIn(f"{package}.fortran.linint2", loaded)
+        self.assertNotIn(f"{package}.fortran.moc_loops", loaded)
+        self.assertNotIn(f"{package}.triple_to_grid_wrapper", loaded)
+
+    def test_attributes(self):
+        if "--cov" in str(sys.argv):
+            import src.geocat.f2py as f2py
+        else:
+            import geocat.f2py as f2py
+
+        self.assertTrue(callable(f2py.rcm2points))
+        self.assertIn("triple_to_grid", dir(f2py))
+        self.assertIn("moc_globe_atl", f2py.__all__)
+        self.assertFalse(hasattr(f2py, "not_a_function"))
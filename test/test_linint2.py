@@ -1,5 +1,4 @@
 import sys
-import time
 import unittest as ut
 
 import numpy as np
@@ -8,9 +7,9 @@ import xarray as xr
 # Import from directory structure if coverage test, or from installed
 # packages otherwise
 if "--cov" in str(sys.argv):
-    from src.geocat.f2py import ChunkError, CoordinateError, linint2
+    from src.geocat.f2py import ChunkError, CoordinateError, linint1, linint2
 else:
-    from geocat.f2py import ChunkError, CoordinateError, linint2
+    from geocat.f2py import ChunkError, CoordinateError, linint1, linint2
 
 n = 127
 
@@ -235,6 +234,37 @@ class Test_linint2_dask(ut.TestCase):
         with self.assertRaises(ChunkError):
             fo = linint2(fi, xo, yo)
 
+    def test_linint2_graph(self):
+        # One task per chunk of the input, in a single layer on top of the
+        # input, without rechunking
+        fi = xr.DataArray(fi_np,
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': yi,
+                              'lon': xi
+                          }).chunk({
+                              'time': 50,
+                              'level': 2
+                          })
+        fo = linint2(fi, xo, yo)
+
+        graph = fo.data.__dask_graph__()
+        self.assertEqual(len(graph.layers), 2)
+        self.assertEqual(fo.data.chunks[:2], fi.data.chunks[:2])
+        self.assertEqual(
+            len(graph) - len(fi.data.__dask_graph__()), fi.data.npartitions)
+        np.testing.assert_array_equal(fi.values, fo[..., ::2, ::2].values)
+
+    def test_linint2_msg_and_nan(self):
+        # Both NaN and `msg_py` are missing in the input; missing values of
+        # the output are `msg_py`
+        fi_msg = fi_np[:2, :1].copy()
+        fi_msg[0, 0, 0, 0] = -99
+        fi_msg[1, 0, 0, 0] = np.nan
+        fo = linint2(fi_msg, xo, yo, xi=xi, yi=yi, msg_py=-99)
+        np.testing.assert_array_equal(fo[:, 0, 0, :2], -99)
+        self.assertFalse(np.isnan(fo).any())
+
 
 class Test_linint2_numpy(ut.TestCase):
 
@@ -255,25 +285,34 @@ class Test_linint2_numpy(ut.TestCase):
             fo = linint2(fi_np, xo, yo, yi=yi)
 
 
-# class Test_linint2_non_monotonic(ut.TestCase):
-#
-#     def test_linint2_non_monotonic_xr(self):
-#         fi = xr.DataArray(fi_np[:, :, ::-1, :],
-#                           dims=['time', 'level', 'lat', 'lon'],
-#                           coords={
-#                               'lat': yi_reverse,
-#                               'lon': xi
-#                           }).chunk(chunks)
-#         with self.assertWarns(_ncomp.NcompWarning):
-#             linint2(fi, xo, yo).compute()
-#
-#     def test_linint2_non_monotonic_np(self):
-#         with self.assertWarns(geocat.ncomp._ncomp.NcompWarning):
-#             linint2(fi_np[:, :, ::-1, :],
-#                                  xo,
-#                                  yo,
-#                                  xi=xi,
-#                                  yi=yi_reverse)
+class Test_linint2_non_monotonic(ut.TestCase):
+
+    def test_linint2_non_monotonic_xr(self):
+        fi = xr.DataArray(fi_np[:, :, ::-1, :],
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': yi_reverse,
+                              'lon': xi
+                          }).chunk(chunks)
+        with self.assertWarns(Warning):
+            fo = linint2(fi, xo, yo).compute()
+        self.assertTrue(np.isnan(fo).all())
+
+    def test_linint2_non_monotonic_np(self):
+        with self.assertWarns(Warning):
+            fo = linint2(fi_np[:, :, ::-1, :], xo, yo, xi=xi, yi=yi_reverse)
+        self.assertTrue(np.isnan(fo).all())
+
+    def test_linint2_decreasing_y(self):
+        # x increasing and y decreasing, e.g. north to south latitudes
+        fo = linint2(fi_np[:, :, ::-1, :], xo, yo[::-1], xi=xi, yi=yi_reverse)
+        np.testing.assert_allclose(fo[..., ::-1, :],
+                                   linint2(fi_np, xo, yo, xi=xi, yi=yi))
+
+    def test_linint1_non_monotonic(self):
+        with self.assertWarns(Warning):
+            fo = linint1(fi_np, xo[::-1], xi=xi)
+        self.assertTrue(np.isnan(fo).all())
 
 
 class Test_linint2_non_contiguous(ut.TestCase):
@@ -302,3 +341,28 @@ class Test_linint2_non_contiguous(ut.TestCase):
                      xi=xi,
                      yi=yi_reverse[::-1])
         np.testing.assert_array_equal(fi[:, :, ::-1, :], fo[..., ::2, ::2])
+
+
+class Test_linint2_cyclic(ut.TestCase):
+    # Cyclic in x (longitude): output points between the last longitude and
+    # 360 are interpolated between the last and the first columns of `fi`
+    lon = np.linspace(0, 360, 36, endpoint=False)
+    lat = np.linspace(-90, 90, 19)
+    fi_cyc = np.cos(np.deg2rad(lon)) * np.ones((lat.shape[0], 1))
+    lon_out = np.asarray([2.5, 180, 355])
+    expected = np.interp(lon_out, np.append(lon, 360),
+                         np.append(np.cos(np.deg2rad(lon)), 1))
+
+    def test_linint1_cyclic(self):
+        fo = linint1(self.fi_cyc[0], self.lon_out, xi=self.lon, icycx=1)
+        np.testing.assert_array_almost_equal(self.expected, fo)
+
+    def test_linint2_cyclic(self):
+        fo = linint2(self.fi_cyc,
+                     self.lon_out,
+                     np.asarray([-5, 0, 45]),
+                     xi=self.lon,
+                     yi=self.lat,
+                     icycx=1)
+        np.testing.assert_array_almost_equal(
+            np.broadcast_to(self.expected, (3, 3)), fo)
@@ -154,6 +154,24 @@ class Test_linint2pts_non_monotonic(ut.TestCase, BaseTestClass):
                        xi=self._xi,
                        yi=self._yi_reverse)
 
+    def test_linint2pts_non_monotonic_warns_once(self):
+        import warnings
+        fi = xr.DataArray(self._fi_np[:, :, ::-1, :],
+                          dims=['time', 'level', 'lat', 'lon'],
+                          coords={
+                              'lat': self._yi_reverse,
+                              'lon': self._xi
+                          }).chunk({
+                              'time': 1,
+                              'level': 1
+                          })
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            fo = linint2pts(fi, self._xo, self._yo, 0).compute()
+        self.assertEqual(len(caught), 1)
+        self.assertTrue(np.isnan(fo).all())
+
 
 class Test_linint2pts_float64(ut.TestCase, BaseTestClass):
 
@@ -302,3 +320,24 @@ class Test_linint2pts_dask(ut.TestCase, BaseTestClass):
                           }).chunk(wrong_chunks)
         with self.assertRaises(ChunkError):
             fo = linint2pts(fi, self._xo, self._yo, 0)
+
+
+class Test_linint2pts_cyclic(ut.TestCase):
+
+    def test_linint2pts_cyclic(self):
+        # Points between the last longitude and 360 are interpolated between
+        # the last and the first columns of `fi`
+        lon = np.linspace(0, 360, 36, endpoint=False)
+        lat = np.linspace(-90, 90, 19)
+        fi = np.cos(np.deg2rad(lon)) * np.ones((lat.shape[0], 1))
+
+        fo = linint2pts(fi,
+                        np.asarray([355, 2.5, 180]),
+                        np.asarray([0, 45, -5]),
+                        icycx=True,
+                        xi=lon,
+                        yi=lat)
+
+        np.testing.assert_almost_equal(
+            np.interp([355, 2.5, 180], np.append(lon, 360),
+                      np.append(np.cos(np.deg2rad(lon)), 1)), fo)
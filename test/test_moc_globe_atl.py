@@ -133,3 +133,108 @@ class Test_Moc_Globe_Atl(ut.TestCase):
 
         nt.assert_array_almost_equal(ncl_truth_msg, out_arr)
         nt.assert_equal((3, 2, kdep, nyaux), out_arr.shape)
+
+    def test_moc_globe_atl_n_regions(self):
+
+        # Globe, Atlantic and a region made of the first two rows only
+        rmlak_n = np.concatenate((rmlak, np.zeros((1, nlat, mlon))))
+        rmlak_n[2, :2] = 1
+
+        out_arr = moc_globe_atl(lat_aux_grid, tmp_a, tmp_a, tmp_a, t_lat,
+                                rmlak_n)
+
+        nt.assert_equal((3, 3, kdep, nyaux), out_arr.shape)
+        nt.assert_array_almost_equal(ncl_truth, out_arr[:, :2])
+
+        # Same result as for the third region alone
+        out_arr_2 = moc_globe_atl(lat_aux_grid, tmp_a, tmp_a, tmp_a, t_lat,
+                                  rmlak_n[[2, 2]])
+        nt.assert_array_almost_equal(out_arr_2[:, 0], out_arr[:, 2])
+
+    def test_moc_globe_atl_region_ids(self):
+
+        region_ids = np.full((nlat, mlon), 6)
+        region_ids[:2] = 1
+
+        out_arr = moc_globe_atl(lat_aux_grid,
+                                tmp_a,
+                                tmp_a,
+                                tmp_a,
+                                t_lat,
+                                region_ids,
+                                regions=[[1, 6], 6, 1])
+
+        rmlak_n = np.stack((np.ones(
+            (nlat, mlon)), region_ids == 6, region_ids == 1))
+        out_arr_masks = moc_globe_atl(lat_aux_grid, tmp_a, tmp_a, tmp_a, t_lat,
+                                      rmlak_n)
+
+        nt.assert_array_almost_equal(ncl_truth[:, :1], out_arr[:, :1])
+        nt.assert_array_almost_equal(out_arr_masks, out_arr)
+
+    def test_moc_globe_atl_regions_with_masks(self):
+
+        with self.assertRaises(ValueError):
+            moc_globe_atl(lat_aux_grid,
+                          tmp_a,
+                          tmp_a,
+                          tmp_a,
+                          t_lat,
+                          rmlak,
+                          regions=[1])
+
+
+class Test_Moc_Globe_Atl_Time(ut.TestCase):
+
+    def test_moc_globe_atl_time(self):
+
+        tmp_a_time = np.stack((tmp_a, 2 * tmp_a, 3 * tmp_a))
+
+        out_arr = moc_globe_atl(lat_aux_grid, tmp_a_time, tmp_a_time,
+                                tmp_a_time, t_lat, rmlak)
+
+        nt.assert_equal((3, 3, 2, kdep, nyaux), out_arr.shape)
+        nt.assert_equal(
+            ('time', 'transport_comp', 'transport_reg', 'z', 'lat_aux_grid'),
+            out_arr.dims)
+        for t in range(3):
+            nt.assert_array_almost_equal((t + 1) * ncl_truth, out_arr[t])
+
+    def test_moc_globe_atl_time_dask_msg_nan(self):
+
+        tmp_a_time = xr.DataArray(np.stack((tmp_a_nan,) * 5),
+                                  dims=('time', 'z_t', 'nlat', 'nlon'),
+                                  coords={
+                                      'time': np.arange(5)
+                                  }).chunk({'time': 2})
+
+        out_arr = moc_globe_atl(xr.DataArray(lat_aux_grid, dims='lat_aux_grid'),
+                                tmp_a_time,
+                                tmp_a_time,
+                                tmp_a_time,
+                                t_lat,
+                                rmlak,
+                                msg=np.nan)
+
+        # Output is lazy and chunked in time like the input
+        nt.assert_equal(((2, 2, 1), (3,), (2,), (kdep,), (nyaux,)),
+                        out_arr.chunks)
+        nt.assert_equal(np.arange(5), out_arr.time.values)
+
+        for t in range(5):
+            nt.assert_array_almost_equal(ncl_truth_msg, out_arr[t])
+
+    def test_moc_globe_atl_time_region_ids(self):
+
+        region_ids = np.full((nlat, mlon), 6)
+        region_ids[:2] = 1
+        tmp_a_time = np.stack((tmp_a, tmp_a))
+
+        out_arr = moc_globe_atl(lat_aux_grid, tmp_a_time, tmp_a_time,
+                                tmp_a_time, t_lat, region_ids)
+
+        # One region per region ID by default
+        nt.assert_equal([1, 6], out_arr.transport_reg.values)
+        nt.assert_equal((2, 3, 2, kdep, nyaux), out_arr.shape)
+        nt.assert_array_almost_equal(ncl_truth[:, 0],
+                                     out_arr.sum(dim='transport_reg')[1])
@@ -0,0 +1,150 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest as ut
+
+import dask.array as da
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import DimensionError, oisst
+else:
+    from geocat.f2py import DimensionError, oisst
+
+rng = np.random.default_rng(0)
+
+
+def record(payload):
+    # A big-endian Fortran unformatted sequential record
+    marker = struct.pack(">i", len(payload))
+    return marker + payload + marker
+
+
+def grid(header, sst, extra=()):
+    # The header and grid records of rdsstoi, and other records
+    return (record(struct.pack(">8i", *header)) +
+            record(sst.astype(">f4").tobytes()) +
+            b"".join(record(e.tobytes()) for e in extra))
+
+
+class Test_oisst(ut.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "oisst.wkmean.1990")
+
+        self.sst = rng.random((5, 180, 360)).astype(np.float32) * 30
+        with open(self.path, "wb") as f:
+            for (i, sst) in enumerate(self.sst):
+                # Weekly grids from Sunday, 1989-12-31
+                start = np.datetime64("1989-12-31") + 7 * i
+                end = start + 6
+                f.write(grid(_ymd(start) + _ymd(end) + [7, i], sst))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_memmap(self):
+        records = oisst.memmap(self.path)
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(records.shape, (5,))
+        nt.assert_array_equal(records["sst"][3], self.sst[3])
+        nt.assert_array_equal(records["header"][1],
+                              [1990, 1, 7, 1990, 1, 13, 7, 1])
+
+    def test_open_dataarray(self):
+        sst = oisst.open_dataarray(self.path, chunks=2)
+        self.assertIsInstance(sst.data, da.Array)
+        self.assertEqual(sst.dims, ("time", "lat", "lon"))
+        self.assertEqual(sst.data.chunks[0], (2, 2, 1))
+        self.assertEqual(sst.dtype, np.float32)
+        nt.assert_array_equal(sst, self.sst)
+
+        self.assertEqual(sst.time.values[0], np.datetime64("1989-12-31", "ns"))
+        self.assertEqual(sst.time_end.values[1],
+                         np.datetime64("1990-01-13", "ns"))
+        nt.assert_array_equal(sst.ndays, 7)
+        nt.assert_array_equal(sst.index, np.arange(5))
+        self.assertEqual((sst.lon.values[0], sst.lat.values[-1]),
+                         (-179.5, 89.5))
+
+        nt.assert_array_equal(
+            sst.sel(time="1990-01-14", lat=slice(-5, 5)).squeeze(),
+            self.sst[2, 85:95])
+
+    def test_files(self):
+        path = os.path.join(self.dir.name, "oisst.wkmean.1991")
+        with open(path, "wb") as f:
+            f.write(grid([91, 1, 6, 91, 1, 12, 7, 0], self.sst[0]))
+
+        sst = oisst.open_dataarray([self.path, path])
+        self.assertEqual(sst.sizes["time"], 6)
+        self.assertEqual(sst.time.values[-1], np.datetime64("1991-01-06", "ns"))
+        nt.assert_array_equal(sst[-1], self.sst[0])
+
+    def test_extra_records(self):
+        # e.g. analysis errors and ice concentrations after each grid
+        path = os.path.join(self.dir.name, "oisst.extra")
+        extra = (np.ones((180, 360), ">f4"), np.zeros((180, 360), "u1"))
+        with open(path, "wb") as f:
+            for sst in self.sst[:3]:
+                f.write(grid([1990, 1, 7, 1990, 1, 13, 7, 0], sst, extra))
+
+        nt.assert_array_equal(oisst.open_dataarray(path), self.sst[:3])
+
+    def test_round_trip(self):
+        sst = oisst.open_dataarray(self.path)
+        path = os.path.join(self.dir.name, "out")
+        oisst.write(sst, path)
+        with open(path, "rb") as f, open(self.path, "rb") as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_write(self):
+        sst = xr.DataArray(self.sst,
+                           dims=("time", "lat", "lon"),
+                           coords={
+                               "time":
+                                   np.array([
+                                       "1990-01-07", "1990-02-28", "1991-12-29",
+                                       "1992-02-23", "1992-03-01"
+                                   ],
+                                            dtype="datetime64[ns]")
+                           })
+        path = os.path.join(self.dir.name, "out")
+        oisst.write(sst.chunk({"time": 2}), path)
+
+        nt.assert_array_equal(
+            oisst.memmap(path)["header"][1], [1990, 2, 28, 1990, 3, 6, 7, 0])
+        nt.assert_array_equal(
+            oisst.memmap(path)["header"][2], [1991, 12, 29, 1992, 1, 4, 7, 0])
+        out = oisst.open_dataarray(path)
+        nt.assert_array_equal(out, self.sst)
+        nt.assert_array_equal(out.time, sst.time)
+
+    def test_errors(self):
+        with self.assertRaises(DimensionError):
+            oisst.write(
+                xr.DataArray(self.sst[:, :90], dims=("time", "lat", "lon")),
+                os.path.join(self.dir.name, "out"))
+        with self.assertRaises(ValueError):
+            oisst.open_dataarray(self.path, chunks=0)
+
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+        with self.assertRaises(ValueError):
+            oisst.open_dataarray(self.path)
+
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<i", 32) + bytes(40))
+        with self.assertRaises(ValueError):
+            oisst.open_dataarray(self.path)
+
+
+def _ymd(date):
+    year, month, day = str(date).split("-")
+    return [int(year), int(month), int(day)]
@@ -0,0 +1,112 @@
+import sys
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (linint2, moc_globe_atl, parallel, rcm2rgrid,
+                                 triple_to_grid)
+else:
+    from geocat.f2py import (linint2, moc_globe_atl, parallel, rcm2rgrid,
+                             triple_to_grid)
+
+rng = np.random.default_rng(0)
+
+# Global grid, with missing values
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = rng.random((3, 4, 73, 144))
+fi[rng.random(fi.shape) < 0.05] = np.nan
+
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+
+class Test_parallel_run(ut.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        parallel.shutdown()
+
+    def test_linint2(self):
+        expected = linint2(fi, lon_out, lat_out, xi=lon, yi=lat, icycx=1)
+
+        # The same pool is used again for the second call
+        for _ in range(2):
+            fo = parallel.run(linint2,
+                              fi,
+                              lon_out,
+                              lat_out,
+                              xi=lon,
+                              yi=lat,
+                              icycx=1,
+                              workers=2)
+            self.assertEqual(fo.shape, (3, 4, 61, 97))
+            nt.assert_array_equal(fo, expected)
+
+    def test_rcm2rgrid(self):
+        lat2d, lon2d = np.meshgrid(np.linspace(-40, 40, 25),
+                                   np.linspace(100, 200, 30),
+                                   indexing="ij")
+        fi_curv = rng.random((5, 25, 30))
+        args = (lat2d, lon2d, fi_curv, np.linspace(-30, 30, 20),
+                np.linspace(110, 190, 25))
+
+        nt.assert_array_equal(parallel.run(rcm2rgrid, *args, workers=2),
+                              rcm2rgrid(*args))
+
+    def test_triple_to_grid(self):
+        x = rng.uniform(0, 360, 300)
+        y = rng.uniform(-90, 90, 300)
+        data = rng.random((2, 3, 300))
+
+        nt.assert_array_equal(
+            parallel.run(triple_to_grid,
+                         data,
+                         x,
+                         y,
+                         lon_out,
+                         lat_out,
+                         workers=2), triple_to_grid(data, x, y, lon_out,
+                                                    lat_out))
+
+    def test_serial(self):
+        # A single slice is computed by the calling process
+        nt.assert_array_equal(
+            parallel.run(linint2,
+                         fi[0, 0],
+                         lon_out,
+                         lat_out,
+                         xi=lon,
+                         yi=lat,
+                         workers=2),
+            linint2(fi[0, 0], lon_out, lat_out, xi=lon, yi=lat))
+
+    def test_warnings(self):
+        # Warnings are issued once, by the calling process
+        with self.assertWarns(UserWarning):
+            parallel.run(linint2,
+                         fi,
+                         lon_out[::-1],
+                         lat_out,
+                         xi=lon,
+                         yi=lat,
+                         workers=2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parallel.run(moc_globe_atl, fi, workers=2)
+        with self.assertRaises(ValueError):
+            parallel.run(linint2, fi, lon_out, lat_out, xi=lon, workers=0)
+        with self.assertRaises(TypeError):
+            parallel.run(linint2,
+                         xr.DataArray(fi),
+                         lon_out,
+                         lat_out,
+                         xi=lon,
+                         yi=lat,
+                         workers=2)
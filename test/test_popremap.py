@@ -0,0 +1,186 @@
+import os
+import sys
+import tempfile
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import DimensionError, ScripRemapper, cache
+    from src.geocat.f2py.fortran import dpopremap
+else:
+    from geocat.f2py import DimensionError, ScripRemapper, cache
+    from geocat.f2py.fortran import dpopremap
+
+rng = np.random.default_rng(0)
+
+# A curvilinear (nlat, nlon) source grid to a (lat, lon) destination grid,
+# four links per destination cell, and a few destinations without links
+src_shape = (24, 32)
+dst_shape = (12, 18)
+nlink = 4 * 12 * 18
+src_address = rng.integers(1, 24 * 32 + 1, nlink)
+dst_address = np.repeat(np.arange(1, 12 * 18 + 1), 4)
+dst_address[dst_address == 7] = 8
+remap_matrix = rng.random((nlink, 3))
+
+fi = rng.random((3, 4) + src_shape)
+
+
+def reference(fi, msg=1e20):
+    # DPOPREMAP, slice by slice
+    fi = np.where(np.isnan(fi), msg, fi)
+    fo = np.empty(fi.shape[:-2] + dst_shape)
+    for index in np.ndindex(fi.shape[:-2]):
+        fo[index] = dpopremap(remap_matrix.T,
+                              dst_address,
+                              src_address,
+                              fi[index].ravel(),
+                              12 * 18,
+                              xmsg=msg).reshape(dst_shape)
+    return np.where(fo == msg, np.nan, fo)
+
+
+def scrip():
+    # A SCRIP remapping file, of grid dimensions in Fortran order
+    return xr.Dataset({
+        "src_grid_dims": ("src_grid_rank", [32, 24]),
+        "dst_grid_dims": ("dst_grid_rank", [18, 12]),
+        "src_address": ("num_links", src_address.astype(np.int32)),
+        "dst_address": ("num_links", dst_address.astype(np.int32)),
+        "remap_matrix": (("num_links", "num_wgts"), remap_matrix),
+        "src_grid_center_lat": ("src_grid_size", np.zeros(24 * 32)),
+        "dst_grid_center_lat": ("dst_grid_size", np.zeros(12 * 18)),
+    })
+
+
+class Test_ScripRemapper(ut.TestCase):
+
+    def setUp(self):
+        self.remap = ScripRemapper(src_address, dst_address, remap_matrix,
+                                   src_shape, dst_shape)
+
+    def test_fortran(self):
+        fo = self.remap(fi)
+        self.assertEqual(fo.shape, (3, 4) + dst_shape)
+        expected = reference(fi)
+        nt.assert_array_equal(np.isnan(fo), np.isnan(expected))
+        nt.assert_allclose(fo, expected, rtol=1e-13)
+
+        # The destination without links is missing
+        self.assertTrue(np.isnan(fo[..., 0, 6]).all())
+
+    def test_flattened(self):
+        fo = self.remap(fi.reshape(12, -1))
+        self.assertEqual(fo.shape, (12, 12 * 18))
+        nt.assert_array_equal(fo, self.remap(fi).reshape(12, -1))
+
+    def test_missing(self):
+        fm = fi.copy()
+        fm[rng.random(fm.shape) < 0.5] = np.nan
+        fo = self.remap(fm)
+        expected = reference(fm)
+        nt.assert_array_equal(np.isnan(fo), np.isnan(expected))
+        nt.assert_allclose(fo, expected, rtol=1e-13)
+        self.assertTrue(np.isnan(fo).sum() > 12)
+
+        # Missing values given by `msg_py`
+        fo = self.remap(np.where(np.isnan(fm), -99.0, fm), msg_py=-99.0)
+        nt.assert_allclose(fo,
+                           np.where(np.isnan(expected), -99.0, expected),
+                           rtol=1e-13)
+
+    def test_float32(self):
+        remap = ScripRemapper(src_address,
+                              dst_address,
+                              remap_matrix,
+                              src_shape,
+                              dst_shape,
+                              dtype=np.float32)
+        fo = remap(fi.astype(np.float32))
+        self.assertEqual(fo.dtype, np.float32)
+        nt.assert_allclose(fo, self.remap(fi), rtol=1e-5)
+
+    def test_weights(self):
+        indptr, indices, data = self.remap.weights()
+        dense = np.zeros((12 * 18, 24 * 32))
+        for i in range(12 * 18):
+            np.add.at(dense[i], indices[indptr[i]:indptr[i + 1]],
+                      data[indptr[i]:indptr[i + 1]])
+        fo = self.remap(fi)
+        nt.assert_allclose(
+            np.where(np.isnan(fo), 0.0, fo).reshape(12, -1),
+            fi.reshape(12, -1) @ dense.T)
+
+    def test_from_file(self):
+        nt.assert_array_equal(
+            ScripRemapper.from_file(scrip())(fi), self.remap(fi))
+
+        esmf = scrip().rename(src_address="col",
+                              dst_address="row",
+                              num_links="n_s",
+                              src_grid_size="n_a",
+                              dst_grid_size="n_b")
+        esmf["S"] = esmf.remap_matrix[:, 0]
+        esmf = esmf.drop_vars(["remap_matrix", "src_grid_dims"])
+        remap = ScripRemapper.from_file(esmf)
+        self.assertEqual(remap.src_shape, (24 * 32,))
+        nt.assert_array_equal(
+            remap(fi.reshape(3, 4, -1)),
+            self.remap(fi.reshape(3, 4, -1)).reshape(3, 4, 12, 18))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "map.nc")
+            scrip().to_netcdf(path)
+            nt.assert_array_equal(
+                ScripRemapper.from_file(path)(fi), self.remap(fi))
+
+    def test_dims(self):
+        fx = xr.DataArray(fi,
+                          dims=("time", "z_t", "nlat", "nlon"),
+                          coords={
+                              "z_t": [5, 15, 25, 35],
+                              "TLAT": (("nlat", "nlon"), np.zeros(src_shape))
+                          })
+
+        fo = self.remap(fx, dims=("lat", "lon"))
+        self.assertEqual(fo.dims, ("time", "z_t", "lat", "lon"))
+        self.assertNotIn("TLAT", fo.coords)
+        nt.assert_array_equal(fo, self.remap(fi))
+
+        # Names of the source grid by default, if of the same number
+        self.assertEqual(self.remap(fx).dims, fx.dims)
+
+        fo = self.remap(
+            fx.stack(ncells=("nlat",
+                             "nlon")).drop_vars(["ncells", "nlat", "nlon"]))
+        self.assertEqual(fo.dims, ("time", "z_t", "ncells"))
+
+    def test_weights_cache(self):
+        cache.enable()
+        try:
+            ScripRemapper.from_file(scrip())
+            before = cache.stats()["weights"]["hits"]
+            ScripRemapper.from_file(scrip(), dtype=np.float32)
+            self.assertEqual(cache.stats()["weights"]["hits"], before + 1)
+        finally:
+            cache.disable()
+            cache.clear()
+
+    def test_errors(self):
+        with self.assertRaises(DimensionError):
+            self.remap(fi[..., 1:])
+        with self.assertRaises(DimensionError):
+            self.remap(xr.DataArray(fi), dims=("ncells",))
+        with self.assertRaises(DimensionError):
+            ScripRemapper(src_address[1:], dst_address, remap_matrix, src_shape,
+                          dst_shape)
+        with self.assertRaises(ValueError):
+            ScripRemapper(src_address, dst_address + 1, remap_matrix, src_shape,
+                          dst_shape)
+        with self.assertRaises(ValueError):
+            ScripRemapper.from_file(xr.Dataset())
@@ -0,0 +1,110 @@
+import sys
+import unittest as ut
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import linint2, profiling, rcm2points
+else:
+    from geocat.f2py import linint2, profiling, rcm2points
+
+xi = np.linspace(0, 10, 11)
+yi = np.linspace(0, 5, 6)
+xo = np.linspace(0.5, 9.5, 10)
+yo = np.linspace(0.5, 4.5, 5)
+fi = np.random.default_rng(0).random((4, 6, 11))
+
+
+class Test_profiling(ut.TestCase):
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled(self):
+        profiling.reset()
+        self.assertFalse(profiling.is_enabled())
+
+        linint2(fi, xo, yo, icycx=0, xi=xi, yi=yi)
+
+        self.assertEqual(profiling.stats(), {})
+
+    def test_profile_stages(self):
+        with profiling.profile() as stats:
+            linint2(fi, xo, yo, icycx=0, xi=xi, yi=yi)
+
+        self.assertFalse(profiling.is_enabled())
+        self.assertEqual(
+            set(stats["linint2"]), {
+                "validation", "cache", "chunking", "compute", "transpose",
+                "fortran", "packaging"
+            })
+
+        # One Fortran call per chunk of `fi`, which missing values are
+        # converted in as well
+        self.assertEqual(stats["linint2"]["fortran"]["calls"], 1)
+        self.assertEqual(stats["linint2"]["validation"]["calls"], 1)
+        for record in stats["linint2"].values():
+            self.assertGreaterEqual(record["time"], 0)
+
+    def test_numpy_backend_stages(self):
+        with profiling.profile() as stats:
+            linint2(fi, xo, yo, icycx=0, xi=xi, yi=yi, backend="numpy")
+
+        self.assertEqual(set(stats["linint2"]), {
+            "validation", "cache", "chunking", "compute", "numpy", "packaging"
+        })
+
+    def test_fortran_copies(self):
+        lat2d, lon2d = np.meshgrid(np.arange(6.0),
+                                   np.arange(11.0),
+                                   indexing="ij")
+
+        with profiling.profile() as stats:
+            rcm2points(lat2d, lon2d, fi, yo, xo[:5])
+            rcm2points(lat2d, lon2d, fi.astype(np.float32), yo, xo[:5])
+
+        # Transposed inputs are passed without copies; only the float32 `fi`
+        # is converted to double precision by f2py
+        self.assertEqual(stats["rcm2points"]["fortran"]["calls"], 2)
+        self.assertEqual(stats["rcm2points"]["fortran"]["bytes"], fi.nbytes)
+
+    def test_stats_frame(self):
+        with profiling.profile():
+            linint2(fi, xo, yo, icycx=0, xi=xi, yi=yi)
+
+        frame = profiling.stats(as_frame=True)
+
+        self.assertEqual(list(frame.index.names), ["function", "stage"])
+        self.assertEqual(list(frame.columns), ["calls", "time", "bytes"])
+        self.assertIn(("linint2", "fortran"), frame.index)
+
+    def test_annotations(self):
+        fi_dask = xr.DataArray(da.from_array(fi, chunks=(2, 6, 11)),
+                               dims=("time", "lat", "lon"),
+                               coords={
+                                   "lat": yi,
+                                   "lon": xi
+                               })
+
+        with profiling.profile(annotations=True):
+            fo = linint2(fi_dask, xo, yo, icycx=0)
+
+        annotations = [
+            layer.annotations
+            for layer in fo.data.__dask_graph__().layers.values()
+            if layer.annotations
+        ]
+        self.assertIn({"geocat_f2py": "linint2"}, annotations)
+
+    def test_restores_enabled(self):
+        profiling.enable()
+
+        with profiling.profile():
+            pass
+
+        self.assertTrue(profiling.is_enabled())
@@ -105,3 +105,8 @@ class Test_rgrid2rcm(ut.TestCase):
                       lat2d,
                       lon2d,
                       msg=msg32))
+
+    def test_rgrid2rcm_non_monotonic(self):
+        with self.assertWarns(Warning):
+            rgrid2rcm(lat[::-1], lon, fi_nom[:, ::-1].astype(np.float64), lat2d,
+                      lon2d)
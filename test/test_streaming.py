@@ -0,0 +1,149 @@
+import sys
+import threading
+import time
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import linint2, streaming
+else:
+    from geocat.f2py import linint2, streaming
+
+rng = np.random.default_rng(0)
+
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = rng.random((6, 4, 73, 144))
+
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+
+def regrid(slab):
+    return linint2(slab, lon_out, lat_out, lon, lat, 1)
+
+
+class Test_imap(ut.TestCase):
+
+    def test_results(self):
+        results = list(
+            streaming.imap(linint2, iter(fi), lon_out, lat_out, lon, lat, 1))
+        self.assertEqual(len(results), 6)
+        for (slab, fo) in zip(fi, results):
+            nt.assert_array_equal(fo, regrid(slab))
+
+    def test_xarray_slabs(self):
+        da = xr.DataArray(fi,
+                          dims=("time", "lev", "lat", "lon"),
+                          coords={
+                              "lat": lat,
+                              "lon": lon
+                          })
+        slabs = (da.isel(time=slice(i, i + 2)) for i in range(0, 6, 2))
+        fo = xr.concat(list(
+            streaming.imap(linint2, slabs, lon_out, lat_out, icycx=1)),
+                       dim="time")
+        nt.assert_array_equal(fo, regrid(fi))
+
+    def test_bounded_prefetch(self):
+        read = []
+
+        def slabs():
+            for (i, slab) in enumerate(fi):
+                read.append(i)
+                yield slab
+
+        for (i, _) in enumerate(
+                streaming.imap(regrid_slow, slabs(), depth=2, delay=0.02)):
+            # Slabs being computed or queued, and at most one being read
+            self.assertLessEqual(len(read), i + 1 + 2 + 1)
+
+    def test_overlap(self):
+
+        def slabs():
+            for slab in fi:
+                time.sleep(0.05)
+                yield slab
+
+        start = time.perf_counter()
+        list(streaming.imap(regrid_slow, slabs(), delay=0.05))
+
+        # Reading and computing take 0.6 s one after the other
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_reader_error(self):
+
+        def slabs():
+            yield fi[0]
+            raise OSError("unreadable")
+
+        results = streaming.imap(regrid, slabs())
+        next(results)
+        with self.assertRaisesRegex(OSError, "unreadable"):
+            next(results)
+
+    def test_close_stops_reader(self):
+        results = streaming.imap(regrid, iter(fi))
+        next(results)
+        results.close()
+        self.assertFalse(
+            any(t.name == "geocat-f2py-reader" for t in threading.enumerate()))
+
+    def test_invalid_depth(self):
+        for depth in (0, 1.5, True):
+            with self.assertRaises(ValueError):
+                streaming.imap(regrid, iter(fi), depth=depth)
+
+
+def regrid_slow(slab, delay):
+    time.sleep(delay)
+    return slab
+
+
+class Test_run(ut.TestCase):
+
+    def test_writes_in_order(self):
+        written = []
+        self.assertEqual(
+            streaming.run(linint2, iter(fi), written.append, lon_out, lat_out,
+                          lon, lat, 1), 6)
+        for (slab, fo) in zip(fi, written):
+            nt.assert_array_equal(fo, regrid(slab))
+
+    def test_writer_error(self):
+        read = []
+
+        def slabs():
+            for (i, slab) in enumerate(fi):
+                read.append(i)
+                yield slab
+
+        def write(fo):
+            raise OSError("disk full")
+
+        with self.assertRaisesRegex(OSError, "disk full"):
+            streaming.run(regrid, slabs(), write, depth=1)
+        self.assertLess(len(read), 6)
+
+    def test_gil_released(self):
+        # The main thread keeps running while Fortran computes a large slab
+        big = rng.random((16, 181, 360))
+        xo, yo = np.linspace(0, 359, 720), np.linspace(-90, 90, 361)
+        ticks = []
+
+        thread = threading.Thread(target=linint2,
+                                  args=(big, xo, yo, np.arange(360.0),
+                                        np.linspace(-90, 90, 181), 1))
+        start = time.perf_counter()
+        thread.start()
+        while thread.is_alive():
+            ticks.append(time.perf_counter())
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(np.diff([start] + ticks).max(), 0.5 * elapsed)
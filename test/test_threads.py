@@ -0,0 +1,115 @@
+import sys
+import unittest as ut
+
+import numpy as np
+import numpy.testing as nt
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import (ScripRemapper, get_num_threads, linint2,
+                                 linint2pts, moc_globe_atl, num_threads,
+                                 rcm2rgrid, rgrid2rcm, set_num_threads, threads)
+else:
+    from geocat.f2py import (ScripRemapper, get_num_threads, linint2,
+                             linint2pts, moc_globe_atl, num_threads, rcm2rgrid,
+                             rgrid2rcm, set_num_threads, threads)
+
+rng = np.random.default_rng(0)
+
+# Smooth field on a global grid, with missing values
+lon = np.linspace(0, 357.5, 144)
+lat = np.linspace(-90, 90, 73)
+fi = np.cos(np.deg2rad(lat))[:, None] * np.sin(np.deg2rad(2 * lon))
+fi = np.stack((fi, 2 * fi)) + rng.random((2, 73, 144)) / 10
+fi[:, 10:14, 30:40] = np.nan
+
+lon_out = np.linspace(0, 359, 97)
+lat_out = np.linspace(-89, 89, 61)
+
+
+def _with_threads(n, func, *args, **kwargs):
+    with num_threads(n):
+        return np.asarray(func(*args, **kwargs))
+
+
+class Test_num_threads(ut.TestCase):
+
+    def setUp(self):
+        self.default = get_num_threads()
+
+    def tearDown(self):
+        set_num_threads(self.default)
+
+    def test_set_get(self):
+        set_num_threads(3)
+        self.assertEqual(get_num_threads(), 3)
+
+    def test_context_manager(self):
+        set_num_threads(2)
+
+        with num_threads(5):
+            self.assertEqual(get_num_threads(), 5)
+
+        self.assertEqual(get_num_threads(), 2)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, set_num_threads, 0)
+        self.assertRaises(TypeError, set_num_threads, 2.0)
+        self.assertRaises(TypeError, set_num_threads, True)
+
+    def test_apply(self):
+        if not threads.openmp_enabled():
+            self.skipTest("not compiled with OpenMP")
+
+        set_num_threads(3)
+        threads.apply()
+        self.assertEqual(threads.fomp_get_max_threads(), 3)
+
+
+class Test_threaded_results(ut.TestCase):
+    # Results must not depend on the number of threads
+
+    def assert_same(self, func, *args, **kwargs):
+        serial = _with_threads(1, func, *args, **kwargs)
+        parallel = _with_threads(4, func, *args, **kwargs)
+        nt.assert_array_equal(serial, parallel)
+
+    def test_linint2(self):
+        self.assert_same(linint2, fi, lon_out, lat_out, lon, lat, icycx=0)
+
+    def test_linint2_cyclic(self):
+        self.assert_same(linint2, fi, lon_out, lat_out, lon, lat, icycx=1)
+
+    def test_linint2pts(self):
+        xo = rng.uniform(0, 359, 500)
+        yo = rng.uniform(-89, 89, 500)
+        self.assert_same(linint2pts, fi, xo, yo, 1, xi=lon, yi=lat)
+
+    def test_rcm2rgrid_rgrid2rcm(self):
+        lat2d, lon2d = np.meshgrid(lat[20:50], lon[20:70], indexing="ij")
+        lat2d = lat2d + 0.1 * np.sin(lon2d)
+        fi_rcm = fi[:, 20:50, 20:70]
+
+        self.assert_same(rcm2rgrid, lat2d, lon2d, fi_rcm, lat[25:45],
+                         lon[25:65])
+        self.assert_same(rgrid2rcm, lat, lon, fi, lat2d, lon2d)
+
+    def test_moc_globe_atl(self):
+        lat_aux_grid = np.linspace(-80, 80, 33)
+        t_lat = np.broadcast_to(lat[:, None], (73, 144)).copy()
+        rmlak = np.stack((np.ones((73, 144)), lon < 60 + 0 * t_lat))
+        work = [rng.random((3, 5, 73, 144)) for _ in range(3)]
+
+        self.assert_same(moc_globe_atl, lat_aux_grid, *work, t_lat,
+                         rmlak.astype(np.int32))
+        self.assert_same(moc_globe_atl, lat_aux_grid, *[w[0] for w in work],
+                         t_lat, rmlak.astype(np.int32))
+
+    def test_scrip_remapper(self):
+        # Bilinear-like links of the global grid to the output one
+        src = rng.integers(1, 73 * 144 + 1, 4 * 61 * 97)
+        dst = np.repeat(np.arange(1, 61 * 97 + 1), 4)
+        remap = ScripRemapper(src, dst, rng.random(src.shape), (73, 144),
+                              (61, 97))
+        self.assert_same(remap, fi)
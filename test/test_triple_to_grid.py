@@ -113,6 +113,41 @@ class Test_triple_to_grid_float64(ut.TestCase):
 
         np.testing.assert_array_equal(out_expected, out.values)
 
+    def test_triple_to_grid_float64_xr_points_chunked(self):
+        out = triple_to_grid(
+            xr.DataArray(data).chunk({'dim_2': 1}), xr.DataArray(x_in),
+            xr.DataArray(y_in), xr.DataArray(x_out), xr.DataArray(y_out))
+
+        np.testing.assert_array_equal(out_expected, out.values)
+
+    def test_triple_to_grid_float64_points_chunked_msg_99(self):
+        out = triple_to_grid(xr.DataArray(data_msg_99).chunk({'dim_2': 3}),
+                             x_in,
+                             y_in,
+                             x_out,
+                             y_out,
+                             missing_value=-99,
+                             distmx=distmx)
+
+        np.testing.assert_array_equal(out_expected_distmx_msg_99, out.values)
+
+    def test_triple_to_grid_float64_points_chunked_random(self):
+        rng = np.random.default_rng(0)
+        x_in_rand = rng.uniform(-5, 365, 1000)
+        y_in_rand = rng.uniform(-95, 95, 1000)
+        data_rand = rng.normal(size=(2, 1000))
+        data_rand[0, ::7] = np.nan
+        x_out_rand = np.linspace(0, 360, 37)
+        y_out_rand = np.linspace(-90, 90, 19)
+
+        out = triple_to_grid(data_rand, x_in_rand, y_in_rand, x_out_rand,
+                             y_out_rand)
+        out_chunked = triple_to_grid(
+            xr.DataArray(data_rand).chunk({'dim_1': 150}), x_in_rand, y_in_rand,
+            x_out_rand, y_out_rand)
+
+        np.testing.assert_array_equal(out, out_chunked.values)
+
     # TODO: Revisit this because it failed arbitrarily in MacOS environment but never in Ubuntu
     # def test_triple_to_grid_float64_method_0(self):
     #     import gc
@@ -0,0 +1,282 @@
+import os
+import struct
+import sys
+import tempfile
+import unittest as ut
+import unittest.mock
+
+import dask.array as da
+import numpy as np
+import numpy.testing as nt
+import xarray as xr
+
+# Import from directory structure if coverage test, or from installed
+# packages otherwise
+if "--cov" in str(sys.argv):
+    from src.geocat.f2py import DimensionError, wps
+else:
+    from geocat.f2py import DimensionError, wps
+
+rng = np.random.default_rng(0)
+
+nx, ny = 12, 7
+
+
+def record(payload):
+    # A big-endian Fortran unformatted sequential record
+    marker = struct.pack(">i", len(payload))
+    return marker + payload + marker
+
+
+def field(name, level, slab, date="2021-06-01_00:00:00", iproj=0):
+    # The five records of a field, as in write_intermediate_wps
+    head = struct.pack(">24sf32s9s25s46sfiii",
+                       date.ljust(24).encode(), 0.0, b"ERA5".ljust(32),
+                       name.ljust(9).encode(), b"K".ljust(25),
+                       b"Temperature".ljust(46), level, slab.shape[1],
+                       slab.shape[0], iproj)
+    if iproj == 0:
+        proj = struct.pack(">8s5f", b"SWCORNER", -30.0, 10.0, 0.5, 0.25,
+                           6367470.0)
+    else:
+        proj = struct.pack(">8s8f", b"SWCORNER", 20.0, -120.0, 30000.0, 30000.0,
+                           -100.0, 30.0, 60.0, 6367470.0)
+    return (record(struct.pack(">i", 5)) + record(head) + record(proj) +
+            record(struct.pack(">i", 0)) + record(slab.astype(">f4").tobytes()))
+
+
+class Test_wps(ut.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "FILE:2021-06-01_00")
+
+        self.tt = rng.random((3, ny, nx)).astype(np.float32)
+        self.pmsl = rng.random((ny, nx)).astype(np.float32)
+        with open(self.path, "wb") as f:
+            for (level, slab) in zip((100000.0, 85000.0, 50000.0), self.tt):
+                f.write(field("TT", level, slab))
+            f.write(field("PMSL", 201300.0, self.pmsl))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_index(self):
+        records = wps.index(self.path)
+        self.assertEqual([(r.field, r.level) for r in records],
+                         [("TT", 100000.0), ("TT", 85000.0), ("TT", 50000.0),
+                          ("PMSL", 201300.0)])
+        r = records[0]
+        self.assertEqual((r.nx, r.ny, r.iproj), (nx, ny, 0))
+        self.assertEqual(r.date, "2021-06-01_00:00:00")
+        self.assertEqual(r.units, "K")
+        self.assertEqual(r.startloc, "SWCORNER")
+        self.assertEqual(r.projection["deltalat"], 0.5)
+        self.assertFalse(r.is_wind_grid_rel)
+
+    def test_memmap(self):
+        records = wps.index(self.path)
+        slab = wps.memmap(records[1])
+        self.assertIsInstance(slab, np.memmap)
+        nt.assert_array_equal(slab, self.tt[1])
+        nt.assert_array_equal(wps.memmap(records[3]), self.pmsl)
+
+    def test_open_dataset(self):
+        ds = wps.open_dataset(self.path)
+        self.assertIsInstance(ds.TT.data, da.Array)
+        self.assertEqual(ds.TT.dims, ("time", "level", "y", "x"))
+        self.assertEqual(ds.TT.dtype, np.float32)
+        nt.assert_array_equal(ds.level, [201300.0, 100000.0, 85000.0, 50000.0])
+        self.assertEqual(ds.time.values[0],
+                         np.datetime64("2021-06-01T00:00:00"))
+
+        nt.assert_array_equal(ds.TT.sel(level=85000.0)[0], self.tt[1])
+        nt.assert_array_equal(ds.TT[0, 1:], self.tt)
+        nt.assert_array_equal(ds.PMSL.sel(level=201300.0)[0], self.pmsl)
+
+        # Fields missing at a level
+        self.assertTrue(np.isnan(ds.TT.sel(level=201300.0)).all())
+        self.assertTrue(np.isnan(ds.PMSL.sel(level=85000.0)).all())
+
+        nt.assert_allclose(ds.lat, -30.0 + 0.5 * np.arange(ny))
+        nt.assert_allclose(ds.lon, 10.0 + 0.25 * np.arange(nx))
+        self.assertEqual(ds.TT.attrs["units"], "K")
+        self.assertEqual(ds.attrs["iproj"], 0)
+
+    def test_selection_reads(self):
+        # Selecting a slab only reads that slab
+        reads = []
+        memmap = wps.memmap
+
+        class Slab:
+
+            def __init__(self, record):
+                self.record = record
+                self.shape = (record.ny, record.nx)
+                self.dtype = np.dtype(">f4")
+                self.ndim = 2
+
+            def __getitem__(self, key):
+                reads.append(self.record.level)
+                return memmap(self.record)[key]
+
+        with ut.mock.patch.object(wps, "memmap", Slab):
+            ds = wps.open_dataset(self.path)
+        nt.assert_array_equal(ds.TT.sel(level=85000.0)[0], self.tt[1])
+        self.assertEqual(reads, [85000.0])
+
+    def test_files(self):
+        path = os.path.join(self.dir.name, "FILE:2021-06-01_06")
+        tt = rng.random((ny, nx)).astype(np.float32)
+        with open(path, "wb") as f:
+            f.write(field("TT", 85000.0, tt, date="2021-06-01_06:00:00"))
+
+        ds = wps.open_dataset([self.path, path])
+        self.assertEqual(ds.sizes["time"], 2)
+        nt.assert_array_equal(ds.TT.sel(level=85000.0), [self.tt[1], tt])
+        self.assertTrue(np.isnan(ds.TT[1].sel(level=50000.0)).all())
+
+    def test_lambert(self):
+        path = os.path.join(self.dir.name, "lambert")
+        with open(path, "wb") as f:
+            f.write(field("TT", 85000.0, self.pmsl, iproj=3))
+
+        (r,) = wps.index(path)
+        self.assertEqual(r.projection["truelat2"], 60.0)
+        ds = wps.open_dataset(path)
+        self.assertNotIn("lat", ds.coords)
+        self.assertEqual(ds.attrs["xlonc"], -100.0)
+
+    def test_different_grids(self):
+        with open(self.path, "ab") as f:
+            f.write(field("SST", 200100.0, rng.random((3, 4))))
+        with self.assertRaises(DimensionError):
+            wps.open_dataset(self.path)
+
+    def test_corrupted(self):
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+        with self.assertRaises(ValueError):
+            wps.index(self.path)
+
+    def test_little_endian(self):
+        with open(self.path, "wb") as f:
+            f.write(
+                struct.pack("<i", 4) + struct.pack("<i", 5) +
+                struct.pack("<i", 4))
+        with self.assertRaises(ValueError):
+            wps.index(self.path)
+
+
+class Test_write(ut.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.dir.name, "FILE")
+
+        self.ds = xr.Dataset(
+            {
+                "TT": (("time", "level", "y", "x"), rng.random(
+                    (3, 2, ny, nx)), {
+                        "units": "K",
+                        "description": "Temperature"
+                    }),
+                "PMSL": (("time", "y", "x"), rng.random((3, ny, nx)), {
+                    "units": "Pa",
+                    "level": 201300.0
+                }),
+            },
+            coords={
+                "time":
+                    np.array(
+                        ["2021-06-01T00", "2021-06-01T06", "2021-06-01T12"],
+                        dtype="datetime64[ns]"),
+                "level": [100000.0, 85000.0],
+                "lat": ("y", -30.0 + 0.5 * np.arange(ny)),
+                "lon": ("x", 10.0 + 0.25 * np.arange(nx)),
+            })
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        paths = wps.write(self.ds, self.prefix, workers=2)
+        self.assertEqual(
+            [os.path.basename(p) for p in paths],
+            ["FILE:2021-06-01_00", "FILE:2021-06-01_06", "FILE:2021-06-01_12"])
+
+        records = wps.index(paths[1])
+        self.assertEqual([(r.field, r.level) for r in records],
+                         [("TT", 100000.0), ("TT", 85000.0),
+                          ("PMSL", 201300.0)])
+        self.assertEqual(records[0].date, "2021-06-01_06:00:00")
+        self.assertEqual(records[0].units, "K")
+        self.assertEqual(records[0].desc, "Temperature")
+        self.assertEqual(records[0].map_source, "geocat-f2py")
+        self.assertEqual(records[0].projection["deltalon"], 0.25)
+        self.assertEqual(records[0].projection["earth_radius"],
+                         np.float32(6367.47))
+
+        ds = wps.open_dataset(paths)
+        nt.assert_array_equal(ds.time, self.ds.time)
+        nt.assert_array_equal(ds.TT.sel(level=[100000.0, 85000.0]),
+                              self.ds.TT.astype(np.float32))
+        nt.assert_array_equal(ds.PMSL.sel(level=201300.0),
+                              self.ds.PMSL.astype(np.float32))
+        nt.assert_allclose(ds.lat, self.ds.lat)
+
+    def test_same_bytes(self):
+        # Writing a file read back gives the same file
+        path = os.path.join(self.dir.name, "FILE:2021-06-01_00")
+        with open(path, "wb") as f:
+            for (level, slab) in zip((100000.0, 85000.0),
+                                     self.ds.TT[0].values.astype(np.float32)):
+                f.write(field("TT", level, slab))
+        with open(path, "rb") as f:
+            expected = f.read()
+
+        (written,) = wps.write(wps.open_dataset(path),
+                               os.path.join(self.dir.name, "OUT"))
+        with open(written, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_dask(self):
+        paths = wps.write(self.ds.chunk({"time": 1}), self.prefix)
+        ds = wps.open_dataset(paths)
+        nt.assert_array_equal(ds.TT.sel(level=[100000.0, 85000.0]),
+                              self.ds.TT.astype(np.float32))
+
+    def test_scalar_time(self):
+        (path,) = wps.write(self.ds.isel(time=2), self.prefix)
+        self.assertTrue(path.endswith("FILE:2021-06-01_12"))
+        self.assertEqual(len(wps.index(path)), 3)
+
+    def test_projection(self):
+        projection = {
+            "iproj": 3,
+            "startlat": 20.0,
+            "startlon": -120.0,
+            "dx": 30000.0,
+            "dy": 30000.0,
+            "xlonc": -100.0,
+            "truelat1": 30.0,
+            "truelat2": 60.0,
+        }
+        paths = wps.write(self.ds, self.prefix, projection=projection)
+        r = wps.index(paths[0])[0]
+        self.assertEqual(r.iproj, 3)
+        self.assertEqual(r.projection["truelat2"], 60.0)
+
+        del projection["truelat2"]
+        with self.assertRaises(ValueError):
+            wps.write(self.ds, self.prefix, projection=projection)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            wps.write(self.ds.rename(TT="TEMPERATURE"), self.prefix)
+        with self.assertRaises(ValueError):
+            wps.write(self.ds.drop_vars(["lat", "lon"]), self.prefix)
+        with self.assertRaises(ValueError):
+            wps.write(self.ds.drop_vars("time"), self.prefix)
+        with self.assertRaises(DimensionError):
+            wps.write(self.ds.expand_dims("member"), self.prefix)